@@ -64,6 +64,7 @@ from .components import (
 from .components.sensor import recorder as sensor_recorder  # noqa: F401
 from .const import (
     BASE_PLATFORMS,
+    EVENT_HOMEASSISTANT_STARTED,
     FORMAT_DATETIME,
     KEY_DATA_LOGGING as DATA_LOGGING,
     REQUIRED_NEXT_PYTHON_HA_RELEASE,
@@ -87,6 +88,7 @@ from .helpers import (
     translation,
 )
 from .helpers.dispatcher import async_dispatcher_send_internal
+from .helpers.json import save_json
 from .helpers.storage import get_internal_store_manager
 from .helpers.system_info import async_get_system_info, is_official_image
 from .helpers.typing import ConfigType
@@ -95,7 +97,9 @@ from .setup import (
     # that it is not part of the public API and should not be used
     # by integrations. It is only used for internal tracking of
     # which integrations are being set up.
+    DATA_STARTUP_TRACE,
     _setup_started,
+    async_enable_startup_trace,
     async_get_setup_timings,
     async_notify_setup_error,
     async_set_domains_to_be_loaded,
@@ -120,6 +124,7 @@ SETUP_ORDER_SORT_KEY = partial(contains, BASE_PLATFORMS)
 
 
 ERROR_LOG_FILENAME = "home-assistant.log"
+STARTUP_TRACE_FILENAME = "home-assistant-startup-trace.json"
 
 # hass.data key for logging information.
 DATA_REGISTRIES_LOADED: HassKey[None] = HassKey("bootstrap_registries_loaded")
@@ -279,6 +284,9 @@ async def async_setup_hass(
         hass.config.skip_pip = runtime_config.skip_pip
         hass.config.skip_pip_packages = runtime_config.skip_pip_packages
 
+        if runtime_config.startup_trace:
+            async_enable_startup_trace_export(hass)
+
         return hass
 
     async def stop_hass(hass: core.HomeAssistant) -> None:
@@ -378,6 +386,38 @@ async def async_setup_hass(
     return hass
 
 
+@core.callback
+def async_enable_startup_trace_export(hass: core.HomeAssistant) -> None:
+    """Record the setup steps and write them to a trace file once started.
+
+    The trace is written in the Chrome trace event format which
+    can be opened with Perfetto or chrome://tracing.
+    """
+    trace = async_enable_startup_trace(hass)
+
+    async def _async_write_startup_trace(_: core.Event) -> None:
+        """Write the startup trace and stop recording."""
+        hass.data.pop(DATA_STARTUP_TRACE, None)
+        for domain in hass.config.components:
+            if "." in domain:
+                continue
+            with contextlib.suppress(loader.IntegrationNotLoaded):
+                integration = loader.async_get_loaded_integration(hass, domain)
+                trace.set_dependencies(
+                    domain,
+                    chain(integration.dependencies, integration.after_dependencies),
+                )
+        path = hass.config.path(STARTUP_TRACE_FILENAME)
+        await hass.async_add_executor_job(save_json, path, trace.as_chrome_trace())
+        _LOGGER.info(
+            "Startup trace written to %s, critical path: %s",
+            path,
+            " -> ".join(trace.critical_path()),
+        )
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_write_startup_trace)
+
+
 def open_hass_ui(hass: core.HomeAssistant) -> None:
     """Open the UI."""
     import webbrowser  # pylint: disable=import-outside-toplevel
@@ -434,6 +474,7 @@ async def async_load_base_functionality(hass: core.HomeAssistant) -> None:
         create_eager_task(label_registry.async_load(hass)),
         hass.async_add_executor_job(_init_blocking_io_modules_in_executor),
         create_eager_task(template.async_load_custom_templates(hass)),
+        create_eager_task(template.async_load_bytecode_cache(hass)),
         create_eager_task(restore_state.async_load(hass)),
         create_eager_task(hass.config_entries.async_initialize()),
         create_eager_task(async_get_system_info(hass)),
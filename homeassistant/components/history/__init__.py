@@ -21,9 +21,11 @@ from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
 from . import websocket_api
+from .cache import async_setup_cache
 from .const import DOMAIN
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
+CONF_CACHE_MAX_STATES = "cache_max_states"
 CONF_ORDER = "use_include_order"
 
 _ONE_DAY = timedelta(days=1)
@@ -35,7 +37,10 @@ CONFIG_SCHEMA = vol.Schema(
             cv.deprecated(CONF_EXCLUDE),
             cv.deprecated(CONF_ORDER),
             INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
-                {vol.Optional(CONF_ORDER, default=False): cv.boolean}
+                {
+                    vol.Optional(CONF_ORDER, default=False): cv.boolean,
+                    vol.Optional(CONF_CACHE_MAX_STATES, default=0): cv.positive_int,
+                }
             ),
         )
     },
@@ -48,6 +53,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.http.register_view(HistoryPeriodView())
     frontend.async_register_built_in_panel(hass, "history", "history", "hass:chart-box")
     websocket_api.async_setup(hass)
+    if max_states := config.get(DOMAIN, {}).get(CONF_CACHE_MAX_STATES):
+        async_setup_cache(hass, max_states)
     return True
 
 
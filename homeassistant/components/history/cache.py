@@ -0,0 +1,384 @@
+"""In-memory cache of the recent history of entities."""
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, cast
+
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+    split_entity_id,
+)
+from homeassistant.helpers.start import async_at_started
+import homeassistant.util.dt as dt_util
+
+from .const import CACHE_WINDOW, HISTORY_CACHE
+
+_EMPTY_ATTRIBUTES: Mapping[str, Any] = {}
+
+
+class EntityHistory:
+    """Ring buffer of the recent states of an entity.
+
+    The states are kept as columns ordered by last_updated. Every
+    change after the first state is in the buffer so the history of
+    any period that starts after the first state can be answered.
+    The attributes are references to the recorded attributes which
+    are shared by consecutive states when they did not change.
+    """
+
+    __slots__ = (
+        "attributes",
+        "domain",
+        "last_changed_ts",
+        "last_updated_ts",
+        "source_attributes",
+        "state",
+    )
+
+    def __init__(self, domain: str) -> None:
+        """Initialize an empty history."""
+        self.domain = domain
+        self.state: deque[str | None] = deque()
+        self.last_updated_ts: deque[float] = deque()
+        self.last_changed_ts: deque[float] = deque()
+        self.attributes: deque[Mapping[str, Any]] = deque()
+        self.source_attributes: Mapping[str, Any] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of states in the history."""
+        return len(self.state)
+
+    def copy(self) -> EntityHistory:
+        """Return a copy of the history that is not changed by later states."""
+        history_copy = EntityHistory(self.domain)
+        history_copy.state = self.state.copy()
+        history_copy.last_updated_ts = self.last_updated_ts.copy()
+        history_copy.last_changed_ts = self.last_changed_ts.copy()
+        history_copy.attributes = self.attributes.copy()
+        return history_copy
+
+    def append(
+        self,
+        state: str | None,
+        last_updated_ts: float,
+        last_changed_ts: float,
+        attributes: Mapping[str, Any],
+    ) -> None:
+        """Append a state."""
+        self.state.append(state)
+        self.last_updated_ts.append(last_updated_ts)
+        self.last_changed_ts.append(last_changed_ts)
+        self.attributes.append(attributes)
+
+    def prepend(self, other: EntityHistory) -> None:
+        """Add the states of another history before the states."""
+        self.state.extendleft(reversed(other.state))
+        self.last_updated_ts.extendleft(reversed(other.last_updated_ts))
+        self.last_changed_ts.extendleft(reversed(other.last_changed_ts))
+        self.attributes.extendleft(reversed(other.attributes))
+
+    def trim(self, start_ts: float) -> int:
+        """Remove the states replaced before start_ts and return how many."""
+        last_updated_ts = self.last_updated_ts
+        removed = 0
+        while len(last_updated_ts) > 1 and last_updated_ts[1] < start_ts:
+            self.state.popleft()
+            last_updated_ts.popleft()
+            self.last_changed_ts.popleft()
+            self.attributes.popleft()
+            removed += 1
+        return removed
+
+    def significant_states(
+        self,
+        start_time_ts: float,
+        end_time_ts: float | None,
+        include_start_time_state: bool,
+        significant_changes_only: bool,
+        minimal_response: bool,
+        no_attributes: bool,
+    ) -> list[dict[str, Any]]:
+        """Return the states in the compressed format of the history queries.
+
+        This mirrors get_significant_states of the recorder history.
+        """
+        last_updated_ts = self.last_updated_ts
+        significant_domain = self.domain in history.SIGNIFICANT_DOMAINS
+        need_attributes = (
+            not minimal_response or self.domain in history.NEED_ATTRIBUTE_DOMAINS
+        )
+        rows: list[tuple[str | None, float, float | None, Mapping[str, Any]]] = []
+        start_state_idx: int | None = None
+        for idx, row_last_updated_ts in enumerate(last_updated_ts):
+            if row_last_updated_ts < start_time_ts:
+                start_state_idx = idx
+                continue
+            if end_time_ts is not None and row_last_updated_ts >= end_time_ts:
+                break
+            # The database queries neither include a state
+            # updated at the start time nor use it as start state
+            if row_last_updated_ts == start_time_ts:
+                continue
+            row_last_changed_ts = self.last_changed_ts[idx]
+            if (
+                significant_changes_only
+                and not significant_domain
+                and row_last_changed_ts != row_last_updated_ts
+            ):
+                continue
+            rows.append(
+                (
+                    self.state[idx],
+                    row_last_updated_ts,
+                    None if significant_changes_only else row_last_changed_ts,
+                    self.attributes[idx],
+                )
+            )
+        if include_start_time_state and start_state_idx is not None:
+            rows.insert(
+                0,
+                (
+                    self.state[start_state_idx],
+                    start_time_ts,
+                    None,
+                    self.attributes[start_state_idx],
+                ),
+            )
+
+        results: list[dict[str, Any]] = []
+        prev_state: str | None = None
+        for state, row_last_updated_ts, last_changed_ts, attributes in rows:
+            if results and not need_attributes:
+                if state != prev_state:
+                    results.append(
+                        {
+                            COMPRESSED_STATE_STATE: (prev_state := state),
+                            COMPRESSED_STATE_LAST_UPDATED: row_last_updated_ts,
+                        }
+                    )
+                continue
+            prev_state = state
+            comp_state: dict[str, Any] = {COMPRESSED_STATE_STATE: state}
+            if need_attributes:
+                comp_state[COMPRESSED_STATE_ATTRIBUTES] = (
+                    _EMPTY_ATTRIBUTES if no_attributes else attributes
+                )
+            elif not no_attributes:
+                comp_state[COMPRESSED_STATE_ATTRIBUTES] = attributes
+            comp_state[COMPRESSED_STATE_LAST_UPDATED] = row_last_updated_ts
+            if last_changed_ts is not None and last_changed_ts != row_last_updated_ts:
+                comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+            results.append(comp_state)
+        return results
+
+
+class HistoryCache:
+    """Cache the recent history of the recorded entities.
+
+    The cache is filled from the state_changed events and seeded
+    once from the database at startup so history requests for the
+    recent past can be answered without querying the database.
+    When the cache holds more than max_states states the entities
+    that were requested the longest time ago are evicted.
+    """
+
+    def __init__(
+        self, max_states: int, entity_filter: Callable[[str], bool] | None
+    ) -> None:
+        """Initialize the cache."""
+        self.max_states = max_states
+        self._entity_filter = entity_filter
+        self._histories: OrderedDict[str, EntityHistory] = OrderedDict()
+        self._size = 0
+        self._seeded = False
+        self._evicted_before_seed: set[str] = set()
+
+    @property
+    def size(self) -> int:
+        """Return the number of states in the cache."""
+        return self._size
+
+    @callback
+    def async_add_state_changed_event(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Add the new state of a state_changed event."""
+        entity_id = event.data["entity_id"]
+        if self._entity_filter is not None and not self._entity_filter(entity_id):
+            return
+        if (entity_history := self._histories.get(entity_id)) is None:
+            entity_history = self._histories[entity_id] = EntityHistory(
+                split_entity_id(entity_id)[0]
+            )
+        # None state means the state was removed from the state machine
+        if (new_state := event.data["new_state"]) is None:
+            entity_history.source_attributes = None
+            last_updated_ts = event.time_fired_timestamp
+            entity_history.append(
+                None, last_updated_ts, last_updated_ts, _EMPTY_ATTRIBUTES
+            )
+        else:
+            if new_state.attributes is entity_history.source_attributes:
+                attributes = entity_history.attributes[-1]
+            else:
+                attributes = StateAttributes.recorded_attributes(new_state)
+                entity_history.source_attributes = new_state.attributes
+            entity_history.append(
+                new_state.state,
+                new_state.last_updated_timestamp,
+                new_state.last_changed_timestamp,
+                attributes,
+            )
+        self._size += 1 - entity_history.trim(
+            event.time_fired_timestamp - CACHE_WINDOW.total_seconds()
+        )
+        self._async_evict()
+
+    @callback
+    def async_seed(
+        self, states: dict[str, list[dict[str, Any]]], start_time_ts: float
+    ) -> None:
+        """Add the history fetched from the database before the cached states.
+
+        The states must be the complete history since start_time_ts
+        in the compressed format including the state at the start time.
+        """
+        self._seeded = True
+        for entity_id, rows in states.items():
+            if not rows or entity_id in self._evicted_before_seed:
+                continue
+            if (entity_history := self._histories.get(entity_id)) is None:
+                entity_history = self._histories[entity_id] = EntityHistory(
+                    split_entity_id(entity_id)[0]
+                )
+                # Entities that only have seeded states were not requested yet
+                self._histories.move_to_end(entity_id, last=False)
+            seeded = EntityHistory(entity_history.domain)
+            first_cached_ts = (
+                entity_history.last_updated_ts[0] if len(entity_history) else None
+            )
+            for row in rows:
+                last_updated_ts = row[COMPRESSED_STATE_LAST_UPDATED]
+                if first_cached_ts is not None and last_updated_ts >= first_cached_ts:
+                    break
+                seeded.append(
+                    row[COMPRESSED_STATE_STATE],
+                    last_updated_ts,
+                    row.get(COMPRESSED_STATE_LAST_CHANGED, last_updated_ts),
+                    row.get(COMPRESSED_STATE_ATTRIBUTES) or _EMPTY_ATTRIBUTES,
+                )
+            self._size += len(seeded)
+            entity_history.prepend(seeded)
+        self._evicted_before_seed.clear()
+        self._async_evict()
+
+    @callback
+    def _async_evict(self) -> None:
+        """Evict the least recently requested entities until under the limit."""
+        histories = self._histories
+        while self._size > self.max_states and histories:
+            entity_id, entity_history = histories.popitem(last=False)
+            self._size -= len(entity_history)
+            if not self._seeded:
+                self._evicted_before_seed.add(entity_id)
+
+    @callback
+    def async_get_histories(
+        self, start_time_ts: float, entity_ids: Iterable[str]
+    ) -> dict[str, EntityHistory] | None:
+        """Return copies of the histories of the entities or None if not cached.
+
+        The copies are not changed by later states so the significant
+        states can be built from them outside the event loop.
+        """
+        histories = self._histories
+        entity_histories: list[tuple[str, EntityHistory]] = []
+        for entity_id in entity_ids:
+            if (
+                entity_history := histories.get(entity_id)
+            ) is None or entity_history.last_updated_ts[0] >= start_time_ts:
+                return None
+            entity_histories.append((entity_id, entity_history))
+        result: dict[str, EntityHistory] = {}
+        for entity_id, entity_history in entity_histories:
+            histories.move_to_end(entity_id)
+            result[entity_id] = entity_history.copy()
+        return result
+
+
+def significant_states_from_histories(
+    histories: dict[str, EntityHistory],
+    start_time_ts: float,
+    end_time_ts: float | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the history of the entities in the compressed state format."""
+    result: dict[str, list[dict[str, Any]]] = {}
+    for entity_id, entity_history in histories.items():
+        if states := entity_history.significant_states(
+            start_time_ts,
+            end_time_ts,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        ):
+            result[entity_id] = states
+    return result
+
+
+@callback
+def async_setup_cache(hass: HomeAssistant, max_states: int) -> None:
+    """Set up the recent history cache."""
+    instance = get_instance(hass)
+    entity_filter = instance.entity_filter
+    cache = hass.data[HISTORY_CACHE] = HistoryCache(max_states, entity_filter)
+    hass.bus.async_listen(EVENT_STATE_CHANGED, cache.async_add_state_changed_event)
+
+    async def _async_seed_cache(hass: HomeAssistant) -> None:
+        """Seed the cache with the recent history from the database."""
+        end_time = dt_util.utcnow()
+        start_time = end_time - CACHE_WINDOW
+        entity_ids = [
+            entity_id
+            for entity_id in hass.states.async_entity_ids()
+            if entity_filter is None or entity_filter(entity_id)
+        ]
+        states: dict[str, list[dict[str, Any]]] = {}
+        if entity_ids and await instance.async_db_ready:
+            states = cast(
+                dict[str, list[dict[str, Any]]],
+                await instance.async_add_executor_job(
+                    history.get_significant_states,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    None,
+                    True,
+                    False,
+                    False,
+                    False,
+                    True,
+                ),
+            )
+        cache.async_seed(states, start_time.timestamp())
+
+    async_at_started(hass, _async_seed_cache)
@@ -1,7 +1,21 @@
 """History integration constants."""
 
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.util.hass_dict import HassKey
+
+if TYPE_CHECKING:
+    from .cache import HistoryCache
+
 DOMAIN = "history"
 
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+CACHE_WINDOW = timedelta(days=1)
+
+HISTORY_CACHE: HassKey[HistoryCache] = HassKey(f"{DOMAIN}_cache")
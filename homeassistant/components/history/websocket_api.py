@@ -39,7 +39,8 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .cache import EntityHistory, significant_states_from_histories
+from .const import EVENT_COALESCE_TIME, HISTORY_CACHE, MAX_PENDING_HISTORY_STATES
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
 _LOGGER = logging.getLogger(__name__)
@@ -94,6 +95,31 @@ def _ws_get_significant_states(
     )
 
 
+def _ws_get_downsampled_states(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    max_points: int,
+) -> bytes:
+    """Fetch downsampled history and convert it to json in the executor."""
+    return json_bytes(
+        messages.result_message(
+            msg_id,
+            history.get_downsampled_states(
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                max_points,
+                include_start_time_state,
+            ),
+        )
+    )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/history_during_period",
@@ -104,6 +130,7 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
@@ -153,11 +180,31 @@ async def ws_get_history_during_period(
         connection.send_result(msg["id"], {})
         return
 
+    instance = get_instance(hass)
+    if (
+        (max_points := msg.get("max_points"))
+        and instance.states_buckets_manager is not None
+        and instance.states_meta_manager.active
+    ):
+        connection.send_message(
+            await instance.async_add_executor_job(
+                _ws_get_downsampled_states,
+                hass,
+                msg["id"],
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                max_points,
+            )
+        )
+        return
+
     significant_changes_only = msg["significant_changes_only"]
     minimal_response = msg["minimal_response"]
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await instance.async_add_executor_job(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -239,6 +286,19 @@ def _generate_historical_response(
             True,
         ),
     )
+    return _generate_historical_response_from_states(
+        msg_id, start_time, end_time, states, send_empty
+    )
+
+
+def _generate_historical_response_from_states(
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    states: dict[str, list[dict[str, Any]]],
+    send_empty: bool,
+) -> tuple[float, dt | None, bytes | None]:
+    """Generate a historical response from compressed states."""
     last_time_ts = 0.0
     for state_list in states.values():
         if (
@@ -265,37 +325,89 @@ def _generate_historical_response(
     )
 
 
-async def _async_send_historical_states(
-    hass: HomeAssistant,
-    connection: ActiveConnection,
+def _generate_historical_response_from_histories(
     msg_id: int,
     start_time: dt,
     end_time: dt,
-    entity_ids: list[str] | None,
+    histories: dict[str, EntityHistory],
     include_start_time_state: bool,
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
-) -> dt | None:
-    """Fetch history significant_states and send them to the client."""
-    instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
-        _generate_historical_response,
-        hass,
-        msg_id,
-        start_time,
-        end_time,
-        entity_ids,
+) -> tuple[float, dt | None, bytes | None]:
+    """Generate a historical response from the cached histories."""
+    states = significant_states_from_histories(
+        histories,
+        start_time.timestamp(),
+        end_time.timestamp(),
         include_start_time_state,
         significant_changes_only,
         minimal_response,
         no_attributes,
-        send_empty,
     )
+    return _generate_historical_response_from_states(
+        msg_id, start_time, end_time, states, send_empty
+    )
+
+
+async def _async_send_historical_states(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str] | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    send_empty: bool,
+) -> tuple[dt | None, bool]:
+    """Fetch history significant_states and send them to the client.
+
+    Returns the time of the last state sent and if the states
+    were answered from the recent history cache.
+    """
+    if (
+        entity_ids
+        and (cache := hass.data.get(HISTORY_CACHE)) is not None
+        and (histories := cache.async_get_histories(start_time.timestamp(), entity_ids))
+        is not None
+    ):
+        from_cache = True
+        last_time_ts, last_time_dt, payload = await hass.async_add_executor_job(
+            _generate_historical_response_from_histories,
+            msg_id,
+            start_time,
+            end_time,
+            histories,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            send_empty,
+        )
+    else:
+        from_cache = False
+        last_time_ts, last_time_dt, payload = await get_instance(
+            hass
+        ).async_add_executor_job(
+            _generate_historical_response,
+            hass,
+            msg_id,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            send_empty,
+        )
     if payload:
         connection.send_message(payload)
-    return last_time_dt if last_time_ts != 0 else None
+    return (last_time_dt if last_time_ts != 0 else None), from_cache
 
 
 def _history_compressed_state(state: State, no_attributes: bool) -> dict[str, Any]:
@@ -522,7 +634,7 @@ async def ws_stream(
     connection.subscriptions[msg_id] = _unsub
     connection.send_result(msg_id)
     # Fetch everything from history
-    last_event_time = await _async_send_historical_states(
+    last_event_time, from_cache = await _async_send_historical_states(
         hass,
         connection,
         msg_id,
@@ -550,6 +662,11 @@ async def ws_stream(
         )
     )
 
+    if from_cache:
+        # The cache is filled from the state_changed events
+        # so it already has every state before the subscriptions
+        return
+
     live_stream.wait_sync_task = create_eager_task(
         get_instance(hass).async_block_till_done()
     )
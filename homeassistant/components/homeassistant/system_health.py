@@ -6,7 +6,7 @@ from typing import Any
 
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import system_info
+from homeassistant.helpers import system_info, template
 
 
 @callback
@@ -20,6 +20,7 @@ def async_register(
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     info = await system_info.async_get_system_info(hass)
+    template_cache = template.TEMPLATE_STATE_CACHE.as_dict()
 
     return {
         "version": f"core-{info.get('version')}",
@@ -35,4 +36,9 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
         "arch": info.get("arch"),
         "timezone": info.get("timezone"),
         "config_dir": hass.config.config_dir,
+        "template_cache_usage": (
+            f"{template_cache['states']}/{template_cache['size']}"
+        ),
+        "template_cache_hit_rate": f"{template_cache['hit_rate']:.1%}",
+        "template_cache_evictions": template_cache["evictions"],
     }
@@ -27,6 +27,7 @@ from homeassistant.helpers import (
 from homeassistant.helpers.event import (
     async_track_same_state,
     async_track_state_change_event,
+    async_track_state_value_change_event,
     process_state_match,
 )
 from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
@@ -232,7 +233,19 @@ async def async_attach_trigger(
             entity_ids=entity,
         )
 
-    unsub = async_track_state_change_event(hass, entity_ids, state_automation_listener)
+    if match_all and attribute is None:
+        unsub = async_track_state_change_event(
+            hass, entity_ids, state_automation_listener
+        )
+    else:
+        # Changes of attributes the trigger does not look at are skipped
+        # without calling the listener
+        unsub = async_track_state_value_change_event(
+            hass,
+            entity_ids,
+            () if attribute is None else (attribute,),
+            state_automation_listener,
+        )
 
     @callback
     def async_remove() -> None:
@@ -19,14 +19,23 @@ import voluptuous as vol
 
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.const import (
+    CONF_SCAN_INTERVAL,
+    CONF_TYPE,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import issue_registry as ir
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
 
-from .const import DOMAIN
+from . import websocket_api
+from .const import DOMAIN, LOOP_MONITOR, SIGNAL_LOOP_STALL
+from .loop_monitor import LoopLagMonitor, LoopStall
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -40,6 +49,7 @@ SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
 SERVICE_SET_ASYNCIO_DEBUG = "set_asyncio_debug"
 SERVICE_LOG_CURRENT_TASKS = "log_current_tasks"
+SERVICE_SET_EVENT_BUS_PROFILING = "set_event_bus_profiling"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -63,11 +73,15 @@ SERVICES = (
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_LOG_CURRENT_TASKS,
+    SERVICE_SET_EVENT_BUS_PROFILING,
 )
 
+PLATFORMS = [Platform.SENSOR]
+
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 DEFAULT_MAX_OBJECTS = 5
+EVENT_BUS_LISTENERS_LOGGED = 25
 
 CONF_ENABLED = "enabled"
 CONF_SECONDS = "seconds"
@@ -273,6 +287,27 @@ async def async_setup_entry(  # noqa: C901
             base_logger.setLevel(logging.INFO)
         hass.loop.set_debug(enabled)
 
+    async def _async_event_bus_profiling(call: ServiceCall) -> None:
+        """Enable or disable recording the time spent in the bus listeners."""
+        if call.data[CONF_ENABLED]:
+            _LOGGER.critical("Recording the time spent in the event bus listeners")
+            hass.bus.async_start_profiling()
+            return
+        if (profiler := hass.bus.async_stop_profiling()) is None:
+            raise HomeAssistantError("Event bus profiling not running")
+        for listener in profiler.as_list()[:EVENT_BUS_LISTENERS_LOGGED]:
+            _LOGGER.critical(
+                "Event bus listener %s for %s: calls=%s rejected=%s"
+                " total=%.6fs p99=%.6fs max=%.6fs",
+                listener["listener"],
+                listener["event_type"],
+                listener["calls"],
+                listener["rejected"],
+                listener["total_time"],
+                listener["p99_time"],
+                listener["max_time"],
+            )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -382,15 +417,68 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_SET_EVENT_BUS_PROFILING,
+        _async_event_bus_profiling,
+        schema=vol.Schema({vol.Optional(CONF_ENABLED, default=True): cv.boolean}),
+    )
+
+    websocket_api.async_setup(hass)
+
+    @callback
+    def _async_loop_stall(stall: LoopStall) -> None:
+        """Report a stall of the event loop."""
+        async_dispatcher_send(hass, SIGNAL_LOOP_STALL, stall)
+        if stall.integration is None:
+            return
+        _LOGGER.warning(
+            "Detected that %sintegration '%s' blocked the event loop for %.3f seconds%s:\n%s",
+            "custom " if stall.custom_integration else "",
+            stall.integration,
+            stall.lag,
+            f" in task {stall.task}" if stall.task else "",
+            "".join(stall.stack),
+        )
+        ir.async_create_issue(
+            hass,
+            DOMAIN,
+            f"loop_stall_{stall.integration}",
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="loop_stall",
+            translation_placeholders={
+                "integration": stall.integration,
+                "lag": f"{stall.lag:.3f}",
+                "task": stall.task or "-",
+            },
+        )
+
+    monitor = domain_data[LOOP_MONITOR] = LoopLagMonitor(hass, _async_loop_stall)
+    monitor.async_start()
+
+    async def _async_stop_loop_monitor(_: Event) -> None:
+        await monitor.async_stop()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_loop_monitor)
+    )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+    await hass.data[DOMAIN][LOOP_MONITOR].async_stop()
     for service in SERVICES:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    hass.bus.async_stop_profiling()
     hass.data.pop(DOMAIN)
     return True
 
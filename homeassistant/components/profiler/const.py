@@ -2,3 +2,6 @@
 
 DOMAIN = "profiler"
 DEFAULT_NAME = "Profiler"
+
+LOOP_MONITOR = "loop_monitor"
+SIGNAL_LOOP_STALL = "profiler_loop_stall"
@@ -0,0 +1,28 @@
+"""Diagnostics support for the profiler."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import async_get_suppressed_state_writes
+from homeassistant.helpers.event import async_get_template_render_stats
+
+from .websocket_api import async_get_event_bus_stats, async_get_loop_stats
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        "event_bus": async_get_event_bus_stats(hass),
+        "event_loop": async_get_loop_stats(hass),
+        "suppressed_state_writes": async_get_suppressed_state_writes(hass),
+        "template_renders": {
+            entity_id: asdict(stats)
+            for entity_id, stats in async_get_template_render_stats(hass).items()
+        },
+    }
@@ -0,0 +1,185 @@
+"""Monitor the lag of the event loop and attribute the stalls."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+import sys
+import threading
+import time
+import traceback
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.frame import MissingIntegrationFrame, get_integration_frame
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_STALL_THRESHOLD = 0.4
+RECENT_STALLS = 25
+STACK_FRAMES = 10
+
+
+@dataclass(slots=True)
+class LoopSample:
+    """The code running in the event loop thread while it was stalled."""
+
+    integration: str | None
+    custom_integration: bool
+    task: str | None
+    stack: list[str]
+
+
+@dataclass(slots=True)
+class LoopStall:
+    """A stall of the event loop."""
+
+    time: float
+    lag: float
+    integration: str | None
+    custom_integration: bool
+    task: str | None
+    stack: list[str]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the stall."""
+        return asdict(self)
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop runs a callback scheduled every interval.
+
+    A watchdog thread samples the stack of the event loop thread when the
+    callback is later than the stall threshold, so the stall can be
+    attributed to the integration and the task that blocked the loop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        stall_listener: Callable[[LoopStall], None],
+        interval: float = DEFAULT_INTERVAL,
+        stall_threshold: float = DEFAULT_STALL_THRESHOLD,
+    ) -> None:
+        """Initialize the monitor."""
+        self._hass = hass
+        self._loop = hass.loop
+        self._stall_listener = stall_listener
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls: deque[LoopStall] = deque(maxlen=RECENT_STALLS)
+        self._window_max_lag = 0.0
+        self._due = 0.0
+        self._sampled_due = 0.0
+        self._sample: LoopSample | None = None
+        self._loop_thread_id: int | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start monitoring the event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._stop_event.clear()
+        self._async_schedule(time.monotonic())
+        self._thread = threading.Thread(
+            target=self._watchdog, name="loop_lag_watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def async_stop(self) -> None:
+        """Stop monitoring the event loop."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._stop_event.set()
+        if (thread := self._thread) is not None:
+            self._thread = None
+            await self._hass.async_add_executor_job(thread.join)
+
+    @callback
+    def async_pop_window_max_lag(self) -> float:
+        """Return the maximum lag since the last call."""
+        window_max_lag = self._window_max_lag
+        self._window_max_lag = self.last_lag
+        return window_max_lag
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the lag statistics and the recent stalls."""
+        return {
+            "interval": self.interval,
+            "stall_threshold": self.stall_threshold,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "stalls": [stall.as_dict() for stall in self.stalls],
+        }
+
+    @callback
+    def _async_schedule(self, now: float) -> None:
+        """Schedule the next measurement."""
+        self._due = now + self.interval
+        self._handle = self._loop.call_at(self._due, self._async_measure)
+
+    @callback
+    def _async_measure(self) -> None:
+        """Measure how late this callback runs."""
+        now = time.monotonic()
+        lag = self.last_lag = max(now - self._due, 0.0)
+        self.max_lag = max(self.max_lag, lag)
+        self._window_max_lag = max(self._window_max_lag, lag)
+        sample, self._sample = self._sample, None
+        self._async_schedule(now)
+        if lag < self.stall_threshold:
+            return
+        stall = LoopStall(
+            time=time.time(),
+            lag=lag,
+            integration=sample.integration if sample else None,
+            custom_integration=sample.custom_integration if sample else False,
+            task=sample.task if sample else None,
+            stack=sample.stack if sample else [],
+        )
+        self.stalls.append(stall)
+        self._stall_listener(stall)
+
+    def _watchdog(self) -> None:
+        """Sample the event loop thread when it is stalled."""
+        sample_interval = self.stall_threshold / 4
+        while not self._stop_event.wait(sample_interval):
+            due = self._due
+            if (
+                due == self._sampled_due
+                or time.monotonic() - due < self.stall_threshold
+            ):
+                continue
+            self._sampled_due = due
+            self._sample = self._take_sample()
+
+    def _take_sample(self) -> LoopSample | None:
+        """Return the code running in the event loop thread."""
+        if (
+            frame := sys._current_frames().get(self._loop_thread_id)  # type: ignore[arg-type]  # noqa: SLF001
+        ) is None:
+            return None
+        integration: str | None = None
+        custom_integration = False
+        try:
+            integration_frame = get_integration_frame(frame=frame)
+        except MissingIntegrationFrame:
+            pass
+        else:
+            integration = integration_frame.integration
+            custom_integration = integration_frame.custom_integration
+        task = asyncio.current_task(self._loop)
+        return LoopSample(
+            integration=integration,
+            custom_integration=custom_integration,
+            task=task.get_name() if task else None,
+            stack=traceback.format_list(
+                traceback.extract_stack(frame, limit=STACK_FRAMES)
+            ),
+        )
@@ -0,0 +1,53 @@
+"""Sensor platform for the profiler."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, LOOP_MONITOR
+from .loop_monitor import LoopLagMonitor
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the profiler sensors."""
+    async_add_entities(
+        [EventLoopLagSensor(entry.entry_id, hass.data[DOMAIN][LOOP_MONITOR])]
+    )
+
+
+class EventLoopLagSensor(SensorEntity):
+    """The maximum event loop lag since the last update."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "event_loop_lag"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 3
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, entry_id: str, monitor: LoopLagMonitor) -> None:
+        """Initialize the sensor."""
+        self._monitor = monitor
+        self._attr_unique_id = f"{entry_id}_event_loop_lag"
+        self._attr_native_value = monitor.last_lag
+
+    async def async_update(self) -> None:
+        """Update the maximum lag."""
+        self._attr_native_value = round(self._monitor.async_pop_window_max_lag(), 6)
@@ -0,0 +1,85 @@
+"""The profiler websocket API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, LOOP_MONITOR, SIGNAL_LOOP_STALL
+from .loop_monitor import LoopStall
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Set up the profiler websocket API."""
+    websocket_api.async_register_command(hass, ws_event_bus_stats)
+    websocket_api.async_register_command(hass, ws_subscribe_loop_stalls)
+
+
+@callback
+def async_get_event_bus_stats(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the statistics of the event bus listeners."""
+    if (profiler := hass.bus.profiler) is None:
+        return {"profiling": False, "sample_size": None, "listeners": []}
+    return {
+        "profiling": True,
+        "sample_size": profiler.sample_size,
+        "listeners": profiler.as_list(),
+    }
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/event_bus_stats",
+        vol.Optional("limit"): vol.All(int, vol.Range(min=1)),
+    }
+)
+@callback
+def ws_event_bus_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the statistics of the event bus listeners."""
+    stats = async_get_event_bus_stats(hass)
+    if limit := msg.get("limit"):
+        stats["listeners"] = stats["listeners"][:limit]
+    connection.send_result(msg["id"], stats)
+
+
+@callback
+def async_get_loop_stats(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the lag statistics and the recent stalls of the event loop."""
+    return hass.data[DOMAIN][LOOP_MONITOR].as_dict()
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/subscribe_loop_stalls",
+    }
+)
+@callback
+def ws_subscribe_loop_stalls(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Subscribe to the stalls of the event loop."""
+
+    @callback
+    def forward_loop_stall(stall: LoopStall) -> None:
+        """Forward a stall of the event loop to websocket."""
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"stalls": [stall.as_dict()]})
+        )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_LOOP_STALL, forward_loop_stall
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], async_get_loop_stats(hass))
+    )
@@ -52,13 +52,19 @@ DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 5
 
+CONF_ARCHIVE = "archive"
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
+CONF_BULK_INSERT = "bulk_insert"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
+CONF_DOWNSAMPLE = "downsample"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
+CONF_PURGE_MAX_ROWS_PER_SECOND = "purge_max_rows_per_second"
 CONF_PURGE_INTERVAL = "purge_interval"
+CONF_PARTITION_BY_DAY = "partition_by_day"
+CONF_SPOOL = "spool"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
 
@@ -96,10 +102,18 @@ CONFIG_SCHEMA = vol.Schema(
                 {
                     vol.Optional(CONF_AUTO_PURGE, default=True): cv.boolean,
                     vol.Optional(CONF_AUTO_REPACK, default=True): cv.boolean,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
+                    vol.Optional(CONF_ARCHIVE, default=False): cv.boolean,
+                    vol.Optional(CONF_DOWNSAMPLE, default=False): cv.boolean,
+                    vol.Optional(CONF_PARTITION_BY_DAY, default=False): cv.boolean,
+                    vol.Optional(CONF_SPOOL, default=False): cv.boolean,
                     vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
+                    vol.Optional(
+                        CONF_PURGE_MAX_ROWS_PER_SECOND, default=0
+                    ): cv.positive_int,
                     vol.Optional(CONF_DB_URL): vol.All(cv.string, validate_db_url),
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
@@ -138,7 +152,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     entity_filter = None if _filter.empty_filter else _filter.get_filter()
     auto_purge = conf[CONF_AUTO_PURGE]
     auto_repack = conf[CONF_AUTO_REPACK]
+    bulk_insert = conf[CONF_BULK_INSERT]
+    archive = conf[CONF_ARCHIVE]
+    downsample = conf[CONF_DOWNSAMPLE]
+    partition_by_day = conf[CONF_PARTITION_BY_DAY]
+    spool = conf[CONF_SPOOL]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
+    purge_max_rows_per_second = conf[CONF_PURGE_MAX_ROWS_PER_SECOND]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
@@ -163,6 +183,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        bulk_insert=bulk_insert,
+        archive=archive,
+        downsample=downsample,
+        purge_max_rows_per_second=purge_max_rows_per_second,
+        partition_by_day=partition_by_day,
+        spool=spool,
     )
     get_instance.cache_clear()
     instance.async_initialize()
@@ -0,0 +1,493 @@
+"""Columnar cold storage archive for purged states.
+
+Before states are purged they can be moved into per day partition files
+in the config directory so long range history remains available without
+keeping the rows in the database.
+
+Each partition holds one UTC day split into row groups of consecutive
+rows. Every column of a row group is stored as a separately zlib
+compressed block. String columns are dictionary encoded and numeric
+columns are packed arrays. The file footer records the time range of
+each row group and the offset of each block so readers only memory map
+the file and decompress the columns of the row groups a query actually
+needs.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Sequence
+import contextlib
+from datetime import datetime, timedelta
+import logging
+from math import isnan
+import mmap
+import os
+import struct
+from typing import Any, NamedTuple
+import zlib
+
+from sqlalchemy import select
+from sqlalchemy.orm.session import Session
+
+from homeassistant.helpers.json import json_bytes
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads, json_loads_object
+
+from .db_schema import StateAttributes, States, StatesMeta
+
+_LOGGER = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "recorder_archive"
+STATES_PARTITION_DIR = "states"
+PARTITION_SUFFIX = ".hacol"
+
+# The number of earlier partitions to search for the state
+# of each entity at the start time of a history query
+START_STATE_LOOKBACK_DAYS = 7
+
+# The number of rows written and held in memory at once when archiving
+ROW_GROUP_SIZE = 32768
+
+_MAGIC = b"HACOL2\n"
+_FOOTER_LENGTH = struct.Struct("<I")
+_COMPRESSION_LEVEL = 6
+_NO_VALUE = -1
+
+_DAY = timedelta(days=1)
+
+
+class ArchivedStateRow(NamedTuple):
+    """A state row read from the archive.
+
+    The field order matches the rows returned by the history
+    queries so the rows can be mixed with database rows.
+    """
+
+    metadata_id: int
+    state: str | None
+    last_updated_ts: float
+    last_changed_ts: float | None
+    attributes: str | None
+
+
+def partition_day_start(timestamp: float) -> datetime:
+    """Return the start of the UTC day partition a timestamp belongs to."""
+    return dt_util.utc_from_timestamp(timestamp).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def _encode_dictionary(values: Iterable[str | None]) -> tuple[list[str], array]:
+    """Encode string values as unique values and indices into them."""
+    lookup: dict[str, int] = {}
+    unique: list[str] = []
+    indices = array("i")
+    for value in values:
+        if value is None:
+            indices.append(_NO_VALUE)
+            continue
+        if (idx := lookup.get(value)) is None:
+            idx = lookup[value] = len(unique)
+            unique.append(value)
+        indices.append(idx)
+    return unique, indices
+
+
+def _decode_dictionary(unique: list[str], indices: array) -> list[str | None]:
+    """Decode dictionary encoded string values."""
+    return [None if idx == _NO_VALUE else unique[idx] for idx in indices]
+
+
+def _float_column(values: Iterable[float | None]) -> array:
+    """Pack a nullable float column, NaN marks a missing value."""
+    return array("d", (float("nan") if value is None else value for value in values))
+
+
+class StatesPartitionWriter:
+    """Write the rows of a single day as a partition.
+
+    The rows are written in row groups as they are appended so only
+    the rows of a single row group are held in memory.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the writer and open a temporary file next to path."""
+        self._path = path
+        self._tmp_path = f"{path}.tmp"
+        self._fh = open(self._tmp_path, "wb")
+        self._fh.write(_MAGIC)
+        self._offset = len(_MAGIC)
+        self._row_groups: list[dict[str, Any]] = []
+        self._written_rows = 0
+        self._clear()
+
+    def _clear(self) -> None:
+        """Start collecting the rows of the next row group."""
+        self.entity_id: list[str | None] = []
+        self.state: list[str | None] = []
+        self.last_updated_ts: list[float] = []
+        self.last_changed_ts: list[float | None] = []
+        self.attributes: list[str | None] = []
+
+    def __len__(self) -> int:
+        """Return the number of rows appended."""
+        return self._written_rows + len(self.last_updated_ts)
+
+    def append(
+        self,
+        entity_id: str | None,
+        state: str | None,
+        last_updated_ts: float,
+        last_changed_ts: float | None,
+        attributes: str | None,
+    ) -> None:
+        """Append a row."""
+        self.entity_id.append(entity_id)
+        self.state.append(state)
+        self.last_updated_ts.append(last_updated_ts)
+        self.last_changed_ts.append(last_changed_ts)
+        self.attributes.append(attributes)
+        if len(self.last_updated_ts) >= ROW_GROUP_SIZE:
+            self._write_row_group()
+
+    def _write_row_group(self) -> None:
+        """Write the collected rows as a row group."""
+        if not (rows := len(self.last_updated_ts)):
+            return
+        entity_ids, entity_idx = _encode_dictionary(self.entity_id)
+        states, state_idx = _encode_dictionary(self.state)
+        attributes, attributes_idx = _encode_dictionary(self.attributes)
+        blocks: dict[str, bytes] = {
+            "entity_ids": json_bytes(entity_ids),
+            "entity_idx": entity_idx.tobytes(),
+            "states": json_bytes(states),
+            "state_idx": state_idx.tobytes(),
+            "last_updated_ts": _float_column(self.last_updated_ts).tobytes(),
+            "last_changed_ts": _float_column(self.last_changed_ts).tobytes(),
+            "attributes": json_bytes(attributes),
+            "attributes_idx": attributes_idx.tobytes(),
+        }
+        columns: dict[str, list[int]] = {}
+        for name, block in blocks.items():
+            compressed = zlib.compress(block, _COMPRESSION_LEVEL)
+            columns[name] = [self._offset, len(compressed)]
+            self._fh.write(compressed)
+            self._offset += len(compressed)
+        self._row_groups.append(
+            {
+                "rows": rows,
+                "min_ts": min(self.last_updated_ts),
+                "max_ts": max(self.last_updated_ts),
+                "columns": columns,
+            }
+        )
+        self._written_rows += rows
+        self._clear()
+
+    def close(self) -> None:
+        """Write the footer and atomically move the partition to its path."""
+        self._write_row_group()
+        footer = json_bytes(
+            {"rows": self._written_rows, "row_groups": self._row_groups}
+        )
+        fh = self._fh
+        fh.write(footer)
+        fh.write(_FOOTER_LENGTH.pack(len(footer)))
+        fh.flush()
+        os.fsync(fh.fileno())
+        fh.close()
+        os.replace(self._tmp_path, self._path)
+
+    def abort(self) -> None:
+        """Remove the partially written partition."""
+        self._fh.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._tmp_path)
+
+
+class StatesRowGroupReader:
+    """Read columns of a row group from a memory mapped partition."""
+
+    def __init__(self, partition: mmap.mmap, row_group: dict[str, Any]) -> None:
+        """Initialize the row group reader."""
+        self._mmap = partition
+        self.rows: int = row_group["rows"]
+        self.min_ts: float = row_group["min_ts"]
+        self.max_ts: float = row_group["max_ts"]
+        self._columns: dict[str, list[int]] = row_group["columns"]
+
+    def _block(self, name: str) -> bytes:
+        """Decompress a single column block."""
+        offset, length = self._columns[name]
+        return zlib.decompress(self._mmap[offset : offset + length])
+
+    def _array(self, name: str, typecode: str) -> array:
+        """Return a packed array column."""
+        column = array(typecode)
+        column.frombytes(self._block(name))
+        return column
+
+    def _strings(self, name: str) -> list[str]:
+        """Return a dictionary of unique strings."""
+        return json_loads(self._block(name))  # type: ignore[return-value]
+
+    def last_updated_ts(self) -> array:
+        """Return the last_updated_ts column."""
+        return self._array("last_updated_ts", "d")
+
+    def last_changed_ts(self) -> list[float | None]:
+        """Return the last_changed_ts column."""
+        return [
+            None if isnan(value) else value
+            for value in self._array("last_changed_ts", "d")
+        ]
+
+    def entity_ids(self) -> tuple[list[str], array]:
+        """Return the entity_id dictionary and indices."""
+        return self._strings("entity_ids"), self._array("entity_idx", "i")
+
+    def states(self) -> list[str | None]:
+        """Return the state column."""
+        return _decode_dictionary(
+            self._strings("states"), self._array("state_idx", "i")
+        )
+
+    def attributes(self) -> list[str | None]:
+        """Return the attributes column."""
+        return _decode_dictionary(
+            self._strings("attributes"), self._array("attributes_idx", "i")
+        )
+
+
+class StatesPartitionReader:
+    """Read the row groups of a memory mapped partition."""
+
+    def __init__(self, path: str) -> None:
+        """Open the partition and read the footer."""
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._mmap)
+        if (
+            self._mmap[: len(_MAGIC)] != _MAGIC
+            or size < len(_MAGIC) + _FOOTER_LENGTH.size
+        ):
+            self._mmap.close()
+            raise ValueError(f"{path} is not a states archive partition")
+        footer_end = size - _FOOTER_LENGTH.size
+        (footer_len,) = _FOOTER_LENGTH.unpack_from(self._mmap, footer_end)
+        footer: dict[str, Any] = json_loads_object(
+            self._mmap[footer_end - footer_len : footer_end]
+        )
+        self.rows: int = footer["rows"]
+        self.row_groups = [
+            StatesRowGroupReader(self._mmap, row_group)
+            for row_group in footer["row_groups"]
+        ]
+
+    def close(self) -> None:
+        """Close the memory map."""
+        self._mmap.close()
+
+
+class StatesArchive:
+    """Manage the states partitions in the archive directory."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the archive."""
+        self.path = path
+        self.states_path = os.path.join(path, STATES_PARTITION_DIR)
+
+    def _partition_path(self, day_start: datetime) -> str:
+        """Return the path of the partition for a day."""
+        return os.path.join(
+            self.states_path, f"{day_start.date().isoformat()}{PARTITION_SUFFIX}"
+        )
+
+    def has_partition(self, day_start: datetime) -> bool:
+        """Return if a partition exists for the day."""
+        return os.path.exists(self._partition_path(day_start))
+
+    def archive_day(self, session: Session, day_start: datetime) -> int:
+        """Copy the states of a day from the database into a partition.
+
+        Returns the number of archived rows.
+        """
+        start_ts = day_start.timestamp()
+        end_ts = (day_start + _DAY).timestamp()
+        stmt = (
+            select(
+                StatesMeta.entity_id,
+                States.state,
+                States.last_updated_ts,
+                States.last_changed_ts,
+                StateAttributes.shared_attrs,
+            )
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .filter(States.last_updated_ts >= start_ts)
+            .filter(States.last_updated_ts < end_ts)
+            .order_by(States.last_updated_ts)
+        )
+        os.makedirs(self.states_path, exist_ok=True)
+        writer = StatesPartitionWriter(self._partition_path(day_start))
+        try:
+            # Stream the rows so only a single row group is held in memory
+            for row in session.execute(stmt).yield_per(ROW_GROUP_SIZE):
+                writer.append(*row)
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+        _LOGGER.debug(
+            "Archived %s states for %s", len(writer), day_start.date().isoformat()
+        )
+        return len(writer)
+
+    def read(
+        self,
+        start_time_ts: float,
+        end_time_ts: float,
+        entity_id_to_metadata_id: dict[str, int],
+        include_start_time_state: bool,
+        no_attributes: bool,
+    ) -> list[ArchivedStateRow]:
+        """Read archived states for the entities during a time period.
+
+        Rows are returned sorted by metadata_id and last_updated_ts. If
+        include_start_time_state is set the state each entity had at the
+        start time is included with a last_updated_ts of 0 to match the
+        rows the database queries return for the start time state.
+        """
+        rows: list[ArchivedStateRow] = []
+        day_start = partition_day_start(start_time_ts)
+        while day_start.timestamp() < end_time_ts:
+            if self.has_partition(day_start):
+                rows.extend(
+                    self._read_partition(
+                        self._partition_path(day_start),
+                        start_time_ts,
+                        end_time_ts,
+                        entity_id_to_metadata_id,
+                        no_attributes,
+                    )
+                )
+            day_start += _DAY
+        if include_start_time_state:
+            rows.extend(
+                self._read_start_time_states(
+                    start_time_ts, entity_id_to_metadata_id, no_attributes
+                )
+            )
+        rows.sort(key=lambda row: (row.metadata_id, row.last_updated_ts))
+        return rows
+
+    def _read_start_time_states(
+        self,
+        start_time_ts: float,
+        entity_id_to_metadata_id: dict[str, int],
+        no_attributes: bool,
+    ) -> list[ArchivedStateRow]:
+        """Find the last archived state before the start time for each entity."""
+        found: dict[int, ArchivedStateRow] = {}
+        missing = dict(entity_id_to_metadata_id)
+        day_start = partition_day_start(start_time_ts)
+        for _ in range(START_STATE_LOOKBACK_DAYS + 1):
+            if not missing:
+                break
+            if self.has_partition(day_start):
+                for row in self._read_partition(
+                    self._partition_path(day_start),
+                    0,
+                    start_time_ts,
+                    missing,
+                    no_attributes,
+                ):
+                    # Rows are in last_updated_ts order so the last one wins
+                    found[row.metadata_id] = row
+                missing = {
+                    entity_id: metadata_id
+                    for entity_id, metadata_id in missing.items()
+                    if metadata_id not in found
+                }
+            day_start -= _DAY
+        return [
+            row._replace(last_updated_ts=0, last_changed_ts=0) for row in found.values()
+        ]
+
+    def _read_partition(
+        self,
+        path: str,
+        start_time_ts: float,
+        end_time_ts: float,
+        entity_id_to_metadata_id: dict[str, int],
+        no_attributes: bool,
+    ) -> list[ArchivedStateRow]:
+        """Read the matching rows of a partition.
+
+        Row groups outside the time period are skipped. Only the entity
+        and timestamp columns of a row group are decompressed to find the
+        matching rows, the remaining columns are only decompressed if any
+        row matches.
+        """
+        try:
+            reader = StatesPartitionReader(path)
+        except (OSError, ValueError):
+            _LOGGER.exception("Error reading states archive partition %s", path)
+            return []
+        try:
+            return [
+                row
+                for row_group in reader.row_groups
+                if row_group.min_ts < end_time_ts and row_group.max_ts >= start_time_ts
+                for row in self._read_row_group(
+                    row_group,
+                    start_time_ts,
+                    end_time_ts,
+                    entity_id_to_metadata_id,
+                    no_attributes,
+                )
+            ]
+        finally:
+            reader.close()
+
+    def _read_row_group(
+        self,
+        row_group: StatesRowGroupReader,
+        start_time_ts: float,
+        end_time_ts: float,
+        entity_id_to_metadata_id: dict[str, int],
+        no_attributes: bool,
+    ) -> list[ArchivedStateRow]:
+        """Read the matching rows of a row group."""
+        entity_ids, entity_idx = row_group.entity_ids()
+        wanted: dict[int, int] = {
+            idx: metadata_id
+            for idx, entity_id in enumerate(entity_ids)
+            if (metadata_id := entity_id_to_metadata_id.get(entity_id)) is not None
+        }
+        if not wanted:
+            return []
+        last_updated_ts = row_group.last_updated_ts()
+        matches: Sequence[int] = [
+            row
+            for row, idx in enumerate(entity_idx)
+            if idx in wanted and start_time_ts <= last_updated_ts[row] < end_time_ts
+        ]
+        if not matches:
+            return []
+        states = row_group.states()
+        last_changed_ts = row_group.last_changed_ts()
+        attributes = None if no_attributes else row_group.attributes()
+        return [
+            ArchivedStateRow(
+                wanted[entity_idx[row]],
+                states[row],
+                last_updated_ts[row],
+                last_changed_ts[row],
+                None if attributes is None else attributes[row],
+            )
+            for row in matches
+        ]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 from concurrent.futures import CancelledError
 import contextlib
 from datetime import datetime, timedelta
@@ -39,6 +39,7 @@ from homeassistant.core import (
     callback,
 )
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
@@ -50,6 +51,7 @@ from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
 from . import migration, statistics
+from .archive import ARCHIVE_DIR, StatesArchive
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
@@ -85,15 +87,20 @@ from .migration import (
     EventsContextIDMigration,
     EventTypeIDMigration,
     StatesContextIDMigration,
+    StatisticsRollupMigration,
 )
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
+from .partition import add_partitions, create_partitioned_tables, get_partitioned_tables
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .purge import PurgeProgress
 from .queries import get_migration_changes
+from .spool import SPOOL_DIR, EventSpool
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
 from .table_managers.states import StatesManager
+from .table_managers.states_buckets import StatesBucketsManager
 from .table_managers.states_meta import StatesMetaManager
 from .table_managers.statistics_meta import StatisticsMetaManager
 from .tasks import (
@@ -109,6 +116,7 @@ from .tasks import (
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    ReplaySpoolTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -150,6 +158,11 @@ DB_LOCK_QUEUE_CHECK_TIMEOUT = 10  # check every 10 seconds
 
 QUEUE_CHECK_INTERVAL = timedelta(minutes=5)
 
+# While events are spooled, the spool is replayed
+# when the queue has drained below the threshold
+SPOOL_REPLAY_INTERVAL = timedelta(seconds=10)
+SPOOL_REPLAY_MAX_BACKLOG = 1000
+
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
 
@@ -174,6 +187,12 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        bulk_insert: bool = False,
+        archive: bool = False,
+        downsample: bool = False,
+        purge_max_rows_per_second: int = 0,
+        partition_by_day: bool = False,
+        spool: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -187,6 +206,16 @@ class Recorder(threading.Thread):
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
+        self.bulk_insert = bulk_insert
+        self.states_archive = (
+            StatesArchive(hass.config.path(ARCHIVE_DIR)) if archive else None
+        )
+        self.purge_progress = PurgeProgress(hass, purge_max_rows_per_second)
+        self.partition_by_day = partition_by_day
+        self.partitioned_tables: set[str] = set()
+        self.event_spool = EventSpool(hass.config.path(SPOOL_DIR)) if spool else None
+        self.spooling = False
+        self._spool_replay_queued = False
         self._queue: queue.SimpleQueue[RecorderTask | Event] = queue.SimpleQueue()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -219,6 +248,7 @@ class Recorder(threading.Thread):
         self.event_data_manager = EventDataManager(self)
         self.event_type_manager = EventTypeManager(self)
         self.states_meta_manager = StatesMetaManager(self)
+        self.states_buckets_manager = StatesBucketsManager(self) if downsample else None
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
 
@@ -229,15 +259,18 @@ class Recorder(threading.Thread):
         self.migration_in_progress = False
         self.migration_is_live = False
         self.use_legacy_events_index = False
+        self.statistics_rollups_active = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
+        self._spool_replay_listener: CALLBACK_TYPE | None = None
         self._keep_alive_listener: CALLBACK_TYPE | None = None
         self._commit_listener: CALLBACK_TYPE | None = None
         self._periodic_listener: CALLBACK_TYPE | None = None
         self._nightly_listener: CALLBACK_TYPE | None = None
+        self._purge_throttle_listener: CALLBACK_TYPE | None = None
         self._dialect_name: SupportedDialect | None = None
         self.enabled = True
 
@@ -265,6 +298,20 @@ class Recorder(threading.Thread):
             SQLITE_URL_PREFIX
         )
 
+    @property
+    def _bulk_insert_states(self) -> bool:
+        """Return if states should be written with bulk inserts.
+
+        Bulk inserts need the states_meta table to be active and a
+        dialect that returns the inserted ids in parameter order.
+        """
+        return (
+            self.bulk_insert
+            and self.states_meta_manager.active
+            and self.engine is not None
+            and self.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+        )
+
     @property
     def recording(self) -> bool:
         """Return if the recorder is recording."""
@@ -302,9 +349,19 @@ class Recorder(threading.Thread):
     @callback
     def async_initialize(self) -> None:
         """Initialize the recorder."""
+        self._async_listen_events(self._queue.put_nowait)
+        self._queue_watcher = async_track_time_interval(
+            self.hass,
+            self._async_check_queue,
+            QUEUE_CHECK_INTERVAL,
+            name="Recorder queue watcher",
+        )
+
+    @callback
+    def _async_listen_events(self, queue_put: Callable[[Event], None]) -> None:
+        """Listen for events to record and pass them to queue_put."""
         entity_filter = self.entity_filter
         exclude_event_types = self.exclude_event_types
-        queue_put = self._queue.put_nowait
 
         @callback
         def _event_listener(event: Event) -> None:
@@ -333,16 +390,12 @@ class Recorder(threading.Thread):
             # Unknown what it is.
             queue_put(event)
 
+        if self._event_listener:
+            self._event_listener()
         self._event_listener = self.hass.bus.async_listen(
             MATCH_ALL,
             _event_listener,
         )
-        self._queue_watcher = async_track_time_interval(
-            self.hass,
-            self._async_check_queue,
-            QUEUE_CHECK_INTERVAL,
-            name="Recorder queue watcher",
-        )
 
     @callback
     def _async_keep_alive(self, now: datetime) -> None:
@@ -376,6 +429,17 @@ class Recorder(threading.Thread):
         _LOGGER.debug("Recorder queue size is: %s", self.backlog)
         if not self._reached_max_backlog():
             return
+        if self.event_spool is not None and not self.spooling:
+            _LOGGER.warning(
+                (
+                    "The recorder backlog queue reached the maximum size of %s "
+                    "events; The recorder will spool events to disk until it "
+                    "catches up"
+                ),
+                self.backlog,
+            )
+            self._async_start_spooling(self.event_spool)
+            return
         _LOGGER.error(
             (
                 "The recorder backlog queue reached the maximum size of %s events; "
@@ -403,6 +467,83 @@ class Recorder(threading.Thread):
         # user a bad backup when they have plenty of RAM available.
         return self._available_memory() < MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG
 
+    @callback
+    def _async_start_spooling(self, spool: EventSpool) -> None:
+        """Append new events to the spool instead of the queue."""
+        spool_put = spool.put
+
+        @callback
+        def _spool_put(event: Event) -> None:
+            """Put an event in the spool and append it in the executor."""
+            if spool_put(event):
+                self.hass.async_create_task(
+                    self._async_write_spool(spool),
+                    "Recorder spool write",
+                    eager_start=True,
+                )
+
+        self.spooling = True
+        self._async_listen_events(_spool_put)
+        self._spool_replay_listener = async_track_time_interval(
+            self.hass,
+            self._async_replay_spool,
+            SPOOL_REPLAY_INTERVAL,
+            name="Recorder spool replay",
+        )
+
+    async def _async_write_spool(self, spool: EventSpool) -> None:
+        """Append the events put in the spool and stop if they do not fit."""
+        try:
+            appended = await self.hass.async_add_executor_job(spool.write_pending)
+        except OSError as err:
+            _LOGGER.error(
+                "Error writing events to the recorder spool: %s; The recorder "
+                "will stop recording events",
+                err,
+            )
+            self._async_stop_queue_watcher_and_event_listener()
+            return
+        if not appended and self._event_listener:
+            self._async_spool_full()
+
+    @callback
+    def _async_spool_full(self) -> None:
+        """Stop recording events when the spool is full."""
+        _LOGGER.error(
+            (
+                "The recorder spool reached the maximum size of %s segments; "
+                "usually, the system is CPU bound, I/O bound, or the database "
+                "is corrupt due to a disk problem; The recorder will stop "
+                "recording events to avoid running out of disk space"
+            ),
+            len(self.event_spool or ()),
+        )
+        self._async_stop_queue_watcher_and_event_listener()
+
+    @callback
+    def _async_replay_spool(self, *_: Any) -> None:
+        """Queue a replay of the spool once the queue has drained."""
+        if self._spool_replay_queued or self.backlog > SPOOL_REPLAY_MAX_BACKLOG:
+            return
+        self._spool_replay_queued = True
+        self.queue_task(ReplaySpoolTask())
+
+    @callback
+    def _async_stop_spooling(self) -> None:
+        """Put new events in the queue again after the spool was replayed."""
+        if not self.spooling:
+            return
+        self.spooling = False
+        if self._spool_replay_listener:
+            self._spool_replay_listener()
+            self._spool_replay_listener = None
+        # Events that were spooled after the last replay are
+        # recorded before the events that are queued from now on
+        self._spool_replay_queued = True
+        self.queue_task(ReplaySpoolTask())
+        if self._event_listener:
+            self._async_listen_events(self._queue.put_nowait)
+
     @callback
     def _async_stop_queue_watcher_and_event_listener(self) -> None:
         """Stop watching the queue and listening for events."""
@@ -412,6 +553,9 @@ class Recorder(threading.Thread):
         if self._event_listener:
             self._event_listener()
             self._event_listener = None
+        if self._spool_replay_listener:
+            self._spool_replay_listener()
+            self._spool_replay_listener = None
 
     @callback
     def _async_stop_listeners(self) -> None:
@@ -429,6 +573,9 @@ class Recorder(threading.Thread):
         if self._periodic_listener:
             self._periodic_listener()
             self._periodic_listener = None
+        if self._purge_throttle_listener:
+            self._purge_throttle_listener()
+            self._purge_throttle_listener = None
 
     async def _async_close(self, event: Event) -> None:
         """Empty the queue if its still present at close."""
@@ -530,6 +677,31 @@ class Recorder(threading.Thread):
         else:
             self.queue_task(PerodicCleanupTask())
 
+    def queue_purge_task_later(self, task: PurgeTask, delay: float) -> None:
+        """Add a purge task to the recorder queue after a delay.
+
+        Used to throttle purging, the recorder keeps processing
+        the queue while waiting.
+        """
+        self.hass.loop.call_soon_threadsafe(
+            self._async_queue_purge_task_later, task, delay
+        )
+
+    @callback
+    def _async_queue_purge_task_later(self, task: PurgeTask, delay: float) -> None:
+        """Add a purge task to the recorder queue after a delay."""
+        if self._purge_throttle_listener:
+            self._purge_throttle_listener()
+
+        @callback
+        def _async_queue_purge_task(now: datetime) -> None:
+            self._purge_throttle_listener = None
+            self.queue_task(task)
+
+        self._purge_throttle_listener = async_call_later(
+            self.hass, delay, _async_queue_purge_task
+        )
+
     @callback
     def _async_five_minute_tasks(self, now: datetime) -> None:
         """Run tasks every five minutes."""
@@ -813,6 +985,7 @@ class Recorder(threading.Thread):
                 EventTypeIDMigration,
                 EntityIDMigration,
                 EventIDPostMigration,
+                StatisticsRollupMigration,
             ):
                 migrator = migrator_cls(schema_status.start_version, migration_changes)
                 migrator.do_migrate(self, session)
@@ -830,6 +1003,11 @@ class Recorder(threading.Thread):
         # with a commit every time the event time
         # has changed. This reduces the disk io.
         queue_ = self._queue
+        if self.event_spool is not None:
+            # Events spooled before a restart are older than the queued ones
+            self.event_spool.load()
+            if len(self.event_spool):
+                self._guarded_process_one_task_or_event_or_recover(ReplaySpoolTask())
         startup_task_or_events: list[RecorderTask | Event] = []
         while not queue_.empty() and (task_or_event := queue_.get_nowait()):
             startup_task_or_events.append(task_or_event)
@@ -846,7 +1024,7 @@ class Recorder(threading.Thread):
             self._guarded_process_one_task_or_event_or_recover(queue_.get())
 
     def _pre_process_startup_events(
-        self, startup_task_or_events: list[RecorderTask | Event[Any]]
+        self, startup_task_or_events: Sequence[RecorderTask | Event[Any]]
     ) -> None:
         """Pre process startup events."""
         # Prime all the state_attributes and event_data caches
@@ -1029,6 +1207,27 @@ class Recorder(threading.Thread):
             self.backlog,
         )
 
+    def _replay_spool(self) -> None:
+        """Record the spooled events and remove the spool segments.
+
+        Each segment is committed before it is removed so the
+        events survive if the database fails during the replay.
+        """
+        assert self.event_spool is not None
+        spool = self.event_spool
+        try:
+            for path, events in spool.replay():
+                _LOGGER.debug("Recording %s spooled events", len(events))
+                self._pre_process_startup_events(events)
+                for event in events:
+                    self._process_one_event(event)
+                self._commit_event_session_or_retry()
+                spool.remove(path)
+        finally:
+            self._spool_replay_queued = False
+        if self.spooling:
+            self.hass.add_job(self._async_stop_spooling)
+
     def _process_one_event(self, event: Event[Any]) -> None:
         if not self.enabled:
             return
@@ -1090,6 +1289,9 @@ class Recorder(threading.Thread):
         self, event: Event[EventStateChangedData]
     ) -> None:
         """Process a state_changed event into the session."""
+        if self._bulk_insert_states:
+            self._process_state_changed_event_into_batch(event)
+            return
         state_attributes_manager = self.state_attributes_manager
         states_meta_manager = self.states_meta_manager
         entity_removed = not event.data.get("new_state")
@@ -1142,6 +1344,22 @@ class Recorder(threading.Thread):
             self._add_to_session(session, states_meta)
             dbstate.states_meta_rel = states_meta
 
+        if (
+            (states_buckets_manager := self.states_buckets_manager) is not None
+            and states_meta_manager.active
+            and not entity_removed
+        ):
+            assert dbstate.state is not None
+            assert dbstate.last_updated_ts is not None
+            states_buckets_manager.add_state(
+                entity_id,
+                dbstate.metadata_id,
+                dbstate.states_meta_rel,
+                dbstate.state,
+                dbstate.last_updated_ts,
+                session,
+            )
+
         # Map the event data to the StateAttributes table
         shared_attrs = shared_attrs_bytes.decode("utf-8")
         dbstate.attributes = None
@@ -1169,6 +1387,109 @@ class Recorder(threading.Thread):
 
         self._add_to_session(session, dbstate)
 
+    def _process_state_changed_event_into_batch(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Process a state_changed event into the pending states batch.
+
+        New StatesMeta and StateAttributes rows are still added to the
+        session, but the States row is collected in the pending batch
+        and bulk inserted when the session is committed.
+        """
+        state_attributes_manager = self.state_attributes_manager
+        states_meta_manager = self.states_meta_manager
+        states_manager = self.states_manager
+        entity_removed = not event.data.get("new_state")
+        entity_id = event.data["entity_id"]
+        old_state = event.data["old_state"]
+
+        assert self.event_session is not None
+        session = self.event_session
+        batch = states_manager.pending_batch
+
+        old_state_id: int | None = None
+        if (old_state_row := states_manager.pop_pending_row(entity_id)) is not None:
+            if old_state:
+                batch.last_reported_ts[old_state_row] = (
+                    old_state.last_reported_timestamp
+                )
+        elif pending_state := states_manager.pop_pending(entity_id):
+            # The previous state was added to the session before bulk
+            # inserts were enabled, flush it to get its state_id
+            session.flush()
+            old_state_id = pending_state.state_id
+            if old_state:
+                pending_state.last_reported_ts = old_state.last_reported_timestamp
+        elif old_state_id := states_manager.pop_committed(entity_id):
+            if old_state:
+                states_manager.update_pending_last_reported(
+                    old_state_id, old_state.last_reported_timestamp
+                )
+
+        if entity_id is None or not (
+            shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
+        ):
+            return
+
+        # Map the entity_id to the StatesMeta table
+        states_meta: StatesMeta | None = None
+        if pending_states_meta := states_meta_manager.get_pending(entity_id):
+            states_meta = pending_states_meta
+            metadata_id = None
+        elif not (metadata_id := states_meta_manager.get(entity_id, session, True)):
+            if entity_removed:
+                # If the entity was removed, we don't need to add it to the
+                # StatesMeta table if it does not have a metadata_id
+                # allocated to it as it either never existed or was just renamed.
+                return
+            states_meta = StatesMeta(entity_id=entity_id)
+            states_meta_manager.add_pending(states_meta)
+            self._add_to_session(session, states_meta)
+
+        # Map the event data to the StateAttributes table
+        shared_attrs = shared_attrs_bytes.decode("utf-8")
+        state_attributes: StateAttributes | None = None
+        # Matching attributes found in the pending commit
+        if pending_attributes := state_attributes_manager.get_pending(shared_attrs):
+            state_attributes = pending_attributes
+            attributes_id = None
+        # Matching attributes id not found in the cache or the database
+        elif not (
+            (attributes_id := state_attributes_manager.get_from_cache(shared_attrs))
+            or (
+                (hash_ := StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes))
+                and (
+                    attributes_id := state_attributes_manager.get(
+                        shared_attrs, hash_, session
+                    )
+                )
+            )
+        ):
+            state_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
+            state_attributes_manager.add_pending(state_attributes)
+            self._add_to_session(session, state_attributes)
+
+        row = batch.append_from_event(
+            event,
+            metadata_id,
+            states_meta,
+            attributes_id,
+            state_attributes,
+            old_state_id,
+            old_state_row,
+        )
+        if not entity_removed:
+            states_manager.add_pending_row(entity_id, row)
+            if (states_buckets_manager := self.states_buckets_manager) is not None:
+                state = batch.state[row]
+                last_updated_ts = batch.last_updated_ts[row]
+                assert state is not None
+                assert last_updated_ts is not None
+                states_buckets_manager.add_state(
+                    entity_id, metadata_id, states_meta, state, last_updated_ts, session
+                )
+        self._event_session_has_pending_writes = True
+
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
         if (
@@ -1215,6 +1536,12 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        if pending_batch := self.states_manager.pending_batch:
+            pending_batch.insert(session)
+
+        if self.states_buckets_manager is not None and self.states_meta_manager.active:
+            self.states_buckets_manager.write_pending(session)
+
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1242,6 +1569,8 @@ class Recorder(threading.Thread):
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        if self.states_buckets_manager is not None:
+            self.states_buckets_manager.post_commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1269,6 +1598,8 @@ class Recorder(threading.Thread):
         self.event_data_manager.reset()
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
+        if self.states_buckets_manager is not None:
+            self.states_buckets_manager.reset()
         self.statistics_meta_manager.reset()
 
         if not self.event_session:
@@ -1439,7 +1770,16 @@ class Recorder(threading.Thread):
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
 
         migration.pre_migrate_schema(self.engine)
+        if self.partition_by_day:
+            create_partitioned_tables(self.engine, self.dialect_name)
         Base.metadata.create_all(self.engine)
+        if self.partition_by_day and (
+            partitioned_tables := get_partitioned_tables(self.engine, self.dialect_name)
+        ):
+            add_partitions(
+                self.engine, self.dialect_name, partitioned_tables, dt_util.utcnow()
+            )
+            self.partitioned_tables = partitioned_tables
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
 
@@ -1500,6 +1840,8 @@ class Recorder(threading.Thread):
                 # to cleanly close the connection.
                 self._db_executor.shutdown(join_threads_or_timeout=False)
             self._close_connection()
+            if self.event_spool is not None:
+                self.event_spool.close()
             if self._db_executor:
                 # After the connection is closed, we can join the threads
                 # or forcefully shutdown the threads if they take too long.
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from datetime import datetime, timedelta
 import logging
 import time
@@ -77,7 +77,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 47
+SCHEMA_VERSION = 49
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -87,12 +87,16 @@ TABLE_EVENT_TYPES = "event_types"
 TABLE_STATES = "states"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_STATES_META = "states_meta"
+TABLE_STATES_BUCKETS = "states_buckets"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_DAY = "statistics_day"
+TABLE_STATISTICS_WEEK = "statistics_week"
+TABLE_STATISTICS_MONTH = "statistics_month"
 TABLE_MIGRATION_CHANGES = "migration_changes"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
@@ -112,10 +116,14 @@ ALL_TABLES = [
     TABLE_SCHEMA_CHANGES,
     TABLE_MIGRATION_CHANGES,
     TABLE_STATES_META,
+    TABLE_STATES_BUCKETS,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_DAY,
+    TABLE_STATISTICS_WEEK,
+    TABLE_STATISTICS_MONTH,
 ]
 
 TABLES_TO_CHECK = [
@@ -596,14 +604,12 @@ class StateAttributes(Base):
         )
 
     @staticmethod
-    def shared_attrs_bytes_from_event(
-        event: Event[EventStateChangedData],
-        dialect: SupportedDialect | None,
-    ) -> bytes:
-        """Create shared_attrs from a state_changed event."""
-        # None state means the state was removed from the state machine
-        if (state := event.data["new_state"]) is None:
-            return b"{}"
+    def recorded_attributes(state: State) -> Mapping[str, Any]:
+        """Return the attributes of a state that are recorded.
+
+        The attributes of the state are returned as is when
+        none of them are excluded from being recorded.
+        """
         if state_info := state.state_info:
             unrecorded_attributes = state_info["unrecorded_attributes"]
             exclude_attrs = {
@@ -617,10 +623,21 @@ class StateAttributes(Base):
                 exclude_attrs -= _MATCH_ALL_KEEP
         else:
             exclude_attrs = ALL_DOMAIN_EXCLUDE_ATTRS
+        if exclude_attrs.isdisjoint(state.attributes):
+            return state.attributes
+        return {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
+
+    @staticmethod
+    def shared_attrs_bytes_from_event(
+        event: Event[EventStateChangedData],
+        dialect: SupportedDialect | None,
+    ) -> bytes:
+        """Create shared_attrs from a state_changed event."""
+        # None state means the state was removed from the state machine
+        if (state := event.data["new_state"]) is None:
+            return b"{}"
         encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
-        bytes_result = encoder(
-            {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
-        )
+        bytes_result = encoder(StateAttributes.recorded_attributes(state))
         if len(bytes_result) > MAX_STATE_ATTRS_BYTES:
             _LOGGER.warning(
                 "State attributes for %s exceed maximum size of %s bytes. "
@@ -669,6 +686,39 @@ class StatesMeta(Base):
         )
 
 
+class StatesBuckets(Base):
+    """Downsampled summary of the states of an entity in a time bucket."""
+
+    __table_args__ = (
+        Index(
+            "ix_states_buckets_metadata_id_bucket_start_ts",
+            "metadata_id",
+            "bucket_start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATES_BUCKETS
+    id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
+    metadata_id: Mapped[int | None] = mapped_column(ID_TYPE)
+    bucket_start_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
+    count: Mapped[int | None] = mapped_column(Integer)
+    first_state: Mapped[str | None] = mapped_column(String(MAX_LENGTH_STATE_STATE))
+    last_state: Mapped[str | None] = mapped_column(String(MAX_LENGTH_STATE_STATE))
+    last_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE)
+    min: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+    max: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.StatesBuckets("
+            f"id={self.id}, metadata_id={self.metadata_id},"
+            f" bucket_start_ts={self.bucket_start_ts}, count={self.count}"
+            ")>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -769,6 +819,71 @@ class StatisticsShortTerm(Base, _StatisticsShortTerm):
     )
 
 
+class StatisticsRollupBase(StatisticsBase):
+    """Long term statistics rolled up to a calendar period.
+
+    The rows are reduced from the hourly statistics of the period in the
+    local time zone. mean_count is the number of hourly rows with a mean
+    so rollups of shorter periods can be combined into longer ones.
+
+    The duration is nominal, the actual length of a period depends on
+    the calendar and daylight saving time.
+    """
+
+    mean_count: Mapped[int | None] = mapped_column(Integer)
+
+
+class StatisticsDay(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per day."""
+
+    duration = timedelta(days=1)
+
+    __table_args__ = (
+        Index(
+            "ix_statistics_day_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_DAY
+
+
+class StatisticsWeek(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per week."""
+
+    duration = timedelta(days=7)
+
+    __table_args__ = (
+        Index(
+            "ix_statistics_week_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_WEEK
+
+
+class StatisticsMonth(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per month."""
+
+    duration = timedelta(days=31)
+
+    __table_args__ = (
+        Index(
+            "ix_statistics_month_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_MONTH
+
+
 class LegacyStatisticsShortTerm(LegacyBase, _StatisticsShortTerm):
     """Short term statistics with 32-bit index, used for schema migration."""
 
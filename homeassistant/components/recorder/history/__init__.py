@@ -13,6 +13,7 @@ from ... import recorder
 from ..filters import Filters
 from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
 from .modern import (
+    get_downsampled_states as _modern_get_downsampled_states,
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
     get_significant_states as _modern_get_significant_states,
@@ -24,6 +25,7 @@ from .modern import (
 __all__ = [
     "NEED_ATTRIBUTE_DOMAINS",
     "SIGNIFICANT_DOMAINS",
+    "get_downsampled_states",
     "get_full_significant_states_with_session",
     "get_last_state_changes",
     "get_significant_states",
@@ -32,6 +34,28 @@ __all__ = [
 ]
 
 
+def get_downsampled_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    max_points: int,
+    include_start_time_state: bool = True,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the history of entity_ids downsampled to at most max_points."""
+    instance = recorder.get_instance(hass)
+    if (
+        instance.states_buckets_manager is None
+        or not instance.states_meta_manager.active
+    ):
+        # The states buckets are only maintained when downsampling is
+        # enabled and entity_ids have been migrated to the states_meta table
+        return {}
+    return _modern_get_downsampled_states(
+        hass, start_time, end_time, entity_ids, max_points, include_start_time_state
+    )
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
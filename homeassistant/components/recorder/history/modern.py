@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
-from itertools import groupby
+from itertools import chain, groupby
+from math import ceil
 from operator import itemgetter
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from sqlalchemy import (
     CompoundSelect,
@@ -27,8 +28,14 @@ from homeassistant.core import HomeAssistant, State, split_entity_id
 import homeassistant.util.dt as dt_util
 
 from ... import recorder
-from ..const import LAST_REPORTED_SCHEMA_VERSION
-from ..db_schema import SHARED_ATTR_OR_LEGACY_ATTRIBUTES, StateAttributes, States
+from ..archive import ArchivedStateRow
+from ..const import LAST_REPORTED_SCHEMA_VERSION, STATES_BUCKET_SECONDS
+from ..db_schema import (
+    SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
+    StateAttributes,
+    States,
+    StatesBuckets,
+)
 from ..filters import Filters
 from ..models import (
     LazyState,
@@ -37,6 +44,7 @@ from ..models import (
     process_timestamp,
     row_to_compressed_state,
 )
+from ..queries import find_oldest_state_ts
 from ..util import execute_stmt_lambda_element, session_scope
 from .const import (
     LAST_CHANGED_KEY,
@@ -45,6 +53,9 @@ from .const import (
     STATE_KEY,
 )
 
+if TYPE_CHECKING:
+    from ..core import Recorder
+
 _FIELD_MAP = {
     "metadata_id": 0,
     "state": 1,
@@ -236,9 +247,41 @@ def get_significant_states_with_session(
         entity_id_to_metadata_id := instance.states_meta_manager.get_many(
             entity_ids, session, False
         )
-    ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
+    ):
         return {}
-    metadata_ids = possible_metadata_ids
+    start_time_ts = dt_util.utc_to_timestamp(start_time)
+    end_time_ts = datetime_to_timestamp_or_none(end_time)
+    archived_rows: list[ArchivedStateRow] = []
+    if instance.states_archive is not None:
+        entity_id_to_metadata_id, archived_rows = _get_archived_states(
+            instance,
+            session,
+            start_time_ts,
+            end_time_ts,
+            entity_id_to_metadata_id,
+            significant_changes_only,
+            include_start_time_state,
+            no_attributes,
+        )
+    if not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
+        return {}
+    # Negative metadata_ids are only used for archived states
+    if not (
+        metadata_ids := [
+            metadata_id for metadata_id in possible_metadata_ids if metadata_id > 0
+        ]
+    ):
+        if not archived_rows:
+            return {}
+        return _sorted_states_to_dict(
+            archived_rows,  # type: ignore[arg-type]
+            start_time_ts,
+            entity_ids,
+            entity_id_to_metadata_id,
+            minimal_response,
+            compressed_state_format,
+            no_attributes=no_attributes,
+        )
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
             metadata_id
@@ -251,8 +294,6 @@ def get_significant_states_with_session(
         run_start_ts := _get_run_start_ts_for_utc_point_in_time(hass, start_time)
     ):
         include_start_time_state = False
-    start_time_ts = dt_util.utc_to_timestamp(start_time)
-    end_time_ts = datetime_to_timestamp_or_none(end_time)
     single_metadata_id = metadata_ids[0] if len(metadata_ids) == 1 else None
     stmt = lambda_stmt(
         lambda: _significant_states_stmt(
@@ -275,8 +316,17 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
+    states: Iterable[Row | ArchivedStateRow] = execute_stmt_lambda_element(
+        session, stmt, None, end_time, orm_rows=False
+    )
+    if archived_rows:
+        states = sorted(
+            chain(archived_rows, states),
+            key=itemgetter(_FIELD_MAP["metadata_id"], _FIELD_MAP["last_updated_ts"]),
+        )
+        include_start_time_state = True
     return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
+        states,  # type: ignore[arg-type]
         start_time_ts if include_start_time_state else None,
         entity_ids,
         entity_id_to_metadata_id,
@@ -286,6 +336,58 @@ def get_significant_states_with_session(
     )
 
 
+def _get_archived_states(
+    instance: Recorder,
+    session: Session,
+    start_time_ts: float,
+    end_time_ts: float | None,
+    entity_id_to_metadata_id: dict[str, int | None],
+    significant_changes_only: bool,
+    include_start_time_state: bool,
+    no_attributes: bool,
+) -> tuple[dict[str, int | None], list[ArchivedStateRow]]:
+    """Return the archived states for the part of the period no longer in the db.
+
+    Entities that only have archived states are assigned a negative
+    metadata_id so they can be mapped back to their entity_id.
+    """
+    states_archive = instance.states_archive
+    assert states_archive is not None
+    oldest_ts: float | None = session.execute(find_oldest_state_ts()).scalar()
+    archive_end_ts = min(
+        ts for ts in (oldest_ts, end_time_ts, dt_util.utcnow().timestamp()) if ts
+    )
+    if start_time_ts >= archive_end_ts:
+        return entity_id_to_metadata_id, []
+    entity_id_to_metadata_id = {
+        entity_id: -idx if metadata_id is None else metadata_id
+        for idx, (entity_id, metadata_id) in enumerate(
+            entity_id_to_metadata_id.items(), 1
+        )
+    }
+    rows = states_archive.read(
+        start_time_ts,
+        archive_end_ts,
+        entity_id_to_metadata_id,  # type: ignore[arg-type]
+        include_start_time_state,
+        no_attributes,
+    )
+    if significant_changes_only:
+        significant_metadata_ids = {
+            metadata_id
+            for entity_id, metadata_id in entity_id_to_metadata_id.items()
+            if split_entity_id(entity_id)[0] in SIGNIFICANT_DOMAINS
+        }
+        rows = [
+            row
+            for row in rows
+            if row.metadata_id in significant_metadata_ids
+            or row.last_changed_ts is None
+            or row.last_changed_ts == row.last_updated_ts
+        ]
+    return entity_id_to_metadata_id, rows
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -319,6 +421,143 @@ def get_full_significant_states_with_session(
     )
 
 
+def _downsampled_states_stmt(
+    start_bucket_ts: float, end_time_ts: float, metadata_ids: list[int]
+) -> Select:
+    """Return a statement for the states buckets of a time period."""
+    return (
+        select(
+            StatesBuckets.metadata_id,
+            StatesBuckets.bucket_start_ts,
+            StatesBuckets.last_state,
+            StatesBuckets.min,
+            StatesBuckets.max,
+        )
+        .filter(
+            (StatesBuckets.bucket_start_ts >= start_bucket_ts)
+            & (StatesBuckets.bucket_start_ts < end_time_ts)
+            & StatesBuckets.metadata_id.in_(metadata_ids)
+        )
+        .order_by(StatesBuckets.metadata_id, StatesBuckets.bucket_start_ts)
+    )
+
+
+def _downsampled_start_states_stmt(
+    start_bucket_ts: float, metadata_ids: list[int]
+) -> Select:
+    """Return a statement for the last states bucket before a time period."""
+    return select(StatesBuckets.metadata_id, StatesBuckets.last_state).join(
+        (
+            most_recent_buckets := (
+                select(
+                    StatesBuckets.metadata_id.label("max_metadata_id"),
+                    func.max(StatesBuckets.bucket_start_ts).label(
+                        "max_bucket_start_ts"
+                    ),
+                )
+                .filter(
+                    (StatesBuckets.bucket_start_ts < start_bucket_ts)
+                    & StatesBuckets.metadata_id.in_(metadata_ids)
+                )
+                .group_by(StatesBuckets.metadata_id)
+                .subquery()
+            )
+        ),
+        and_(
+            StatesBuckets.metadata_id == most_recent_buckets.c.max_metadata_id,
+            StatesBuckets.bucket_start_ts == most_recent_buckets.c.max_bucket_start_ts,
+        ),
+    )
+
+
+def get_downsampled_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    max_points: int,
+    include_start_time_state: bool = True,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the history of entity_ids downsampled to at most max_points.
+
+    The history is read from the states buckets the recorder maintains as
+    states are committed, so the cost of the query depends on the length
+    of the time period and not on the number of states. Each point has the
+    last state of its bucket and, for numeric states, the min and max.
+    """
+    start_time_ts = start_time.timestamp()
+    end_time_ts = (end_time or dt_util.utcnow()).timestamp()
+    width = max(
+        STATES_BUCKET_SECONDS,
+        ceil((end_time_ts - start_time_ts) / max_points / STATES_BUCKET_SECONDS)
+        * STATES_BUCKET_SECONDS,
+    )
+    start_bucket_ts = start_time_ts - start_time_ts % STATES_BUCKET_SECONDS
+    with session_scope(hass=hass, read_only=True) as session:
+        entity_id_to_metadata_id = recorder.get_instance(
+            hass
+        ).states_meta_manager.get_many(entity_ids, session, False)
+        metadata_id_to_entity_id = {
+            metadata_id: entity_id
+            for entity_id, metadata_id in entity_id_to_metadata_id.items()
+            if metadata_id is not None
+        }
+        if not metadata_id_to_entity_id:
+            return {}
+        metadata_ids = list(metadata_id_to_entity_id)
+        result: dict[str, list[dict[str, Any]]] = {}
+        if include_start_time_state:
+            start_states_stmt = lambda_stmt(
+                lambda: _downsampled_start_states_stmt(start_bucket_ts, metadata_ids)
+            )
+            for metadata_id, last_state in execute_stmt_lambda_element(
+                session, start_states_stmt, orm_rows=False
+            ):
+                result[metadata_id_to_entity_id[metadata_id]] = [
+                    {
+                        COMPRESSED_STATE_STATE: last_state,
+                        COMPRESSED_STATE_LAST_UPDATED: start_time_ts,
+                    }
+                ]
+        stmt = lambda_stmt(
+            lambda: _downsampled_states_stmt(start_bucket_ts, end_time_ts, metadata_ids)
+        )
+        point: dict[str, Any] | None = None
+        prev_metadata_id: int | None = None
+        for (
+            metadata_id,
+            bucket_start_ts,
+            last_state,
+            min_,
+            max_,
+        ) in execute_stmt_lambda_element(session, stmt, orm_rows=False):
+            point_ts = max(
+                start_bucket_ts + (bucket_start_ts - start_bucket_ts) // width * width,
+                start_time_ts,
+            )
+            if (
+                point is None
+                or metadata_id != prev_metadata_id
+                or point[COMPRESSED_STATE_LAST_UPDATED] != point_ts
+            ):
+                point = {COMPRESSED_STATE_LAST_UPDATED: point_ts}
+                result.setdefault(metadata_id_to_entity_id[metadata_id], []).append(
+                    point
+                )
+                prev_metadata_id = metadata_id
+            elif min_ is not None:
+                # Merge the bucket into the point
+                if (point_min := point.get("min")) is not None:
+                    min_ = min(min_, point_min)
+                if (point_max := point.get("max")) is not None:
+                    max_ = max(max_, point_max)
+            point[COMPRESSED_STATE_STATE] = last_state
+            if min_ is not None:
+                point["min"] = min_
+                point["max"] = max_
+        return result
+
+
 def _state_changed_during_period_stmt(
     start_time_ts: float,
     end_time_ts: float | None,
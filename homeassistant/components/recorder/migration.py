@@ -53,6 +53,7 @@ from .const import (
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
+    STATISTICS_ROLLUP_SCHEMA_VERSION,
     SupportedDialect,
 )
 from .db_schema import (
@@ -73,11 +74,15 @@ from .db_schema import (
     MigrationChanges,
     SchemaChanges,
     States,
+    StatesBuckets,
     StatesMeta,
     Statistics,
+    StatisticsDay,
     StatisticsMeta,
+    StatisticsMonth,
     StatisticsRuns,
     StatisticsShortTerm,
+    StatisticsWeek,
 )
 from .models import process_timestamp
 from .models.time import datetime_to_timestamp_or_none
@@ -89,6 +94,7 @@ from .queries import (
     find_event_type_to_migrate,
     find_events_context_ids_to_migrate,
     find_states_context_ids_to_migrate,
+    find_statistics_to_roll_up,
     find_unmigrated_short_term_statistics_rows,
     find_unmigrated_statistics_rows,
     has_entity_ids_to_migrate,
@@ -99,7 +105,7 @@ from .queries import (
     migrate_single_short_term_statistics_row_to_timestamp,
     migrate_single_statistics_row_to_timestamp,
 )
-from .statistics import get_start_time
+from .statistics import get_start_time, update_statistics_rollups
 from .tasks import (
     CommitTask,
     EntityIDPostMigrationTask,
@@ -132,6 +138,9 @@ MIGRATION_NOTE_OFFLINE = (
 _EMPTY_ENTITY_ID = "missing.entity_id"
 _EMPTY_EVENT_TYPE = "missing_event_type"
 
+# The number of statistics rolled up in each migration step
+STATISTICS_ROLLUP_BATCH_SIZE = 10
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -1757,6 +1766,21 @@ class _SchemaVersion47Migrator(_SchemaVersionMigrator, target_version=47):
         )
 
 
+class _SchemaVersion48Migrator(_SchemaVersionMigrator, target_version=48):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # Add the states_buckets table for downsampled history
+        cast(Table, StatesBuckets.__table__).create(self.engine, checkfirst=True)
+
+
+class _SchemaVersion49Migrator(_SchemaVersionMigrator, target_version=49):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # Add the tables the hourly statistics are rolled up into
+        for table in (StatisticsDay, StatisticsWeek, StatisticsMonth):
+            cast(Table, table.__table__).create(self.engine, checkfirst=True)
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
@@ -2698,6 +2722,43 @@ class EventIDPostMigration(BaseRunTimeMigration):
         return NeedsMigrateResult(needs_migrate=False, migration_done=True)
 
 
+class StatisticsRollupMigration(BaseRunTimeMigrationWithQuery):
+    """Migration to roll up the existing hourly statistics."""
+
+    required_schema_version = STATISTICS_ROLLUP_SCHEMA_VERSION
+    migration_id = "statistics_rollup"
+    task = MigrationTask
+
+    @staticmethod
+    @retryable_database_job("roll up statistics")
+    def migrate_data(instance: Recorder) -> bool:
+        """Roll up the hourly statistics, return True if completed."""
+        _LOGGER.debug("Rolling up statistics")
+        with session_scope(session=instance.get_session()) as session:
+            if statistics := session.execute(
+                find_statistics_to_roll_up(STATISTICS_ROLLUP_BATCH_SIZE)
+            ).all():
+                now_ts = time()
+                for metadata_id, first_start_ts in statistics:
+                    update_statistics_rollups(
+                        session, {metadata_id}, first_start_ts, now_ts
+                    )
+            if is_done := not statistics:
+                _mark_migration_done(session, StatisticsRollupMigration)
+
+        _LOGGER.debug("Rolling up statistics done=%s", is_done)
+        return is_done
+
+    def migration_done(self, instance: Recorder, session: Session | None) -> None:
+        """Will be called after migrate returns True."""
+        _LOGGER.debug("Serving statistics from rollups as all data is rolled up")
+        instance.statistics_rollups_active = True
+
+    def needs_migrate_query(self) -> StatementLambdaElement:
+        """Check if the data is migrated."""
+        return find_statistics_to_roll_up(1)
+
+
 def _mark_migration_done(
     session: Session, migration: type[BaseRunTimeMigration]
 ) -> None:
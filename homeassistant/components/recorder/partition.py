@@ -0,0 +1,363 @@
+"""Time partitioned tables for MySQL and PostgreSQL."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import logging
+
+import sqlalchemy
+from sqlalchemy import (
+    Column,
+    Computed,
+    DefaultClause,
+    Index,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    Table,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from homeassistant.util import dt as dt_util
+
+from .const import SupportedDialect
+from .db_schema import TABLE_EVENTS, TABLE_STATES, TABLE_STATISTICS_SHORT_TERM, Base
+
+_LOGGER = logging.getLogger(__name__)
+
+# The tables that are partitioned by day and the
+# timestamp column the partitions are ranges of
+PARTITIONED_TABLES = {
+    TABLE_STATES: "last_updated_ts",
+    TABLE_EVENTS: "time_fired_ts",
+    TABLE_STATISTICS_SHORT_TERM: "start_ts",
+}
+PARTITIONS_AHEAD = 7
+PARTITION_DAY_SECONDS = 86400
+
+# MySQL cannot partition on a floating point column so
+# the partitions are ranges of a generated day number
+MYSQL_PARTITION_DAY_COLUMN = "partition_day"
+MYSQL_MAX_PARTITION = "pmax"
+POSTGRESQL_DEFAULT_PARTITION_SUFFIX = "default"
+
+PARTITION_NAME_FORMAT = "p%Y%m%d"
+
+PARTITIONED_DIALECTS = {SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL}
+
+
+def _day_start(day: datetime) -> datetime:
+    """Return the start of the UTC day of a datetime."""
+    return dt_util.as_utc(day).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _partition_name(day: datetime) -> str:
+    """Return the name of the partition of a day."""
+    return day.strftime(PARTITION_NAME_FORMAT)
+
+
+def _postgresql_partition_table(table_name: str, partition_name: str) -> str:
+    """Return the name of the table of a PostgreSQL partition."""
+    return f"{table_name}_{partition_name}"
+
+
+def _partition_day(partition_name: str) -> datetime | None:
+    """Return the day of a partition or None if it is not a day partition."""
+    try:
+        return datetime.strptime(partition_name, PARTITION_NAME_FORMAT).replace(
+            tzinfo=dt_util.UTC
+        )
+    except ValueError:
+        return None
+
+
+def _mysql_day_number(day: datetime) -> int:
+    """Return the day number a MySQL partition is a range of."""
+    return int(day.timestamp()) // PARTITION_DAY_SECONDS
+
+
+def _partitioned_table(
+    metadata: MetaData, table_name: str, dialect_name: SupportedDialect
+) -> Table:
+    """Adapt a copy of a table in metadata to be partitioned.
+
+    The primary key and unique indexes have to include the partition
+    key, and foreign keys to or from partitioned tables are dropped
+    since neither database supports them.
+    """
+    table = metadata.tables[table_name]
+    id_column = next(iter(table.primary_key.columns))
+    if dialect_name == SupportedDialect.MYSQL:
+        partition_column = Column(
+            MYSQL_PARTITION_DAY_COLUMN,
+            Integer,
+            Computed(
+                f"FLOOR({PARTITIONED_TABLES[table_name]} / {PARTITION_DAY_SECONDS})",
+                persisted=True,
+            ),
+            nullable=False,
+        )
+        table.append_column(partition_column)
+        # AUTO_INCREMENT is only rendered for composite
+        # primary keys when it is explicitly enabled
+        id_column.autoincrement = True
+    else:
+        partition_column = table.c[PARTITIONED_TABLES[table_name]]
+        # Identity columns are not supported by partitioned
+        # tables before PostgreSQL 17, use a sequence instead
+        id_column.identity = None
+        id_column.server_default = DefaultClause(
+            text(f"nextval('{table_name}_{id_column.name}_seq')")
+        )
+    partition_column.primary_key = True
+    partition_column.nullable = False
+    table.append_constraint(PrimaryKeyConstraint(id_column, partition_column))
+    for index in list(table.indexes):
+        if index.unique and partition_column not in index.columns.values():
+            table.indexes.remove(index)
+            Index(index.name, *index.columns, partition_column, unique=True)
+    return table
+
+
+def _create_table_statements(
+    table: Table, dialect_name: SupportedDialect, days: list[datetime]
+) -> list[str]:
+    """Return the statements to create a table partitioned by day."""
+    dialect = sqlalchemy.dialects.registry.load(dialect_name)()
+    foreign_key_constraints = (
+        []
+        if dialect_name == SupportedDialect.MYSQL
+        else [
+            constraint
+            for constraint in table.foreign_key_constraints
+            if constraint.referred_table.name not in PARTITIONED_TABLES
+        ]
+    )
+    create_table = str(
+        CreateTable(
+            table, include_foreign_key_constraints=foreign_key_constraints
+        ).compile(dialect=dialect)
+    ).strip()
+    create_indexes = [
+        str(CreateIndex(index).compile(dialect=dialect))  # type: ignore[no-untyped-call]
+        for index in table.indexes
+    ]
+    if dialect_name == SupportedDialect.MYSQL:
+        partitions = ", ".join(
+            [
+                f"PARTITION {_partition_name(day)} VALUES LESS THAN "
+                f"({_mysql_day_number(day) + 1})"
+                for day in days
+            ]
+            + [f"PARTITION {MYSQL_MAX_PARTITION} VALUES LESS THAN MAXVALUE"]
+        )
+        return [
+            f"{create_table} PARTITION BY RANGE ({MYSQL_PARTITION_DAY_COLUMN}) "
+            f"({partitions})",
+            *create_indexes,
+        ]
+    id_column = next(iter(table.primary_key.columns))
+    sequence = f"{table.name}_{id_column.name}_seq"
+    return [
+        f"CREATE SEQUENCE {sequence}",
+        f"{create_table} PARTITION BY RANGE ({PARTITIONED_TABLES[table.name]})",
+        f"ALTER SEQUENCE {sequence} OWNED BY {table.name}.{id_column.name}",
+        f"CREATE TABLE {table.name}_{POSTGRESQL_DEFAULT_PARTITION_SUFFIX} "
+        f"PARTITION OF {table.name} DEFAULT",
+        *(_postgresql_create_partition(table.name, day) for day in days),
+        *create_indexes,
+    ]
+
+
+def _postgresql_create_partition(table_name: str, day: datetime) -> str:
+    """Return the statement to create a PostgreSQL partition for a day."""
+    partition_table = _postgresql_partition_table(table_name, _partition_name(day))
+    start = day.timestamp()
+    end = start + PARTITION_DAY_SECONDS
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_table} PARTITION OF {table_name} "
+        f"FOR VALUES FROM ({start}) TO ({end})"
+    )
+
+
+def _days_ahead(now: datetime) -> list[datetime]:
+    """Return the days that should have a partition."""
+    today = _day_start(now)
+    return [today + timedelta(days=days) for days in range(-1, PARTITIONS_AHEAD)]
+
+
+def create_partitioned_tables(
+    engine: Engine, dialect_name: SupportedDialect | None
+) -> None:
+    """Create the partitioned tables in a new database.
+
+    This function is called before calling Base.metadata.create_all
+    which creates the remaining tables. Existing tables are not
+    converted since that requires rewriting them.
+    """
+    if dialect_name not in PARTITIONED_DIALECTS:
+        _LOGGER.warning(
+            "Partitioning tables by day is only supported with MySQL,"
+            " MariaDB and PostgreSQL"
+        )
+        return
+    inspector = sqlalchemy.inspect(engine)
+    if inspector.has_table(TABLE_STATES):
+        if not get_partitioned_tables(engine, dialect_name):
+            _LOGGER.warning(
+                "Partitioning tables by day is only possible when"
+                " the database is created"
+            )
+        return
+
+    # The partitioned tables have foreign keys to the tables
+    # that are not partitioned so they have to be created first
+    Base.metadata.create_all(
+        engine,
+        [
+            table
+            for table in Base.metadata.sorted_tables
+            if table.name not in PARTITIONED_TABLES
+        ],
+    )
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    days = _days_ahead(dt_util.utcnow())
+    with engine.begin() as connection:
+        for table_name in PARTITIONED_TABLES:
+            table = _partitioned_table(metadata, table_name, dialect_name)
+            for statement in _create_table_statements(table, dialect_name, days):
+                connection.execute(text(statement))
+    _LOGGER.info("Created tables partitioned by day")
+
+
+def get_partitioned_tables(
+    engine: Engine, dialect_name: SupportedDialect | None
+) -> set[str]:
+    """Return the tables that are partitioned by day."""
+    if dialect_name not in PARTITIONED_DIALECTS:
+        return set()
+    with engine.connect() as connection:
+        return {
+            table_name
+            for table_name in PARTITIONED_TABLES
+            if _get_partitions(connection, dialect_name, table_name)
+        }
+
+
+def _get_partitions(
+    connection: Connection, dialect_name: SupportedDialect, table_name: str
+) -> dict[str, datetime]:
+    """Return the day partitions of a table by name."""
+    partition_names: Iterable[str]
+    if dialect_name == SupportedDialect.MYSQL:
+        partition_names = connection.execute(
+            text(
+                "SELECT PARTITION_NAME FROM information_schema.PARTITIONS"
+                " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+                " AND PARTITION_NAME IS NOT NULL"
+            ),
+            {"table_name": table_name},
+        ).scalars()
+    else:
+        prefix = f"{table_name}_"
+        partition_names = (
+            partition_table.removeprefix(prefix)
+            for partition_table in connection.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits"
+                    " JOIN pg_class parent ON pg_inherits.inhparent = parent.oid"
+                    " JOIN pg_class child ON pg_inherits.inhrelid = child.oid"
+                    " WHERE parent.relname = :table_name"
+                ),
+                {"table_name": table_name},
+            ).scalars()
+        )
+    return {
+        partition_name: day
+        for partition_name in partition_names
+        if (day := _partition_day(partition_name)) is not None
+    }
+
+
+def add_partitions(
+    engine: Engine,
+    dialect_name: SupportedDialect | None,
+    partitioned_tables: set[str],
+    now: datetime,
+) -> None:
+    """Add the partitions for the days ahead that do not exist yet."""
+    assert dialect_name in PARTITIONED_DIALECTS
+    days = _days_ahead(now)
+    with engine.begin() as connection:
+        for table_name in partitioned_tables:
+            existing = set(
+                _get_partitions(connection, dialect_name, table_name).values()
+            )
+            last_day = max(existing, default=None)
+            for day in days:
+                # Partitions can only be added after the last
+                # one since they are split from the max partition
+                if day in existing or (last_day is not None and day < last_day):
+                    continue
+                _LOGGER.debug("Adding partition %s to %s", day.date(), table_name)
+                if dialect_name == SupportedDialect.MYSQL:
+                    connection.execute(
+                        text(
+                            f"ALTER TABLE {table_name} REORGANIZE PARTITION"
+                            f" {MYSQL_MAX_PARTITION} INTO (PARTITION"
+                            f" {_partition_name(day)} VALUES LESS THAN"
+                            f" ({_mysql_day_number(day) + 1}), PARTITION"
+                            f" {MYSQL_MAX_PARTITION} VALUES LESS THAN MAXVALUE)"
+                        )
+                    )
+                else:
+                    connection.execute(
+                        text(_postgresql_create_partition(table_name, day))
+                    )
+
+
+def find_partitions_to_drop(
+    connection: Connection,
+    dialect_name: SupportedDialect | None,
+    table_name: str,
+    purge_before: datetime,
+) -> list[tuple[str, datetime]]:
+    """Return the partitions that only have rows older than purge_before."""
+    assert dialect_name in PARTITIONED_DIALECTS
+    purge_before_day = _day_start(purge_before)
+    return sorted(
+        (
+            (partition_name, day)
+            for partition_name, day in _get_partitions(
+                connection, dialect_name, table_name
+            ).items()
+            if day < purge_before_day
+        ),
+        key=lambda partition: partition[1],
+    )
+
+
+def drop_partition(
+    connection: Connection,
+    dialect_name: SupportedDialect | None,
+    table_name: str,
+    partition_name: str,
+) -> None:
+    """Drop a partition and all of its rows."""
+    assert dialect_name in PARTITIONED_DIALECTS
+    if dialect_name == SupportedDialect.MYSQL:
+        connection.execute(
+            text(f"ALTER TABLE {table_name} DROP PARTITION {partition_name}")
+        )
+    else:
+        connection.execute(
+            text(
+                "DROP TABLE"
+                f" {_postgresql_partition_table(table_name, partition_name)}"
+            )
+        )
@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from datetime import datetime
+from datetime import datetime, timedelta
 from itertools import zip_longest
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.orm.session import Session
 
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from .archive import partition_day_start
+from .db_schema import TABLE_EVENTS, TABLE_STATES, Events, States, StatesMeta
 from .models import DatabaseEngine
+from .partition import PARTITION_DAY_SECONDS, drop_partition, find_partitions_to_drop
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_with_fast_in_distinct,
@@ -25,11 +29,15 @@ from .queries import (
     delete_event_types_rows,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
+    delete_states_buckets_rows,
+    delete_states_buckets_rows_for_metadata_ids,
     delete_states_meta_rows,
     delete_states_rows,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    find_attributes_ids_in_range,
+    find_data_ids_in_range,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
     find_events_to_purge,
@@ -37,7 +45,10 @@ from .queries import (
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_old_state_ids_in_range,
+    find_oldest_state_ts,
     find_short_term_statistics_to_purge,
+    find_state_ids_in_range,
     find_states_to_purge,
     find_statistics_runs_to_purge,
 )
@@ -53,6 +64,123 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+# The recorder cannot insert while a purge cycle is running so
+# the number of batches per cycle is adapted to stay close to this
+PURGE_CYCLE_TARGET_SECONDS = 1.0
+MAX_BATCHES_PER_PURGE_MULTIPLIER = 4
+
+
+class PurgeProgress:
+    """Track the progress and pace of purging old data.
+
+    The number of batches deleted per purge cycle is adapted to how long
+    the previous cycle took so live recording is never stalled for long,
+    and cycles are spaced out to stay under max_rows_per_second when it
+    is set.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_rows_per_second: int) -> None:
+        """Initialize the purge progress."""
+        self.hass = hass
+        self.max_rows_per_second = max_rows_per_second
+        self.states_batch_size = DEFAULT_STATES_BATCHES_PER_PURGE
+        self.events_batch_size = DEFAULT_EVENTS_BATCHES_PER_PURGE
+        self.purge_before: datetime | None = None
+        self.started: datetime | None = None
+        self.finished: datetime | None = None
+        self.deleted_rows: dict[str, int] = {}
+        self._started_monotonic = 0.0
+        self._last_cycle_monotonic = 0.0
+        self._cycle_deleted_rows = 0
+        self._listeners: set[Callable[[dict[str, Any]], None]] = set()
+
+    @property
+    def in_progress(self) -> bool:
+        """Return if a purge is in progress."""
+        return self.started is not None and self.finished is None
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the number of rows deleted per second by the current purge."""
+        if not (elapsed := self._last_cycle_monotonic - self._started_monotonic):
+            return 0.0
+        return sum(self.deleted_rows.values()) / elapsed
+
+    def start(self, purge_before: datetime) -> None:
+        """Start tracking a purge unless it is already in progress."""
+        if self.in_progress and self.purge_before == purge_before:
+            return
+        self.purge_before = purge_before
+        self.started = dt_util.utcnow()
+        self.finished = None
+        self.deleted_rows = {}
+        self._started_monotonic = self._last_cycle_monotonic = time.monotonic()
+        self._cycle_deleted_rows = 0
+
+    def add_deleted_rows(self, table: str, count: int) -> None:
+        """Count rows deleted from a table."""
+        self.deleted_rows[table] = self.deleted_rows.get(table, 0) + count
+        self._cycle_deleted_rows += count
+
+    def end_cycle(self, elapsed: float, finished: bool) -> float:
+        """Record a purge cycle and return the seconds to wait before the next."""
+        self._last_cycle_monotonic = time.monotonic()
+        if elapsed > PURGE_CYCLE_TARGET_SECONDS:
+            self.states_batch_size = max(1, self.states_batch_size // 2)
+            self.events_batch_size = max(1, self.events_batch_size // 2)
+        elif elapsed < PURGE_CYCLE_TARGET_SECONDS / 2 and not finished:
+            self.states_batch_size = min(
+                self.states_batch_size * 2,
+                DEFAULT_STATES_BATCHES_PER_PURGE * MAX_BATCHES_PER_PURGE_MULTIPLIER,
+            )
+            self.events_batch_size = min(
+                self.events_batch_size * 2,
+                DEFAULT_EVENTS_BATCHES_PER_PURGE * MAX_BATCHES_PER_PURGE_MULTIPLIER,
+            )
+        if finished:
+            self.finished = dt_util.utcnow()
+        cycle_deleted_rows = self._cycle_deleted_rows
+        self._cycle_deleted_rows = 0
+        if self._listeners:
+            self.hass.loop.call_soon_threadsafe(
+                self._async_notify_listeners, self.as_dict()
+            )
+        if finished or not self.max_rows_per_second:
+            return 0.0
+        return max(0.0, cycle_deleted_rows / self.max_rows_per_second - elapsed)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the purge progress as a dict."""
+        return {
+            "in_progress": self.in_progress,
+            "purge_before": self.purge_before and self.purge_before.isoformat(),
+            "started": self.started and self.started.isoformat(),
+            "finished": self.finished and self.finished.isoformat(),
+            "deleted_rows": dict(self.deleted_rows),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "states_batch_size": self.states_batch_size,
+            "events_batch_size": self.events_batch_size,
+        }
+
+    @callback
+    def async_subscribe(
+        self, listener: Callable[[dict[str, Any]], None]
+    ) -> CALLBACK_TYPE:
+        """Subscribe to progress updates after each purge cycle."""
+        self._listeners.add(listener)
+
+        @callback
+        def _async_unsubscribe() -> None:
+            self._listeners.discard(listener)
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_notify_listeners(self, progress: dict[str, Any]) -> None:
+        """Notify listeners of the purge progress."""
+        for listener in list(self._listeners):
+            listener(progress)
+
 
 @retryable_database_job("purge")
 def purge_old_data(
@@ -86,8 +214,16 @@ def purge_old_data(
                 " remaining"
             )
             # Once we are done purging legacy rows, we use the new method
+            states_purge_before = purge_before
+            if instance.states_archive is not None:
+                states_purge_before, has_more_to_archive = _archive_states(
+                    instance, session, purge_before
+                )
+                has_more_to_purge |= has_more_to_archive
+            if instance.partitioned_tables:
+                _purge_partitions(instance, session, states_purge_before, purge_before)
             has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
+                instance, session, states_batch_size, states_purge_before
             )
             has_more_to_purge |= _purge_events_and_data_ids(
                 instance, session, events_batch_size, purge_before
@@ -100,10 +236,10 @@ def purge_old_data(
             session, purge_before, instance.max_bind_vars
         )
         if statistics_runs:
-            _purge_statistics_runs(session, statistics_runs)
+            _purge_statistics_runs(instance, session, statistics_runs)
 
         if short_term_statistics:
-            _purge_short_term_statistics(session, short_term_statistics)
+            _purge_short_term_statistics(instance, session, short_term_statistics)
 
         if has_more_to_purge or statistics_runs or short_term_statistics:
             # Return false, as we might not be done yet.
@@ -123,6 +259,7 @@ def purge_old_data(
             _purge_old_entity_ids(instance, session)
 
         _purge_old_recorder_runs(instance, session, purge_before)
+        _purge_old_states_buckets(instance, session, purge_before)
     if repack:
         repack_database(instance)
     return True
@@ -147,7 +284,7 @@ def _purge_legacy_format(
     )
     _purge_state_ids(instance, session, state_ids)
     _purge_unused_attributes_ids(instance, session, attributes_ids)
-    _purge_event_ids(session, event_ids)
+    _purge_event_ids(instance, session, event_ids)
     _purge_unused_data_ids(instance, session, data_ids)
 
     # The database may still have some rows that have an event_id but are not
@@ -173,6 +310,119 @@ def _purge_legacy_format(
     )
 
 
+def _archive_states(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> tuple[datetime, bool]:
+    """Archive the oldest day of states before they are purged.
+
+    Only whole days before purge_before are archived so each day is
+    written to the archive exactly once. The states of the day the
+    purge_before falls in are kept until the next purge.
+
+    Returns the point in time states can be purged before and if
+    there are more days to archive.
+    """
+    states_archive = instance.states_archive
+    assert states_archive is not None
+    cutoff = partition_day_start(purge_before.timestamp())
+    oldest_ts: float | None = session.execute(find_oldest_state_ts()).scalar()
+    if oldest_ts is None or oldest_ts >= cutoff.timestamp():
+        return cutoff, False
+    day_start = partition_day_start(oldest_ts)
+    if not states_archive.has_partition(day_start):
+        try:
+            states_archive.archive_day(session, day_start)
+        except OSError:
+            # Keep the states in the database until they can be archived
+            _LOGGER.exception("Error archiving states for %s", day_start.date())
+            return day_start, False
+    next_day_start = day_start + timedelta(days=1)
+    return next_day_start, next_day_start < cutoff
+
+
+def _purge_partitions(
+    instance: Recorder,
+    session: Session,
+    states_purge_before: datetime,
+    purge_before: datetime,
+) -> None:
+    """Drop the day partitions that are entirely before the purge point.
+
+    Dropping a partition removes a day of rows without scanning them,
+    the rows in the partition purge_before falls in are purged in
+    batches. The attributes and event data used by the dropped rows
+    are collected first so the unused ones can be purged after.
+    """
+    dialect_name = instance.dialect_name
+    engine = instance.engine
+    assert engine is not None
+    for table_name in sorted(instance.partitioned_tables):
+        table_purge_before = (
+            states_purge_before if table_name == TABLE_STATES else purge_before
+        )
+        for partition_name, day in find_partitions_to_drop(
+            session.connection(), dialect_name, table_name, table_purge_before
+        ):
+            start_ts = day.timestamp()
+            end_ts = start_ts + PARTITION_DAY_SECONDS
+            attributes_ids: set[int] = set()
+            data_ids: set[int] = set()
+            if table_name == TABLE_STATES:
+                attributes_ids = set(
+                    session.execute(
+                        find_attributes_ids_in_range(start_ts, end_ts)
+                    ).scalars()
+                )
+                _disconnect_states_in_range(instance, session, start_ts, end_ts)
+                _evict_committed_state_ids_in_range(instance, session, start_ts, end_ts)
+            elif table_name == TABLE_EVENTS:
+                data_ids = set(
+                    session.execute(find_data_ids_in_range(start_ts, end_ts)).scalars()
+                )
+            # MySQL implicitly commits the open transaction before running
+            # DDL, so commit it first and drop the partition on its own
+            # connection instead of in the middle of the purge transaction.
+            session.commit()
+            _LOGGER.debug("Dropping partition %s of %s", partition_name, table_name)
+            with engine.begin() as connection:
+                drop_partition(connection, dialect_name, table_name, partition_name)
+            _purge_unused_attributes_ids(instance, session, attributes_ids)
+            _purge_unused_data_ids(instance, session, data_ids)
+
+
+def _disconnect_states_in_range(
+    instance: Recorder, session: Session, start_ts: float, end_ts: float
+) -> None:
+    """Disconnect the later states from the states in a range about to be dropped.
+
+    The partitioned tables have no foreign keys, so the old_state_id of
+    the states that follow the dropped states has to be cleared the same
+    way the batch purge does.
+    """
+    old_state_ids = set(
+        session.execute(find_old_state_ids_in_range(start_ts, end_ts)).scalars()
+    )
+    for state_ids_chunk in chunked_or_all(old_state_ids, instance.max_bind_vars):
+        disconnected_rows = session.execute(disconnect_states_rows(state_ids_chunk))
+        _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+
+
+def _evict_committed_state_ids_in_range(
+    instance: Recorder, session: Session, start_ts: float, end_ts: float
+) -> None:
+    """Evict the committed states in a range that is about to be dropped."""
+    purged_state_ids: set[int] = set()
+    for state_ids_chunk in chunked_or_all(
+        instance.states_manager.get_committed_state_ids(), instance.max_bind_vars
+    ):
+        purged_state_ids.update(
+            session.execute(
+                find_state_ids_in_range(state_ids_chunk, start_ts, end_ts)
+            ).scalars()
+        )
+    instance.states_manager.evict_purged_state_ids(purged_state_ids)
+
+
 def _purge_states_and_attributes_ids(
     instance: Recorder,
     session: Session,
@@ -234,7 +484,7 @@ def _purge_events_and_data_ids(
         if not event_ids:
             has_remaining_event_ids_to_purge = False
             break
-        _purge_event_ids(session, event_ids)
+        _purge_event_ids(instance, session, event_ids)
         data_ids_batch = data_ids_batch | data_ids
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
@@ -523,6 +773,7 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
 
     deleted_rows = session.execute(delete_states_rows(state_ids))
     _LOGGER.debug("Deleted %s states", deleted_rows)
+    instance.purge_progress.add_deleted_rows("states", len(state_ids))
 
     # Evict eny entries in the old_states cache referring to a purged state
     instance.states_manager.evict_purged_state_ids(state_ids)
@@ -537,6 +788,7 @@ def _purge_batch_attributes_ids(
             delete_states_attributes_rows(attributes_ids_chunk)
         )
         _LOGGER.debug("Deleted %s attribute states", deleted_rows)
+    instance.purge_progress.add_deleted_rows("state_attributes", len(attributes_ids))
 
     # Evict any entries in the state_attributes_ids cache referring to a purged state
     instance.state_attributes_manager.evict_purged(attributes_ids)
@@ -549,33 +801,41 @@ def _purge_batch_data_ids(
     for data_ids_chunk in chunked_or_all(data_ids, instance.max_bind_vars):
         deleted_rows = session.execute(delete_event_data_rows(data_ids_chunk))
         _LOGGER.debug("Deleted %s data events", deleted_rows)
+    instance.purge_progress.add_deleted_rows("event_data", len(data_ids))
 
     # Evict any entries in the event_data_ids cache referring to a purged state
     instance.event_data_manager.evict_purged(data_ids)
 
 
-def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None:
+def _purge_statistics_runs(
+    instance: Recorder, session: Session, statistics_runs: list[int]
+) -> None:
     """Delete by run_id."""
     deleted_rows = session.execute(delete_statistics_runs_rows(statistics_runs))
     _LOGGER.debug("Deleted %s statistic runs", deleted_rows)
+    instance.purge_progress.add_deleted_rows("statistics_runs", len(statistics_runs))
 
 
 def _purge_short_term_statistics(
-    session: Session, short_term_statistics: list[int]
+    instance: Recorder, session: Session, short_term_statistics: list[int]
 ) -> None:
     """Delete by id."""
     deleted_rows = session.execute(
         delete_statistics_short_term_rows(short_term_statistics)
     )
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
+    instance.purge_progress.add_deleted_rows(
+        "statistics_short_term", len(short_term_statistics)
+    )
 
 
-def _purge_event_ids(session: Session, event_ids: set[int]) -> None:
+def _purge_event_ids(instance: Recorder, session: Session, event_ids: set[int]) -> None:
     """Delete by event id."""
     if not event_ids:
         return
     deleted_rows = session.execute(delete_event_rows(event_ids))
     _LOGGER.debug("Deleted %s events", deleted_rows)
+    instance.purge_progress.add_deleted_rows("events", len(event_ids))
 
 
 def _purge_old_recorder_runs(
@@ -591,6 +851,17 @@ def _purge_old_recorder_runs(
     _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
 
+def _purge_old_states_buckets(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> None:
+    """Purge all states buckets that ended before purge_before."""
+    purge_before_ts = purge_before.timestamp()
+    deleted_rows = session.execute(delete_states_buckets_rows(purge_before_ts))
+    _LOGGER.debug("Deleted %s states buckets", deleted_rows)
+    if instance.states_buckets_manager is not None:
+        instance.states_buckets_manager.evict_purged(purge_before_ts)
+
+
 def _purge_old_event_types(instance: Recorder, session: Session) -> None:
     """Purge all old event types."""
     # Event types is small, no need to batch run it
@@ -624,10 +895,16 @@ def _purge_old_entity_ids(instance: Recorder, session: Session) -> None:
 
     deleted_rows = session.execute(delete_states_meta_rows(states_metadata_ids))
     _LOGGER.debug("Deleted %s states meta", deleted_rows)
+    deleted_rows = session.execute(
+        delete_states_buckets_rows_for_metadata_ids(states_metadata_ids)
+    )
+    _LOGGER.debug("Deleted %s states buckets", deleted_rows)
 
     # Evict any entries in the event_type cache referring to a purged state
     instance.states_meta_manager.evict_purged(purge_entity_ids)
     instance.states_manager.evict_purged_entity_ids(purge_entity_ids)
+    if instance.states_buckets_manager is not None:
+        instance.states_buckets_manager.evict_purged_entity_ids(purge_entity_ids)
 
 
 def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
@@ -705,7 +982,7 @@ def _purge_filtered_states(
     # These are legacy events that are linked to a state that are no longer
     # created but since we did not remove them when we stopped adding new ones
     # we will need to purge them here.
-    _purge_event_ids(session, filtered_event_ids)
+    _purge_event_ids(instance, session, filtered_event_ids)
     unused_attribute_ids_set = _select_unused_attributes_ids(
         instance,
         session,
@@ -755,7 +1032,7 @@ def _purge_filtered_events(
         # created but since we did not remove them when we stopped adding new ones
         # we will need to purge them here.
         _purge_state_ids(instance, session, state_ids)
-    _purge_event_ids(session, event_ids_set)
+    _purge_event_ids(instance, session, event_ids_set)
     if unused_data_ids_set := _select_unused_event_data_ids(
         instance, session, set(data_ids), database_engine
     ):
@@ -5,11 +5,22 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from sqlalchemy import (
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    or_,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
+from .const import STATES_BUCKET_SECONDS
 from .db_schema import (
+    OLD_STATE,
     EventData,
     Events,
     EventTypes,
@@ -17,8 +28,10 @@ from .db_schema import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesBuckets,
     StatesMeta,
     Statistics,
+    StatisticsDay,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -636,6 +649,59 @@ def find_states_to_purge(
     )
 
 
+def find_attributes_ids_in_range(
+    start_ts: float, end_ts: float
+) -> StatementLambdaElement:
+    """Find the attributes ids used by states in a range."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id)
+        .distinct()
+        .filter(States.last_updated_ts >= start_ts)
+        .filter(States.last_updated_ts < end_ts)
+        .filter(States.attributes_id.is_not(None))
+    )
+
+
+def find_data_ids_in_range(start_ts: float, end_ts: float) -> StatementLambdaElement:
+    """Find the data ids used by events in a range."""
+    return lambda_stmt(
+        lambda: select(Events.data_id)
+        .distinct()
+        .filter(Events.time_fired_ts >= start_ts)
+        .filter(Events.time_fired_ts < end_ts)
+        .filter(Events.data_id.is_not(None))
+    )
+
+
+def find_state_ids_in_range(
+    state_ids: Iterable[int], start_ts: float, end_ts: float
+) -> StatementLambdaElement:
+    """Find which of the state ids are in a range."""
+    return lambda_stmt(
+        lambda: select(States.state_id)
+        .filter(States.state_id.in_(state_ids))
+        .filter(States.last_updated_ts >= start_ts)
+        .filter(States.last_updated_ts < end_ts)
+    )
+
+
+def find_old_state_ids_in_range(
+    start_ts: float, end_ts: float
+) -> StatementLambdaElement:
+    """Find the states in a range that are the old state of a later state."""
+    return lambda_stmt(
+        lambda: select(States.old_state_id)
+        .filter(States.last_updated_ts >= end_ts)
+        .filter(
+            States.old_state_id.in_(
+                select(OLD_STATE.state_id)
+                .filter(OLD_STATE.last_updated_ts >= start_ts)
+                .filter(OLD_STATE.last_updated_ts < end_ts)
+            )
+        )
+    )
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -694,6 +760,11 @@ def find_legacy_detached_states_and_attributes_to_purge(
     )
 
 
+def find_oldest_state_ts() -> StatementLambdaElement:
+    """Find the last_updated_ts of the oldest state."""
+    return lambda_stmt(lambda: select(func.min(States.last_updated_ts)))
+
+
 def find_legacy_row() -> StatementLambdaElement:
     """Check if there are still states in the table with an event_id."""
     return lambda_stmt(lambda: select(func.max(States.event_id)))
@@ -798,6 +869,42 @@ def has_entity_ids_to_migrate() -> StatementLambdaElement:
     )
 
 
+def find_statistics_to_roll_up(limit: int) -> StatementLambdaElement:
+    """Find statistics with hourly statistics before their first day rollup."""
+    return lambda_stmt(
+        lambda: select(
+            (
+                first_hours := select(
+                    Statistics.metadata_id,
+                    func.min(Statistics.start_ts).label("first_start_ts"),
+                )
+                .group_by(Statistics.metadata_id)
+                .subquery()
+            ).c.metadata_id,
+            first_hours.c.first_start_ts,
+        )
+        .outerjoin(
+            (
+                first_days := select(
+                    StatisticsDay.metadata_id,
+                    func.min(StatisticsDay.start_ts).label("first_start_ts"),
+                )
+                .group_by(StatisticsDay.metadata_id)
+                .subquery()
+            ),
+            first_days.c.metadata_id == first_hours.c.metadata_id,
+        )
+        .filter(
+            or_(
+                first_days.c.first_start_ts.is_(None),
+                first_days.c.first_start_ts > first_hours.c.first_start_ts,
+            )
+        )
+        .order_by(first_hours.c.metadata_id)
+        .limit(limit)
+    )
+
+
 def find_states_context_ids_to_migrate(max_bind_vars: int) -> StatementLambdaElement:
     """Find events context_ids to migrate."""
     return lambda_stmt(
@@ -872,6 +979,27 @@ def delete_states_meta_rows(metadata_ids: Iterable[int]) -> StatementLambdaEleme
     )
 
 
+def delete_states_buckets_rows(purge_before: float) -> StatementLambdaElement:
+    """Delete StatesBuckets rows that ended before purge_before."""
+    last_bucket_start_ts = purge_before - STATES_BUCKET_SECONDS
+    return lambda_stmt(
+        lambda: delete(StatesBuckets)
+        .where(StatesBuckets.bucket_start_ts <= last_bucket_start_ts)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_buckets_rows_for_metadata_ids(
+    metadata_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Delete StatesBuckets rows for the given metadata_ids."""
+    return lambda_stmt(
+        lambda: delete(StatesBuckets)
+        .where(StatesBuckets.metadata_id.in_(metadata_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
 def find_unmigrated_short_term_statistics_rows(
     max_bind_vars: int,
 ) -> StatementLambdaElement:
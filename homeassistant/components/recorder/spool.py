@@ -0,0 +1,318 @@
+"""Write-ahead spool for events the recorder cannot keep up with.
+
+When the database falls behind, events are appended to an on-disk spool
+instead of the in-memory queue so the memory use stays bounded and no
+events are dropped. The spool is replayed into the database in bulk once
+the queue has drained.
+
+The spool is a log of fixed size segment files in the config directory
+that are memory mapped while they are written. Each record is a length
+prefixed JSON array with the event. The length is written after the
+payload so a record that was interrupted by a crash reads as the end of
+the segment. The attributes of states that are not recorded are left out
+of the records since the state info is not spooled.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, cast
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads_array
+
+from .db_schema import StateAttributes
+
+_LOGGER = logging.getLogger(__name__)
+
+SPOOL_DIR = "recorder_spool"
+SEGMENT_SUFFIX = ".spool"
+SEGMENT_SIZE = 8 * 1024**2
+# With the default segment size this bounds the spool to 1 GiB
+MAX_SEGMENTS = 128
+
+_MAGIC = b"HASPL1\n\x00"
+_RECORD_LENGTH = struct.Struct("<I")
+
+_EVENT_ORIGINS = list(EventOrigin)
+
+
+def _state_to_record(state: State | None) -> dict[str, Any] | None:
+    """Serialize a state with only the attributes that are recorded."""
+    if state is None:
+        return None
+    return {**state.as_dict(), "attributes": StateAttributes.recorded_attributes(state)}
+
+
+def _event_to_record(event: Event) -> bytes:
+    """Serialize an event as a spool record payload."""
+    context = event.context
+    data = event.data
+    if event.event_type == EVENT_STATE_CHANGED:
+        data = {
+            **data,
+            "old_state": _state_to_record(data["old_state"]),
+            "new_state": _state_to_record(data["new_state"]),
+        }
+    return json_bytes(
+        [
+            event.event_type,
+            data,
+            event.origin.idx,
+            event.time_fired_timestamp,
+            context.id,
+            context.user_id,
+            context.parent_id,
+        ]
+    )
+
+
+def _event_from_record(payload: bytes) -> Event:
+    """Deserialize an event from a spool record payload."""
+    (
+        event_type,
+        data,
+        origin_idx,
+        time_fired_timestamp,
+        context_id,
+        user_id,
+        parent_id,
+    ) = cast(
+        tuple[str, dict[str, Any], int, float, str | None, str | None, str | None],
+        json_loads_array(payload),
+    )
+    if event_type == EVENT_STATE_CHANGED:
+        data["old_state"] = State.from_dict(data["old_state"])
+        data["new_state"] = State.from_dict(data["new_state"])
+    return Event(
+        event_type,
+        data,
+        _EVENT_ORIGINS[origin_idx],
+        time_fired_timestamp,
+        Context(user_id=user_id, parent_id=parent_id, id=context_id),
+    )
+
+
+def read_segment(path: str) -> list[Event]:
+    """Read the events of a segment."""
+    with open(path, "rb") as segment_file:
+        if not (size := os.fstat(segment_file.fileno()).st_size):
+            return []
+        with mmap.mmap(segment_file.fileno(), size, access=mmap.ACCESS_READ) as data:
+            if data[: len(_MAGIC)] != _MAGIC:
+                _LOGGER.warning("Ignoring spool segment %s with a bad header", path)
+                return []
+            events: list[Event] = []
+            offset = len(_MAGIC)
+            while offset + _RECORD_LENGTH.size <= size:
+                (length,) = _RECORD_LENGTH.unpack_from(data, offset)
+                if not length:
+                    break
+                offset += _RECORD_LENGTH.size
+                events.append(_event_from_record(data[offset : offset + length]))
+                offset += length
+            return events
+
+
+class _SegmentWriter:
+    """Append records to a memory mapped segment."""
+
+    def __init__(self, path: str, size: int) -> None:
+        """Create the segment file and map it."""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            self._data = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._data[: len(_MAGIC)] = _MAGIC
+        self._offset = len(_MAGIC)
+
+    def append(self, payload: bytes) -> bool:
+        """Append a record, return False if the segment is full."""
+        offset = self._offset
+        end = offset + _RECORD_LENGTH.size + len(payload)
+        # Leave room for the zero length that marks the end
+        if end + _RECORD_LENGTH.size > len(self._data):
+            return False
+        data = self._data
+        data[offset + _RECORD_LENGTH.size : end] = payload
+        _RECORD_LENGTH.pack_into(data, offset, len(payload))
+        self._offset = end
+        return True
+
+    def close(self) -> None:
+        """Flush and unmap the segment."""
+        self._data.flush()
+        self._data.close()
+
+
+class EventSpool:
+    """Append-only on-disk log of events waiting to be recorded.
+
+    Events are put from the event loop and appended by write_pending
+    in the executor. The segments are replayed and removed from the
+    recorder thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        segment_size: int = SEGMENT_SIZE,
+        max_segments: int = MAX_SEGMENTS,
+    ) -> None:
+        """Initialize the spool."""
+        self.path = path
+        self._segment_size = segment_size
+        self._max_segments = max_segments
+        self._lock = threading.Lock()
+        self._segments: list[str] = []
+        self._writer: _SegmentWriter | None = None
+        self._last_name = 0
+        self._closed = False
+        self._pending: list[Event] = []
+        self._pending_condition = threading.Condition()
+        self._writing = False
+
+    def __len__(self) -> int:
+        """Return the number of segments in the spool."""
+        return len(self._segments)
+
+    def load(self) -> None:
+        """Add the segments left over from a previous run.
+
+        This call does blocking I/O and must not be called from the
+        event loop.
+        """
+        if not os.path.isdir(self.path):
+            return
+        existing = [
+            os.path.join(self.path, name)
+            for name in os.listdir(self.path)
+            if name.endswith(SEGMENT_SUFFIX)
+        ]
+        with self._lock:
+            self._segments = sorted({*existing, *self._segments})
+        if existing:
+            _LOGGER.info("Found %s spooled event segments to replay", len(existing))
+
+    def _new_segment_path(self) -> str:
+        """Return the path of a new segment that sorts after the others."""
+        self._last_name = max(time.time_ns(), self._last_name + 1)
+        return os.path.join(self.path, f"{self._last_name:020d}{SEGMENT_SUFFIX}")
+
+    def put(self, event: Event) -> bool:
+        """Add an event to be appended by write_pending.
+
+        Returns True when write_pending has to be scheduled since it
+        is not running already.
+
+        Async friendly.
+        """
+        with self._pending_condition:
+            self._pending.append(event)
+            if self._writing:
+                return False
+            self._writing = True
+            return True
+
+    def write_pending(self) -> bool:
+        """Append the events that were put, return False if any did not fit.
+
+        This call does blocking I/O and must not be called from the
+        event loop.
+        """
+        appended = True
+        try:
+            while True:
+                with self._pending_condition:
+                    if not (events := self._pending):
+                        return appended
+                    self._pending = []
+                for event in events:
+                    if not self.append(event):
+                        appended = False
+        finally:
+            with self._pending_condition:
+                self._writing = False
+                self._pending_condition.notify_all()
+
+    def wait_written(self) -> None:
+        """Wait until the events that were put are appended.
+
+        This call blocks and must not be called from the event loop.
+        """
+        with self._pending_condition:
+            self._pending_condition.wait_for(lambda: not self._writing)
+
+    def append(self, event: Event) -> bool:
+        """Append an event, return False if the spool is full or closed.
+
+        This call does blocking I/O and must not be called from the
+        event loop.
+        """
+        payload = _event_to_record(event)
+        with self._lock:
+            if self._closed:
+                return False
+            if (writer := self._writer) is not None and writer.append(payload):
+                return True
+            if len(self._segments) >= self._max_segments:
+                return False
+            if writer is not None:
+                writer.close()
+            os.makedirs(self.path, exist_ok=True)
+            path = self._new_segment_path()
+            self._writer = writer = _SegmentWriter(
+                path,
+                max(
+                    self._segment_size,
+                    len(_MAGIC) + 2 * _RECORD_LENGTH.size + len(payload),
+                ),
+            )
+            self._segments.append(path)
+            return writer.append(payload)
+
+    def seal(self) -> list[str]:
+        """Close the segment being written and return all segments in order.
+
+        The next event that is appended starts a new segment so the
+        returned segments can be read without holding the lock.
+        """
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            return list(self._segments)
+
+    def remove(self, path: str) -> None:
+        """Remove a segment after its events have been recorded."""
+        with self._lock:
+            self._segments.remove(path)
+        os.remove(path)
+
+    def close(self) -> None:
+        """Flush the segment being written and stop accepting events."""
+        with self._lock:
+            self._closed = True
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def replay(self) -> Iterator[tuple[str, list[Event]]]:
+        """Yield the events of each sealed segment.
+
+        The events that were put before are appended first. The caller
+        must remove each segment once its events are recorded.
+        """
+        self.wait_written()
+        for path in self.seal():
+            yield path, read_segment(path)
@@ -13,7 +13,18 @@ from operator import itemgetter
 import re
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from sqlalchemy import (
+    Select,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    select,
+    text,
+)
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.session import Session
@@ -59,8 +70,12 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDay,
+    StatisticsMonth,
+    StatisticsRollupBase,
     StatisticsRuns,
     StatisticsShortTerm,
+    StatisticsWeek,
 )
 from .models import (
     StatisticData,
@@ -155,6 +170,7 @@ UNIT_CLASSES = {
 }
 
 DATA_SHORT_TERM_STATISTICS_RUN_CACHE = "recorder_short_term_statistics_run_cache"
+DATA_HOURLY_STATISTICS_ACCUMULATOR = "recorder_hourly_statistics_accumulator"
 
 
 def mean(values: list[float]) -> float | None:
@@ -198,6 +214,118 @@ class ShortTermStatisticsRunCache:
         self._latest_id_by_metadata_id.update(metadata_id_to_id)
 
 
+@dataclasses.dataclass(slots=True)
+class _RunningStatistic:
+    """Running summary of the statistics rows of a metadata_id in a period."""
+
+    mean_total: float = 0
+    mean_count: int = 0
+    min: float | None = None
+    max: float | None = None
+    last_reset_ts: float | None = None
+    state: float | None = None
+    sum: float | None = None
+
+    def add(self, row: StatisticsBase) -> None:
+        """Add the next row of the period."""
+        if (_mean := row.mean) is not None:
+            self.mean_total += _mean
+            self.mean_count += 1
+        if (_min := row.min) is not None and (self.min is None or _min < self.min):
+            self.min = _min
+        if (_max := row.max) is not None and (self.max is None or _max > self.max):
+            self.max = _max
+        self.last_reset_ts = row.last_reset_ts
+        self.state = row.state
+        self.sum = row.sum
+
+    def as_statistic(self, start_ts: float) -> StatisticDataTimestamp:
+        """Return the summary of the period.
+
+        The values that are not known are left out.
+        """
+        statistic: StatisticDataTimestamp = {
+            "start_ts": start_ts,
+            "last_reset_ts": self.last_reset_ts,
+        }
+        if self.mean_count:
+            statistic["mean"] = self.mean_total / self.mean_count
+        if self.min is not None:
+            statistic["min"] = self.min
+        if self.max is not None:
+            statistic["max"] = self.max
+        if self.state is not None:
+            statistic["state"] = self.state
+        if self.sum is not None:
+            statistic["sum"] = self.sum
+        return statistic
+
+
+class HourlyStatisticsAccumulator:
+    """Accumulate the 5-minute statistics of the current hour.
+
+    The 5-minute statistics are added as they are compiled so the hourly
+    statistics can be compiled without reading them back. The summary is
+    only used when every 5-minute period of the hour was added exactly
+    once, otherwise the hour is compiled from the database.
+    """
+
+    __slots__ = ("_hour_start_ts", "_period_starts", "_statistics", "_valid")
+
+    def __init__(self) -> None:
+        """Initialize the accumulator."""
+        self._hour_start_ts: float | None = None
+        self._period_starts: set[float] = set()
+        self._statistics: dict[int, _RunningStatistic] = {}
+        self._valid = False
+
+    def reset(self) -> None:
+        """Discard the current hour."""
+        self._hour_start_ts = None
+        self._period_starts.clear()
+        self._statistics = {}
+        self._valid = False
+
+    def add_period(
+        self, period_start_ts: float, rows: Iterable[StatisticsBase]
+    ) -> None:
+        """Add the statistics compiled for a 5-minute period."""
+        hour_seconds = Statistics.duration.total_seconds()
+        hour_start_ts = period_start_ts - period_start_ts % hour_seconds
+        if hour_start_ts != self._hour_start_ts:
+            self.reset()
+            self._hour_start_ts = hour_start_ts
+            self._valid = True
+        if period_start_ts in self._period_starts:
+            # The period was compiled again after a failed commit
+            self._valid = False
+        self._period_starts.add(period_start_ts)
+        statistics = self._statistics
+        for row in rows:
+            metadata_id = cast(int, row.metadata_id)
+            if (running := statistics.get(metadata_id)) is None:
+                running = statistics[metadata_id] = _RunningStatistic()
+            running.add(row)
+
+    def pop_hour(
+        self, hour_start_ts: float
+    ) -> dict[int, StatisticDataTimestamp] | None:
+        """Return the summary of a complete hour or None if it is not complete."""
+        periods = Statistics.duration // StatisticsShortTerm.duration
+        summary: dict[int, StatisticDataTimestamp] | None = None
+        if (
+            self._valid
+            and self._hour_start_ts == hour_start_ts
+            and len(self._period_starts) == periods
+        ):
+            summary = {
+                metadata_id: running.as_statistic(hour_start_ts)
+                for metadata_id, running in self._statistics.items()
+            }
+        self.reset()
+        return summary
+
+
 class BaseStatisticsRow(TypedDict, total=False):
     """A processed row of statistic data."""
 
@@ -217,6 +345,10 @@ class StatisticsRow(BaseStatisticsRow, total=False):
     change: float | None
 
 
+# The values of each type of a statistic, index aligned with the start column
+type StatisticsColumns = dict[str, list[float | None]]
+
+
 def get_display_unit(
     hass: HomeAssistant,
     statistic_id: str,
@@ -387,13 +519,27 @@ def _compile_hourly_statistics_last_sum_stmt(
     )
 
 
-def _compile_hourly_statistics(session: Session, start: datetime) -> None:
+def _compile_hourly_statistics(
+    session: Session,
+    start: datetime,
+    accumulated: dict[int, StatisticDataTimestamp] | None = None,
+) -> None:
     """Compile hourly statistics.
 
     This will summarize 5-minute statistics for one hour:
     - average, min max is computed by a database query
     - sum is taken from the last 5-minute entry during the hour
+
+    If the 5-minute statistics of the hour were accumulated while they
+    were compiled, the accumulated summary is inserted instead.
     """
+    if accumulated is not None:
+        session.add_all(
+            Statistics.from_stats_ts(metadata_id, summary_item)
+            for metadata_id, summary_item in accumulated.items()
+        )
+        return
+
     start_time = start.replace(minute=0)
     start_time_ts = start_time.timestamp()
     end_time = start_time + Statistics.duration
@@ -586,9 +732,21 @@ def _compile_statistics(
         ):
             new_short_term_stats.append(new_stat)
 
+    accumulator = get_hourly_statistics_accumulator(instance.hass)
+    accumulator.add_period(start.timestamp(), new_short_term_stats)
     if start.minute == 55:
         # A full hour is ready, summarize it
-        _compile_hourly_statistics(session, start)
+        hour_start = start.replace(minute=0)
+        hour_start_ts = hour_start.timestamp()
+        _compile_hourly_statistics(
+            session, hour_start, accumulator.pop_hour(hour_start_ts)
+        )
+        update_statistics_rollups(
+            session,
+            None,
+            hour_start_ts,
+            hour_start_ts + Statistics.duration.total_seconds(),
+        )
 
     session.add(StatisticsRuns(start=start))
 
@@ -733,6 +891,7 @@ def get_metadata(
 
 def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
+    get_hourly_statistics_accumulator(instance.hass).reset()
     with session_scope(session=instance.get_session()) as session:
         instance.statistics_meta_manager.delete(session, statistic_ids)
 
@@ -1101,6 +1260,200 @@ def _reduce_statistics_per_month(
     )
 
 
+STATISTICS_ROLLUP_TABLES: dict[str, type[StatisticsRollupBase]] = {
+    "day": StatisticsDay,
+    "week": StatisticsWeek,
+    "month": StatisticsMonth,
+}
+
+STATISTICS_ROLLUP_FACTORIES: dict[
+    str,
+    Callable[
+        [],
+        tuple[
+            Callable[[float, float], bool],
+            Callable[[float], tuple[float, float]],
+        ],
+    ],
+] = {
+    "day": reduce_day_ts_factory,
+    "week": reduce_week_ts_factory,
+    "month": reduce_month_ts_factory,
+}
+
+
+def _rollup_source_columns(
+    table: type[Statistics | StatisticsDay],
+) -> tuple[Any, ...]:
+    """Return the columns to select from the table a rollup is reduced from."""
+    return (
+        table.metadata_id,
+        table.start_ts,
+        table.mean,
+        # An hourly row is a rollup of itself
+        literal(1).label("mean_count")
+        if table is Statistics
+        else StatisticsDay.mean_count,
+        table.min,
+        table.max,
+        table.last_reset_ts,
+        table.state,
+        table.sum,
+    )
+
+
+def _reduce_rollup_rows(
+    rows: Sequence[Row],
+    same_period: Callable[[float, float], bool],
+    period_start_end: Callable[[float], tuple[float, float]],
+) -> list[dict[str, Any]]:
+    """Reduce rows ordered by metadata_id and start_ts to one row per period.
+
+    The result is the same as _reduce_statistics, the means are weighted
+    with mean_count so rollups of shorter periods can be reduced as well.
+    """
+    result: list[dict[str, Any]] = []
+    for metadata_id, group in groupby(rows, itemgetter(0)):
+        period_rows = list(group)
+        begin = 0
+        for idx in range(1, len(period_rows) + 1):
+            if idx < len(period_rows) and same_period(
+                period_rows[idx - 1].start_ts, period_rows[idx].start_ts
+            ):
+                continue
+            mean_sum = 0.0
+            mean_count = 0
+            min_values: list[float] = []
+            max_values: list[float] = []
+            for row in period_rows[begin:idx]:
+                if row.mean is not None and row.mean_count:
+                    mean_sum += row.mean * row.mean_count
+                    mean_count += row.mean_count
+                if row.min is not None:
+                    min_values.append(row.min)
+                if row.max is not None:
+                    max_values.append(row.max)
+            last_row = period_rows[idx - 1]
+            result.append(
+                {
+                    "metadata_id": metadata_id,
+                    "start_ts": period_start_end(last_row.start_ts)[0],
+                    "mean": mean_sum / mean_count if mean_count else None,
+                    "mean_count": mean_count,
+                    "min": min(min_values) if min_values else None,
+                    "max": max(max_values) if max_values else None,
+                    "last_reset_ts": last_row.last_reset_ts,
+                    "state": last_row.state,
+                    "sum": last_row.sum,
+                }
+            )
+            begin = idx
+    return result
+
+
+def _replace_statistics_rollups(
+    session: Session,
+    period: str,
+    source: type[Statistics | StatisticsDay],
+    metadata_ids: set[int] | None,
+    start_ts: float,
+    end_ts: float,
+) -> None:
+    """Replace the rollups starting in start_ts - end_ts by reducing source."""
+    table = STATISTICS_ROLLUP_TABLES[period]
+    same_period, period_start_end = STATISTICS_ROLLUP_FACTORIES[period]()
+    query = (
+        select(*_rollup_source_columns(source))
+        .filter(source.start_ts >= start_ts)
+        .filter(source.start_ts < end_ts)
+        .order_by(source.metadata_id, source.start_ts)
+    )
+    remove = (
+        delete(table).filter(table.start_ts >= start_ts).filter(table.start_ts < end_ts)
+    )
+    if metadata_ids is not None:
+        query = query.filter(source.metadata_id.in_(metadata_ids))
+        remove = remove.filter(table.metadata_id.in_(metadata_ids))
+    rows = session.execute(query).all()
+    session.execute(remove)
+    if rollups := _reduce_rollup_rows(rows, same_period, period_start_end):
+        session.execute(insert(table), rollups)
+
+
+def update_statistics_rollups(
+    session: Session,
+    metadata_ids: set[int] | None,
+    start_ts: float,
+    end_ts: float,
+) -> None:
+    """Update the rollups of the periods overlapping start_ts - end_ts.
+
+    The day rollups are reduced from the hourly statistics and the week
+    and month rollups are reduced from the day rollups. If metadata_ids
+    is None the rollups of all statistics are updated.
+    """
+    session.flush()
+    _, day_start_end = reduce_day_ts_factory()
+    day_start = day_start_end(start_ts)[0]
+    day_end = day_start_end(max(start_ts, end_ts - 1))[1]
+    _replace_statistics_rollups(
+        session, "day", Statistics, metadata_ids, day_start, day_end
+    )
+    for period in ("week", "month"):
+        _, period_start_end = STATISTICS_ROLLUP_FACTORIES[period]()
+        _replace_statistics_rollups(
+            session,
+            period,
+            StatisticsDay,
+            metadata_ids,
+            period_start_end(day_start)[0],
+            period_start_end(day_end - 1)[1],
+        )
+
+
+def _statistics_rollups_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata_ids: list[int] | None,
+    period: Literal["5minute", "day", "hour", "week", "month"],
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> tuple[type[StatisticsRollupBase], Sequence[Row], dict[float, float]] | None:
+    """Return the rollups during a period and the end of each period start.
+
+    Returns None if the period has to be reduced from the hourly statistics,
+    that is until the existing hourly statistics have been rolled up, or
+    if a rollup does not start at the start of a period in the current time
+    zone which happens after the time zone was changed.
+    """
+    if (
+        period not in STATISTICS_ROLLUP_TABLES
+        or not get_instance(hass).statistics_rollups_active
+    ):
+        return None
+    table = STATISTICS_ROLLUP_TABLES[period]
+    _, period_start_end = STATISTICS_ROLLUP_FACTORIES[period]()
+    stmt = _generate_statistics_during_period_stmt(
+        start_time, end_time, metadata_ids, table, types
+    )
+    stats = cast(
+        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+    )
+    period_ends: dict[float, float] = {}
+    for row in stats:
+        if (start_ts := row.start_ts) in period_ends:
+            continue
+        period_start, period_end = period_start_end(start_ts)
+        if period_start != start_ts:
+            _LOGGER.debug(
+                "Statistics %s rollups are not aligned with the time zone", period
+            )
+            return None
+        period_ends[start_ts] = period_end
+    return table, stats, period_ends
+
+
 def _generate_statistics_during_period_stmt(
     start_time: datetime,
     end_time: datetime | None,
@@ -1635,22 +1988,20 @@ def _extract_metadata_and_discard_impossible_columns(
     return metadata_ids
 
 
-def _augment_result_with_change(
+def _get_previous_sums(
     hass: HomeAssistant,
     session: Session,
     start_time: datetime,
     units: dict[str, str] | None,
-    _types: set[Literal["change", "last_reset", "max", "mean", "min", "state", "sum"]],
     table: type[Statistics | StatisticsShortTerm],
     metadata: dict[str, tuple[int, StatisticMetaData]],
-    result: dict[str, list[StatisticsRow]],
-) -> None:
-    """Add change to the result."""
-    drop_sum = "sum" not in _types
-    prev_sums = {}
+    statistic_ids: Iterable[str],
+) -> dict[str, float | None]:
+    """Return the last sums before start_time in the display unit."""
+    prev_sums: dict[str, float | None] = {}
     if tmp := _statistics_at_time(
         session,
-        {metadata[statistic_id][0] for statistic_id in result},
+        {metadata[statistic_id][0] for statistic_id in statistic_ids},
         table,
         start_time,
         {"sum"},
@@ -1669,6 +2020,24 @@ def _augment_result_with_change(
                 prev_sums[statistic_id] = convert(row.sum)
             else:
                 prev_sums[statistic_id] = row.sum
+    return prev_sums
+
+
+def _augment_result_with_change(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    units: dict[str, str] | None,
+    _types: set[Literal["change", "last_reset", "max", "mean", "min", "state", "sum"]],
+    table: type[Statistics | StatisticsShortTerm],
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    result: dict[str, list[StatisticsRow]],
+) -> None:
+    """Add change to the result."""
+    drop_sum = "sum" not in _types
+    prev_sums = _get_previous_sums(
+        hass, session, start_time, units, table, metadata, result
+    )
 
     for statistic_id, rows in result.items():
         prev_sum = prev_sums.get(statistic_id) or 0
@@ -1712,56 +2081,30 @@ def _statistics_during_period_with_session(
     if not metadata:
         return {}
 
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]] = set()
-    for stat_type in _types:
-        if stat_type == "change":
-            types.add("sum")
-            continue
-        types.add(stat_type)
+    types = _get_column_types(_types)
 
     metadata_ids = None
     if statistic_ids is not None:
         metadata_ids = _extract_metadata_and_discard_impossible_columns(metadata, types)
 
-    # Align start_time and end_time with the period
-    if period == "day":
-        start_time = dt_util.as_local(start_time).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        start_time = start_time.replace()
-        if end_time is not None:
-            end_local = dt_util.as_local(end_time)
-            end_time = end_local.replace(
-                hour=0, minute=0, second=0, microsecond=0
-            ) + timedelta(days=1)
-    elif period == "week":
-        start_local = dt_util.as_local(start_time)
-        start_time = start_local.replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) - timedelta(days=start_local.weekday())
-        if end_time is not None:
-            end_local = dt_util.as_local(end_time)
-            end_time = (
-                end_local.replace(hour=0, minute=0, second=0, microsecond=0)
-                - timedelta(days=end_local.weekday())
-                + timedelta(days=7)
-            )
-    elif period == "month":
-        start_time = dt_util.as_local(start_time).replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-        if end_time is not None:
-            end_time = _find_month_end_time(dt_util.as_local(end_time))
+    start_time, end_time = _align_start_end_time_to_period(start_time, end_time, period)
 
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
+    stats_table: type[StatisticsBase] = table
+    period_ends: dict[float, float] | None = None
+    if rollups := _statistics_rollups_during_period(
+        hass, session, start_time, end_time, metadata_ids, period, types
+    ):
+        stats_table, stats, period_ends = rollups
+    else:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
 
     if not stats:
         return {}
@@ -1772,18 +2115,23 @@ def _statistics_during_period_with_session(
         statistic_ids,
         metadata,
         True,
-        table,
+        stats_table,
         units,
         types,
     )
 
-    if period == "day":
+    if period_ends is not None:
+        for rows in result.values():
+            for row in rows:
+                row["end"] = period_ends[row["start"]]
+
+    elif period == "day":
         result = _reduce_statistics_per_day(result, types)
 
-    if period == "week":
+    elif period == "week":
         result = _reduce_statistics_per_week(result, types)
 
-    if period == "month":
+    elif period == "month":
         result = _reduce_statistics_per_month(result, types)
 
     if "change" in _types:
@@ -1795,6 +2143,56 @@ def _statistics_during_period_with_session(
     return result
 
 
+def _get_column_types(
+    _types: set[Literal["change", "last_reset", "max", "mean", "min", "state", "sum"]],
+) -> set[Literal["last_reset", "max", "mean", "min", "state", "sum"]]:
+    """Return the columns to select for the requested types."""
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]] = set()
+    for stat_type in _types:
+        if stat_type == "change":
+            types.add("sum")
+            continue
+        types.add(stat_type)
+    return types
+
+
+def _align_start_end_time_to_period(
+    start_time: datetime,
+    end_time: datetime | None,
+    period: Literal["5minute", "day", "hour", "week", "month"],
+) -> tuple[datetime, datetime | None]:
+    """Align start_time and end_time with the period."""
+    if period == "day":
+        start_time = dt_util.as_local(start_time).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        start_time = start_time.replace()
+        if end_time is not None:
+            end_local = dt_util.as_local(end_time)
+            end_time = end_local.replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ) + timedelta(days=1)
+    elif period == "week":
+        start_local = dt_util.as_local(start_time)
+        start_time = start_local.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=start_local.weekday())
+        if end_time is not None:
+            end_local = dt_util.as_local(end_time)
+            end_time = (
+                end_local.replace(hour=0, minute=0, second=0, microsecond=0)
+                - timedelta(days=end_local.weekday())
+                + timedelta(days=7)
+            )
+    elif period == "month":
+        start_time = dt_util.as_local(start_time).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        if end_time is not None:
+            end_time = _find_month_end_time(dt_util.as_local(end_time))
+    return start_time, end_time
+
+
 def statistics_during_period(
     hass: HomeAssistant,
     start_time: datetime,
@@ -1822,6 +2220,195 @@ def statistics_during_period(
         )
 
 
+def _sorted_statistics_to_columns(
+    hass: HomeAssistant,
+    stats: Sequence[Row[Any]],
+    _metadata: dict[str, tuple[int, StatisticMetaData]],
+    table: type[StatisticsBase],
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, StatisticsColumns]:
+    """Convert SQL results into columns per statistic id.
+
+    The rows of each metadata_id are transposed in one pass and the unit
+    conversion is applied to whole columns instead of building a dict
+    for every row.
+    """
+    result: dict[str, StatisticsColumns] = {}
+    metadata = dict(_metadata.values())
+    field_map: dict[str, int] = {key: idx for idx, key in enumerate(stats[0]._fields)}
+    start_ts_idx = field_map["start_ts"]
+    last_reset_ts_idx = field_map["last_reset_ts"] if "last_reset" in types else None
+    value_idxes = [
+        (key, field_map[key])
+        for key in ("mean", "min", "max", "state", "sum")
+        if key in types
+    ]
+    table_duration_seconds = table.duration.total_seconds()
+    for meta_id, group in groupby(stats, itemgetter(field_map["metadata_id"])):
+        db_columns = list(zip(*group, strict=True))
+        metadata_by_id = metadata[meta_id]
+        statistic_id = metadata_by_id["statistic_id"]
+        state_unit = unit = metadata_by_id["unit_of_measurement"]
+        if state := hass.states.get(statistic_id):
+            state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        convert = _get_statistic_to_display_unit_converter(unit, state_unit, units)
+
+        start = list(db_columns[start_ts_idx])
+        columns: StatisticsColumns = {
+            "start": start,
+            "end": [start_ts + table_duration_seconds for start_ts in start],
+        }
+        if last_reset_ts_idx is not None:
+            columns["last_reset"] = list(db_columns[last_reset_ts_idx])
+        for key, idx in value_idxes:
+            if convert is not None:
+                columns[key] = list(map(convert, db_columns[idx]))
+            else:
+                columns[key] = list(db_columns[idx])
+        result[statistic_id] = columns
+    return result
+
+
+def _reduce_statistics_columns(
+    stats: dict[str, StatisticsColumns],
+    same_period: Callable[[float, float], bool],
+    period_start_end: Callable[[float], tuple[float, float]],
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, StatisticsColumns]:
+    """Reduce hourly statistic columns to daily, weekly or monthly columns."""
+    result: dict[str, StatisticsColumns] = {}
+    aggregates: list[tuple[str, Callable[[list[float]], float | None]]] = [
+        (key, aggregate)
+        for key, aggregate in (("mean", mean), ("min", min), ("max", max))
+        if key in types
+    ]
+    last_keys = [key for key in ("last_reset", "state", "sum") if key in types]
+    for statistic_id, columns in stats.items():
+        # The start of a period is never None
+        start = cast(list[float], columns["start"])
+        # The index after the last row of each period
+        period_ends = [
+            idx
+            for idx in range(1, len(start))
+            if not same_period(start[idx - 1], start[idx])
+        ]
+        period_ends.append(len(start))
+        period_starts = [0, *period_ends[:-1]]
+        reduced: StatisticsColumns = {"start": [], "end": []}
+        for begin in period_starts:
+            period_start, period_end = period_start_end(start[begin])
+            reduced["start"].append(period_start)
+            reduced["end"].append(period_end)
+        for key, aggregate in aggregates:
+            column = columns[key]
+            reduced[key] = [
+                aggregate(values)
+                if (values := [v for v in column[begin:end] if v is not None])
+                else None
+                for begin, end in zip(period_starts, period_ends, strict=True)
+            ]
+        for key in last_keys:
+            column = columns[key]
+            reduced[key] = [column[end - 1] for end in period_ends]
+        result[statistic_id] = reduced
+    return result
+
+
+def _change_column(sums: list[float | None], prev_sum: float) -> list[float | None]:
+    """Return the change between each sum and the previous known sum."""
+    changes: list[float | None] = []
+    changes_append = changes.append
+    for _sum in sums:
+        if _sum is None:
+            changes_append(None)
+            continue
+        changes_append(_sum - prev_sum)
+        prev_sum = _sum
+    return changes
+
+
+def statistics_during_period_columns(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str] | None,
+    period: Literal["5minute", "day", "hour", "week", "month"],
+    units: dict[str, str] | None,
+    _types: set[Literal["change", "last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, StatisticsColumns]:
+    """Return statistic data points during UTC period start_time - end_time.
+
+    The same as statistics_during_period, but each statistic id has a list
+    of values per type instead of a list of rows.
+    """
+    with session_scope(hass=hass, read_only=True) as session:
+        metadata = get_instance(hass).statistics_meta_manager.get_many(
+            session, statistic_ids=statistic_ids
+        )
+        if not metadata:
+            return {}
+        types = _get_column_types(_types)
+        metadata_ids = _extract_metadata_and_discard_impossible_columns(metadata, types)
+        start_time, end_time = _align_start_end_time_to_period(
+            start_time, end_time, period
+        )
+        table: type[Statistics | StatisticsShortTerm] = (
+            Statistics if period != "5minute" else StatisticsShortTerm
+        )
+        stats_table: type[StatisticsBase] = table
+        period_ends: dict[float, float] | None = None
+        if rollups := _statistics_rollups_during_period(
+            hass, session, start_time, end_time, metadata_ids, period, types
+        ):
+            stats_table, stats, period_ends = rollups
+        else:
+            stmt = _generate_statistics_during_period_stmt(
+                start_time, end_time, metadata_ids, table, types
+            )
+            stats = cast(
+                Sequence[Row],
+                execute_stmt_lambda_element(session, stmt, orm_rows=False),
+            )
+        if not stats:
+            return {}
+
+        result = _sorted_statistics_to_columns(
+            hass, stats, metadata, stats_table, units, types
+        )
+        if period_ends is not None:
+            for columns in result.values():
+                # The start of a period is never None
+                columns["end"] = [
+                    period_ends[start] for start in cast(list[float], columns["start"])
+                ]
+        elif period == "day":
+            result = _reduce_statistics_columns(result, *reduce_day_ts_factory(), types)
+        elif period == "week":
+            result = _reduce_statistics_columns(
+                result, *reduce_week_ts_factory(), types
+            )
+        elif period == "month":
+            result = _reduce_statistics_columns(
+                result, *reduce_month_ts_factory(), types
+            )
+
+        if "change" in _types:
+            drop_sum = "sum" not in _types
+            prev_sums = _get_previous_sums(
+                hass, session, start_time, units, table, metadata, result
+            )
+            for statistic_id, columns in result.items():
+                if "sum" not in columns:
+                    continue
+                sums = columns.pop("sum") if drop_sum else columns["sum"]
+                columns["change"] = _change_column(
+                    sums, prev_sums.get(statistic_id) or 0
+                )
+
+    return result
+
+
 def _get_last_statistics_stmt(
     metadata_id: int,
     number_of_stats: int,
@@ -2354,13 +2941,22 @@ def _import_statistics_with_session(
     _, metadata_id = statistics_meta_manager.update_or_add(
         session, metadata, old_metadata_dict
     )
+    start_timestamps: list[float] = []
     for stat in statistics:
+        start_timestamps.append(stat["start"].timestamp())
         if stat_id := _statistics_exists(session, table, metadata_id, stat["start"]):
             _update_statistics(session, table, stat_id, stat)
         else:
             _insert_statistics(session, table, metadata_id, stat)
 
     if table != StatisticsShortTerm:
+        if start_timestamps:
+            update_statistics_rollups(
+                session,
+                {metadata_id},
+                min(start_timestamps),
+                max(start_timestamps) + table.duration.total_seconds(),
+            )
         return True
 
     # We just inserted new short term statistics, so we need to update the
@@ -2381,6 +2977,14 @@ def get_short_term_statistics_run_cache(
     return ShortTermStatisticsRunCache()
 
 
+@singleton(DATA_HOURLY_STATISTICS_ACCUMULATOR)
+def get_hourly_statistics_accumulator(
+    hass: HomeAssistant,
+) -> HourlyStatisticsAccumulator:
+    """Get the accumulator of the 5-minute statistics of the current hour."""
+    return HourlyStatisticsAccumulator()
+
+
 def cache_latest_short_term_statistic_id_for_metadata_id(
     run_cache: ShortTermStatisticsRunCache,
     session: Session,
@@ -2439,6 +3043,8 @@ def import_statistics(
     table: type[StatisticsBase],
 ) -> bool:
     """Process an import_statistics job."""
+    if table == StatisticsShortTerm:
+        get_hourly_statistics_accumulator(instance.hass).reset()
 
     with session_scope(
         session=instance.get_session(),
@@ -2460,6 +3066,7 @@ def adjust_statistics(
     adjustment_unit: str,
 ) -> bool:
     """Process an add_statistics job."""
+    get_hourly_statistics_accumulator(instance.hass).reset()
 
     with session_scope(session=instance.get_session()) as session:
         metadata = instance.statistics_meta_manager.get_many(
@@ -2482,14 +3089,33 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        hour_start = start_time.replace(minute=0)
         _adjust_sum_statistics(
             session,
             Statistics,
             metadata[statistic_id][0],
-            start_time.replace(minute=0),
+            hour_start,
             sum_adjustment,
         )
 
+        # Rollups starting after the adjusted hour are adjusted the same
+        # way, the rollups of the periods of the hour are reduced again
+        for rollup_table in STATISTICS_ROLLUP_TABLES.values():
+            _adjust_sum_statistics(
+                session,
+                rollup_table,
+                metadata[statistic_id][0],
+                hour_start,
+                sum_adjustment,
+            )
+        hour_start_ts = hour_start.timestamp()
+        update_statistics_rollups(
+            session,
+            {metadata[statistic_id][0]},
+            hour_start_ts,
+            hour_start_ts + Statistics.duration.total_seconds(),
+        )
+
     return True
 
 
@@ -2523,6 +3149,7 @@ def change_statistics_unit(
     old_unit: str,
 ) -> None:
     """Change statistics unit for a statistic_id."""
+    get_hourly_statistics_accumulator(instance.hass).reset()
     statistics_meta_manager = instance.statistics_meta_manager
     with session_scope(session=instance.get_session()) as session:
         metadata = statistics_meta_manager.get(session, statistic_id)
@@ -2550,6 +3177,7 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            *STATISTICS_ROLLUP_TABLES.values(),
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
@@ -55,6 +55,19 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_purge_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the current or last purge."""
+    purge_progress = instance.purge_progress
+    if purge_progress.started is None:
+        return {}
+    return {
+        "purge_in_progress": purge_progress.in_progress,
+        "purge_deleted_rows": sum(purge_progress.deleted_rows.values()),
+        "purge_rows_per_second": round(purge_progress.rows_per_second, 1),
+    }
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -72,4 +85,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | _async_get_purge_info(instance)
@@ -2,7 +2,172 @@
 
 from __future__ import annotations
 
-from ..db_schema import States
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import Event, EventStateChangedData
+
+from ..db_schema import StateAttributes, States, StatesMeta
+from ..models import ulid_to_bytes_or_none, uuid_hex_to_bytes_or_none
+
+
+class PendingStatesBatch:
+    """Column-oriented batch of states waiting to be inserted.
+
+    Rows are kept as parallel lists instead of ORM objects so they can
+    be written with a single executemany INSERT ... RETURNING per commit
+    without going through the session's unit of work and identity map.
+
+    Rows that replace another row in the same batch reference it by its
+    row index in old_state_row since the state_id is not known until
+    the earlier row has been inserted.
+    """
+
+    __slots__ = (
+        "state",
+        "last_updated_ts",
+        "last_changed_ts",
+        "last_reported_ts",
+        "origin_idx",
+        "context_id_bin",
+        "context_user_id_bin",
+        "context_parent_id_bin",
+        "metadata_id",
+        "states_meta",
+        "attributes_id",
+        "state_attributes",
+        "old_state_id",
+        "old_state_row",
+        "state_id",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty batch."""
+        self.state: list[str | None] = []
+        self.last_updated_ts: list[float | None] = []
+        self.last_changed_ts: list[float | None] = []
+        self.last_reported_ts: list[float | None] = []
+        self.origin_idx: list[int | None] = []
+        self.context_id_bin: list[bytes | None] = []
+        self.context_user_id_bin: list[bytes | None] = []
+        self.context_parent_id_bin: list[bytes | None] = []
+        self.metadata_id: list[int | None] = []
+        self.states_meta: list[StatesMeta | None] = []
+        self.attributes_id: list[int | None] = []
+        self.state_attributes: list[StateAttributes | None] = []
+        self.old_state_id: list[int | None] = []
+        self.old_state_row: list[int | None] = []
+        self.state_id: list[int | None] = []
+
+    def __len__(self) -> int:
+        """Return the number of rows in the batch."""
+        return len(self.state)
+
+    def append_from_event(
+        self,
+        event: Event[EventStateChangedData],
+        metadata_id: int | None,
+        states_meta: StatesMeta | None,
+        attributes_id: int | None,
+        state_attributes: StateAttributes | None,
+        old_state_id: int | None,
+        old_state_row: int | None,
+    ) -> int:
+        """Append a row from a state_changed event and return its row index.
+
+        The column values mirror States.from_event.
+        """
+        state = event.data["new_state"]
+        # None state means the state was removed from the state machine
+        if state is None:
+            self.state.append(None)
+            self.last_updated_ts.append(event.time_fired_timestamp)
+            self.last_changed_ts.append(None)
+            self.last_reported_ts.append(None)
+        else:
+            self.state.append(state.state)
+            self.last_updated_ts.append(state.last_updated_timestamp)
+            self.last_changed_ts.append(
+                None
+                if state.last_updated == state.last_changed
+                else state.last_changed_timestamp
+            )
+            self.last_reported_ts.append(
+                None
+                if state.last_updated == state.last_reported
+                else state.last_reported_timestamp
+            )
+        context = event.context
+        self.origin_idx.append(event.origin.idx)
+        self.context_id_bin.append(ulid_to_bytes_or_none(context.id))
+        self.context_user_id_bin.append(uuid_hex_to_bytes_or_none(context.user_id))
+        self.context_parent_id_bin.append(ulid_to_bytes_or_none(context.parent_id))
+        self.metadata_id.append(metadata_id)
+        self.states_meta.append(states_meta)
+        self.attributes_id.append(attributes_id)
+        self.state_attributes.append(state_attributes)
+        self.old_state_id.append(old_state_id)
+        self.old_state_row.append(old_state_row)
+        self.state_id.append(None)
+        return len(self.state) - 1
+
+    def insert(self, session: Session) -> None:
+        """Insert all rows in the batch and record the assigned state_ids.
+
+        Any pending StatesMeta and StateAttributes rows are flushed first
+        so their ids can be resolved. Rows are inserted in generations
+        where generation N holds the N-th row for each entity in this
+        batch so each row can reference the state_id of the row it
+        replaced.
+        """
+        session.flush()
+        metadata_ids = self.metadata_id
+        attributes_ids = self.attributes_id
+        for row, states_meta in enumerate(self.states_meta):
+            if states_meta is not None:
+                metadata_ids[row] = states_meta.metadata_id
+        for row, state_attributes in enumerate(self.state_attributes):
+            if state_attributes is not None:
+                attributes_ids[row] = state_attributes.attributes_id
+
+        generations: list[list[int]] = []
+        generation_of_row: list[int] = []
+        for row, old_state_row in enumerate(self.old_state_row):
+            generation = (
+                0 if old_state_row is None else generation_of_row[old_state_row] + 1
+            )
+            generation_of_row.append(generation)
+            if generation == len(generations):
+                generations.append([])
+            generations[generation].append(row)
+
+        stmt = insert(States).returning(States.state_id, sort_by_parameter_order=True)
+        state_ids = self.state_id
+        old_state_ids = self.old_state_id
+        for rows in generations:
+            params = []
+            for row in rows:
+                if (old_state_row := self.old_state_row[row]) is not None:
+                    old_state_ids[row] = state_ids[old_state_row]
+                params.append(
+                    {
+                        "state": self.state[row],
+                        "last_updated_ts": self.last_updated_ts[row],
+                        "last_changed_ts": self.last_changed_ts[row],
+                        "last_reported_ts": self.last_reported_ts[row],
+                        "origin_idx": self.origin_idx[row],
+                        "context_id_bin": self.context_id_bin[row],
+                        "context_user_id_bin": self.context_user_id_bin[row],
+                        "context_parent_id_bin": self.context_parent_id_bin[row],
+                        "metadata_id": metadata_ids[row],
+                        "attributes_id": attributes_ids[row],
+                        "old_state_id": old_state_ids[row],
+                    }
+                )
+            for row, state_id in zip(
+                rows, session.execute(stmt, params).scalars(), strict=True
+            ):
+                state_ids[row] = state_id
 
 
 class StatesManager:
@@ -11,6 +176,8 @@ class StatesManager:
     def __init__(self) -> None:
         """Initialize the states manager for linking old_state_id."""
         self._pending: dict[str, States] = {}
+        self._pending_rows: dict[str, int] = {}
+        self.pending_batch = PendingStatesBatch()
         self._last_committed_id: dict[str, int] = {}
         self._last_reported: dict[int, float] = {}
 
@@ -24,6 +191,14 @@ class StatesManager:
         """
         return self._pending.pop(entity_id, None)
 
+    def pop_pending_row(self, entity_id: str) -> int | None:
+        """Pop the row index of a pending state in the pending batch.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        return self._pending_rows.pop(entity_id, None)
+
     def pop_committed(self, entity_id: str) -> int | None:
         """Pop a committed state.
 
@@ -35,6 +210,14 @@ class StatesManager:
         """
         return self._last_committed_id.pop(entity_id, None)
 
+    def get_committed_state_ids(self) -> set[int]:
+        """Return the state ids of the committed states.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        return set(self._last_committed_id.values())
+
     def add_pending(self, entity_id: str, state: States) -> None:
         """Add a pending state.
 
@@ -45,6 +228,14 @@ class StatesManager:
         """
         self._pending[entity_id] = state
 
+    def add_pending_row(self, entity_id: str, row: int) -> None:
+        """Add the row index of a pending state in the pending batch.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_rows[entity_id] = row
+
     def update_pending_last_reported(
         self, state_id: int, last_reported_timestamp: float
     ) -> None:
@@ -63,7 +254,12 @@ class StatesManager:
         """
         for entity_id, db_states in self._pending.items():
             self._last_committed_id[entity_id] = db_states.state_id
+        state_ids = self.pending_batch.state_id
+        for entity_id, row in self._pending_rows.items():
+            self._last_committed_id[entity_id] = state_ids[row]  # type: ignore[assignment]
         self._pending.clear()
+        self._pending_rows.clear()
+        self.pending_batch = PendingStatesBatch()
         self._last_reported.clear()
 
     def reset(self) -> None:
@@ -74,6 +270,8 @@ class StatesManager:
         """
         self._last_committed_id.clear()
         self._pending.clear()
+        self._pending_rows.clear()
+        self.pending_batch = PendingStatesBatch()
 
     def evict_purged_state_ids(self, purged_state_ids: set[int]) -> None:
         """Evict purged states from the committed states.
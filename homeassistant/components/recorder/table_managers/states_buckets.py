@@ -0,0 +1,249 @@
+"""Support managing StatesBuckets."""
+
+from __future__ import annotations
+
+from itertools import chain
+from math import isfinite
+from typing import TYPE_CHECKING, cast
+
+from sqlalchemy import Table, bindparam, insert, select, update
+from sqlalchemy.orm.session import Session
+
+from ..const import STATES_BUCKET_SECONDS
+from ..db_schema import StatesBuckets, StatesMeta
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+
+class PendingStatesBucket:
+    """A states bucket that is being accumulated in memory."""
+
+    __slots__ = (
+        "metadata_id",
+        "states_meta",
+        "bucket_start_ts",
+        "count",
+        "first_state",
+        "last_state",
+        "last_ts",
+        "min",
+        "max",
+        "in_db",
+        "dirty",
+    )
+
+    def __init__(
+        self,
+        metadata_id: int | None,
+        states_meta: StatesMeta | None,
+        bucket_start_ts: float,
+    ) -> None:
+        """Initialize an empty bucket."""
+        self.metadata_id = metadata_id
+        self.states_meta = states_meta
+        self.bucket_start_ts = bucket_start_ts
+        self.count = 0
+        self.first_state: str | None = None
+        self.last_state: str | None = None
+        self.last_ts: float | None = None
+        self.min: float | None = None
+        self.max: float | None = None
+        self.in_db = False
+        self.dirty = False
+
+    def add(self, state: str, timestamp: float) -> None:
+        """Add a state to the bucket."""
+        if not self.count:
+            self.first_state = state
+        self.count += 1
+        self.last_state = state
+        self.last_ts = timestamp
+        self.dirty = True
+        try:
+            value = float(state)
+        except ValueError:
+            return
+        if not isfinite(value):
+            return
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def as_params(self) -> dict[str, float | int | str | None]:
+        """Return the bucket as statement parameters."""
+        return {
+            "b_metadata_id": self.metadata_id,
+            "b_bucket_start_ts": self.bucket_start_ts,
+            "count": self.count,
+            "first_state": self.first_state,
+            "last_state": self.last_state,
+            "last_ts": self.last_ts,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+# Core statements on the table so they are executed as
+# executemany instead of ORM bulk operations
+_STATES_BUCKETS_TABLE = cast(Table, StatesBuckets.__table__)
+_INSERT_BUCKET = insert(_STATES_BUCKETS_TABLE).values(
+    metadata_id=bindparam("b_metadata_id"),
+    bucket_start_ts=bindparam("b_bucket_start_ts"),
+)
+_UPDATE_BUCKET = (
+    update(_STATES_BUCKETS_TABLE)
+    .where(_STATES_BUCKETS_TABLE.c.metadata_id == bindparam("b_metadata_id"))
+    .where(_STATES_BUCKETS_TABLE.c.bucket_start_ts == bindparam("b_bucket_start_ts"))
+)
+
+
+class StatesBucketsManager:
+    """Manage the StatesBuckets table.
+
+    The bucket each entity is currently writing to is kept in memory and
+    only written to the database when the session is committed, so the
+    summaries are maintained without reading back the states.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the states buckets manager."""
+        self.recorder = recorder
+        self._current: dict[str, PendingStatesBucket] = {}
+        self._pending: list[PendingStatesBucket] = []
+
+    def add_state(
+        self,
+        entity_id: str,
+        metadata_id: int | None,
+        states_meta: StatesMeta | None,
+        state: str,
+        timestamp: float,
+        session: Session,
+    ) -> None:
+        """Add a state to the bucket for its entity.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        bucket_start_ts = timestamp - timestamp % STATES_BUCKET_SECONDS
+        if (bucket := self._current.get(entity_id)) is None or (
+            metadata_id is not None and bucket.metadata_id != metadata_id
+        ):
+            # First state since the recorder started, the bucket was
+            # purged, or the entity_id was renamed. The bucket may
+            # already exist in the database.
+            if bucket is not None and bucket.dirty:
+                self._pending.append(bucket)
+            bucket = PendingStatesBucket(metadata_id, states_meta, bucket_start_ts)
+            if metadata_id is not None:
+                self._load_from_db(bucket, session)
+            self._current[entity_id] = bucket
+        elif bucket.bucket_start_ts != bucket_start_ts:
+            if bucket_start_ts < bucket.bucket_start_ts:
+                # States that are older than the current bucket
+                # are not summarized
+                return
+            if bucket.dirty:
+                self._pending.append(bucket)
+            bucket = PendingStatesBucket(
+                bucket.metadata_id, bucket.states_meta, bucket_start_ts
+            )
+            self._current[entity_id] = bucket
+        bucket.add(state, timestamp)
+
+    def _load_from_db(self, bucket: PendingStatesBucket, session: Session) -> None:
+        """Load a bucket that was written before the recorder restarted."""
+        with session.no_autoflush:
+            row = session.execute(
+                select(
+                    StatesBuckets.count,
+                    StatesBuckets.first_state,
+                    StatesBuckets.last_state,
+                    StatesBuckets.last_ts,
+                    StatesBuckets.min,
+                    StatesBuckets.max,
+                )
+                .where(StatesBuckets.metadata_id == bucket.metadata_id)
+                .where(StatesBuckets.bucket_start_ts == bucket.bucket_start_ts)
+            ).first()
+        if row is None:
+            return
+        (
+            bucket.count,
+            bucket.first_state,
+            bucket.last_state,
+            bucket.last_ts,
+            bucket.min,
+            bucket.max,
+        ) = row
+        bucket.in_db = True
+
+    def write_pending(self, session: Session) -> None:
+        """Write the buckets that changed since the last commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        inserts: list[dict[str, float | int | str | None]] = []
+        updates: list[dict[str, float | int | str | None]] = []
+        buckets = [
+            bucket
+            for bucket in chain(self._pending, self._current.values())
+            if bucket.dirty
+        ]
+        if any(bucket.metadata_id is None for bucket in buckets):
+            # Flush the new states meta rows to get their metadata_id
+            session.flush()
+        for bucket in buckets:
+            if bucket.metadata_id is None:
+                assert bucket.states_meta is not None
+                bucket.metadata_id = bucket.states_meta.metadata_id
+                bucket.states_meta = None
+            if bucket.in_db:
+                updates.append(bucket.as_params())
+            else:
+                inserts.append(bucket.as_params())
+        if inserts:
+            session.execute(_INSERT_BUCKET, inserts)
+        if updates:
+            session.execute(_UPDATE_BUCKET, updates)
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to mark the written buckets as stored.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        for bucket in self._current.values():
+            if bucket.dirty:
+                bucket.in_db = True
+                bucket.dirty = False
+        self._pending.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._current.clear()
+        self._pending.clear()
+
+    def evict_purged(self, purge_before_ts: float) -> None:
+        """Evict buckets that ended before the purge point.
+
+        The next state for the entity starts a new bucket instead of
+        updating a row that no longer exists.
+        """
+        self._current = {
+            entity_id: bucket
+            for entity_id, bucket in self._current.items()
+            if bucket.bucket_start_ts + STATES_BUCKET_SECONDS > purge_before_ts
+        }
+
+    def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
+        """Evict the buckets of purged entity_ids."""
+        for entity_id in purged_entity_ids:
+            self._current.pop(entity_id, None)
@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 import threading
+import time
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.helpers.typing import UndefinedType
@@ -111,9 +112,19 @@ class PurgeTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
-        if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
-        ):
+        purge_progress = instance.purge_progress
+        purge_progress.start(self.purge_before)
+        start = time.monotonic()
+        finished = purge.purge_old_data(
+            instance,
+            self.purge_before,
+            self.repack,
+            self.apply_filter,
+            events_batch_size=purge_progress.events_batch_size,
+            states_batch_size=purge_progress.states_batch_size,
+        )
+        delay = purge_progress.end_cycle(time.monotonic() - start, finished)
+        if finished:
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
             # We always need to do the db cleanups after a purge
@@ -122,9 +133,11 @@ class PurgeTask(RecorderTask):
             periodic_db_cleanups(instance)
             return
         # Schedule a new purge task if this one didn't finish
-        instance.queue_task(
-            PurgeTask(self.purge_before, self.repack, self.apply_filter)
-        )
+        task = PurgeTask(self.purge_before, self.repack, self.apply_filter)
+        if delay:
+            instance.queue_purge_task_later(task, delay)
+        else:
+            instance.queue_task(task)
 
 
 @dataclass(slots=True)
@@ -358,6 +371,15 @@ class AdjustLRUSizeTask(RecorderTask):
         instance._adjust_lru_size()  # noqa: SLF001
 
 
+@dataclass(slots=True)
+class ReplaySpoolTask(RecorderTask):
+    """An object to insert into the recorder queue to record spooled events."""
+
+    def run(self, instance: Recorder) -> None:
+        """Record the spooled events."""
+        instance._replay_spool()  # noqa: SLF001
+
+
 @dataclass(slots=True)
 class EntityIDPostMigrationTask(RecorderTask):
     """An object to insert into the recorder queue to cleanup after entity_ids migration."""
@@ -57,6 +57,7 @@ from .models import (
     UnsupportedDialect,
     process_timestamp,
 )
+from .partition import add_partitions
 
 if TYPE_CHECKING:
     from sqlite3.dbapi2 import Cursor as SQLiteCursor
@@ -732,6 +733,14 @@ def periodic_db_cleanups(instance: Recorder) -> None:
         with instance.engine.connect() as connection:
             connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE);"))
             connection.execute(text("PRAGMA OPTIMIZE;"))
+    if instance.partitioned_tables:
+        # Make sure the partitions for the coming days exist
+        add_partitions(
+            instance.engine,
+            instance.dialect_name,
+            instance.partitioned_tables,
+            dt_util.utcnow(),
+        )
 
 
 @contextmanager
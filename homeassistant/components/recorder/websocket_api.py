@@ -41,7 +41,7 @@ from .statistics import (
     async_list_statistic_ids,
     list_statistic_ids,
     statistic_during_period,
-    statistics_during_period,
+    statistics_during_period_columns,
     validate_statistics,
 )
 from .util import PERIOD_SCHEMA, get_instance, resolve_period
@@ -79,6 +79,7 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_get_statistics_metadata)
     websocket_api.async_register_command(hass, ws_list_statistic_ids)
     websocket_api.async_register_command(hass, ws_import_statistics)
+    websocket_api.async_register_command(hass, ws_subscribe_purge_progress)
     websocket_api.async_register_command(hass, ws_update_statistics_metadata)
     websocket_api.async_register_command(hass, ws_validate_statistics)
 
@@ -145,29 +146,44 @@ def _ws_get_statistics_during_period(
     msg_id: int,
     start_time: dt,
     end_time: dt | None,
-    statistic_ids: set[str] | None,
+    statistic_ids: list[str],
     period: Literal["5minute", "day", "hour", "week", "month"],
     units: dict[str, str],
     types: set[Literal["change", "last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> bytes:
-    """Fetch statistics and convert them to json in the executor."""
-    result = statistics_during_period(
+    """Fetch statistics and convert them to json in the executor.
+
+    The statistics are returned in the order of statistic_ids.
+    """
+    result = statistics_during_period_columns(
         hass,
         start_time,
         end_time,
-        statistic_ids,
+        set(statistic_ids),
         period,
         units,
         types,
     )
-    include_last_reset = "last_reset" in types
-    for statistic_rows in result.values():
-        for row in statistic_rows:
-            row["start"] = int(row["start"] * 1000)
-            row["end"] = int(row["end"] * 1000)
-            if include_last_reset and (last_reset := row["last_reset"]) is not None:
-                row["last_reset"] = int(last_reset * 1000)
-    return json_bytes(messages.result_message(msg_id, result))
+    rows: dict[str, list[dict[str, Any]]] = {}
+    for statistic_id in statistic_ids:
+        if (columns := result.get(statistic_id)) is None or statistic_id in rows:
+            continue
+        # The start and end of a period are never None
+        columns["start"] = [
+            int(start * 1000) for start in cast(list[float], columns["start"])
+        ]
+        columns["end"] = [int(end * 1000) for end in cast(list[float], columns["end"])]
+        if "last_reset" in columns:
+            columns["last_reset"] = [
+                None if last_reset is None else int(last_reset * 1000)
+                for last_reset in columns["last_reset"]
+            ]
+        keys = tuple(columns)
+        rows[statistic_id] = [
+            dict(zip(keys, values, strict=True))
+            for values in zip(*columns.values(), strict=True)
+        ]
+    return json_bytes(messages.result_message(msg_id, rows))
 
 
 async def ws_handle_get_statistics_during_period(
@@ -201,7 +217,7 @@ async def ws_handle_get_statistics_during_period(
             msg["id"],
             start_time,
             end_time,
-            set(msg["statistic_ids"]),
+            msg["statistic_ids"],
             msg.get("period"),
             msg.get("units"),
             types,
@@ -291,6 +307,31 @@ async def ws_validate_statistics(
     connection.send_result(msg["id"], statistic_ids)
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "recorder/subscribe_purge_progress",
+    }
+)
+@callback
+def ws_subscribe_purge_progress(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Subscribe to the progress of purging old data."""
+    purge_progress = get_instance(hass).purge_progress
+    msg_id: int = msg["id"]
+
+    @callback
+    def _async_send_progress(progress: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg_id, progress))
+
+    connection.subscriptions[msg_id] = purge_progress.async_subscribe(
+        _async_send_progress
+    )
+    connection.send_result(msg_id)
+    _async_send_progress(purge_progress.as_dict())
+
+
 @websocket_api.require_admin
 @websocket_api.websocket_command(
     {
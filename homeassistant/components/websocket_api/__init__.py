@@ -69,6 +69,7 @@ def async_register_command(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Initialize the websocket API."""
+    hass.data[const.DATA_STATS] = http.WebSocketStats()
     hass.http.register_view(http.WebsocketAPIView())
     commands.async_register_commands(hass, async_register_command)
     return True
@@ -60,6 +60,7 @@ from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
 from .connection import ActiveConnection
+from .entity_subscriptions import EntitySubscription, async_get_entity_subscription_hub
 from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
@@ -363,58 +364,55 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str],
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if entity_ids and entity_id not in entity_ids:
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
-
-
 @callback
 @decorators.websocket_command(
     {
         vol.Required("type"): "subscribe_entities",
         vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("resumable", default=False): bool,
+        vol.Optional("resume"): {
+            vol.Required("stream_id"): str,
+            vol.Required("seq"): vol.All(int, vol.Range(min=0)),
+        },
     }
 )
 def handle_subscribe_entities(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
-    """Handle subscribe entities command."""
+    """Handle subscribe entities command.
+
+    Resumable subscriptions number the state changes. A client that
+    reconnects can resume from the last number it received and is only
+    sent the state changes it missed while they are still buffered.
+    """
     entity_ids = set(msg.get("entity_ids", []))
+    resume: dict[str, Any] | None = msg.get("resume")
+    resumable = msg["resumable"] or resume is not None
+    hub = async_get_entity_subscription_hub(hass)
+    subscription = EntitySubscription(connection, msg["id"], entity_ids, resumable)
+    connection.subscriptions[msg["id"]] = hub.async_subscribe(subscription)
+    resume_seq: int | None = None
+    if resume is not None and hub.async_can_resume(resume["stream_id"], resume["seq"]):
+        resume_seq = resume["seq"]
+    if not resumable:
+        connection.send_result(msg["id"])
+    else:
+        connection.send_result(
+            msg["id"],
+            {
+                "stream_id": hub.stream_id,
+                "seq": hub.seq,
+                "resumed": resume_seq is not None,
+            },
+        )
+    if resume_seq is not None:
+        hub.async_replay(subscription, resume_seq)
+        return
+
     # We must never await between sending the states and listening for
     # state changed events or we will introduce a race condition
     # where some states are missed
     states = _async_get_allowed_states(hass, connection)
-    message_id_as_bytes = str(msg["id"]).encode()
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
-            entity_ids,
-            connection.user,
-            message_id_as_bytes,
-        ),
-    )
-    connection.send_result(msg["id"])
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
@@ -30,6 +30,11 @@ type MessageHandler = Callable[[HomeAssistant, ActiveConnection, dict[str, Any]]
 type BinaryHandler = Callable[[HomeAssistant, ActiveConnection, bytes], None]
 
 
+def _never_coalesce(key: Hashable, build: Callable[..., bytes], *args: Any) -> bool:
+    """Return False to send every message."""
+    return False
+
+
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
@@ -42,6 +47,8 @@ class ActiveConnection:
         "subscriptions",
         "last_id",
         "can_coalesce",
+        "can_deflate",
+        "coalesce_message",
         "supported_features",
         "handlers",
         "binary_handlers",
@@ -54,16 +61,22 @@ class ActiveConnection:
         send_message: Callable[[bytes | str | dict[str, Any]], None],
         user: User,
         refresh_token: RefreshToken,
+        coalesce_message: Callable[..., bool] | None = None,
     ) -> None:
         """Initialize an active connection."""
         self.logger = logger
         self.hass = hass
         self.send_message = send_message
+        # coalesce_message(key, build, *args) replaces the pending message of
+        # the key with build(*args) when the client is lagging, it returns
+        # False when the message should be sent with send_message instead.
+        self.coalesce_message = coalesce_message or _never_coalesce
         self.user = user
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
         self.can_coalesce = False
+        self.can_deflate = False
         self.supported_features: dict[str, float] = {}
         self.handlers: dict[str, tuple[MessageHandler, vol.Schema | Literal[False]]] = (
             self.hass.data[const.DOMAIN]
@@ -79,6 +92,9 @@ class ActiveConnection:
         """Set supported features."""
         self.supported_features = features
         self.can_coalesce = const.FEATURE_COALESCE_MESSAGES in features
+        self.can_deflate = (
+            features.get(const.FEATURE_DEFLATE_MESSAGES) == const.DEFLATE_VERSION
+        )
 
     def get_description(self, request: web.Request | None) -> str:
         """Return a description of the connection."""
@@ -6,9 +6,11 @@ from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.core import HomeAssistant
+from homeassistant.util.hass_dict import HassKey
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection
+    from .http import WebSocketStats
 
 
 type WebSocketCommandHandler = Callable[
@@ -56,5 +58,26 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
+# Data used to store the statistics of the connections
+DATA_STATS: HassKey[WebSocketStats] = HassKey(f"{DOMAIN}.stats")
 
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+# Send the outgoing messages deflated with the preset dictionary of the
+# version in binary frames. Clients inflate the frames with one raw deflate
+# stream, the compression context is kept between messages.
+FEATURE_DEFLATE_MESSAGES = "deflate_messages"
+DEFLATE_VERSION: Final = 1
+# The strings that repeat in the messages, the most common come last
+DEFLATE_DICTIONARY: Final = (
+    b'"supported_color_modes":["brightness","color_temp","hs","xy"],'
+    b'"state_class":"measurement","total_increasing","total",'
+    b'"entity_picture":"icon":"mdi:","attribution":"assumed_state":true,'
+    b'"restored":true,"editable":false,"supported_features":0,'
+    b'"device_class":"unit_of_measurement":"friendly_name":'
+    b'"unavailable","unknown","off","on",'
+    b'{"id":1,"type":"result","success":true,"result":null}'
+    b'{"id":1,"type":"event","event":{"a":{"sensor.":{"s":"a":{'
+    b'"c":"lc":"lu":{"id":1,"type":"event","event":{"c":{"sensor.":{"+":{"s":"lc":'
+)
+# Messages larger than this are deflated in the executor
+DEFLATE_MAX_SYNC_SIZE: Final = 64 * 1024
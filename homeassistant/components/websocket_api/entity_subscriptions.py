@@ -0,0 +1,307 @@
+"""Fan out the state changes to the entity subscriptions of the connections."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HassJob,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.ulid import ulid_now
+
+from . import messages
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .connection import ActiveConnection
+
+DATA_ENTITY_SUBSCRIPTIONS: HassKey[EntitySubscriptionHub] = HassKey(
+    f"{DOMAIN}.entity_subscriptions"
+)
+
+# Number of state changes kept to resume the subscriptions of clients
+# that reconnect without sending them the states of all entities again
+STATE_CHANGED_BUFFER_SIZE = 4096
+# Seconds the state changes are still buffered after the last
+# resumable subscription is removed, for its client to reconnect
+RESUME_WINDOW = 300
+
+
+class EntitySubscription:
+    """A subscribe_entities subscription of a connection."""
+
+    __slots__ = (
+        "coalesce_message",
+        "entity_ids",
+        "resumable",
+        "send_message",
+        "suffix",
+        "user",
+    )
+
+    def __init__(
+        self,
+        connection: ActiveConnection,
+        message_id: int,
+        entity_ids: set[str],
+        resumable: bool = False,
+    ) -> None:
+        """Initialize the subscription."""
+        self.send_message = connection.send_message
+        self.coalesce_message = connection.coalesce_message
+        self.user = connection.user
+        self.entity_ids = entity_ids
+        self.resumable = resumable
+        self.suffix = b"".join((b',"id":', str(message_id).encode(), b"}"))
+
+    def send_state_changed(
+        self, event: Event[EventStateChangedData], prefix: bytes, seq_bytes: bytes
+    ) -> None:
+        """Send a state diff message.
+
+        When the client is lagging the diffs of an entity are coalesced
+        into a message with the latest state of the entity.
+        """
+        if not self.coalesce_message(
+            (self.suffix, event.data["entity_id"]),
+            self._latest_state_message,
+            event,
+            seq_bytes,
+        ):
+            self.send_message(self._message(prefix, seq_bytes))
+
+    def _message(self, prefix: bytes, seq_bytes: bytes) -> bytes:
+        """Complete a message, with its sequence number when resumable."""
+        if self.resumable:
+            return b"".join((prefix, b',"seq":', seq_bytes, self.suffix))
+        return prefix + self.suffix
+
+    def _latest_state_message(
+        self, event: Event[EventStateChangedData], seq_bytes: bytes
+    ) -> bytes:
+        """Return a message replacing the state of the entity with the new state."""
+        if (new_state := event.data["new_state"]) is None:
+            entity_event = b"".join(
+                (b'{"r":[', json_bytes(event.data["entity_id"]), b"]}")
+            )
+        else:
+            try:
+                entity_event = b"".join(
+                    (b'{"a":{', new_state.as_compressed_state_json, b"}}")
+                )
+            except (ValueError, TypeError):
+                return self._message(
+                    messages.state_diff_message_prefix(event), seq_bytes
+                )
+        return self._message(b'{"type":"event","event":' + entity_event, seq_bytes)
+
+
+class EntitySubscriptionHub:
+    """Forward the state changes to all entity subscriptions.
+
+    A single state_changed listener serializes the state diff of an
+    event once and completes it with the id of every subscription
+    interested in the entity. The subscriptions are indexed by entity_id
+    so the cost of an event grows with the matching subscriptions
+    instead of all connections, and the read permission is checked once
+    per user instead of once per subscription.
+
+    The state changes are numbered and the most recent ones are kept in
+    a ring buffer so a client that reconnects can resume its subscription
+    from the last sequence number it received. The buffer is only filled
+    while there are resumable subscriptions and during the resume window
+    after the last one is removed. The listener is removed once there are
+    no subscriptions left to forward to or buffer for.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_by_entity_id",
+        "_cancel_resume_window",
+        "_hass",
+        "_resumable",
+        "_resume_window_job",
+        "_seq",
+        "_unfiltered",
+        "_unsub_state_changed",
+        "stream_id",
+    )
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self._hass = hass
+        self._unfiltered: dict[EntitySubscription, None] = {}
+        self._by_entity_id: dict[str, dict[EntitySubscription, None]] = {}
+        # The sequence numbers are only valid for the stream they were sent on
+        self.stream_id = ulid_now()
+        self._seq = 0
+        self._buffer: deque[tuple[int, Event[EventStateChangedData]]] = deque(
+            maxlen=STATE_CHANGED_BUFFER_SIZE
+        )
+        self._resumable = 0
+        self._resume_window_job = HassJob(
+            self._async_resume_window_expired,
+            "entity subscriptions resume window",
+            cancel_on_shutdown=True,
+        )
+        self._cancel_resume_window: CALLBACK_TYPE | None = None
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+
+    @property
+    def seq(self) -> int:
+        """Return the sequence number of the last state change."""
+        return self._seq
+
+    @callback
+    def async_subscribe(self, subscription: EntitySubscription) -> CALLBACK_TYPE:
+        """Add a subscription and return a callback to remove it."""
+        if subscription.entity_ids:
+            by_entity_id = self._by_entity_id
+            for entity_id in subscription.entity_ids:
+                if (subscriptions := by_entity_id.get(entity_id)) is None:
+                    subscriptions = by_entity_id[entity_id] = {}
+                subscriptions[subscription] = None
+        else:
+            self._unfiltered[subscription] = None
+        if subscription.resumable:
+            self._resumable += 1
+            if self._cancel_resume_window is not None:
+                self._cancel_resume_window()
+                self._cancel_resume_window = None
+        if self._unsub_state_changed is None:
+            self._unsub_state_changed = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_forward_state_changed
+            )
+        return callback(lambda: self._async_unsubscribe(subscription))
+
+    @callback
+    def _async_unsubscribe(self, subscription: EntitySubscription) -> None:
+        """Remove a subscription."""
+        if subscription.entity_ids:
+            by_entity_id = self._by_entity_id
+            for entity_id in subscription.entity_ids:
+                subscriptions = by_entity_id[entity_id]
+                del subscriptions[subscription]
+                if not subscriptions:
+                    del by_entity_id[entity_id]
+        else:
+            del self._unfiltered[subscription]
+        if subscription.resumable:
+            self._resumable -= 1
+            if not self._resumable:
+                self._cancel_resume_window = async_call_later(
+                    self._hass, RESUME_WINDOW, self._resume_window_job
+                )
+                return
+        self._async_stop_if_unused()
+
+    @callback
+    def _async_resume_window_expired(self, _now: datetime) -> None:
+        """Stop buffering when no client resumed within the resume window."""
+        self._cancel_resume_window = None
+        self._buffer.clear()
+        # The state changes are no longer buffered or numbered without
+        # gaps, so the sequence numbers sent before can not be resumed
+        self.stream_id = ulid_now()
+        self._async_stop_if_unused()
+
+    @callback
+    def _async_stop_if_unused(self) -> None:
+        """Remove the listener when there is nothing to forward or buffer."""
+        if (
+            self._unfiltered
+            or self._by_entity_id
+            or self._cancel_resume_window is not None
+            or self._unsub_state_changed is None
+        ):
+            return
+        self._unsub_state_changed()
+        self._unsub_state_changed = None
+
+    @callback
+    def async_can_resume(self, stream_id: str, seq: int) -> bool:
+        """Return if the state changes after seq are still buffered."""
+        buffer = self._buffer
+        first_seq = buffer[0][0] if buffer else self._seq + 1
+        return stream_id == self.stream_id and first_seq - 1 <= seq <= self._seq
+
+    @callback
+    def async_replay(self, subscription: EntitySubscription, seq: int) -> None:
+        """Send the buffered state changes after seq to a subscription."""
+        entity_ids = subscription.entity_ids
+        allowed_by_entity_id: dict[str, bool] = {}
+        for event_seq, event in self._buffer:
+            if event_seq <= seq:
+                continue
+            entity_id = event.data["entity_id"]
+            if entity_ids and entity_id not in entity_ids:
+                continue
+            if (allowed := allowed_by_entity_id.get(entity_id)) is None:
+                allowed = allowed_by_entity_id[entity_id] = _async_can_read(
+                    subscription.user, entity_id
+                )
+            if allowed:
+                subscription.send_state_changed(
+                    event,
+                    messages.state_diff_message_prefix(event),
+                    str(event_seq).encode(),
+                )
+
+    @callback
+    def _async_forward_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Forward a state change to the interested subscriptions."""
+        self._seq += 1
+        if self._resumable or self._cancel_resume_window is not None:
+            self._buffer.append((self._seq, event))
+        entity_id = event.data["entity_id"]
+        subscriptions: Iterable[EntitySubscription]
+        if (filtered := self._by_entity_id.get(entity_id)) is None:
+            if not self._unfiltered:
+                return
+            subscriptions = list(self._unfiltered)
+        else:
+            subscriptions = [*self._unfiltered, *filtered]
+        prefix = messages.state_diff_message_prefix(event)
+        seq_bytes = str(self._seq).encode()
+        allowed_by_user_id: dict[str, bool] = {}
+        for subscription in subscriptions:
+            user = subscription.user
+            if (allowed := allowed_by_user_id.get(user.id)) is None:
+                allowed = allowed_by_user_id[user.id] = _async_can_read(user, entity_id)
+            if allowed:
+                subscription.send_state_changed(event, prefix, seq_bytes)
+
+
+@callback
+def _async_can_read(user: User, entity_id: str) -> bool:
+    """Return if the user can read the entity."""
+    # We have to lookup the permissions again because the user
+    # might have changed since the subscription was created.
+    permissions = user.permissions
+    return (
+        user.is_admin
+        or permissions.access_all_entities(POLICY_READ)
+        or permissions.check_entity(entity_id, POLICY_READ)
+    )
+
+
+@callback
+def async_get_entity_subscription_hub(hass: HomeAssistant) -> EntitySubscriptionHub:
+    """Return the entity subscription hub."""
+    if (hub := hass.data.get(DATA_ENTITY_SUBSCRIPTIONS)) is None:
+        hub = hass.data[DATA_ENTITY_SUBSCRIPTIONS] = EntitySubscriptionHub(hass)
+    return hub
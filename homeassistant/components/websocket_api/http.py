@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import asyncio
 from collections import deque
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Hashable
 import datetime as dt
 from functools import partial
 import logging
 from typing import TYPE_CHECKING, Any, Final
+import zlib
 
 from aiohttp import WSMsgType, web
 from aiohttp.http_websocket import WebSocketWriter
@@ -24,6 +25,9 @@ from homeassistant.util.json import json_loads
 from .auth import AUTH_REQUIRED_MESSAGE, AuthPhase
 from .const import (
     DATA_CONNECTIONS,
+    DATA_STATS,
+    DEFLATE_DICTIONARY,
+    DEFLATE_MAX_SYNC_SIZE,
     MAX_PENDING_MSG,
     PENDING_MSG_MAX_FORCE_READY,
     PENDING_MSG_PEAK,
@@ -55,6 +59,47 @@ class WebsocketAPIView(HomeAssistantView):
         return await WebSocketHandler(request.app[KEY_HASS], request).async_handle()
 
 
+class MessageDeflater:
+    """Deflate the outgoing messages of a connection into binary frames.
+
+    The compressor starts with the preset DEFLATE_DICTIONARY and keeps its
+    context between messages, so the keys of the first messages already
+    compress and the later ones compress against the messages before.
+    Every message is sync flushed so the client can inflate it on arrival.
+    """
+
+    __slots__ = ("_compressor", "_hass", "_send_bytes_binary")
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send_bytes_binary: Callable[[bytes], Coroutine[Any, Any, None]],
+    ) -> None:
+        """Initialize the deflater."""
+        self._hass = hass
+        self._send_bytes_binary = send_bytes_binary
+        self._compressor = zlib.compressobj(
+            wbits=-zlib.MAX_WBITS, zdict=DEFLATE_DICTIONARY
+        )
+
+    def _compress(self, message: bytes) -> bytes:
+        """Compress a message and flush it."""
+        compressor = self._compressor
+        return compressor.compress(message) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    async def async_send(self, message: bytes) -> None:
+        """Compress and send a message."""
+        if len(message) > DEFLATE_MAX_SYNC_SIZE:
+            # The writer sends one message at a time so the
+            # compressor is never used concurrently
+            compressed = await self._hass.async_add_executor_job(
+                self._compress, message
+            )
+        else:
+            compressed = self._compress(message)
+        await self._send_bytes_binary(compressed)
+
+
 class WebSocketAdapter(logging.LoggerAdapter):
     """Add connection id to websocket messages."""
 
@@ -64,6 +109,38 @@ class WebSocketAdapter(logging.LoggerAdapter):
         return f'[{self.extra["connid"]}] {msg}', kwargs
 
 
+class WebSocketStats:
+    """Statistics of the websocket connections."""
+
+    __slots__ = ("coalesced_messages", "handlers", "slow_disconnects")
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.handlers: set[WebSocketHandler] = set()
+        self.coalesced_messages = 0
+        self.slow_disconnects = 0
+
+    @property
+    def max_pending_messages(self) -> int:
+        """Return the most messages pending for a connection."""
+        return max((handler.pending_messages for handler in self.handlers), default=0)
+
+    @property
+    def pending_messages_by_connection(self) -> list[dict[str, Any]]:
+        """Return the messages pending for each connection, most first."""
+        return sorted(
+            (
+                {
+                    "connection": handler.description,
+                    "pending_messages": handler.pending_messages,
+                }
+                for handler in self.handlers
+            ),
+            key=lambda connection: connection["pending_messages"],
+            reverse=True,
+        )
+
+
 class WebSocketHandler:
     """Handle an active websocket client connection."""
 
@@ -80,8 +157,11 @@ class WebSocketHandler:
         "_peak_checker_unsub",
         "_connection",
         "_message_queue",
+        "_coalesced",
         "_ready_future",
         "_release_ready_queue_size",
+        "_stats",
+        "coalesced_messages",
     )
 
     def __init__(self, hass: HomeAssistant, request: web.Request) -> None:
@@ -106,6 +186,15 @@ class WebSocketHandler:
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
 
+        # When the client is lagging, messages which can be coalesced
+        # are kept here by key until the message queue is drained
+        # so only the latest message of every key is sent.
+        self._coalesced: dict[
+            Hashable, tuple[Callable[..., bytes], tuple[Any, ...]]
+        ] = {}
+        self._stats = hass.data[DATA_STATS]
+        self.coalesced_messages = 0
+
     def __repr__(self) -> str:
         """Return the representation."""
         return (
@@ -115,6 +204,11 @@ class WebSocketHandler:
             f"description={self.description}>"
         )
 
+    @property
+    def pending_messages(self) -> int:
+        """Return the number of messages waiting to be sent."""
+        return len(self._message_queue) + len(self._coalesced)
+
     @property
     def description(self) -> str:
         """Return a description of the connection."""
@@ -128,20 +222,32 @@ class WebSocketHandler:
         self,
         connection: ActiveConnection,
         send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]],
+        send_bytes_binary: Callable[[bytes], Coroutine[Any, Any, None]],
     ) -> None:
         """Write outgoing messages."""
         # Variables are set locally to avoid lookups in the loop
         message_queue = self._message_queue
+        coalesced = self._coalesced
         logger = self._logger
         wsock = self._wsock
         loop = self._loop
         is_debug_log_enabled = partial(logger.isEnabledFor, logging.DEBUG)
         debug = logger.debug
         can_coalesce = connection.can_coalesce
+        deflater: MessageDeflater | None = None
+        send_bytes = send_bytes_text
         ready_message_count = len(message_queue)
         # Exceptions if Socket disconnected or cancelled by connection handler
         try:
             while not wsock.closed:
+                if not message_queue and coalesced:
+                    # The client caught up, queue the latest coalesced messages
+                    message_queue.extend(
+                        build(*args) for build, args in coalesced.values()
+                    )
+                    coalesced.clear()
+                    ready_message_count = len(message_queue)
+
                 if not message_queue:
                     self._ready_future = loop.create_future()
                     ready_message_count = await self._ready_future
@@ -153,18 +259,23 @@ class WebSocketHandler:
                     # coalesce may be enabled later in the connection
                     can_coalesce = connection.can_coalesce
 
+                if deflater is None and connection.can_deflate:
+                    # deflate may be enabled later in the connection
+                    deflater = MessageDeflater(self._hass, send_bytes_binary)
+                    send_bytes = deflater.async_send
+
                 if not can_coalesce or ready_message_count == 1:
                     message = message_queue.popleft()
                     if is_debug_log_enabled():
                         debug("%s: Sending %s", self.description, message)
-                    await send_bytes_text(message)
+                    await send_bytes(message)
                     continue
 
                 coalesced_messages = b"".join((b"[", b",".join(message_queue), b"]"))
                 message_queue.clear()
                 if is_debug_log_enabled():
                     debug("%s: Sending %s", self.description, coalesced_messages)
-                await send_bytes_text(coalesced_messages)
+                await send_bytes(coalesced_messages)
         except asyncio.CancelledError:
             debug("%s: Writer cancelled", self.description)
             raise
@@ -214,6 +325,7 @@ class WebSocketHandler:
                 MAX_PENDING_MSG,
                 message,
             )
+            self._stats.slow_disconnects += 1
             self._cancel()
             return
 
@@ -234,6 +346,29 @@ class WebSocketHandler:
                 self._hass, PENDING_MSG_PEAK_TIME, self._check_write_peak
             )
 
+    @callback
+    def _coalesce_message(
+        self, key: Hashable, build: Callable[..., bytes], *args: Any
+    ) -> bool:
+        """Coalesce a message with the pending message of the same key.
+
+        Messages are only coalesced while the client is lagging behind,
+        the message is then built with build(*args) when the queue is drained.
+        Returns False if the message should be queued with _send_message.
+        """
+        coalesced = self._coalesced
+        if self._closing:
+            return True
+        if not coalesced and len(self._message_queue) < PENDING_MSG_PEAK:
+            return False
+        # The key is moved to the end so the messages are sent
+        # in the order of the latest message of each key
+        if coalesced.pop(key, None) is not None:
+            self.coalesced_messages += 1
+            self._stats.coalesced_messages += 1
+        coalesced[key] = (build, args)
+        return True
+
     @callback
     def _release_ready_future_or_reschedule(self) -> None:
         """Release the ready future or reschedule.
@@ -279,6 +414,7 @@ class WebSocketHandler:
             PENDING_MSG_PEAK_TIME,
             self._message_queue[-1],
         )
+        self._stats.slow_disconnects += 1
         self._cancel()
 
     @callback
@@ -329,14 +465,23 @@ class WebSocketHandler:
             assert writer is not None
 
         send_bytes_text = partial(writer.send, binary=False)
+        send_bytes_binary = partial(writer.send, binary=True)
         auth = AuthPhase(
-            logger, hass, self._send_message, self._cancel, request, send_bytes_text
+            logger,
+            hass,
+            self._send_message,
+            self._cancel,
+            request,
+            send_bytes_text,
+            self._coalesce_message,
         )
         connection: ActiveConnection | None = None
         disconnect_warn: str | None = None
 
         try:
-            connection = await self._async_handle_auth_phase(auth, send_bytes_text)
+            connection = await self._async_handle_auth_phase(
+                auth, send_bytes_text, send_bytes_binary
+            )
             self._async_increase_writer_limit(writer)
             await self._async_websocket_command_phase(connection, send_bytes_text)
         except asyncio.CancelledError:
@@ -371,6 +516,7 @@ class WebSocketHandler:
         self,
         auth: AuthPhase,
         send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]],
+        send_bytes_binary: Callable[[bytes], Coroutine[Any, Any, None]],
     ) -> ActiveConnection:
         """Handle the auth phase of the websocket connection."""
         await send_bytes_text(AUTH_REQUIRED_MESSAGE)
@@ -401,8 +547,11 @@ class WebSocketHandler:
         # We only start the writer queue after the auth phase is completed
         # since there is no need to queue messages before the auth phase
         self._connection = connection
-        self._writer_task = create_eager_task(self._writer(connection, send_bytes_text))
+        self._writer_task = create_eager_task(
+            self._writer(connection, send_bytes_text, send_bytes_binary)
+        )
         self._hass.data[DATA_CONNECTIONS] = self._hass.data.get(DATA_CONNECTIONS, 0) + 1
+        self._stats.handlers.add(self)
         async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_CONNECTED)
 
         self._authenticated = True
@@ -522,6 +671,7 @@ class WebSocketHandler:
 
                 if connection is not None:
                     hass.data[DATA_CONNECTIONS] -= 1
+                    self._stats.handlers.discard(self)
                     self._connection = None
 
                 async_dispatcher_send(hass, SIGNAL_WEBSOCKET_DISCONNECTED)
@@ -154,7 +154,7 @@ def cached_state_diff_message(
     """
     return b"".join(
         (
-            _partial_cached_state_diff_message(event)[:-1],
+            state_diff_message_prefix(event),
             b',"id":',
             message_id_as_bytes,
             b"}",
@@ -162,6 +162,14 @@ def cached_state_diff_message(
     )
 
 
+def state_diff_message_prefix(event: Event[EventStateChangedData]) -> bytes:
+    """Return the state diff message of an event up to the id.
+
+    The message is completed by appending the id and the closing brace.
+    """
+    return _partial_cached_state_diff_message(event)[:-1]
+
+
 @lru_cache(maxsize=128)
 def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> bytes:
     """Cache and serialize the event to json.
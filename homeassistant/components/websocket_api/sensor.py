@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -10,9 +18,47 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 from .const import (
     DATA_CONNECTIONS,
+    DATA_STATS,
     SIGNAL_WEBSOCKET_CONNECTED,
     SIGNAL_WEBSOCKET_DISCONNECTED,
 )
+from .http import WebSocketStats
+
+
+@dataclass(frozen=True, kw_only=True)
+class WebSocketStatsSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the websocket statistics."""
+
+    value_fn: Callable[[WebSocketStats], int]
+    attributes_fn: Callable[[WebSocketStats], dict[str, Any]] | None = None
+
+
+STATS_SENSORS: tuple[WebSocketStatsSensorEntityDescription, ...] = (
+    WebSocketStatsSensorEntityDescription(
+        key="pending_messages",
+        name="Pending messages",
+        native_unit_of_measurement="messages",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.max_pending_messages,
+        attributes_fn=lambda stats: {
+            "connections": stats.pending_messages_by_connection
+        },
+    ),
+    WebSocketStatsSensorEntityDescription(
+        key="coalesced_messages",
+        name="Coalesced messages",
+        native_unit_of_measurement="messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.coalesced_messages,
+    ),
+    WebSocketStatsSensorEntityDescription(
+        key="slow_disconnects",
+        name="Slow client disconnects",
+        native_unit_of_measurement="clients",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.slow_disconnects,
+    ),
+)
 
 
 async def async_setup_platform(
@@ -22,9 +68,16 @@ async def async_setup_platform(
     discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the API streams platform."""
-    entity = APICount()
-
-    async_add_entities([entity])
+    stats = hass.data[DATA_STATS]
+    async_add_entities(
+        [
+            APICount(),
+            *(
+                WebSocketStatsSensor(stats, description)
+                for description in STATS_SENSORS
+            ),
+        ]
+    )
 
 
 class APICount(SensorEntity):
@@ -54,3 +107,38 @@ class APICount(SensorEntity):
     def _update_count(self) -> None:
         self._attr_native_value = self.hass.data.get(DATA_CONNECTIONS, 0)
         self.async_write_ha_state()
+
+
+class WebSocketStatsSensor(SensorEntity):
+    """Entity to represent a statistic of the websocket connections.
+
+    The pending messages are those of the connection with the most
+    messages waiting to be sent, the messages pending for each
+    connection are in the attributes.
+    """
+
+    _unrecorded_attributes = frozenset({"connections"})
+
+    entity_description: WebSocketStatsSensorEntityDescription
+
+    def __init__(
+        self,
+        stats: WebSocketStats,
+        description: WebSocketStatsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._stats = stats
+        self._update_from_stats()
+
+    @callback
+    def _update_from_stats(self) -> None:
+        """Update the value and attributes from the statistics."""
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(self._stats)
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = description.attributes_fn(self._stats)
+
+    async def async_update(self) -> None:
+        """Update the statistic."""
+        self._update_from_stats()
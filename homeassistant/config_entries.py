@@ -13,6 +13,7 @@ from collections.abc import (
     Mapping,
     ValuesView,
 )
+from contextlib import contextmanager
 from contextvars import ContextVar
 from copy import deepcopy
 from datetime import datetime
@@ -66,6 +67,7 @@ from .setup import (
     async_process_deps_reqs,
     async_setup_component,
     async_start_setup,
+    async_trace_setup_step,
 )
 from .util import ulid as ulid_util
 from .util.async_ import create_eager_task
@@ -568,7 +570,10 @@ class ConfigEntry(Generic[_DataT]):
 
         if domain_is_integration:
             try:
-                await integration.async_get_platform("config_flow")
+                with async_trace_setup_step(
+                    hass, self.domain, "import_config_flow", self.entry_id
+                ):
+                    await integration.async_get_platform("config_flow")
             except ImportError as err:
                 _LOGGER.error(
                     (
@@ -991,6 +996,12 @@ class ConfigEntry(Generic[_DataT]):
             self._on_unload = []
         self._on_unload.append(func)
 
+    @contextmanager
+    def async_trace_setup_step(self, hass: HomeAssistant, name: str) -> Generator[None]:
+        """Record a setup step of the config entry in the startup trace."""
+        with async_trace_setup_step(hass, self.domain, name, self.entry_id):
+            yield
+
     async def _async_process_on_unload(self, hass: HomeAssistant) -> None:
         """Process the on_unload callbacks and wait for pending tasks."""
         if self._on_unload is not None:
@@ -51,10 +51,12 @@ import yarl
 
 from . import util
 from .const import (
+    ATTR_DEVICE_CLASS,
     ATTR_DOMAIN,
     ATTR_FRIENDLY_NAME,
     ATTR_SERVICE,
     ATTR_SERVICE_DATA,
+    ATTR_UNIT_OF_MEASUREMENT,
     BASE_PLATFORMS,
     COMPRESSED_STATE_ATTRIBUTES,
     COMPRESSED_STATE_CONTEXT,
@@ -105,6 +107,10 @@ from .util.async_ import (
     run_callback_threadsafe,
     shutdown_run_callback_threadsafe,
 )
+from .util.bus_profiler import (
+    DEFAULT_SAMPLE_SIZE as DEFAULT_PROFILER_SAMPLE_SIZE,
+    EventBusProfiler,
+)
 from .util.event_type import EventType
 from .util.executor import InterruptibleThreadPoolExecutor
 from .util.hass_dict import HassDict
@@ -146,6 +152,9 @@ DOMAIN = "homeassistant"
 # How long to wait to log tasks that are blocking
 BLOCK_LOG_TIMEOUT = 60
 
+# State attributes the state machine keeps an index of entity_ids for
+INDEXED_STATE_ATTRIBUTES = (ATTR_DEVICE_CLASS, ATTR_UNIT_OF_MEASUREMENT)
+
 type ServiceResponse = JsonObjectType | None
 type EntityServiceResponse = dict[str, ServiceResponse]
 
@@ -184,6 +193,10 @@ class EventStateReportedData(EventStateEventData):
     old_last_reported: datetime.datetime
 
 
+# The event type, data, context and time fired of a deferred state write
+type _PendingStateEvent = tuple[EventType[Any], Mapping[str, Any], Context, float]
+
+
 # SOURCE_* are deprecated as of Home Assistant 2022.2, use ConfigSource instead
 _DEPRECATED_SOURCE_DISCOVERED = DeprecatedConstantEnum(
     ConfigSource.DISCOVERED, "2025.1"
@@ -1444,10 +1457,11 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners", "_profiler")
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
+        self._profiler: EventBusProfiler | None = None
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
@@ -1475,6 +1489,32 @@ class EventBus:
         """Return dictionary with events and the number of listeners."""
         return run_callback_threadsafe(self._hass.loop, self.async_listeners).result()
 
+    @property
+    def profiler(self) -> EventBusProfiler | None:
+        """Return the profiler of the listeners if profiling."""
+        return self._profiler
+
+    @callback
+    def async_start_profiling(
+        self, sample_size: int = DEFAULT_PROFILER_SAMPLE_SIZE
+    ) -> EventBusProfiler:
+        """Start recording the time spent in the listeners.
+
+        This method must be run in the event loop.
+        """
+        if self._profiler is None:
+            self._profiler = EventBusProfiler(sample_size)
+        return self._profiler
+
+    @callback
+    def async_stop_profiling(self) -> EventBusProfiler | None:
+        """Stop recording the time spent in the listeners.
+
+        This method must be run in the event loop.
+        """
+        profiler, self._profiler = self._profiler, None
+        return profiler
+
     def fire(
         self,
         event_type: EventType[_DataT] | str,
@@ -1539,6 +1579,18 @@ class EventBus:
         else:
             match_all_listeners = EMPTY_LIST
 
+        if self._profiler is not None:
+            self._async_fire_profiled(
+                self._profiler,
+                listeners + match_all_listeners,
+                event_type,
+                event_data,
+                origin,
+                context,
+                time_fired,
+            )
+            return
+
         event: Event[_DataT] | None = None
         for job, event_filter in listeners + match_all_listeners:
             if event_filter is not None:
@@ -1563,6 +1615,47 @@ class EventBus:
             except Exception:
                 _LOGGER.exception("Error running job: %s", job)
 
+    def _async_fire_profiled(
+        self,
+        profiler: EventBusProfiler,
+        jobs: list[_FilterableJobType[_DataT]],
+        event_type: EventType[_DataT] | str,
+        event_data: _DataT | None,
+        origin: EventOrigin,
+        context: Context | None,
+        time_fired: float | None,
+    ) -> None:
+        """Fire an event while recording the time spent in the listeners.
+
+        Only the time until a coroutine listener is scheduled is recorded.
+        """
+        event: Event[_DataT] | None = None
+        for job, event_filter in jobs:
+            if event_filter is not None:
+                try:
+                    if event_data is None or not event_filter(event_data):
+                        profiler.add_rejected(event_type, job)
+                        continue
+                except Exception:
+                    _LOGGER.exception("Error in event filter")
+                    continue
+
+            if not event:
+                event = Event(
+                    event_type,
+                    event_data,
+                    origin,
+                    time_fired,
+                    context,
+                )
+
+            start = time.perf_counter()
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:
+                _LOGGER.exception("Error running job: %s", job)
+            profiler.add_call(event_type, job, time.perf_counter() - start)
+
     def listen(
         self,
         event_type: EventType[_DataT] | str,
@@ -1878,10 +1971,22 @@ class State:
             as_dict["context"] = ReadOnlyDict(context)
         return ReadOnlyDict(as_dict)
 
+    @cached_property
+    def _attributes_json_fragment(self) -> json_fragment:
+        """Return a JSON fragment of the attributes.
+
+        The attributes are serialized once for the JSON representations
+        of the state. The fragment is not shared with later states using
+        the same attributes so they always see the current values.
+        """
+        return json_fragment(json_bytes(self.attributes))
+
     @cached_property
     def as_dict_json(self) -> bytes:
         """Return a JSON string of the State."""
-        return json_bytes(self._as_dict)
+        return json_bytes(
+            {**self._as_dict, "attributes": self._attributes_json_fragment}
+        )
 
     @cached_property
     def json_fragment(self) -> json_fragment:
@@ -1924,7 +2029,15 @@ class State:
 
         It is used for sending multiple states in a single message.
         """
-        return json_bytes({self.entity_id: self.as_compressed_state})[1:-1]
+        compressed_state = self.as_compressed_state
+        return json_bytes(
+            {
+                self.entity_id: {
+                    **compressed_state,
+                    COMPRESSED_STATE_ATTRIBUTES: self._attributes_json_fragment,
+                }
+            }
+        )[1:-1]
 
     @classmethod
     def from_dict(cls, json_dict: dict[str, Any]) -> Self | None:
@@ -1993,14 +2106,18 @@ class State:
 class States(UserDict[str, State]):
     """Container for states, maps entity_id -> State.
 
-    Maintains an additional index:
+    Maintains additional indexes:
     - domain -> dict[str, State]
+    - indexed attribute -> attribute value -> dict[str, None]
     """
 
     def __init__(self) -> None:
         """Initialize the container."""
         super().__init__()
         self._domain_index: defaultdict[str, dict[str, State]] = defaultdict(dict)
+        self._attribute_index: dict[str, defaultdict[str, dict[str, None]]] = {
+            attribute: defaultdict(dict) for attribute in INDEXED_STATE_ATTRIBUTES
+        }
 
     def values(self) -> ValuesView[State]:
         """Return the underlying values to avoid __iter__ overhead."""
@@ -2008,15 +2125,49 @@ class States(UserDict[str, State]):
 
     def __setitem__(self, key: str, entry: State) -> None:
         """Add an item."""
+        old_entry = self.data.get(key)
         self.data[key] = entry
         self._domain_index[entry.domain][entry.entity_id] = entry
+        # The state machine reuses the attributes when they did not change
+        if old_entry is None or old_entry.attributes is not entry.attributes:
+            self._update_attribute_index(key, old_entry, entry)
 
     def __delitem__(self, key: str) -> None:
         """Remove an item."""
         entry = self[key]
         del self._domain_index[entry.domain][entry.entity_id]
+        self._update_attribute_index(key, entry, None)
         super().__delitem__(key)
 
+    def _update_attribute_index(
+        self, key: str, old_entry: State | None, entry: State | None
+    ) -> None:
+        """Update the attribute index for a changed item."""
+        for attribute, index in self._attribute_index.items():
+            old_value = (
+                None if old_entry is None else old_entry.attributes.get(attribute)
+            )
+            value = None if entry is None else entry.attributes.get(attribute)
+            if old_value == value:
+                continue
+            if isinstance(old_value, str):
+                entity_ids = index[old_value]
+                del entity_ids[key]
+                if not entity_ids:
+                    del index[old_value]
+            if isinstance(value, str):
+                index[value][key] = None
+
+    def attribute_entity_ids(
+        self, attribute: str, value: str
+    ) -> KeysView[str] | tuple[()]:
+        """Get all entity_ids with an indexed attribute value."""
+        index = self._attribute_index[attribute]
+        # Avoid polluting the index with non-existing values
+        if value not in index:
+            return ()
+        return index[value].keys()
+
     def domain_entity_ids(self, key: str) -> KeysView[str] | tuple[()]:
         """Get all entity_ids for a domain."""
         # Avoid polluting _domain_index with non-existing domains
@@ -2073,6 +2224,24 @@ class StateMachine:
             entity_ids.extend(self._states.domain_entity_ids(domain))
         return entity_ids
 
+    @callback
+    def async_entity_ids_by_attribute(
+        self, attribute: str, value: str, domain_filter: str | None = None
+    ) -> list[str]:
+        """List of entity ids with a value of an indexed attribute.
+
+        The indexed attributes are listed in INDEXED_STATE_ATTRIBUTES.
+
+        This method must be run in the event loop.
+        """
+        if attribute not in INDEXED_STATE_ATTRIBUTES:
+            raise ValueError(f"State attribute {attribute} is not indexed")
+        entity_ids = self._states.attribute_entity_ids(attribute, value)
+        if domain_filter is None:
+            return list(entity_ids)
+        prefix = f"{domain_filter.lower()}."
+        return [entity_id for entity_id in entity_ids if entity_id.startswith(prefix)]
+
     @callback
     def async_entity_ids_count(
         self, domain_filter: str | Iterable[str] | None = None
@@ -2271,6 +2440,74 @@ class StateMachine:
 
         This method must be run in the event loop.
         """
+        self._async_set_state(
+            entity_id,
+            new_state,
+            attributes,
+            force_update,
+            context,
+            state_info,
+            timestamp,
+            None,
+        )
+
+    @callback
+    def _async_fire_pending(self, pending: list[_PendingStateEvent]) -> None:
+        """Fire the events of deferred state writes in order."""
+        fire = self._bus.async_fire_internal
+        for event_type, event_data, context, timestamp in pending:
+            fire(event_type, event_data, context=context, time_fired=timestamp)
+
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Set the states of many entities, add the entities that do not exist.
+
+        States is an iterable of entity_id, state and attributes tuples.
+
+        All states are set before the events are fired so the listeners
+        see the states of the whole batch.
+
+        This method must be run in the event loop.
+        """
+        timestamp = timestamp or time.time()
+        pending: list[_PendingStateEvent] = []
+        try:
+            for entity_id, new_state, attributes in states:
+                self._async_set_state(
+                    entity_id.lower(),
+                    str(new_state),
+                    attributes or {},
+                    force_update,
+                    context,
+                    None,
+                    timestamp,
+                    pending,
+                )
+        finally:
+            # The states set before an invalid state are still announced
+            self._async_fire_pending(pending)
+
+    def _async_set_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Mapping[str, Any] | None,
+        force_update: bool,
+        context: Context | None,
+        state_info: StateInfo | None,
+        timestamp: float,
+        pending: list[_PendingStateEvent] | None,
+    ) -> None:
+        """Set the state of an entity and fire or defer its event.
+
+        The event is added to pending instead of fired if given.
+        """
         # Most cases the key will be in the dict
         # so we optimize for the happy path as
         # python 3.11+ has near zero overhead for
@@ -2310,13 +2547,19 @@ class StateMachine:
             old_state.last_reported = now  # type: ignore[union-attr]
             old_state.last_reported_timestamp = timestamp  # type: ignore[union-attr]
             # Avoid creating an EventStateReportedData
+            state_reported_data = {
+                "entity_id": entity_id,
+                "old_last_reported": old_last_reported,
+                "new_state": old_state,
+            }
+            if pending is not None:
+                pending.append(
+                    (EVENT_STATE_REPORTED, state_reported_data, context, timestamp)
+                )
+                return
             self._bus.async_fire_internal(  # type: ignore[misc]
                 EVENT_STATE_REPORTED,
-                {
-                    "entity_id": entity_id,
-                    "old_last_reported": old_last_reported,
-                    "new_state": old_state,
-                },
+                state_reported_data,
                 context=context,
                 time_fired=timestamp,
             )
@@ -2349,6 +2592,11 @@ class StateMachine:
             "old_state": old_state,
             "new_state": state,
         }
+        if pending is not None:
+            pending.append(
+                (EVENT_STATE_CHANGED, state_changed_data, context, timestamp)
+            )
+            return
         self._bus.async_fire_internal(
             EVENT_STATE_CHANGED,
             state_changed_data,
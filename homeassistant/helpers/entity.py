@@ -57,8 +57,14 @@ from homeassistant.exceptions import (
 from homeassistant.loader import async_suggest_report_issue, bind_hass
 from homeassistant.util import ensure_unique_string, slugify
 from homeassistant.util.frozen_dataclass_compat import FrozenOrThawed
+from homeassistant.util.hass_dict import HassKey
 
-from . import device_registry as dr, entity_registry as er, singleton
+from . import (
+    device_registry as dr,
+    entity_registry as er,
+    significant_change,
+    singleton,
+)
 from .device_registry import DeviceInfo, EventDeviceRegistryUpdatedData
 from .event import (
     async_track_device_registry_updated_event,
@@ -75,6 +81,9 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
 DATA_ENTITY_SOURCE = "entity_info"
+DATA_STATE_WRITE_COALESCER: HassKey[_StateWriteCoalescer] = HassKey(
+    "entity_state_write_coalescer"
+)
 
 # Used when converting float states to string: limit precision according to machine
 # epsilon to make the string representation readable
@@ -100,6 +109,81 @@ def entity_sources(hass: HomeAssistant) -> dict[str, EntityInfo]:
     return {}
 
 
+class _StateWriteCoalescer:
+    """Write the deferred states of coalescing entities.
+
+    All entities with a deferred state write that is due are written
+    in one loop callback.
+    """
+
+    __slots__ = ("_hass", "_pending", "_timer", "suppressed")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coalescer."""
+        self._hass = hass
+        self._pending: dict[Entity, float] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self.suppressed: dict[str, int] = {}
+
+    @callback
+    def async_schedule(self, entity: Entity, due: float) -> None:
+        """Schedule writing the state of an entity at a loop time."""
+        self._pending[entity] = due
+        self._async_schedule_timer(due)
+
+    @callback
+    def _async_schedule_timer(self, due: float) -> None:
+        """Schedule the callback for the earliest deferred state write."""
+        if (timer := self._timer) is None or due < timer.when():
+            if timer is not None:
+                timer.cancel()
+            self._timer = self._hass.loop.call_at(due, self._async_write_due)
+
+    @callback
+    def async_cancel(self, entity: Entity) -> None:
+        """Cancel the deferred state write of an entity."""
+        self._pending.pop(entity, None)
+
+    @callback
+    def async_add_suppressed(self, entity_id: str) -> None:
+        """Count a state write that was not written."""
+        self.suppressed[entity_id] = self.suppressed.get(entity_id, 0) + 1
+
+    @callback
+    def _async_write_due(self) -> None:
+        """Write the states that are due."""
+        self._timer = None
+        now = self._hass.loop.time()
+        due_entities: list[Entity] = []
+        next_due: float | None = None
+        for entity, due in self._pending.items():
+            if due <= now:
+                due_entities.append(entity)
+            elif next_due is None or due < next_due:
+                next_due = due
+        for entity in due_entities:
+            del self._pending[entity]
+            entity._async_write_deferred_state()  # noqa: SLF001
+        if next_due is not None:
+            self._async_schedule_timer(next_due)
+
+
+@callback
+@singleton.singleton(DATA_STATE_WRITE_COALESCER)
+def _async_get_state_write_coalescer(hass: HomeAssistant) -> _StateWriteCoalescer:
+    """Get the state write coalescer."""
+    return _StateWriteCoalescer(hass)
+
+
+@callback
+def async_get_suppressed_state_writes(hass: HomeAssistant) -> dict[str, int]:
+    """Return the number of state writes not written by entity id.
+
+    Only entities that coalesce their state writes are counted.
+    """
+    return dict(_async_get_state_write_coalescer(hass).suppressed)
+
+
 def generate_entity_id(
     entity_id_format: str,
     name: str | None,
@@ -512,6 +596,17 @@ class Entity(
     # Job type cache
     _job_types: dict[str, HassJobType] | None = None
 
+    # Minimum number of seconds between state writes, set by integrations with
+    # high frequency updates. The writes in between are coalesced into one write
+    # at the end of the interval.
+    _state_write_min_interval: float | None = None
+    # Drop state writes which are not a significant change of the current state
+    # according to the significant_change platform of the entity domain.
+    _state_write_significant_only: bool = False
+    # Loop time of the last state write when state writes are coalesced
+    _state_write_last: float | None = None
+    _state_write_pending: bool = False
+
     # StateInfo. Set by EntityPlatform by calling async_internal_added_to_hass
     # While not purely typed, it makes typehinting more useful for us
     # and removes the need for constant None checks or asserts.
@@ -1109,6 +1204,11 @@ class Entity(
             # Polling returned after the entity has already been removed
             return
 
+        if (
+            min_interval := self._state_write_min_interval
+        ) is not None and self._async_defer_state_write(min_interval):
+            return
+
         hass = self.hass
         entity_id = self.entity_id
 
@@ -1205,6 +1305,12 @@ class Entity(
             self._context = None
             self._context_set = None
 
+        if (
+            self._state_write_significant_only
+            and not self._async_is_significant_state_write(state, attr, capabilities)
+        ):
+            return
+
         try:
             hass.states.async_set_internal(
                 entity_id,
@@ -1223,6 +1329,69 @@ class Entity(
                 entity_id, STATE_UNKNOWN, {}, self.force_update, self._context
             )
 
+    @callback
+    def _async_defer_state_write(self, min_interval: float) -> bool:
+        """Coalesce a state write and return if it was deferred."""
+        if self._state_write_pending:
+            _async_get_state_write_coalescer(self.hass).async_add_suppressed(
+                self.entity_id
+            )
+            return True
+        now = self.hass.loop.time()
+        if (last := self._state_write_last) is not None and now < (
+            due := last + min_interval
+        ):
+            self._state_write_pending = True
+            _async_get_state_write_coalescer(self.hass).async_schedule(self, due)
+            return True
+        self._state_write_last = now
+        return False
+
+    @callback
+    def _async_write_deferred_state(self) -> None:
+        """Write the state deferred by coalescing state writes."""
+        self._state_write_pending = False
+        self._state_write_last = None
+        self._async_write_ha_state()
+
+    @callback
+    def _async_is_significant_state_write(
+        self,
+        state: str,
+        attr: dict[str, Any],
+        capabilities: Mapping[str, Any] | None,
+    ) -> bool:
+        """Return if a state write is a significant change of the current state.
+
+        Writes changing attributes which are not numbers, or which are
+        capabilities or supported features, are always significant. Only
+        state and numeric attribute changes are left to the significant
+        change platform of the domain.
+        """
+        if (old_state := self.hass.states.get(self.entity_id)) is None:
+            return True
+        old_attr = old_state.attributes
+        if old_attr.keys() != attr.keys() or any(
+            key == ATTR_SUPPORTED_FEATURES
+            or (capabilities is not None and key in capabilities)
+            or type(value) not in (int, float)
+            or type(old_attr[key]) not in (int, float)
+            for key, value in attr.items()
+            if value != old_attr[key]
+        ):
+            return True
+        if significant_change.async_is_significant_state_change(
+            self.hass,
+            old_state.domain,
+            old_state.state,
+            old_attr,
+            state,
+            attr,
+        ):
+            return True
+        _async_get_state_write_coalescer(self.hass).async_add_suppressed(self.entity_id)
+        return False
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -1460,6 +1629,9 @@ class Entity(
             "unrecorded_attributes": self.__combined_unrecorded_attributes
         }
 
+        if self._state_write_significant_only:
+            await significant_change.async_initialize(self.hass)
+
         if self.registry_entry is not None:
             # This is an assert as it should never happen, but helps in tests
             assert (
@@ -1486,6 +1658,10 @@ class Entity(
         if self.platform:
             del entity_sources(self.hass)[self.entity_id]
 
+        if self._state_write_pending:
+            self._state_write_pending = False
+            _async_get_state_write_coalescer(self.hass).async_cancel(self)
+
     @callback
     def _async_registry_updated(
         self, event: Event[er.EventEntityRegistryUpdatedData]
@@ -9,10 +9,12 @@ import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import partial, wraps
+from heapq import heappop, heappush
+from itertools import count
 import logging
 from random import randint
 import time
-from typing import TYPE_CHECKING, Any, Concatenate, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Concatenate, Generic, TypeVar, cast
 
 from homeassistant.const import (
     EVENT_CORE_CONFIG_UPDATE,
@@ -40,6 +42,7 @@ from homeassistant.exceptions import TemplateError
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.bus_profiler import EventBusProfiler
 from homeassistant.util.event_type import EventType
 from homeassistant.util.hass_dict import HassKey
 
@@ -60,6 +63,15 @@ from .typing import TemplateVarsType
 _TRACK_STATE_CHANGE_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = HassKey(
     "track_state_change_data"
 )
+_TRACK_STATE_VALUE_CHANGE_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = (
+    HassKey("track_state_value_change_data")
+)
+_TRACK_STATE_VALUE_CHANGE_ATTRIBUTES: HassKey[
+    dict[str, dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]]]
+] = HassKey("track_state_value_change_attributes")
+_TEMPLATE_RENDER_SCHEDULER: HassKey[_TemplateRenderScheduler] = HassKey(
+    "template_render_scheduler"
+)
 _TRACK_STATE_REPORT_DATA: HassKey[_KeyedEventData[EventStateReportedData]] = HassKey(
     "track_state_report_data"
 )
@@ -82,6 +94,8 @@ _ENTITIES_LISTENER = "entities"
 
 _LOGGER = logging.getLogger(__name__)
 
+_MISSING = object()
+
 # Used to spread async_track_utc_time_change listeners and DataUpdateCoordinator
 # refresh cycles between RANDOM_MICROSECOND_MIN..RANDOM_MICROSECOND_MAX.
 # The values have been determined experimentally in production testing, background
@@ -328,6 +342,25 @@ def async_track_state_change_event(
     return _async_track_state_change_event(hass, entity_ids, action, job_type)
 
 
+@callback
+def _async_run_profiled_job(
+    hass: HomeAssistant,
+    profiler: EventBusProfiler,
+    job: HassJob[[Event[Any]], Any],
+    event: Event[Any],
+) -> None:
+    """Run a keyed listener while recording its time in the bus profiler.
+
+    The keyed listeners share a single bus listener, so they are
+    recorded by their own name as well.
+    """
+    start = time.perf_counter()
+    try:
+        hass.async_run_hass_job(job, event)
+    finally:
+        profiler.add_call(event.event_type, job, time.perf_counter() - start)
+
+
 @callback
 def _async_dispatch_entity_id_event_soon(
     hass: HomeAssistant,
@@ -347,9 +380,13 @@ def _async_dispatch_entity_id_event(
     """Dispatch to listeners."""
     if not (callbacks_list := callbacks.get(event.data["entity_id"])):
         return
+    profiler = hass.bus.profiler
     for job in callbacks_list.copy():
         try:
-            hass.async_run_hass_job(job, event)
+            if profiler is None:
+                hass.async_run_hass_job(job, event)
+            else:
+                _async_run_profiled_job(hass, profiler, job, event)
         except Exception:
             _LOGGER.exception(
                 "Error while dispatching event for %s to %s",
@@ -389,6 +426,148 @@ def _async_track_state_change_event(
     )
 
 
+@callback
+def _async_state_value_filter(
+    hass: HomeAssistant,
+    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
+    event_data: EventStateChangedData,
+) -> bool:
+    """Filter out attribute changes of entities without attribute listeners."""
+    if (entity_id := event_data["entity_id"]) not in callbacks:
+        return False
+    old_state = event_data["old_state"]
+    new_state = event_data["new_state"]
+    return (
+        old_state is None
+        or new_state is None
+        or old_state.state != new_state.state
+        or (
+            (attribute_index := hass.data.get(_TRACK_STATE_VALUE_CHANGE_ATTRIBUTES))
+            is not None
+            and entity_id in attribute_index
+        )
+    )
+
+
+@callback
+def _async_dispatch_state_value_change_event(
+    hass: HomeAssistant,
+    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
+    event: Event[EventStateChangedData],
+) -> None:
+    """Dispatch to the listeners of the state value or the changed attributes."""
+    event_data = event.data
+    old_state = event_data["old_state"]
+    new_state = event_data["new_state"]
+    if old_state is None or new_state is None or old_state.state != new_state.state:
+        _async_dispatch_entity_id_event(hass, callbacks, event)
+        return
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    # The state machine reuses the attributes when they did not change
+    if (
+        old_attributes is new_attributes
+        or (attribute_index := hass.data.get(_TRACK_STATE_VALUE_CHANGE_ATTRIBUTES))
+        is None
+        or not (attribute_callbacks := attribute_index.get(event_data["entity_id"]))
+    ):
+        return
+    jobs: dict[HassJob[[Event[EventStateChangedData]], Any], None] = {}
+    for attribute, attribute_jobs in attribute_callbacks.items():
+        if old_attributes.get(attribute, _MISSING) != new_attributes.get(
+            attribute, _MISSING
+        ):
+            jobs.update(dict.fromkeys(attribute_jobs))
+    profiler = hass.bus.profiler
+    for job in jobs:
+        try:
+            if profiler is None:
+                hass.async_run_hass_job(job, event)
+            else:
+                _async_run_profiled_job(hass, profiler, job, event)
+        except Exception:
+            _LOGGER.exception(
+                "Error while dispatching event for %s to %s",
+                event_data["entity_id"],
+                job,
+            )
+
+
+@callback
+def _async_dispatch_state_value_change_event_soon(
+    hass: HomeAssistant,
+    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
+    event: Event[EventStateChangedData],
+) -> None:
+    """Dispatch to listeners soon to ensure one event loop runs before dispatch."""
+    hass.loop.call_soon(
+        _async_dispatch_state_value_change_event, hass, callbacks, event
+    )
+
+
+_KEYED_TRACK_STATE_VALUE_CHANGE = _KeyedEventTracker(
+    key=_TRACK_STATE_VALUE_CHANGE_DATA,
+    event_type=EVENT_STATE_CHANGED,
+    dispatcher_callable=_async_dispatch_state_value_change_event_soon,
+    filter_callable=_async_state_value_filter,
+)
+
+
+@bind_hass
+def async_track_state_value_change_event(
+    hass: HomeAssistant,
+    entity_ids: str | Iterable[str],
+    attributes: Iterable[str],
+    action: Callable[[Event[EventStateChangedData]], Any],
+    job_type: HassJobType | None = None,
+) -> CALLBACK_TYPE:
+    """Track changes of the state value and some attributes indexed by entity_id.
+
+    Unlike async_track_state_change_event, the action is only called
+    when the entity is added or removed, its state value changes or
+    one of the given attributes changes. The listeners are indexed by
+    entity_id and attribute so changes of other attributes are skipped
+    without calling them.
+    """
+    if not (entity_ids := _async_string_to_lower_list(entity_ids)):
+        return _remove_empty_listener
+    job = HassJob(
+        action,
+        f"track {EVENT_STATE_CHANGED} value event {entity_ids} {attributes}",
+        job_type=job_type,
+    )
+    remove_listener = _async_track_event_job(
+        _KEYED_TRACK_STATE_VALUE_CHANGE, hass, entity_ids, job
+    )
+    if not (attributes := frozenset(attributes)):
+        return remove_listener
+
+    hass_data = hass.data
+    if (attribute_index := hass_data.get(_TRACK_STATE_VALUE_CHANGE_ATTRIBUTES)) is None:
+        attribute_index = hass_data[_TRACK_STATE_VALUE_CHANGE_ATTRIBUTES] = {}
+    for entity_id in entity_ids:
+        attribute_callbacks = attribute_index.setdefault(entity_id, {})
+        for attribute in attributes:
+            attribute_callbacks.setdefault(attribute, []).append(job)
+
+    @callback
+    def _remove_attribute_listener() -> None:
+        """Remove the listener from the attribute index."""
+        remove_listener()
+        for entity_id in entity_ids:
+            attribute_callbacks = attribute_index[entity_id]
+            for attribute in attributes:
+                attribute_callbacks[attribute].remove(job)
+                if not attribute_callbacks[attribute]:
+                    del attribute_callbacks[attribute]
+            if not attribute_callbacks:
+                del attribute_index[entity_id]
+        if not attribute_index:
+            hass_data.pop(_TRACK_STATE_VALUE_CHANGE_ATTRIBUTES)
+
+    return _remove_attribute_listener
+
+
 _KEYED_TRACK_STATE_REPORT = _KeyedEventTracker(
     key=_TRACK_STATE_REPORT_DATA,
     event_type=EVENT_STATE_REPORTED,
@@ -448,6 +627,20 @@ def _async_track_event(
     if not keys:
         return _remove_empty_listener
 
+    job = HassJob(action, f"track {tracker.event_type} event {keys}", job_type=job_type)
+    return _async_track_event_job(tracker, hass, keys, job)
+
+
+def _async_track_event_job(
+    tracker: _KeyedEventTracker[_TypedDictT],
+    hass: HomeAssistant,
+    keys: str | Iterable[str],
+    job: HassJob[[Event[_TypedDictT]], Any],
+) -> CALLBACK_TYPE:
+    """Track an event by a specific key with a job.
+
+    This function is intended for internal use only.
+    """
     hass_data = hass.data
     tracker_key = tracker.key
     if tracker_key in hass_data:
@@ -463,8 +656,6 @@ def _async_track_event(
         event_data = _KeyedEventData(listener, callbacks)
         hass_data[tracker_key] = event_data
 
-    job = HassJob(action, f"track {tracker.event_type} event {keys}", job_type=job_type)
-
     if isinstance(keys, str):
         # Almost all calls to this function use a single key
         # so we optimize for that case. We don't use setdefault
@@ -493,9 +684,13 @@ def _async_dispatch_old_entity_id_or_entity_id_event(
         )
     ):
         return
+    profiler = hass.bus.profiler
     for job in callbacks_list.copy():
         try:
-            hass.async_run_hass_job(job, event)
+            if profiler is None:
+                hass.async_run_hass_job(job, event)
+            else:
+                _async_run_profiled_job(hass, profiler, job, event)
         except Exception:
             _LOGGER.exception(
                 "Error while dispatching event for %s to %s",
@@ -560,9 +755,13 @@ def _async_dispatch_device_id_event(
     """Dispatch to listeners."""
     if not (callbacks_list := callbacks.get(event.data["device_id"])):
         return
+    profiler = hass.bus.profiler
     for job in callbacks_list.copy():
         try:
-            hass.async_run_hass_job(job, event)
+            if profiler is None:
+                hass.async_run_hass_job(job, event)
+            else:
+                _async_run_profiled_job(hass, profiler, job, event)
         except Exception:
             _LOGGER.exception(
                 "Error while dispatching event for %s to %s",
@@ -603,9 +802,13 @@ def _async_dispatch_domain_event(
 ) -> None:
     """Dispatch domain event listeners."""
     domain = split_entity_id(event.data["entity_id"])[0]
+    profiler = hass.bus.profiler
     for job in callbacks.get(domain, []) + callbacks.get(MATCH_ALL, []):
         try:
-            hass.async_run_hass_job(job, event)
+            if profiler is None:
+                hass.async_run_hass_job(job, event)
+            else:
+                _async_run_profiled_job(hass, profiler, job, event)
         except Exception:
             _LOGGER.exception(
                 "Error while processing event %s for domain %s", event, domain
@@ -744,6 +947,11 @@ class _TrackStateChangeFiltered:
         self._setup_domains_listener(track_states.domains)
         self._setup_entities_listener(track_states.domains, track_states.entities)
 
+    @property
+    def track_states(self) -> TrackStates:
+        """Return the states being tracked."""
+        return self._last_track_states
+
     @property
     def listeners(self) -> dict[str, bool | set[str]]:
         """State changes that will cause a re-render."""
@@ -962,6 +1170,278 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+@dataclass(slots=True)
+class TemplateRenderStats:
+    """Statistics of the template refreshes of an entity."""
+
+    refreshes: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
+class _TemplateRenderScheduler:
+    """Refresh the templates of template entities in dependency order.
+
+    The state changes for the templates of entities are coalesced per
+    event loop iteration and refreshed in one pass where the templates
+    reading the state of other template entities come after them. When
+    a template entity writes its state during the pass, the templates
+    reading it are refreshed later in the same pass instead of once
+    more in a later iteration with the intermediate state.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.stats: dict[str, TemplateRenderStats] = {}
+        self._producers: dict[str, TrackTemplateResultInfo] = {}
+        self._producers_by_domain: dict[str, set[str]] = {}
+        # The templates of entities by the state changes they listen to
+        self._reads: dict[TrackTemplateResultInfo, TrackStates] = {}
+        self._entity_readers: dict[str, set[TrackTemplateResultInfo]] = {}
+        self._domain_readers: dict[str, set[TrackTemplateResultInfo]] = {}
+        self._all_readers: set[TrackTemplateResultInfo] = set()
+        self._pending: dict[
+            TrackTemplateResultInfo, dict[str, Event[EventStateChangedData]]
+        ] = {}
+        self._flush_scheduled = False
+        # The state of the pass while it runs
+        self._flushing: (
+            dict[TrackTemplateResultInfo, dict[str, Event[EventStateChangedData]]]
+            | None
+        ) = None
+        self._queue: list[tuple[int, int, TrackTemplateResultInfo]] = []
+        self._sequence = count()
+        self._ranks: dict[TrackTemplateResultInfo, int] = {}
+        self._refreshed: set[TrackTemplateResultInfo] = set()
+        # Events already refreshed in the last passes that are still
+        # dispatched to the listeners of the templates
+        self._handled: dict[
+            TrackTemplateResultInfo, set[Event[EventStateChangedData]]
+        ] = {}
+        self._handled_previous: dict[
+            TrackTemplateResultInfo, set[Event[EventStateChangedData]]
+        ] = {}
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_register(self, info: TrackTemplateResultInfo, entity_id: str) -> None:
+        """Register the templates of an entity."""
+        self._producers[entity_id] = info
+        self._producers_by_domain.setdefault(split_entity_id(entity_id)[0], set()).add(
+            entity_id
+        )
+        self._remove_reads(info)
+        self._add_reads(info)
+        if self._unsub_state_changed is None:
+            self._unsub_state_changed = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_producer_state_changed,
+                event_filter=self._async_producer_state_changed_filter,
+            )
+
+    @callback
+    def async_unregister(self, info: TrackTemplateResultInfo, entity_id: str) -> None:
+        """Unregister the templates of an entity."""
+        if self._producers.get(entity_id) is info:
+            del self._producers[entity_id]
+            domain = split_entity_id(entity_id)[0]
+            self._producers_by_domain[domain].discard(entity_id)
+            if not self._producers_by_domain[domain]:
+                del self._producers_by_domain[domain]
+            self.stats.pop(entity_id, None)
+        self._remove_reads(info)
+        self._pending.pop(info, None)
+        if self._flushing is not None:
+            self._flushing.pop(info, None)
+        if not self._producers and self._unsub_state_changed is not None:
+            self._unsub_state_changed()
+            self._unsub_state_changed = None
+
+    @callback
+    def async_update_reads(self, info: TrackTemplateResultInfo) -> None:
+        """Update the index after the templates of an entity changed listeners."""
+        if info in self._reads:
+            self._remove_reads(info)
+            self._add_reads(info)
+
+    @callback
+    def _add_reads(self, info: TrackTemplateResultInfo) -> None:
+        """Index the state changes the templates of an entity listen to."""
+        track_states = self._reads[info] = info.track_states
+        if track_states.all_states:
+            self._all_readers.add(info)
+        for entity_id in track_states.entities:
+            self._entity_readers.setdefault(entity_id, set()).add(info)
+        for domain in track_states.domains:
+            self._domain_readers.setdefault(domain, set()).add(info)
+
+    @callback
+    def _remove_reads(self, info: TrackTemplateResultInfo) -> None:
+        """Remove the templates of an entity from the index."""
+        if (track_states := self._reads.pop(info, None)) is None:
+            return
+        self._all_readers.discard(info)
+        for readers, keys in (
+            (self._entity_readers, track_states.entities),
+            (self._domain_readers, track_states.domains),
+        ):
+            for key in keys:
+                readers[key].discard(info)
+                if not readers[key]:
+                    del readers[key]
+
+    def _readers(self, entity_id: str) -> set[TrackTemplateResultInfo]:
+        """Return the templates re-rendered by a state change of an entity."""
+        return self._all_readers.union(
+            self._entity_readers.get(entity_id, ()),
+            self._domain_readers.get(split_entity_id(entity_id)[0], ()),
+        )
+
+    def _producers_read_by(self, info: TrackTemplateResultInfo) -> set[str]:
+        """Return the template entities whose state the templates read."""
+        track_states = self._reads[info]
+        if track_states.all_states:
+            return set(self._producers)
+        producers = {
+            entity_id
+            for entity_id in track_states.entities
+            if entity_id in self._producers
+        }
+        for domain in track_states.domains:
+            producers.update(self._producers_by_domain.get(domain, ()))
+        return producers
+
+    @callback
+    def async_schedule_refresh(
+        self, info: TrackTemplateResultInfo, event: Event[EventStateChangedData]
+    ) -> None:
+        """Schedule refreshing the templates for a state change."""
+        if event in self._handled.get(info, ()) or event in self._handled_previous.get(
+            info, ()
+        ):
+            return
+        if not (events := self._pending.get(info)):
+            events = self._pending[info] = {}
+        # Only the latest state change of an entity is needed
+        events.pop(event.data["entity_id"], None)
+        events[event.data["entity_id"]] = event
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.async_create_task_internal(
+                self._async_flush(), "template refresh", eager_start=False
+            )
+
+    @callback
+    def _async_producer_state_changed_filter(
+        self, event_data: EventStateChangedData
+    ) -> bool:
+        """Filter state changes of template entities during a pass."""
+        return self._flushing is not None and event_data["entity_id"] in self._producers
+
+    @callback
+    def _async_producer_state_changed(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Add the templates reading a template entity written during a pass."""
+        flushing = self._flushing
+        assert flushing is not None
+        entity_id = event.data["entity_id"]
+        for info in self._readers(entity_id):
+            # Templates already refreshed in this pass depend on each other
+            # and get the change through their listener
+            if info in self._refreshed:
+                continue
+            self._handled.setdefault(info, set()).add(event)
+            if (events := flushing.get(info)) is None:
+                events = flushing[info] = {}
+                heappush(self._queue, (self._rank(info), next(self._sequence), info))
+            events.pop(entity_id, None)
+            events[entity_id] = event
+
+    def _rank(
+        self,
+        info: TrackTemplateResultInfo,
+        visiting: set[TrackTemplateResultInfo] | None = None,
+    ) -> int:
+        """Return the depth of the templates in the dependency graph."""
+        if (rank := self._ranks.get(info)) is not None:
+            return rank
+        if visiting is None:
+            visiting = set()
+        visiting.add(info)
+        rank = 0
+        for entity_id in self._producers_read_by(info):
+            producer = self._producers[entity_id]
+            if producer in visiting or producer is info:
+                continue
+            rank = max(rank, self._rank(producer, visiting) + 1)
+        visiting.discard(info)
+        self._ranks[info] = rank
+        return rank
+
+    async def _async_flush(self) -> None:
+        """Refresh the templates of the pending state changes."""
+        self._flush_scheduled = False
+        self._handled_previous = self._handled
+        self._handled = {}
+        flushing = self._flushing = self._pending
+        self._pending = {}
+        queue = self._queue
+        for info in flushing:
+            heappush(queue, (self._rank(info), next(self._sequence), info))
+        try:
+            while queue:
+                info = heappop(queue)[2]
+                if (events := flushing.pop(info, None)) is None:
+                    continue
+                self._refreshed.add(info)
+                start = time.perf_counter()
+                try:
+                    # The templates are rendered once for all the changes
+                    # with the latest change passed to the entity
+                    *_, event = coalesced = list(events.values())
+                    info._refresh(  # noqa: SLF001
+                        event, coalesced=coalesced if len(coalesced) > 1 else None
+                    )
+                except Exception:
+                    _LOGGER.exception("Error while refreshing templates of %s", info)
+                duration = time.perf_counter() - start
+                entity_id = cast(str, info.entity_id)
+                if (stats := self.stats.get(entity_id)) is None:
+                    stats = self.stats[entity_id] = TemplateRenderStats()
+                stats.refreshes += 1
+                stats.total_time += duration
+                stats.max_time = max(stats.max_time, duration)
+        finally:
+            self._flushing = None
+            queue.clear()
+            self._ranks.clear()
+            self._refreshed.clear()
+
+
+@callback
+def _async_get_template_render_scheduler(
+    hass: HomeAssistant,
+) -> _TemplateRenderScheduler:
+    """Return the template render scheduler."""
+    if (scheduler := hass.data.get(_TEMPLATE_RENDER_SCHEDULER)) is None:
+        scheduler = hass.data[_TEMPLATE_RENDER_SCHEDULER] = _TemplateRenderScheduler(
+            hass
+        )
+    return scheduler
+
+
+@callback
+def async_get_template_render_stats(
+    hass: HomeAssistant,
+) -> dict[str, TemplateRenderStats]:
+    """Return the statistics of the template refreshes by entity_id."""
+    if (scheduler := hass.data.get(_TEMPLATE_RENDER_SCHEDULER)) is None:
+        return {}
+    return scheduler.stats
+
+
 class TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -971,9 +1451,11 @@ class TrackTemplateResultInfo:
         track_templates: Sequence[TrackTemplate],
         action: TrackTemplateResultListener,
         has_super_template: bool = False,
+        entity_id: str | None = None,
     ) -> None:
         """Handle removal / refresh of tracker init."""
         self.hass = hass
+        self.entity_id = entity_id
         self._job = HassJob(action, f"track template result {track_templates}")
 
         self._track_templates = track_templates
@@ -1038,9 +1520,16 @@ class TrackTemplateResultInfo:
                 else:
                     log_fn(logging.ERROR, str(info.exception))
 
+        if self.entity_id is None:
+            action: Callable[[Event[EventStateChangedData]], None] = self._refresh
+        else:
+            scheduler = _async_get_template_render_scheduler(self.hass)
+            action = partial(scheduler.async_schedule_refresh, self)
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass, _render_infos_to_track_states(self._info.values()), action
         )
+        if self.entity_id is not None:
+            scheduler.async_register(self, self.entity_id)
         self._update_time_listeners()
         _LOGGER.debug(
             (
@@ -1091,11 +1580,21 @@ class TrackTemplateResultInfo:
         for template, info in self._info.items():
             self._setup_time_listener(template, info.has_time)
 
+    @property
+    def track_states(self) -> TrackStates:
+        """State changes the templates listen to."""
+        assert self._track_state_changes
+        return self._track_state_changes.track_states
+
     @callback
     def async_remove(self) -> None:
         """Cancel the listener."""
         assert self._track_state_changes
         self._track_state_changes.async_remove()
+        if self.entity_id is not None:
+            _async_get_template_render_scheduler(self.hass).async_unregister(
+                self, self.entity_id
+            )
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
@@ -1110,6 +1609,7 @@ class TrackTemplateResultInfo:
         track_template_: TrackTemplate,
         now: float,
         event: Event[EventStateChangedData] | None,
+        coalesced: Sequence[Event[EventStateChangedData]] | None = None,
     ) -> bool | TrackTemplateResult:
         """Re-render the template if conditions match.
 
@@ -1126,7 +1626,11 @@ class TrackTemplateResultInfo:
         if event:
             info = self._info[template]
 
-            if not _event_triggers_rerender(event, info):
+            if coalesced is not None:
+                if (triggering := _coalesced_triggering_event(coalesced, info)) is None:
+                    return False
+                event = triggering
+            elif not _event_triggers_rerender(event, info):
                 return False
 
             had_timer = self._rate_limit.async_has_timer(template)
@@ -1201,12 +1705,16 @@ class TrackTemplateResultInfo:
         event: Event[EventStateChangedData] | None,
         track_templates: Iterable[TrackTemplate] | None = None,
         replayed: bool | None = False,
+        coalesced: Sequence[Event[EventStateChangedData]] | None = None,
     ) -> None:
         """Refresh the template.
 
         The event is the state_changed event that caused the refresh
         to be considered.
 
+        coalesced is an optional list of the state_changed events
+        ending with event to consider in a single refresh.
+
         track_templates is an optional list of TrackTemplate objects
         to refresh.  If not provided, all tracked templates will be
         considered.
@@ -1225,7 +1733,9 @@ class TrackTemplateResultInfo:
 
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            update = self._render_template_if_ready(
+                super_template, now, event, coalesced
+            )
             info_changed |= self._apply_update(updates, update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
@@ -1252,11 +1762,22 @@ class TrackTemplateResultInfo:
 
         # Then update the remaining templates unless blocked by the super template
         if not block_updates:
+            if event and coalesced is not None:
+                # Apply the results in the order of the changes they were
+                # triggered by as if the changes were refreshed one by one
+                track_templates = sorted(
+                    track_templates,
+                    key=lambda track_template_: _first_triggering_index(
+                        coalesced, self._info.get(track_template_.template)
+                    ),
+                )
             for track_template_ in track_templates:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update = self._render_template_if_ready(
+                    track_template_, now, event, coalesced
+                )
                 info_changed |= self._apply_update(
                     updates, update, track_template_.template
                 )
@@ -1273,6 +1794,8 @@ class TrackTemplateResultInfo:
                     ]
                 )
             )
+            if self.entity_id is not None:
+                _async_get_template_render_scheduler(self.hass).async_update_reads(self)
             _LOGGER.debug(
                 (
                     "Template group %s listens for %s, re-render blocked by super"
@@ -1320,6 +1843,7 @@ def async_track_template_result(
     strict: bool = False,
     log_fn: Callable[[int, str], None] | None = None,
     has_super_template: bool = False,
+    entity_id: str | None = None,
 ) -> TrackTemplateResultInfo:
     """Add a listener that fires when the result of a template changes.
 
@@ -1351,13 +1875,19 @@ def async_track_template_result(
     has_super_template
         When set to True, the first template will block rendering of other
         templates if it doesn't render as True.
+    entity_id
+        The entity whose state the action writes. The templates of entities
+        are refreshed once per event loop iteration after the templates of
+        the entities they read.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = TrackTemplateResultInfo(hass, track_templates, action, has_super_template)
+    tracker = TrackTemplateResultInfo(
+        hass, track_templates, action, has_super_template, entity_id
+    )
     tracker.async_setup(strict=strict, log_fn=log_fn)
     return tracker
 
@@ -1958,6 +2488,37 @@ def _event_triggers_rerender(
     return bool(info.filter_lifecycle(entity_id))
 
 
+@callback
+def _coalesced_triggering_event(
+    events: Sequence[Event[EventStateChangedData]], info: RenderInfo
+) -> Event[EventStateChangedData] | None:
+    """Return the latest event a template should be re-rendered from.
+
+    Events of specifically referenced entities are preferred since
+    they are excluded from the rate limit.
+    """
+    triggering: Event[EventStateChangedData] | None = None
+    for event in reversed(events):
+        if not _event_triggers_rerender(event, info):
+            continue
+        if event.data["entity_id"] in info.entities:
+            return event
+        if triggering is None:
+            triggering = event
+    return triggering
+
+
+def _first_triggering_index(
+    events: Sequence[Event[EventStateChangedData]], info: RenderInfo | None
+) -> int:
+    """Return the index of the first event a template should be re-rendered from."""
+    if info is not None:
+        for index, event in enumerate(events):
+            if _event_triggers_rerender(event, info):
+                return index
+    return len(events)
+
+
 @callback
 def _rate_limit_for_event(
     event: Event[EventStateChangedData],
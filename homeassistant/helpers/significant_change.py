@@ -86,12 +86,12 @@ async def create_checker(
     extra_significant_check: ExtraCheckTypeFunc | None = None,
 ) -> SignificantlyChangedChecker:
     """Create a significantly changed checker for a domain."""
-    await _initialize(hass)
+    await async_initialize(hass)
     return SignificantlyChangedChecker(hass, extra_significant_check)
 
 
 # Marked as singleton so multiple calls all wait for same output.
-async def _initialize(hass: HomeAssistant) -> None:
+async def async_initialize(hass: HomeAssistant) -> None:
     """Initialize the functions."""
     if DATA_FUNCTIONS in hass.data:
         return
@@ -110,6 +110,37 @@ async def _initialize(hass: HomeAssistant) -> None:
     await async_process_integration_platforms(hass, PLATFORM, process_platform)
 
 
+@callback
+def async_is_significant_state_change(
+    hass: HomeAssistant,
+    domain: str,
+    old_state: str,
+    old_attrs: dict[str, Any],
+    new_state: str,
+    new_attrs: dict[str, Any],
+) -> bool:
+    """Return if a state change of an entity in a domain is significant.
+
+    A change is significant unless the significant_change platform
+    of the domain decides it is not.
+    """
+    if new_state in (STATE_UNKNOWN, STATE_UNAVAILABLE) or old_state in (
+        STATE_UNKNOWN,
+        STATE_UNAVAILABLE,
+    ):
+        return new_state != old_state
+
+    if (functions := hass.data.get(DATA_FUNCTIONS)) is None or (
+        check_significantly_changed := functions.get(domain)
+    ) is None:
+        return True
+
+    return (
+        check_significantly_changed(hass, old_state, old_attrs, new_state, new_attrs)
+        is not False
+    )
+
+
 def either_one_none(val1: Any | None, val2: Any | None) -> bool:
     """Test if exactly one value is None."""
     return (val1 is None and val2 is not None) or (val1 is not None and val2 is None)
@@ -11,8 +11,11 @@ from contextlib import AbstractContextManager
 from contextvars import ContextVar
 from datetime import date, datetime, time, timedelta
 from functools import cache, cached_property, lru_cache, partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
 from operator import contains
 import pathlib
@@ -21,6 +24,7 @@ import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import threading
 from types import CodeType, TracebackType
 from typing import Any, Concatenate, Literal, NoReturn, Self, cast, overload
 from urllib.parse import urlencode as urllib_urlencode
@@ -37,6 +41,7 @@ import orjson
 import voluptuous as vol
 
 from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
     ATTR_ENTITY_ID,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
@@ -47,6 +52,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__,
 )
 from homeassistant.core import (
     Context,
@@ -81,6 +87,7 @@ from . import (
     location as loc_helper,
 )
 from .singleton import singleton
+from .storage import Store
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -98,6 +105,12 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_BYTECODE_CACHE: HassKey[TemplateBytecodeCache] = HassKey("template.bytecode_cache")
+
+BYTECODE_CACHE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_CACHE_STORAGE_VERSION = 1
+BYTECODE_CACHE_SAVE_DELAY = 60
+BYTECODE_CACHE_MAX_SIZE = 10000
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -132,8 +145,8 @@ template_cv: ContextVar[tuple[str, str] | None] = ContextVar(
 
 #
 # CACHED_TEMPLATE_STATES is a rough estimate of the number of entities
-# on a typical system. It is used as the initial size of the LRU cache
-# for TemplateState objects.
+# on a typical system. It is used as the initial size of the
+# TemplateStateCache.
 #
 # If the cache is too small we will end up creating and destroying
 # TemplateState objects too often which will cause a lot of GC activity
@@ -142,64 +155,131 @@ template_cv: ContextVar[tuple[str, str] | None] = ContextVar(
 # per minute.
 #
 # Since entity counts may grow over time, we will increase
-# the size if the number of entities grows via _async_adjust_lru_sizes
-# at the start of the system and every 10 minutes if needed.
+# the size if the number of entities or the evictions grow via
+# TemplateStateCache.async_adjust_size at the start of the system
+# and every 10 minutes if needed.
 #
 CACHED_TEMPLATE_STATES = 512
 EVAL_CACHE_SIZE = 512
 
 MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
 
-CACHED_TEMPLATE_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
-CACHED_TEMPLATE_NO_COLLECT_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
 ENTITY_COUNT_GROWTH_FACTOR = 1.2
+# Old State objects stay referenced by templates for a while after they
+# are replaced, the cache may grow up to this factor of the entity count
+# when evictions show the working set does not fit.
+ENTITY_COUNT_MAX_FACTOR = 2
 
 ORJSON_PASSTHROUGH_OPTIONS = (
     orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
 )
 
 
+class TemplateStateCache:
+    """Cache the TemplateState wrappers of State objects.
+
+    Every State has a wrapper that collects the state for the render
+    info and one that does not, created when first handed out. A wrapper
+    never changes whether it collects, so iterating a domain does not
+    affect an entity looked up before. Hits, misses and evictions are
+    counted so the size can follow the measured working set.
+    """
+
+    __slots__ = ("_evictions_at_adjust", "_lru", "evictions", "hits", "misses")
+
+    def __init__(self, size: int) -> None:
+        """Initialize the cache."""
+        self._lru: LRU[State, list[TemplateState | None]] = LRU(
+            size, callback=self._async_evicted
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._evictions_at_adjust = 0
+
+    def _async_evicted(
+        self, state: State, template_states: list[TemplateState | None]
+    ) -> None:
+        """Count an evicted entry."""
+        self.evictions += 1
+
+    def get(self, hass: HomeAssistant, state: State, collect: bool) -> TemplateState:
+        """Return the TemplateState for a state."""
+        if (template_states := self._lru.get(state)) is None:
+            template_states = self._lru[state] = [None, None]
+        elif (template_state := template_states[collect]) is not None:
+            self.hits += 1
+            return template_state
+        self.misses += 1
+        template_state = template_states[collect] = TemplateState(hass, state, collect)
+        return template_state
+
+    @property
+    def size(self) -> int:
+        """Return the maximum number of states in the cache."""
+        return self._lru.get_size()
+
+    def set_size(self, size: int) -> None:
+        """Set the maximum number of states in the cache."""
+        self._lru.set_size(size)
+
+    def async_adjust_size(self, entity_count: int) -> None:
+        """Grow the cache to fit the entities and the measured working set."""
+        size = self._lru.get_size()
+        new_size = round(entity_count * ENTITY_COUNT_GROWTH_FACTOR)
+        evicted = self.evictions - self._evictions_at_adjust
+        self._evictions_at_adjust = self.evictions
+        if evicted:
+            # The working set did not fit, grow by what was evicted
+            new_size = max(
+                new_size,
+                min(size + evicted, round(entity_count * ENTITY_COUNT_MAX_FACTOR)),
+            )
+        if new_size > size:
+            self._lru.set_size(new_size)
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Return the usage statistics of the cache."""
+        requests = self.hits + self.misses
+        return {
+            "states": len(self._lru),
+            "size": self._lru.get_size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+
+TEMPLATE_STATE_CACHE = TemplateStateCache(CACHED_TEMPLATE_STATES)
+
+
 def _template_state_no_collect(hass: HomeAssistant, state: State) -> TemplateState:
     """Return a TemplateState for a state without collecting."""
-    if template_state := CACHED_TEMPLATE_NO_COLLECT_LRU.get(state):
-        return template_state
-    template_state = _create_template_state_no_collect(hass, state)
-    CACHED_TEMPLATE_NO_COLLECT_LRU[state] = template_state
-    return template_state
+    return TEMPLATE_STATE_CACHE.get(hass, state, False)
 
 
 def _template_state(hass: HomeAssistant, state: State) -> TemplateState:
     """Return a TemplateState for a state that collects."""
-    if template_state := CACHED_TEMPLATE_LRU.get(state):
-        return template_state
-    template_state = TemplateState(hass, state)
-    CACHED_TEMPLATE_LRU[state] = template_state
-    return template_state
+    return TEMPLATE_STATE_CACHE.get(hass, state, True)
 
 
 def async_setup(hass: HomeAssistant) -> bool:
-    """Set up tracking the template LRUs."""
+    """Set up tracking the template state cache."""
 
     @callback
-    def _async_adjust_lru_sizes(_: Any) -> None:
-        """Adjust the lru cache sizes."""
-        new_size = int(
-            round(hass.states.async_entity_ids_count() * ENTITY_COUNT_GROWTH_FACTOR)
-        )
-        for lru in (CACHED_TEMPLATE_LRU, CACHED_TEMPLATE_NO_COLLECT_LRU):
-            # There is no typing for LRU
-            current_size = lru.get_size()
-            if new_size > current_size:
-                lru.set_size(new_size)
+    def _async_adjust_cache_size(_: Any) -> None:
+        """Adjust the template state cache size."""
+        TEMPLATE_STATE_CACHE.async_adjust_size(hass.states.async_entity_ids_count())
 
     from .event import (  # pylint: disable=import-outside-toplevel
         async_track_time_interval,
     )
 
     cancel = async_track_time_interval(
-        hass, _async_adjust_lru_sizes, timedelta(minutes=10)
+        hass, _async_adjust_cache_size, timedelta(minutes=10)
     )
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, _async_adjust_lru_sizes)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, _async_adjust_cache_size)
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, callback(lambda _: cancel()))
     return True
 
@@ -1150,9 +1230,6 @@ class TemplateStateFromEntityId(TemplateStateBase):
         return f"<template TemplateStateFromEntityId({self._entity_id})>"
 
 
-_create_template_state_no_collect = partial(TemplateState, collect=False)
-
-
 def _collect_state(hass: HomeAssistant, entity_id: str) -> None:
     if (entity_collect := _render_info.get()) is not None:
         entity_collect.entities.add(entity_id)  # type: ignore[attr-defined]
@@ -1292,6 +1369,66 @@ def expand(hass: HomeAssistant, *args: Any) -> Iterable[State]:
     return list(found.values())
 
 
+def state_values(
+    hass: HomeAssistant,
+    domain: str | None = None,
+    device_class: str | None = None,
+    unit_of_measurement: str | None = None,
+    area: str | None = None,
+) -> list[float]:
+    """Return the numeric states of the entities matching all the filters.
+
+    The entities are looked up in the attribute index of the state
+    machine and the states are read without wrapping them into
+    TemplateStates, so aggregating many states is cheap.
+    """
+    if domain is not None and not valid_domain(domain):
+        raise TemplateError(f"Invalid domain name '{domain}'")
+    states = hass.states
+    candidates: collections.abc.Iterable[str] | None = None
+    for attribute, value in (
+        (ATTR_DEVICE_CLASS, device_class),
+        (ATTR_UNIT_OF_MEASUREMENT, unit_of_measurement),
+    ):
+        if value is None:
+            continue
+        entity_ids = states.async_entity_ids_by_attribute(attribute, value, domain)
+        if candidates is None:
+            candidates = entity_ids
+        else:
+            matching = set(entity_ids)
+            candidates = [
+                entity_id for entity_id in candidates if entity_id in matching
+            ]
+    if candidates is None:
+        candidates = states.async_entity_ids(domain)
+    if area is not None:
+        area_entity_ids = set(area_entities(hass, area))
+        candidates = [
+            entity_id for entity_id in candidates if entity_id in area_entity_ids
+        ]
+
+    if (render_info := _render_info.get()) is not None:
+        # Track every state of the domain so entities whose attributes
+        # start matching the filters re-render the template
+        if domain is None:
+            render_info.all_states = True
+        else:
+            render_info.domains.add(domain)  # type: ignore[attr-defined]
+    values: list[float] = []
+    for entity_id in candidates:
+        if (state := states.get(entity_id)) is None:
+            continue
+        _collect_state(hass, entity_id)
+        try:
+            number = float(state.state)
+        except ValueError:
+            continue
+        if math.isfinite(number):
+            values.append(number)
+    return values
+
+
 def device_entities(hass: HomeAssistant, _device_id: str) -> Iterable[str]:
     """Get entity ids for entities tied to a device."""
     entity_reg = entity_registry.async_get(hass)
@@ -2711,6 +2848,94 @@ def _load_custom_templates(hass: HomeAssistant) -> dict[str, str]:
     return result
 
 
+class TemplateBytecodeCache:
+    """Cache of the compiled code of templates persisted across restarts.
+
+    The code is keyed by a hash of the source and the environment
+    variant. The cache is dropped when Home Assistant or Python is
+    upgraded since the compiled code depends on both.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._store = Store[dict[str, Any]](
+            hass,
+            BYTECODE_CACHE_STORAGE_VERSION,
+            BYTECODE_CACHE_STORAGE_KEY,
+            private=True,
+        )
+        self._build = f"{__version__}-{MAGIC_NUMBER.hex()}"
+        # Encoded code loaded from the store
+        self._stored: dict[str, str] = {}
+        # Encoded code compiled or loaded during this run
+        self._used: dict[str, str] = {}
+
+    async def async_load(self) -> None:
+        """Load the cache."""
+        if (data := await self._store.async_load()) is not None and data.get(
+            "build"
+        ) == self._build:
+            self._stored = data["code"]
+
+    @staticmethod
+    def _key(variant: str, source: str) -> str:
+        """Return the key of a template source."""
+        return f"{variant}-{hashlib.sha256(source.encode()).hexdigest()}"
+
+    def get(self, variant: str, source: str) -> CodeType | None:
+        """Return the compiled code of a template source if cached."""
+        key = self._key(variant, source)
+        if (encoded := self._stored.get(key)) is None:
+            return None
+        try:
+            code = marshal.loads(base64.b64decode(encoded))
+        except (ValueError, EOFError, TypeError):
+            del self._stored[key]
+            return None
+        if not isinstance(code, CodeType):
+            return None
+        self._used[key] = encoded
+        return code
+
+    def add(self, variant: str, source: str, code: CodeType) -> None:
+        """Add the compiled code of a template source.
+
+        This method is safe to call from any thread.
+        """
+        key = self._key(variant, source)
+        self._used[key] = self._stored[key] = base64.b64encode(
+            marshal.dumps(code)
+        ).decode()
+        if self.hass.loop_thread_id == threading.get_ident():
+            self._async_schedule_save()
+        else:
+            self.hass.loop.call_soon_threadsafe(self._async_schedule_save)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule saving the cache."""
+        self._store.async_delay_save(self._data_to_save, BYTECODE_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to save.
+
+        Code not used during this run is dropped when the cache is full.
+        """
+        if len(self._stored) > BYTECODE_CACHE_MAX_SIZE:
+            self._stored = dict(self._used)
+        # Copied since templates may be compiled while the data is written
+        return {"build": self._build, "code": dict(self._stored)}
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the compiled code of the templates from the previous run."""
+    bytecode_cache = TemplateBytecodeCache(hass)
+    await bytecode_cache.async_load()
+    hass.data[_BYTECODE_CACHE] = bytecode_cache
+
+
 @singleton(_HASS_LOADER)
 def _get_hass_loader(hass: HomeAssistant) -> HassLoader:
     return HassLoader({})
@@ -2757,6 +2982,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__(undefined=make_logging_undefined(strict, log_fn))
         self.hass = hass
+        self._variant = "limited" if limited else "strict" if strict else "normal"
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | None
         ] = weakref.WeakValueDictionary()
@@ -2969,6 +3195,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 "is_state",
                 "is_state_attr",
                 "state_attr",
+                "state_values",
                 "states",
                 "state_translated",
                 "has_value",
@@ -3016,6 +3243,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
         self.globals["expand"] = hassfunction(expand)
         self.filters["expand"] = self.globals["expand"]
+        self.globals["state_values"] = hassfunction(state_values)
         self.globals["closest"] = hassfunction(closest)
         self.filters["closest"] = hassfunction(closest_filter)
         self.globals["distance"] = hassfunction(distance)
@@ -3111,7 +3339,17 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
+        if (
+            self.hass is None
+            or not isinstance(source, str)
+            or (bytecode_cache := self.hass.data.get(_BYTECODE_CACHE)) is None
+        ):
+            compiled = super().compile(source)
+        elif (cached := bytecode_cache.get(self._variant, source)) is not None:
+            compiled = cached
+        else:
+            compiled = super().compile(source)
+            bytecode_cache.add(self._variant, source, compiled)
         self.template_cache[source] = compiled
         return compiled
 
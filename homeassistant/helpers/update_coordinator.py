@@ -277,6 +277,14 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_DataT]):
         fails. Additionally logging is handled by config entry setup
         to ensure that multiple retries do not cause log spam.
         """
+        if (entry := self.config_entry) is None:
+            await self._async_first_refresh()
+            return
+        with entry.async_trace_setup_step(self.hass, "first_refresh"):
+            await self._async_first_refresh()
+
+    async def _async_first_refresh(self) -> None:
+        """Refresh data for the first time."""
         if await self.__wrap_async_setup():
             await self._async_refresh(
                 log_failures=False, raise_on_auth_failed=True, raise_on_entry_error=True
@@ -34,6 +34,7 @@ from .helpers.issue_registry import IssueSeverity, async_create_issue
 from .helpers.typing import ConfigType
 from .util.async_ import create_eager_task
 from .util.hass_dict import HassKey
+from .util.startup_trace import StartupTrace
 
 current_setup_group: contextvars.ContextVar[tuple[str, str | None] | None] = (
     contextvars.ContextVar("current_setup_group", default=None)
@@ -72,6 +73,11 @@ DATA_SETUP_TIME: HassKey[
     defaultdict[str, defaultdict[str | None, defaultdict[SetupPhases, float]]]
 ] = HassKey("setup_time")
 
+# DATA_STARTUP_TRACE is the timeline of the setup steps during
+# startup, only recorded when startup tracing is enabled and
+# removed once the trace has been written.
+DATA_STARTUP_TRACE: HassKey[StartupTrace] = HassKey("startup_trace")
+
 DATA_DEPS_REQS: HassKey[set[str]] = HassKey("deps_reqs_processed")
 
 DATA_PERSISTENT_ERRORS: HassKey[dict[str, str | None]] = HassKey(
@@ -331,7 +337,8 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = await integration.async_get_component()
+        with async_trace_setup_step(hass, domain, "import"):
+            component = await integration.async_get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", err)
         return False
@@ -571,10 +578,11 @@ async def async_process_deps_reqs(
     if failed_deps := await _async_process_dependencies(hass, config, integration):
         raise DependencyError(failed_deps)
 
-    async with hass.timeout.async_freeze(integration.domain):
-        await requirements.async_get_integration_with_requirements(
-            hass, integration.domain
-        )
+    with async_trace_setup_step(hass, integration.domain, "requirements"):
+        async with hass.timeout.async_freeze(integration.domain):
+            await requirements.async_get_integration_with_requirements(
+                hass, integration.domain
+            )
 
     processed.add(integration.domain)
 
@@ -709,10 +717,13 @@ def async_pause_setup(hass: core.HomeAssistant, phase: SetupPhases) -> Generator
     try:
         yield
     finally:
-        time_taken = time.monotonic() - started
+        finished = time.monotonic()
+        time_taken = finished - started
         integration, group = running
         # Add negative time for the time we waited
         _setup_times(hass)[integration][group][phase] = -time_taken
+        if (trace := _async_get_startup_trace(hass)) is not None:
+            trace.add_span(phase, integration, group, started, finished)
         _LOGGER.debug(
             "Adding wait for %s for %s (%s) of %.2f",
             phase,
@@ -770,8 +781,11 @@ def async_start_setup(
     try:
         yield
     finally:
-        time_taken = time.monotonic() - started
+        finished = time.monotonic()
+        time_taken = finished - started
         del setup_started[current]
+        if (trace := _async_get_startup_trace(hass)) is not None:
+            trace.add_span(phase, integration, group, started, finished)
         group_setup_times = _setup_times(hass)[integration][group]
         # We may see the phase multiple times if there are multiple
         # platforms, but we only care about the longest time.
@@ -794,6 +808,45 @@ def async_start_setup(
             )
 
 
+@callback
+def async_enable_startup_trace(hass: core.HomeAssistant) -> StartupTrace:
+    """Start recording the timeline of the setup steps during startup."""
+    if (trace := hass.data.get(DATA_STARTUP_TRACE)) is None:
+        trace = hass.data[DATA_STARTUP_TRACE] = StartupTrace()
+    return trace
+
+
+@callback
+def _async_get_startup_trace(hass: core.HomeAssistant) -> StartupTrace | None:
+    """Return the startup trace while Home Assistant is starting."""
+    if hass.state in (core.CoreState.not_running, core.CoreState.starting):
+        return hass.data.get(DATA_STARTUP_TRACE)
+    return None
+
+
+@contextlib.contextmanager
+def async_trace_setup_step(
+    hass: core.HomeAssistant,
+    integration: str,
+    name: str,
+    group: str | None = None,
+) -> Generator[None]:
+    """Record a setup step in the startup trace.
+
+    Nothing is recorded when startup tracing is not enabled
+    or Home Assistant is no longer starting.
+    """
+    if (trace := _async_get_startup_trace(hass)) is None:
+        yield
+        return
+
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        trace.add_span(name, integration, group, started, time.monotonic())
+
+
 @callback
 def async_get_setup_timings(hass: core.HomeAssistant) -> dict[str, float]:
     """Return timing data for each integration."""
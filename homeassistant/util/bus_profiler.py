@@ -0,0 +1,126 @@
+"""Profile the time event bus listeners take per event type."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable
+import functools
+import math
+from typing import TYPE_CHECKING, Any
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from homeassistant.core import HassJob
+
+    from .event_type import EventType
+
+DEFAULT_SAMPLE_SIZE = 256
+
+
+def _callable_name(target: Callable[..., Any]) -> str:
+    """Return the dotted name of a listener callable."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    module = getattr(target, "__module__", None)
+    qualname = getattr(target, "__qualname__", None) or type(target).__qualname__
+    return f"{module}.{qualname}" if module else qualname
+
+
+class ListenerStats:
+    """Call statistics of a listener for an event type.
+
+    The durations of the most recent calls are kept in a ring buffer
+    so percentiles reflect recent behavior in constant memory.
+    """
+
+    __slots__ = ("_durations", "_next", "calls", "max_time", "rejected", "total_time")
+
+    def __init__(self, sample_size: int) -> None:
+        """Initialize the statistics."""
+        self._durations = array("d", bytes(8 * sample_size))
+        self._next = 0
+        self.calls = 0
+        self.rejected = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def add_call(self, duration: float) -> None:
+        """Add the duration of a call."""
+        self.calls += 1
+        self.total_time += duration
+        self.max_time = max(duration, self.max_time)
+        durations = self._durations
+        durations[self._next] = duration
+        self._next = (self._next + 1) % len(durations)
+
+    def percentile(self, percent: float) -> float:
+        """Return a percentile of the recent call durations."""
+        if not (samples := min(self.calls, len(self._durations))):
+            return 0.0
+        recent = sorted(self._durations[:samples])
+        return recent[max(math.ceil(samples * percent / 100) - 1, 0)]
+
+
+class EventBusProfiler:
+    """Collect the statistics of the event bus listeners.
+
+    The statistics are kept by the name of the listener callable so
+    removed listeners are not kept alive and the listeners of all
+    instances of a class are summarized together.
+    """
+
+    __slots__ = ("_names", "_stats", "sample_size")
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE) -> None:
+        """Initialize the profiler."""
+        self.sample_size = sample_size
+        self._stats: dict[EventType[Any] | str, dict[str, ListenerStats]] = {}
+        self._names: WeakKeyDictionary[HassJob[..., Any], str] = WeakKeyDictionary()
+
+    def _listener_stats(
+        self, event_type: EventType[Any] | str, job: HassJob[..., Any]
+    ) -> ListenerStats:
+        """Return the statistics of a listener."""
+        if (name := self._names.get(job)) is None:
+            name = self._names[job] = _callable_name(job.target)
+        if (by_name := self._stats.get(event_type)) is None:
+            by_name = self._stats[event_type] = {}
+        if (stats := by_name.get(name)) is None:
+            stats = by_name[name] = ListenerStats(self.sample_size)
+        return stats
+
+    def add_call(
+        self,
+        event_type: EventType[Any] | str,
+        job: HassJob[..., Any],
+        duration: float,
+    ) -> None:
+        """Add the duration of a listener call."""
+        self._listener_stats(event_type, job).add_call(duration)
+
+    def add_rejected(
+        self, event_type: EventType[Any] | str, job: HassJob[..., Any]
+    ) -> None:
+        """Add an event rejected by the event filter of a listener."""
+        self._listener_stats(event_type, job).rejected += 1
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the statistics ordered by the total time spent."""
+        return sorted(
+            (
+                {
+                    "event_type": event_type,
+                    "listener": name,
+                    "calls": stats.calls,
+                    "rejected": stats.rejected,
+                    "total_time": stats.total_time,
+                    "mean_time": stats.total_time / stats.calls if stats.calls else 0.0,
+                    "p99_time": stats.percentile(99),
+                    "max_time": stats.max_time,
+                }
+                for event_type, by_name in self._stats.items()
+                for name, stats in by_name.items()
+            ),
+            key=lambda listener: listener["total_time"],
+            reverse=True,
+        )
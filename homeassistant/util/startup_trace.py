@@ -0,0 +1,167 @@
+"""Record a timeline of the integration setups during startup."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import time
+from typing import Any
+
+CRITICAL_PATH_LANE = "Critical path"
+TOP_LEVEL_SPANS = ("requirements", "import", "setup")
+
+
+class TraceSpan:
+    """A step of the setup of an integration or config entry."""
+
+    __slots__ = ("end", "group", "integration", "name", "start")
+
+    def __init__(
+        self,
+        name: str,
+        integration: str,
+        group: str | None,
+        start: float,
+        end: float,
+    ) -> None:
+        """Initialize the span."""
+        self.name = name
+        self.integration = integration
+        self.group = group
+        self.start = start
+        self.end = end
+
+
+class StartupTrace:
+    """Collect the setup steps of the integrations during startup.
+
+    The timeline can be exported in the Chrome trace event format
+    which can be opened with Perfetto or chrome://tracing.
+    """
+
+    __slots__ = ("_dependencies", "origin", "spans")
+
+    def __init__(self) -> None:
+        """Initialize the trace."""
+        self.origin = time.monotonic()
+        self.spans: list[TraceSpan] = []
+        self._dependencies: dict[str, set[str]] = {}
+
+    def add_span(
+        self,
+        name: str,
+        integration: str,
+        group: str | None,
+        start: float,
+        end: float,
+    ) -> None:
+        """Add a setup step measured with time.monotonic."""
+        self.spans.append(TraceSpan(name, integration, group, start, end))
+
+    def set_dependencies(self, integration: str, dependencies: Iterable[str]) -> None:
+        """Set the integrations that are set up before an integration."""
+        self._dependencies[integration] = set(dependencies)
+
+    def _integration_bounds(self) -> dict[str, tuple[float, float]]:
+        """Return when the top level setup of each integration started and ended.
+
+        Integrations without a setup step failed before they were
+        set up and are left out.
+        """
+        bounds: dict[str, tuple[float, float]] = {}
+        starts: dict[str, float] = {}
+        for span in self.spans:
+            if span.group is not None or span.name not in TOP_LEVEL_SPANS:
+                continue
+            starts[span.integration] = min(
+                span.start, starts.get(span.integration, span.start)
+            )
+            if span.name == "setup":
+                bounds[span.integration] = (starts[span.integration], span.end)
+        return bounds
+
+    def critical_path(self) -> list[str]:
+        """Return the chain of dependencies that bounded the startup.
+
+        The path ends with the integration that finished setting up last
+        and walks back through the dependency that finished last before
+        each integration could start.
+        """
+        if not (bounds := self._integration_bounds()):
+            return []
+        integration = max(bounds, key=lambda domain: bounds[domain][1])
+        path = [integration]
+        while blocking := [
+            dependency
+            for dependency in self._dependencies.get(integration, ())
+            if dependency in bounds
+            and bounds[dependency][1] <= bounds[integration][0]
+            and dependency not in path
+        ]:
+            integration = max(blocking, key=lambda domain: bounds[domain][1])
+            path.append(integration)
+        path.reverse()
+        return path
+
+    def as_chrome_trace(self) -> dict[str, Any]:
+        """Return the timeline in the Chrome trace event format."""
+        origin = self.origin
+        lanes: dict[tuple[str, str | None], int] = {}
+        events: list[dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": 0,
+                "args": {"name": CRITICAL_PATH_LANE},
+            }
+        ]
+        for span in sorted(self.spans, key=lambda span: span.start):
+            lane_key = (span.integration, span.group)
+            if (tid := lanes.get(lane_key)) is None:
+                tid = lanes[lane_key] = len(lanes) + 1
+                lane_name = span.integration
+                if span.group is not None:
+                    lane_name = f"{lane_name} ({span.group})"
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": 1,
+                        "tid": tid,
+                        "args": {"name": lane_name},
+                    }
+                )
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.integration,
+                    "ph": "X",
+                    "ts": round((span.start - origin) * 1_000_000),
+                    "dur": round((span.end - span.start) * 1_000_000),
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"integration": span.integration, "group": span.group},
+                }
+            )
+        critical_path = self.critical_path()
+        bounds = self._integration_bounds()
+        events.extend(
+            {
+                "name": integration,
+                "cat": "critical_path",
+                "ph": "X",
+                "ts": round((bounds[integration][0] - origin) * 1_000_000),
+                "dur": round(
+                    (bounds[integration][1] - bounds[integration][0]) * 1_000_000
+                ),
+                "pid": 1,
+                "tid": 0,
+                "args": {"integration": integration},
+            }
+            for integration in critical_path
+        )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"critical_path": critical_path},
+        }
@@ -0,0 +1,227 @@
+"""The tests for the recent history cache of the history integration."""
+
+from datetime import timedelta
+from itertools import product
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components import history
+from homeassistant.components.history.cache import (
+    HistoryCache,
+    significant_states_from_histories,
+)
+from homeassistant.components.history.const import HISTORY_CACHE
+from homeassistant.components.recorder import Recorder, history as recorder_history
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
+
+from tests.components.recorder.common import async_wait_recording_done
+from tests.typing import WebSocketGenerator
+
+ENTITY_IDS = ["sensor.power", "climate.living_room", "light.kitchen"]
+
+
+async def _async_set_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Set states with state and attribute only changes."""
+    for state, attributes in (
+        ("1", {"unit_of_measurement": "W"}),
+        ("2", {"unit_of_measurement": "W"}),
+        ("2", {"unit_of_measurement": "kW"}),
+        ("3", {"unit_of_measurement": "kW", "supported_features": 1}),
+        ("3", {"unit_of_measurement": "W"}),
+    ):
+        for entity_id in ENTITY_IDS:
+            hass.states.async_set(entity_id, state, attributes)
+        freezer.tick(timedelta(minutes=1))
+    hass.states.async_remove("light.kitchen")
+    await async_wait_recording_done(hass)
+
+
+def _database_states(hass: HomeAssistant, *args: Any) -> dict[str, Any]:
+    """Return the history from the database in the compressed state format."""
+    return json_loads(
+        json_bytes(
+            recorder_history.get_significant_states(
+                hass, *args[:3], None, *args[3:], True
+            )
+        )
+    )
+
+
+def _cached_states(
+    cache: HistoryCache,
+    start_time_ts: float,
+    end_time_ts: float | None,
+    entity_ids: list[str],
+    *args: bool,
+) -> dict[str, Any] | None:
+    """Return the history from the cache or None if it is not cached."""
+    if (histories := cache.async_get_histories(start_time_ts, entity_ids)) is None:
+        return None
+    return significant_states_from_histories(
+        histories, start_time_ts, end_time_ts, *args
+    )
+
+
+@pytest.mark.parametrize(
+    ("include_start_time_state", "significant_changes_only", "minimal_response"),
+    list(product((True, False), repeat=3)),
+)
+@pytest.mark.parametrize("no_attributes", [True, False])
+async def test_cache_matches_database(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> None:
+    """Test the cache returns the same history as the database."""
+    assert await async_setup_component(
+        hass, history.DOMAIN, {history.DOMAIN: {"cache_max_states": 1000}}
+    )
+    start = dt_util.utcnow()
+    await _async_set_states(hass, freezer)
+    cache = hass.data[HISTORY_CACHE]
+
+    for start_time, end_time in (
+        (start + timedelta(seconds=30), None),
+        (start + timedelta(minutes=1), start + timedelta(minutes=3)),
+        (start + timedelta(minutes=2, seconds=30), dt_util.utcnow()),
+    ):
+        args = (
+            start_time,
+            end_time,
+            ENTITY_IDS,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+        cached = _cached_states(
+            cache,
+            start_time.timestamp(),
+            end_time.timestamp() if end_time else None,
+            *args[2:],
+        )
+        assert cached is not None
+        assert json_loads(json_bytes(cached)) == (
+            await recorder_mock.async_add_executor_job(_database_states, hass, *args)
+        )
+
+    # The history before the first cached state is not known
+    assert (
+        _cached_states(
+            cache, start.timestamp(), None, ENTITY_IDS, True, True, False, False
+        )
+        is None
+    )
+
+
+async def test_cache_seeded_from_database(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the cache is seeded with the history recorded before it was set up."""
+    start = dt_util.utcnow()
+    await _async_set_states(hass, freezer)
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+    freezer.tick(timedelta(minutes=1))
+
+    assert await async_setup_component(
+        hass, history.DOMAIN, {history.DOMAIN: {"cache_max_states": 1000}}
+    )
+    await hass.async_block_till_done()
+    cache = hass.data[HISTORY_CACHE]
+    assert cache.size
+
+    args = (start + timedelta(seconds=30), None, ENTITY_IDS, True, False, False, False)
+    cached = _cached_states(cache, start.timestamp() + 30, *args[1:])
+    assert cached is not None
+    assert json_loads(json_bytes(cached)) == (
+        await recorder_mock.async_add_executor_job(_database_states, hass, *args)
+    )
+
+
+async def test_cache_evicts_least_recently_requested(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the entities requested the longest time ago are evicted."""
+    assert await async_setup_component(
+        hass, history.DOMAIN, {history.DOMAIN: {"cache_max_states": 4}}
+    )
+    cache = hass.data[HISTORY_CACHE]
+    start = dt_util.utcnow().timestamp()
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "1")
+    freezer.tick(timedelta(minutes=1))
+    hass.states.async_set("sensor.one", "2")
+    assert _cached_states(
+        cache, start + 1, None, ["sensor.two"], True, True, False, False
+    ) == {"sensor.two": [{"s": "1", "a": {}, "lu": start + 1}]}
+    hass.states.async_set("sensor.three", "1")
+    assert cache.size == 4
+
+    # sensor.one was created first and never requested
+    hass.states.async_set("sensor.three", "2")
+    assert cache.size == 3
+    assert (
+        _cached_states(cache, start + 1, None, ["sensor.one"], True, True, False, False)
+        is None
+    )
+    assert (
+        _cached_states(cache, start + 1, None, ["sensor.two"], True, True, False, False)
+        is not None
+    )
+
+
+async def test_history_stream_from_cache(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the history stream is answered from the cache."""
+    assert await async_setup_component(
+        hass, history.DOMAIN, {history.DOMAIN: {"cache_max_states": 1000}}
+    )
+    start = dt_util.utcnow()
+    await _async_set_states(hass, freezer)
+
+    client = await hass_ws_client()
+    with patch.object(
+        recorder_history, "get_significant_states"
+    ) as get_significant_states:
+        await client.send_json_auto_id(
+            {
+                "type": "history/stream",
+                "start_time": (start + timedelta(seconds=30)).isoformat(),
+                "entity_ids": ["sensor.power"],
+                "minimal_response": True,
+                "no_attributes": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+    assert not get_significant_states.called
+    assert response["event"]["states"] == {
+        "sensor.power": [
+            {"lu": start.timestamp() + 30, "s": "1"},
+            {"lu": start.timestamp() + 60, "s": "2"},
+            {"lu": start.timestamp() + 180, "s": "3"},
+        ]
+    }
@@ -5,11 +5,12 @@ from datetime import timedelta
 from unittest.mock import ANY, patch
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant.components import history
 from homeassistant.components.history import websocket_api
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder import CONF_DOWNSAMPLE, Recorder
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_state_change_event
@@ -173,6 +174,48 @@ async def test_history_during_period(
     assert sensor_test_history[2]["a"] == {"any": "attr"}
 
 
+@pytest.mark.parametrize("recorder_config", [{CONF_DOWNSAMPLE: True}])
+async def test_history_during_period_max_points(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test history_during_period with max_points returns downsampled history."""
+    now = dt_util.utcnow()
+    start = now.replace(second=0, microsecond=0) + timedelta(minutes=5 - now.minute % 5)
+    freezer.move_to(start)
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    for value in ("10", "30", "20", "15"):
+        hass.states.async_set("sensor.test", value)
+        await async_recorder_block_till_done(hass)
+        freezer.tick(timedelta(minutes=5))
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=20)).isoformat(),
+            "entity_ids": ["sensor.test"],
+            "max_points": 2,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    start_ts = start.timestamp()
+    assert response["result"] == {
+        "sensor.test": [
+            {"s": "30", "lu": start_ts, "min": 10.0, "max": 30.0},
+            {"s": "15", "lu": start_ts + 600, "min": 15.0, "max": 20.0},
+        ]
+    }
+
+
 async def test_history_during_period_impossible_conditions(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -0,0 +1,33 @@
+"""Tests for Home Assistant system health."""
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import template
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+
+
+async def test_system_health_info(hass: HomeAssistant) -> None:
+    """Test system health info endpoint."""
+    assert await async_setup_component(hass, "homeassistant", {})
+    assert await async_setup_component(hass, "system_health", {})
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+
+    with patch.object(
+        template, "TEMPLATE_STATE_CACHE", template.TemplateStateCache(4)
+    ) as cache:
+        for _ in range(3):
+            template.Template(
+                "{{ states.sensor.one.state }}{{ states.sensor.two.state }}", hass
+            ).async_render()
+        info = await get_system_health_info(hass, "homeassistant")
+
+    assert cache.as_dict()["states"] == 2
+    assert info["config_dir"] == hass.config.config_dir
+    assert info["template_cache_usage"] == "2/4"
+    assert info["template_cache_hit_rate"] == "66.7%"
+    assert info["template_cache_evictions"] == 0
@@ -0,0 +1,54 @@
+"""Test the profiler diagnostics."""
+
+from homeassistant.components.profiler.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from tests.common import MockConfigEntry
+from tests.components.diagnostics import get_diagnostics_for_config_entry
+from tests.typing import ClientSessionGenerator
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test the event bus statistics are included in the diagnostics."""
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                "platform": "template",
+                "sensors": {
+                    "double": {
+                        "value_template": "{{ states('sensor.source') | int(0) * 2 }}",
+                    },
+                },
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass.bus.async_listen("test_event", lambda event: None)
+    hass.bus.async_start_profiling()
+    hass.bus.async_fire("test_event")
+    hass.states.async_set("sensor.source", "1")
+    await hass.async_block_till_done()
+
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+    event_bus = diagnostics["event_bus"]
+    assert event_bus["profiling"] is True
+    assert event_bus["sample_size"] == 256
+    assert any(
+        stats["event_type"] == "test_event" and stats["calls"] == 1
+        for stats in event_bus["listeners"]
+    )
+    assert diagnostics["suppressed_state_writes"] == {}
+    assert diagnostics["template_renders"]["sensor.double"]["refreshes"] >= 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
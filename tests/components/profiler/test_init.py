@@ -24,6 +24,7 @@ from homeassistant.components.profiler import (
     SERVICE_LRU_STATS,
     SERVICE_MEMORY,
     SERVICE_SET_ASYNCIO_DEBUG,
+    SERVICE_SET_EVENT_BUS_PROFILING,
     SERVICE_START,
     SERVICE_START_LOG_OBJECT_SOURCES,
     SERVICE_START_LOG_OBJECTS,
@@ -32,11 +33,12 @@ from homeassistant.components.profiler import (
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.typing import WebSocketGenerator
 
 
 async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
@@ -446,3 +448,75 @@ async def test_set_asyncio_debug(
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_event_bus_profiling(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test profiling the event bus listeners."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_SET_EVENT_BUS_PROFILING)
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/event_bus_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "profiling": False,
+        "sample_size": None,
+        "listeners": [],
+    }
+
+    with pytest.raises(HomeAssistantError, match="Event bus profiling not running"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_EVENT_BUS_PROFILING,
+            {CONF_ENABLED: False},
+            blocking=True,
+        )
+
+    @callback
+    def _listener(event: Event) -> None:
+        """Listen to the test event."""
+
+    hass.bus.async_listen("test_event", _listener)
+    await hass.services.async_call(
+        DOMAIN, SERVICE_SET_EVENT_BUS_PROFILING, {}, blocking=True
+    )
+    assert hass.bus.profiler is not None
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    await client.send_json_auto_id({"type": "profiler/event_bus_stats", "limit": 50})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["profiling"] is True
+    [stats] = [
+        stats
+        for stats in response["result"]["listeners"]
+        if stats["event_type"] == "test_event"
+    ]
+    assert stats["listener"].endswith("test_event_bus_profiling.<locals>._listener")
+    assert stats["calls"] == 2
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_SET_EVENT_BUS_PROFILING, {CONF_ENABLED: False}, blocking=True
+    )
+    assert hass.bus.profiler is None
+    assert "test_event_bus_profiling.<locals>._listener for test_event" in caplog.text
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_SET_EVENT_BUS_PROFILING, {}, blocking=True
+    )
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.bus.profiler is None
@@ -0,0 +1,126 @@
+"""Test the event loop lag monitor of the profiler."""
+
+import asyncio
+from functools import partial
+import time
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.profiler.const import DOMAIN, LOOP_MONITOR
+from homeassistant.components.profiler.loop_monitor import LoopLagMonitor
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er, issue_registry as ir
+from homeassistant.helpers.entity_component import async_update_entity
+from homeassistant.helpers.frame import IntegrationFrame
+
+from tests.common import MockConfigEntry
+from tests.typing import WebSocketGenerator
+
+
+def _integration_frame(**kwargs) -> IntegrationFrame:
+    """Attribute every sampled stack to the hue integration."""
+    return IntegrationFrame(
+        custom_integration=False,
+        integration="hue",
+        module="homeassistant.components.hue.light",
+        relative_filename="homeassistant/components/hue/light.py",
+        frame=kwargs["frame"],
+    )
+
+
+@pytest.fixture(autouse=True)
+def fast_loop_monitor():
+    """Measure the event loop lag with a short interval and threshold."""
+    with patch(
+        "homeassistant.components.profiler.LoopLagMonitor",
+        partial(LoopLagMonitor, interval=0.02, stall_threshold=0.1),
+    ):
+        yield
+
+
+async def _async_block_loop(seconds: float) -> None:
+    """Block the event loop and let the monitor measure it."""
+    time.sleep(seconds)  # noqa: ASYNC251
+    await asyncio.sleep(0.05)
+
+
+async def test_loop_stall(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    issue_registry: ir.IssueRegistry,
+    hass_ws_client: WebSocketGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a stall is attributed and reported by the issue, sensor and websocket."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    monitor: LoopLagMonitor = hass.data[DOMAIN][LOOP_MONITOR]
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/subscribe_loop_stalls"})
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert response["event"]["stalls"] == []
+    assert response["event"]["stall_threshold"] == 0.1
+
+    with patch(
+        "homeassistant.components.profiler.loop_monitor.get_integration_frame",
+        side_effect=_integration_frame,
+    ):
+        await _async_block_loop(0.4)
+
+    [stall] = monitor.stalls
+    assert stall.lag >= 0.3
+    assert stall.integration == "hue"
+    assert stall.task is not None
+    assert any("_async_block_loop" in line for line in stall.stack)
+    assert "Detected that integration 'hue' blocked the event loop" in caplog.text
+
+    response = await client.receive_json()
+    assert response["event"]["stalls"] == [stall.as_dict()]
+
+    issue = issue_registry.async_get_issue(DOMAIN, "loop_stall_hue")
+    assert issue is not None
+    assert issue.translation_placeholders["integration"] == "hue"
+
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_event_loop_lag"
+    )
+    assert entity_id is not None
+    await async_update_entity(hass, entity_id)
+    assert float(hass.states.get(entity_id).state) >= 0.3
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_loop_stall_not_attributed(
+    hass: HomeAssistant, issue_registry: ir.IssueRegistry
+) -> None:
+    """Test a stall outside of an integration does not create an issue."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    monitor: LoopLagMonitor = hass.data[DOMAIN][LOOP_MONITOR]
+
+    await _async_block_loop(0.4)
+    [stall] = monitor.stalls
+    assert stall.integration is None
+    assert not issue_registry.issues
+
+    # The watchdog thread is joined in the executor
+    thread = monitor._thread
+    assert thread is not None
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as add_executor_job:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    add_executor_job.assert_any_call(thread.join)
+    assert monitor._thread is None
+    assert not thread.is_alive()
@@ -8,16 +8,23 @@ import json
 from unittest.mock import patch, sentinel
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 from sqlalchemy import text
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder import Recorder, get_instance, history
+from homeassistant.components.recorder import (
+    CONF_DOWNSAMPLE,
+    Recorder,
+    get_instance,
+    history,
+)
 from homeassistant.components.recorder.db_schema import (
     Events,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesBuckets,
     StatesMeta,
 )
 from homeassistant.components.recorder.filters import Filters
@@ -1220,6 +1227,119 @@ async def test_get_full_significant_states_past_year_2038(
     assert sensor_one_states[0].last_updated == past_2038_time
 
 
+@pytest.mark.parametrize("recorder_config", [{CONF_DOWNSAMPLE: True}])
+async def test_get_downsampled_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test getting downsampled states from the states buckets."""
+    start = dt_util.parse_datetime("2024-01-01 00:00:00+00:00")
+    freezer.move_to(start)
+    # Two states in the first bucket, one in the second and one in the fourth
+    for offset, temperature, mode in (
+        (0, "10", "on"),
+        (60, "30", "off"),
+        (360, "20", "on"),
+        (960, "15", "off"),
+    ):
+        freezer.move_to(start + timedelta(seconds=offset))
+        hass.states.async_set("sensor.temperature", temperature)
+        hass.states.async_set("sensor.mode", mode)
+        await async_wait_recording_done(hass)
+
+    def _get_buckets():
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                (row.bucket_start_ts, row.count, row.first_state, row.last_state)
+                for row in session.query(StatesBuckets)
+                .join(StatesMeta, StatesBuckets.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == "sensor.temperature")
+                .order_by(StatesBuckets.bucket_start_ts)
+            ]
+
+    start_ts = start.timestamp()
+    instance = recorder.get_instance(hass)
+    assert await instance.async_add_executor_job(_get_buckets) == [
+        (start_ts, 2, "10", "30"),
+        (start_ts + 300, 1, "20", "20"),
+        (start_ts + 900, 1, "15", "15"),
+    ]
+
+    entity_ids = ["sensor.temperature", "sensor.mode"]
+    assert await instance.async_add_executor_job(
+        history.get_downsampled_states,
+        hass,
+        start,
+        start + timedelta(minutes=20),
+        entity_ids,
+        2,
+    ) == {
+        "sensor.temperature": [
+            {"s": "20", "lu": start_ts, "min": 10.0, "max": 30.0},
+            {"s": "15", "lu": start_ts + 600, "min": 15.0, "max": 15.0},
+        ],
+        "sensor.mode": [
+            {"s": "on", "lu": start_ts},
+            {"s": "off", "lu": start_ts + 600},
+        ],
+    }
+
+    # The start state comes from the last bucket before the period
+    period_start = start + timedelta(minutes=10)
+    assert await instance.async_add_executor_job(
+        history.get_downsampled_states,
+        hass,
+        period_start,
+        start + timedelta(minutes=20),
+        entity_ids,
+        10,
+    ) == {
+        "sensor.temperature": [
+            {"s": "20", "lu": start_ts + 600},
+            {"s": "15", "lu": start_ts + 900, "min": 15.0, "max": 15.0},
+        ],
+        "sensor.mode": [
+            {"s": "on", "lu": start_ts + 600},
+            {"s": "off", "lu": start_ts + 900},
+        ],
+    }
+    assert (
+        await instance.async_add_executor_job(
+            history.get_downsampled_states,
+            hass,
+            start,
+            None,
+            ["sensor.not_recorded"],
+            10,
+        )
+        == {}
+    )
+
+
+async def test_get_downsampled_states_disabled(hass: HomeAssistant) -> None:
+    """Test no states buckets are written unless downsampling is enabled."""
+    hass.states.async_set("sensor.temperature", "10")
+    await async_wait_recording_done(hass)
+
+    def _count_buckets() -> int:
+        with session_scope(hass=hass, read_only=True) as session:
+            return session.query(StatesBuckets).count()
+
+    instance = recorder.get_instance(hass)
+    assert instance.states_buckets_manager is None
+    assert await instance.async_add_executor_job(_count_buckets) == 0
+    assert (
+        await instance.async_add_executor_job(
+            history.get_downsampled_states,
+            hass,
+            dt_util.utcnow() - timedelta(hours=1),
+            None,
+            ["sensor.temperature"],
+            10,
+        )
+        == {}
+    )
+
+
 async def test_get_significant_states_without_entity_ids_raises(
     hass: HomeAssistant,
 ) -> None:
@@ -20,6 +20,7 @@ from homeassistant.components import recorder
 from homeassistant.components.recorder import (
     CONF_AUTO_PURGE,
     CONF_AUTO_REPACK,
+    CONF_BULK_INSERT,
     CONF_COMMIT_INTERVAL,
     CONF_DB_MAX_RETRIES,
     CONF_DB_RETRY_WAIT,
@@ -1469,6 +1470,63 @@ async def test_saving_sets_old_state(hass: HomeAssistant, setup_recorder: None)
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+@pytest.mark.parametrize("recorder_config", [{CONF_BULK_INSERT: True}])
+async def test_saving_states_with_bulk_insert(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test saving states with bulk inserts links old states and attributes."""
+    instance = recorder.get_instance(hass)
+    assert instance._bulk_insert_states is True
+
+    hass.states.async_set("test.one", "s1", {"unit": "W"})
+    hass.states.async_set("test.two", "s2", {"unit": "W"})
+    hass.states.async_set("test.one", "s3", {"unit": "W"})
+    hass.states.async_set("test.one", "s4", {"unit": "kW"})
+    hass.states.async_remove("test.two")
+    await async_wait_recording_done(hass)
+    hass.states.async_set("test.one", "s5", {"unit": "W"})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                StateAttributes.shared_attrs,
+            )
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes,
+                States.attributes_id == StateAttributes.attributes_id,
+            )
+        )
+        assert len(states) == 6
+        states_by_state = {state.state: state for state in states}
+
+        assert states_by_state["s1"].entity_id == "test.one"
+        assert states_by_state["s2"].entity_id == "test.two"
+        assert states_by_state[None].entity_id == "test.two"
+        assert states_by_state["s5"].entity_id == "test.one"
+
+        assert states_by_state["s1"].old_state_id is None
+        assert states_by_state["s2"].old_state_id is None
+        assert states_by_state["s3"].old_state_id == states_by_state["s1"].state_id
+        assert states_by_state["s4"].old_state_id == states_by_state["s3"].state_id
+        assert states_by_state[None].old_state_id == states_by_state["s2"].state_id
+        assert states_by_state["s5"].old_state_id == states_by_state["s4"].state_id
+
+        assert json_loads(states_by_state["s1"].shared_attrs) == {"unit": "W"}
+        assert json_loads(states_by_state["s4"].shared_attrs) == {"unit": "kW"}
+        assert json_loads(states_by_state["s5"].shared_attrs) == {"unit": "W"}
+        assert json_loads(states_by_state[None].shared_attrs) == {}
+        assert session.query(StateAttributes).count() == 3
+
+    assert "test.two" not in instance.states_manager._last_committed_id
+    assert not instance.states_manager.pending_batch
+
+
 async def test_saving_state_with_serializable_data(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture, setup_recorder: None
 ) -> None:
@@ -690,6 +690,42 @@ def test_forgiving_add_column(recorder_db_url: str) -> None:
     engine.dispose()
 
 
+def test_add_states_buckets_table(recorder_db_url: str) -> None:
+    """Test the migration to schema 48 adds the states_buckets table."""
+    engine = create_engine(recorder_db_url, poolclass=StaticPool)
+    db_schema.Base.metadata.create_all(engine)
+    db_schema.StatesBuckets.__table__.drop(engine)
+    session_maker = Mock(side_effect=lambda: Session(engine))
+    migration._apply_update(Mock(), Mock(), engine, session_maker, 48, 47)
+    assert "states_buckets" in inspect(engine).get_table_names()
+    # The table is not added again
+    migration._apply_update(Mock(), Mock(), engine, session_maker, 48, 47)
+    engine.dispose()
+
+
+def test_add_statistics_rollup_tables(recorder_db_url: str) -> None:
+    """Test the migration to schema 49 adds the statistics rollup tables."""
+    engine = create_engine(recorder_db_url, poolclass=StaticPool)
+    db_schema.Base.metadata.create_all(engine)
+    rollup_tables = (
+        db_schema.StatisticsDay,
+        db_schema.StatisticsWeek,
+        db_schema.StatisticsMonth,
+    )
+    for table in rollup_tables:
+        table.__table__.drop(engine)
+    session_maker = Mock(side_effect=lambda: Session(engine))
+    migration._apply_update(Mock(), Mock(), engine, session_maker, 49, 48)
+    assert {
+        "statistics_day",
+        "statistics_week",
+        "statistics_month",
+    } <= set(inspect(engine).get_table_names())
+    # The tables are not added again
+    migration._apply_update(Mock(), Mock(), engine, session_maker, 49, 48)
+    engine.dispose()
+
+
 def test_forgiving_add_index(recorder_db_url: str) -> None:
     """Test that add index will continue if index exists."""
     engine = create_engine(recorder_db_url, poolclass=StaticPool)
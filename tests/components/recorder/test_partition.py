@@ -0,0 +1,115 @@
+"""Test the tables partitioned by day."""
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import MetaData
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.db_schema import Base
+from homeassistant.components.recorder.partition import (
+    _create_table_statements,
+    _days_ahead,
+    _partitioned_table,
+)
+
+DAYS = [datetime(2024, 10, 1, tzinfo=UTC), datetime(2024, 10, 2, tzinfo=UTC)]
+
+
+def _statements(table_name: str, dialect_name: SupportedDialect) -> list[str]:
+    """Return the statements to create a partitioned table."""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    table = _partitioned_table(metadata, table_name, dialect_name)
+    return _create_table_statements(table, dialect_name, DAYS)
+
+
+def test_partitioned_tables_postgresql() -> None:
+    """Test creating the partitioned tables for PostgreSQL."""
+    statements = _statements("states", SupportedDialect.POSTGRESQL)
+    create_table = statements[1]
+    assert statements[0] == "CREATE SEQUENCE states_state_id_seq"
+    assert "nextval('states_state_id_seq')" in create_table
+    assert "PRIMARY KEY (state_id, last_updated_ts)" in create_table
+    assert create_table.endswith("PARTITION BY RANGE (last_updated_ts)")
+    # Foreign keys to the partitioned tables are not supported
+    assert "REFERENCES states " not in create_table
+    assert "REFERENCES events " not in create_table
+    assert "REFERENCES state_attributes (attributes_id)" in create_table
+    assert "CREATE TABLE states_default PARTITION OF states DEFAULT" in statements
+    assert (
+        "CREATE TABLE IF NOT EXISTS states_p20241001 PARTITION OF states"
+        " FOR VALUES FROM (1727740800.0) TO (1727827200.0)"
+    ) in statements
+    assert "CREATE INDEX ix_states_last_updated_ts ON states (last_updated_ts)" in (
+        statements
+    )
+
+
+@pytest.mark.parametrize(
+    ("table_name", "id_column"),
+    [
+        ("states", "state_id"),
+        ("events", "event_id"),
+        ("statistics_short_term", "id"),
+    ],
+)
+def test_partitioned_tables_postgresql_id_column(
+    table_name: str, id_column: str
+) -> None:
+    """Test the id column of a partitioned table only defaults to the sequence."""
+    create_table = _statements(table_name, SupportedDialect.POSTGRESQL)[1]
+    column_definitions = [
+        line.strip().rstrip(",") for line in create_table.splitlines()[1:]
+    ]
+    assert column_definitions[0] == (
+        f"{id_column} BIGINT DEFAULT nextval('{table_name}_{id_column}_seq')"
+        " NOT NULL"
+    )
+    assert "IDENTITY" not in create_table
+
+
+def test_partitioned_tables_mysql() -> None:
+    """Test creating the partitioned tables for MySQL."""
+    statements = _statements("statistics_short_term", SupportedDialect.MYSQL)
+    create_table = statements[0]
+    assert (
+        "partition_day INTEGER GENERATED ALWAYS AS (FLOOR(start_ts / 86400))"
+        " STORED NOT NULL"
+    ) in create_table
+    assert "id BIGINT NOT NULL AUTO_INCREMENT" in create_table
+    assert "PRIMARY KEY (id, partition_day)" in create_table
+    assert "FOREIGN KEY" not in create_table
+    assert create_table.endswith(
+        "PARTITION BY RANGE (partition_day) ("
+        "PARTITION p20241001 VALUES LESS THAN (19998), "
+        "PARTITION p20241002 VALUES LESS THAN (19999), "
+        "PARTITION pmax VALUES LESS THAN MAXVALUE)"
+    )
+    # Unique indexes have to include the partition key
+    assert (
+        "CREATE UNIQUE INDEX ix_statistics_short_term_statistic_id_start_ts"
+        " ON statistics_short_term (metadata_id, start_ts, partition_day)"
+    ) in statements
+
+
+def test_days_ahead() -> None:
+    """Test partitions are kept from yesterday until a week ahead."""
+    days = _days_ahead(datetime(2024, 10, 2, 13, 30, tzinfo=UTC))
+    assert days[0] == datetime(2024, 10, 1, tzinfo=UTC)
+    assert days[-1] == datetime(2024, 10, 8, tzinfo=UTC)
+    assert len(days) == 8
+
+
+@pytest.mark.parametrize("recorder_config", [{"partition_by_day": True}])
+async def test_partition_by_day_sqlite(
+    recorder_mock: Recorder, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test partitioning is not supported with SQLite."""
+    assert recorder_mock.partition_by_day is True
+    assert recorder_mock.partitioned_tables == set()
+    assert "Partitioning tables by day is only supported with" in "".join(
+        record.message for record in caplog.get_records("setup")
+    )
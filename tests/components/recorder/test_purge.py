@@ -3,29 +3,49 @@
 from collections.abc import Generator
 from datetime import datetime, timedelta
 import json
+from pathlib import Path
 import sqlite3
 from unittest.mock import patch
 
 from freezegun import freeze_time
 import pytest
+from sqlalchemy import select
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
 
-from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
-from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder import (
+    CONF_DOWNSAMPLE,
+    DOMAIN as RECORDER_DOMAIN,
+    Recorder,
+)
+from homeassistant.components.recorder.archive import (
+    StatesArchive,
+    StatesPartitionReader,
+)
+from homeassistant.components.recorder.const import (
+    STATES_BUCKET_SECONDS,
+    SupportedDialect,
+)
 from homeassistant.components.recorder.db_schema import (
     Events,
     EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesBuckets,
     StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    DEFAULT_EVENTS_BATCHES_PER_PURGE,
+    DEFAULT_STATES_BATCHES_PER_PURGE,
+    PURGE_CYCLE_TARGET_SECONDS,
+    PurgeProgress,
+    purge_old_data,
+)
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -206,6 +226,236 @@ async def test_purge_old_states(hass: HomeAssistant, recorder_mock: Recorder) ->
         assert state_attributes.count() == 3
 
 
+async def test_purge_old_states_with_archive(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> None:
+    """Test old states are archived before they are purged."""
+    recorder_mock.states_archive = StatesArchive(str(tmp_path))
+    await _add_test_states(hass)
+    start_time = dt_util.utcnow() - timedelta(days=12)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    # Write several row groups per partition
+    with patch("homeassistant.components.recorder.archive.ROW_GROUP_SIZE", 1):
+        while not purge_old_data(recorder_mock, purge_before, repack=False):
+            pass
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        assert states.count() == 2
+        assert {state.state for state in states} == {"dontpurgeme_4", "dontpurgeme_5"}
+
+    partitions = list((tmp_path / "states").iterdir())
+    assert len(partitions) == 2
+    readers = [StatesPartitionReader(str(path)) for path in partitions]
+    assert sum(reader.rows for reader in readers) == 4
+    assert all(len(reader.row_groups) == reader.rows for reader in readers)
+    for reader in readers:
+        reader.close()
+
+    hist = await recorder_mock.async_add_executor_job(
+        get_significant_states, hass, start_time, None, ["test.recorder2"]
+    )
+    assert [state.state for state in hist["test.recorder2"]] == [
+        "autopurgeme_0",
+        "autopurgeme_1",
+        "purgeme_2",
+        "purgeme_3",
+        "dontpurgeme_4",
+        "dontpurgeme_5",
+    ]
+    assert hist["test.recorder2"][2].attributes == {
+        "purgeme": True,
+        "test_attr": 5,
+        "test_attr_10": "nice",
+    }
+
+    # Only the archive has states in the requested period
+    hist = await recorder_mock.async_add_executor_job(
+        get_significant_states,
+        hass,
+        start_time + timedelta(days=2),
+        purge_before,
+        ["test.recorder2"],
+    )
+    assert [state.state for state in hist["test.recorder2"]] == [
+        "autopurgeme_1",
+        "purgeme_2",
+        "purgeme_3",
+    ]
+
+    # Purging again does not rewrite the archive
+    with patch.object(StatesArchive, "archive_day") as archive_day_mock:
+        assert purge_old_data(recorder_mock, purge_before, repack=False)
+    assert not archive_day_mock.called
+
+
+async def test_purge_drops_partitions(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test partitions before the purge point are dropped instead of purged."""
+    await _add_test_states(hass)
+    eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+    with freeze_time(eleven_days_ago):
+        hass.states.async_set("test.idle", "on", {"idle": True})
+        await async_wait_recording_done(hass)
+    hass.states.async_set("test.idle", "off", {"idle": True})
+    await async_wait_recording_done(hass)
+    with session_scope(hass=hass) as session:
+        assert (
+            session.query(States).filter(States.state == "off").one().old_state_id
+            is not None
+        )
+    idle_partition_day = eleven_days_ago.replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    recorder_mock.partitioned_tables = {"states"}
+
+    def _drop_partition(connection, dialect_name, table_name, partition_name):
+        start_ts = idle_partition_day.timestamp()
+        in_partition = (
+            select(States.state_id)
+            .where(States.last_updated_ts >= start_ts)
+            .where(States.last_updated_ts < start_ts + 86400)
+        )
+        # The later states must already be disconnected from the dropped ones
+        assert not connection.execute(
+            select(States.state_id)
+            .where(States.last_updated_ts >= start_ts + 86400)
+            .where(States.old_state_id.in_(in_partition))
+        ).all()
+        connection.execute(
+            States.__table__.delete()
+            .where(States.last_updated_ts >= start_ts)
+            .where(States.last_updated_ts < start_ts + 86400)
+        )
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with (
+        patch(
+            "homeassistant.components.recorder.purge.find_partitions_to_drop",
+            return_value=[("p_idle", idle_partition_day)],
+        ) as find_partitions_mock,
+        patch(
+            "homeassistant.components.recorder.purge.drop_partition",
+            side_effect=_drop_partition,
+        ) as drop_partition_mock,
+    ):
+        assert purge_old_data(recorder_mock, purge_before, repack=False)
+
+    assert find_partitions_mock.call_args[0][2:] == ("states", purge_before)
+    assert drop_partition_mock.call_args[0][2:] == ("states", "p_idle")
+    committed_state_id = recorder_mock.states_manager.pop_committed("test.idle")
+    with session_scope(hass=hass) as session:
+        assert {state.state for state in session.query(States)} == {
+            "dontpurgeme_4",
+            "dontpurgeme_5",
+            "off",
+        }
+        later_state = session.query(States).filter(States.state == "off").one()
+        # The later state is disconnected from the dropped state
+        assert later_state.old_state_id is None
+        assert committed_state_id == later_state.state_id
+        # The attributes only used by dropped and purged states are removed
+        assert session.query(StateAttributes).count() == 2
+
+
+async def test_purge_progress(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test the progress of a purge is tracked."""
+    await _add_test_states(hass)
+    await async_wait_recording_done(hass)
+    purge_progress = recorder_mock.purge_progress
+    assert purge_progress.as_dict() == {
+        "in_progress": False,
+        "purge_before": None,
+        "started": None,
+        "finished": None,
+        "deleted_rows": {},
+        "rows_per_second": 0.0,
+        "states_batch_size": DEFAULT_STATES_BATCHES_PER_PURGE,
+        "events_batch_size": DEFAULT_EVENTS_BATCHES_PER_PURGE,
+    }
+
+    progress_updates = []
+    unsub = purge_progress.async_subscribe(progress_updates.append)
+    await hass.services.async_call(RECORDER_DOMAIN, SERVICE_PURGE, {"keep_days": 4})
+    await hass.async_block_till_done()
+    await async_wait_purge_done(hass)
+    await hass.async_block_till_done()
+    unsub()
+
+    progress = purge_progress.as_dict()
+    assert progress["in_progress"] is False
+    assert progress["finished"] is not None
+    assert progress["deleted_rows"] == {"states": 4, "state_attributes": 2}
+    assert progress_updates[-1] == progress
+
+
+async def test_purge_progress_pace(hass: HomeAssistant) -> None:
+    """Test the batch size and throttling of purge cycles."""
+    purge_progress = PurgeProgress(hass, 1000)
+    purge_progress.start(dt_util.utcnow())
+
+    # A slow cycle halves the batches
+    purge_progress.add_deleted_rows("states", 500)
+    assert purge_progress.end_cycle(PURGE_CYCLE_TARGET_SECONDS * 2, False) == 0
+    assert purge_progress.states_batch_size == DEFAULT_STATES_BATCHES_PER_PURGE // 2
+    assert purge_progress.events_batch_size == DEFAULT_EVENTS_BATCHES_PER_PURGE // 2
+
+    # A fast cycle doubles them and waits to stay under the budget
+    purge_progress.add_deleted_rows("states", 2000)
+    assert purge_progress.end_cycle(0.1, False) == pytest.approx(1.9)
+    assert purge_progress.states_batch_size == DEFAULT_STATES_BATCHES_PER_PURGE
+    assert purge_progress.events_batch_size == DEFAULT_EVENTS_BATCHES_PER_PURGE - 1
+
+    # No wait after the last cycle
+    purge_progress.add_deleted_rows("events", 2000)
+    assert purge_progress.end_cycle(0.1, True) == 0
+    assert not purge_progress.in_progress
+    assert purge_progress.deleted_rows == {"states": 2500, "events": 2000}
+
+
+@pytest.mark.parametrize("recorder_config", [{CONF_DOWNSAMPLE: True}])
+async def test_purge_old_states_buckets(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test states buckets that ended before the purge point are purged."""
+    hass.states.async_set("sensor.test", "1")
+    await async_wait_recording_done(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    purge_before_ts = purge_before.timestamp()
+
+    with session_scope(hass=hass) as session:
+        metadata_id = session.query(StatesMeta.metadata_id).scalar()
+        session.add_all(
+            StatesBuckets(
+                metadata_id=metadata_id,
+                bucket_start_ts=bucket_start_ts,
+                count=1,
+                first_state="0",
+                last_state="0",
+            )
+            for bucket_start_ts in (
+                purge_before_ts - 86400,
+                purge_before_ts - STATES_BUCKET_SECONDS,
+                # Ends after the purge point
+                purge_before_ts - STATES_BUCKET_SECONDS + 1,
+            )
+        )
+
+    assert purge_old_data(recorder_mock, purge_before, repack=False)
+
+    with session_scope(hass=hass) as session:
+        assert [
+            bucket_start_ts
+            for (bucket_start_ts,) in session.query(StatesBuckets.bucket_start_ts)
+            .filter(StatesBuckets.bucket_start_ts < purge_before_ts)
+            .order_by(StatesBuckets.bucket_start_ts)
+        ] == [purge_before_ts - STATES_BUCKET_SECONDS + 1]
+        # The bucket of the current state is kept
+        assert session.query(StatesBuckets).count() == 2
+
+
 @pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
 @pytest.mark.usefixtures("recorder_mock", "skip_by_db_engine")
 async def test_purge_old_states_encouters_database_corruption(
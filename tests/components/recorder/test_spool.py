@@ -0,0 +1,180 @@
+"""Test the recorder event spool."""
+
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import Events, States
+from homeassistant.components.recorder.spool import EventSpool, read_segment
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, HomeAssistant, State
+from homeassistant.helpers.entity import StateInfo
+from homeassistant.helpers.json import json_bytes
+
+from .common import async_wait_recording_done
+
+from tests.common import async_fire_time_changed
+
+
+def _state_changed_event(entity_id: str, old: str, new: str) -> Event:
+    """Return a state_changed event."""
+    context = Context(user_id="b9eed9ac93b24a8a8f4e1e8e7d3d1e5a")
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": State(entity_id, old, {"unit": "W"}, context=context),
+            "new_state": State(entity_id, new, {"unit": "W"}, context=context),
+        },
+        EventOrigin.remote,
+        context=context,
+    )
+
+
+def test_spool_round_trip(tmp_path: Path) -> None:
+    """Test events are read back from the spool as they were appended."""
+    spool = EventSpool(str(tmp_path))
+    state_changed = _state_changed_event("sensor.power", "1", "2")
+    other = Event("test_event", {"value": [1, 2]})
+    assert spool.append(state_changed)
+    assert spool.append(other)
+
+    [(path, events)] = list(spool.replay())
+    assert [json_bytes(event) for event in events] == [
+        json_bytes(state_changed),
+        json_bytes(other),
+    ]
+    assert isinstance(events[0].data["new_state"], State)
+    assert events[0].origin is EventOrigin.remote
+
+    spool.remove(path)
+    assert len(spool) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spool_unrecorded_attributes(tmp_path: Path) -> None:
+    """Test the attributes that are not recorded are not spooled."""
+    spool = EventSpool(str(tmp_path))
+    state_info: StateInfo = {"unrecorded_attributes": frozenset({"forecast"})}
+    new_state = State(
+        "weather.home",
+        "sunny",
+        {"temperature": 20, "forecast": [1, 2]},
+        state_info=state_info,
+    )
+    event = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "weather.home", "old_state": None, "new_state": new_state},
+    )
+    assert spool.put(event)
+    assert not spool.put(event)
+    assert spool.write_pending()
+
+    [(_, events)] = list(spool.replay())
+    assert len(events) == 2
+    assert events[0].data["old_state"] is None
+    assert events[0].data["new_state"].attributes == {"temperature": 20}
+    assert events[0].data["new_state"].last_updated == new_state.last_updated
+
+
+def test_spool_segments(tmp_path: Path) -> None:
+    """Test the spool rolls over to new segments until it is full."""
+    spool = EventSpool(str(tmp_path), segment_size=256, max_segments=2)
+    event = Event("test_event", {"value": "x"})
+    appended = 0
+    while spool.append(event):
+        appended += 1
+    assert len(spool) == 2
+    assert appended > 2
+
+    segments = spool.seal()
+    assert sum(len(read_segment(path)) for path in segments) == appended
+
+    # Segments left over are found when the spool is loaded again
+    spool.close()
+    assert not spool.append(event)
+    reloaded = EventSpool(str(tmp_path))
+    reloaded.load()
+    assert reloaded.seal() == segments
+
+
+def test_spool_truncated_record(tmp_path: Path) -> None:
+    """Test a record interrupted by a crash ends the segment."""
+    spool = EventSpool(str(tmp_path))
+    assert spool.append(Event("test_event", {"value": 1}))
+    [path] = spool.seal()
+    size = Path(path).stat().st_size
+    with open(path, "r+b") as segment_file:
+        data = bytearray(segment_file.read())
+        end = data.index(b"]") + 1
+        # A payload without its length written
+        data[end + 4 : end + 10] = b'["a",1'
+        segment_file.seek(0)
+        segment_file.write(data)
+    assert Path(path).stat().st_size == size
+    assert len(read_segment(path)) == 1
+
+
+async def test_spool_events_on_backlog(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test events are spooled when the backlog is reached and recorded later."""
+    spool = recorder_mock.event_spool = EventSpool(str(tmp_path))
+    await async_wait_recording_done(hass)
+
+    with patch.object(Recorder, "_reached_max_backlog", return_value=True):
+        recorder_mock._async_check_queue()
+    assert recorder_mock.spooling
+    assert recorder_mock.recording
+    assert "The recorder will spool events to disk" in caplog.text
+
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("sensor.power", "2")
+    hass.bus.async_fire("test_event", {"value": 1})
+    await async_wait_recording_done(hass)
+    assert len(spool) == 1
+
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    # Replay the spool, then the events spooled while switching back
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+    assert not recorder_mock.spooling
+    assert len(spool) == 0
+
+    hass.states.async_set("sensor.power", "3")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = session.query(States).order_by(States.state_id).all()
+        assert [state.state for state in states] == ["1", "2", "3"]
+        assert states[1].old_state_id == states[0].state_id
+        assert states[2].old_state_id == states[1].state_id
+        assert session.query(Events).count() >= 1
+
+
+async def test_spool_full(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test recording stops when the spool is full."""
+    recorder_mock.event_spool = EventSpool(str(tmp_path), max_segments=0)
+    await async_wait_recording_done(hass)
+
+    with patch.object(Recorder, "_reached_max_backlog", return_value=True):
+        recorder_mock._async_check_queue()
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert not recorder_mock.recording
+    assert "The recorder spool reached the maximum size" in caplog.text
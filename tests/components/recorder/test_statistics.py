@@ -8,8 +8,11 @@ import pytest
 from sqlalchemy import select
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder import Recorder, history, migration, statistics
+from homeassistant.components.recorder.db_schema import (
+    SCHEMA_VERSION,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
@@ -292,6 +295,110 @@ async def test_compile_hourly_statistics(
     assert stats == {}
 
 
+async def test_compile_hourly_statistics_accumulated(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test hourly statistics are compiled from the accumulated 5-minute rows."""
+    await async_setup_component(hass, "sensor", {})
+    zero, _, _ = await async_record_states(hass)
+    # The periods before zero were compiled when the recorder started
+    hour_start = zero.replace(minute=0) + timedelta(hours=1)
+
+    with patch.object(
+        statistics,
+        "_compile_hourly_statistics_summary_mean_stmt",
+        wraps=statistics._compile_hourly_statistics_summary_mean_stmt,
+    ) as summary_stmt_mock:
+        for minutes in range(0, 60, 5):
+            do_adhoc_statistics(hass, start=hour_start + timedelta(minutes=minutes))
+        await async_wait_recording_done(hass)
+    assert not summary_stmt_mock.called
+
+    short_term = statistics_during_period(
+        hass, hour_start, period="5minute", statistic_ids={"sensor.test1"}
+    )["sensor.test1"]
+    means = [row["mean"] for row in short_term]
+    assert statistics_during_period(
+        hass, hour_start, period="hour", statistic_ids={"sensor.test1"}
+    ) == {
+        "sensor.test1": [
+            {
+                "start": hour_start.timestamp(),
+                "end": (hour_start + timedelta(hours=1)).timestamp(),
+                "mean": pytest.approx(sum(means) / len(means)),
+                "min": pytest.approx(min(row["min"] for row in short_term)),
+                "max": pytest.approx(max(row["max"] for row in short_term)),
+                "last_reset": None,
+            }
+        ]
+    }
+
+    # An hour that was not fully compiled is read back
+    next_hour_start = hour_start + timedelta(hours=1)
+    with patch.object(
+        statistics,
+        "_compile_hourly_statistics_summary_mean_stmt",
+        wraps=statistics._compile_hourly_statistics_summary_mean_stmt,
+    ) as summary_stmt_mock:
+        do_adhoc_statistics(hass, start=next_hour_start + timedelta(minutes=55))
+        await async_wait_recording_done(hass)
+    assert summary_stmt_mock.called
+
+
+def test_hourly_statistics_accumulator() -> None:
+    """Test the hourly statistics accumulator."""
+    hour_start_ts = 1727740800.0
+    accumulator = statistics.HourlyStatisticsAccumulator()
+
+    def _add_hour(periods: int) -> None:
+        for period in range(periods):
+            start_ts = hour_start_ts + period * 300
+            accumulator.add_period(
+                start_ts,
+                [
+                    StatisticsShortTerm.from_stats_ts(
+                        1,
+                        {
+                            "start_ts": start_ts,
+                            "mean": period,
+                            "min": period - 1,
+                            "max": None if period == 11 else period + 1,
+                            "state": period * 2,
+                            "sum": period * 3,
+                        },
+                    ),
+                    StatisticsShortTerm.from_stats_ts(
+                        2, {"start_ts": start_ts, "mean": None}
+                    ),
+                ],
+            )
+
+    _add_hour(12)
+    assert accumulator.pop_hour(hour_start_ts) == {
+        1: {
+            "start_ts": hour_start_ts,
+            "mean": 5.5,
+            "min": -1,
+            "max": 11,
+            "last_reset_ts": None,
+            "state": 22,
+            "sum": 33,
+        },
+        2: {"start_ts": hour_start_ts, "last_reset_ts": None},
+    }
+    # The hour is discarded once it was popped
+    assert accumulator.pop_hour(hour_start_ts) is None
+
+    _add_hour(11)
+    assert accumulator.pop_hour(hour_start_ts) is None
+
+    # A period that was compiled twice can not be trusted
+    _add_hour(12)
+    accumulator.add_period(hour_start_ts + 3300, [])
+    assert accumulator.pop_hour(hour_start_ts) is None
+
+
 @pytest.fixture
 def mock_sensor_statistics():
     """Generate some fake statistics."""
@@ -2490,6 +2597,283 @@ async def test_change_with_none(
     assert stats == {}
 
 
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_statistics_during_period_columns(
+    hass: HomeAssistant, setup_recorder: None, timezone: str
+) -> None:
+    """Test the columns match the rows of statistics_during_period."""
+    await hass.config.async_set_time_zone(timezone)
+    await async_wait_recording_done(hass)
+    start = dt_util.as_utc(dt_util.parse_datetime("2022-09-20 00:00:00"))
+    external_statistics = [
+        {
+            "start": start + timedelta(hours=hour),
+            "last_reset": None,
+            "mean": hour % 7,
+            "min": hour % 5,
+            "max": hour % 11,
+            "state": hour,
+            "sum": None if hour == 30 else hour * 2,
+        }
+        for hour in range(24 * 9)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    for period in ("hour", "day", "week", "month"):
+        for units in (None, {"energy": "Wh"}):
+            for types in (
+                {"change", "last_reset", "max", "mean", "min", "state", "sum"},
+                {"change"},
+                {"mean", "sum"},
+            ):
+                rows = statistics_during_period(
+                    hass,
+                    start + timedelta(hours=5),
+                    period=period,
+                    statistic_ids={"test:total_energy_import"},
+                    units=units,
+                    types=types,
+                )
+                assert rows
+                columns = statistics.statistics_during_period_columns(
+                    hass,
+                    start + timedelta(hours=5),
+                    None,
+                    {"test:total_energy_import"},
+                    period,
+                    units,
+                    types,
+                )
+                assert {
+                    statistic_id: [
+                        dict(zip(statistic_columns, values, strict=True))
+                        for values in zip(*statistic_columns.values(), strict=True)
+                    ]
+                    for statistic_id, statistic_columns in columns.items()
+                } == rows
+
+    assert (
+        statistics.statistics_during_period_columns(
+            hass,
+            start + timedelta(days=30),
+            None,
+            {"test:total_energy_import"},
+            "hour",
+            None,
+            {"sum"},
+        )
+        == {}
+    )
+
+
+def _assert_statistics_equal(
+    rows: dict[str, list[dict[str, Any]]], expected: dict[str, list[dict[str, Any]]]
+) -> None:
+    """Assert statistics are equal within floating point precision."""
+    assert rows.keys() == expected.keys()
+    for statistic_id, expected_rows in expected.items():
+        assert len(rows[statistic_id]) == len(expected_rows)
+        for row, expected_row in zip(rows[statistic_id], expected_rows, strict=True):
+            assert row == pytest.approx(expected_row)
+
+
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
+@pytest.mark.parametrize("period", ["day", "week", "month"])
+async def test_statistics_rollups(
+    hass: HomeAssistant, recorder_mock: Recorder, timezone: str, period: str
+) -> None:
+    """Test the rollups are kept up to date and match the hourly statistics."""
+    await hass.config.async_set_time_zone(timezone)
+    await async_wait_recording_done(hass)
+    assert recorder_mock.statistics_rollups_active is True
+    start = dt_util.as_utc(dt_util.parse_datetime("2022-09-20 03:00:00"))
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [
+            {
+                "start": start + timedelta(hours=hour),
+                "last_reset": None,
+                "mean": hour % 7 + 0.1,
+                "min": hour % 5,
+                "max": hour % 11,
+                "state": hour,
+                "sum": hour * 2,
+            }
+            for hour in range(24 * 40)
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+    def _assert_rollups_match_hourly_statistics() -> None:
+        types = {"change", "last_reset", "max", "mean", "min", "state", "sum"}
+        rows = statistics_during_period(
+            hass, start, period=period, units=None, types=types
+        )
+        columns = statistics.statistics_during_period_columns(
+            hass,
+            start,
+            None,
+            {"test:total_energy_import"},
+            period,
+            None,
+            types,
+        )
+        recorder_mock.statistics_rollups_active = False
+        expected = statistics_during_period(
+            hass, start, period=period, units=None, types=types
+        )
+        recorder_mock.statistics_rollups_active = True
+        _assert_statistics_equal(rows, expected)
+        _assert_statistics_equal(
+            {
+                statistic_id: [
+                    dict(zip(statistic_columns, values, strict=True))
+                    for values in zip(*statistic_columns.values(), strict=True)
+                ]
+                for statistic_id, statistic_columns in columns.items()
+            },
+            expected,
+        )
+
+    with session_scope(hass=hass, read_only=True) as session:
+        table = statistics.STATISTICS_ROLLUP_TABLES[period]
+        assert session.query(table).count() > 1
+    _assert_rollups_match_hourly_statistics()
+
+    recorder_mock.async_adjust_statistics(
+        "test:total_energy_import", start + timedelta(days=9, hours=5), 10, "kWh"
+    )
+    await async_wait_recording_done(hass)
+    _assert_rollups_match_hourly_statistics()
+
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [
+            {
+                "start": start + timedelta(days=20, hours=hour),
+                "last_reset": None,
+                "mean": 100,
+                "min": -100,
+                "max": 200,
+                "state": hour,
+                "sum": hour * 3,
+            }
+            for hour in range(3)
+        ],
+    )
+    await async_wait_recording_done(hass)
+    _assert_rollups_match_hourly_statistics()
+
+
+async def test_statistics_rollups_time_zone_changed(
+    hass: HomeAssistant, setup_recorder: None, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test statistics are reduced from hourly statistics after a time zone change."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    await async_wait_recording_done(hass)
+    start = dt_util.parse_datetime("2022-09-20 00:00:00+00:00")
+    async_add_external_statistics(
+        hass,
+        {
+            "has_mean": False,
+            "has_sum": True,
+            "name": "Total imported energy",
+            "source": "test",
+            "statistic_id": "test:total_energy_import",
+            "unit_of_measurement": "kWh",
+        },
+        [
+            {"start": start + timedelta(hours=hour), "state": hour, "sum": hour}
+            for hour in range(48)
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+    await hass.config.async_set_time_zone("US/Hawaii")
+    stats = statistics_during_period(
+        hass, start, period="day", statistic_ids={"test:total_energy_import"}
+    )
+    assert "Statistics day rollups are not aligned" in caplog.text
+    local_start = dt_util.as_local(start).replace(hour=0)
+    assert stats["test:total_energy_import"][0] == {
+        "start": local_start.timestamp(),
+        "end": (local_start + timedelta(days=1)).timestamp(),
+        "last_reset": None,
+        "state": 9.0,
+        "sum": 9.0,
+    }
+
+
+async def test_statistics_rollup_migration(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test existing hourly statistics are rolled up by the migration."""
+    start = dt_util.as_utc(dt_util.parse_datetime("2022-09-20 00:00:00"))
+    async_add_external_statistics(
+        hass,
+        {
+            "has_mean": False,
+            "has_sum": True,
+            "name": "Total imported energy",
+            "source": "test",
+            "statistic_id": "test:total_energy_import",
+            "unit_of_measurement": "kWh",
+        },
+        [
+            {"start": start + timedelta(hours=hour), "state": hour, "sum": hour}
+            for hour in range(24 * 40)
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+    def _delete_rollups() -> None:
+        with session_scope(hass=hass) as session:
+            for table in statistics.STATISTICS_ROLLUP_TABLES.values():
+                session.query(table).delete()
+
+    def _rollup_counts() -> list[int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                session.query(table).count()
+                for table in statistics.STATISTICS_ROLLUP_TABLES.values()
+            ]
+
+    rollup_counts = await recorder_mock.async_add_executor_job(_rollup_counts)
+    await recorder_mock.async_add_executor_job(_delete_rollups)
+    recorder_mock.statistics_rollups_active = False
+
+    with session_scope(hass=hass, read_only=True) as session:
+        migrator = migration.StatisticsRollupMigration(SCHEMA_VERSION, {})
+        assert migrator.needs_migrate(recorder_mock, session) is True
+    recorder_mock.queue_task(migration.MigrationTask(migrator))
+    # The first step rolls up the statistics and the second finds nothing left
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+
+    assert recorder_mock.statistics_rollups_active is True
+    assert await recorder_mock.async_add_executor_job(_rollup_counts) == rollup_counts
+
+
 async def test_recorder_platform_with_statistics(
     hass: HomeAssistant,
     setup_recorder: None,
@@ -9,7 +9,7 @@ from homeassistant.components.recorder.const import SupportedDialect
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
 
-from .common import async_wait_recording_done
+from .common import async_wait_purge_done, async_wait_recording_done
 
 from tests.common import get_system_health_info
 from tests.typing import RecorderInstanceGenerator
@@ -38,6 +38,22 @@ async def test_recorder_system_health(
     }
 
 
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_recorder_system_health_purge(
+    recorder_mock: Recorder, hass: HomeAssistant, recorder_db_url: str
+) -> None:
+    """Test recorder system health includes the last purge."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    await hass.services.async_call("recorder", "purge", {"keep_days": 1})
+    await async_wait_purge_done(hass)
+    info = await get_system_health_info(hass, "recorder")
+    assert info["purge_in_progress"] is False
+    assert info["purge_deleted_rows"] == 0
+    assert info["purge_rows_per_second"] == 0.0
+
+
 @pytest.mark.parametrize(
     "db_engine", [SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL]
 )
@@ -32,6 +32,7 @@ from homeassistant.util.unit_system import METRIC_SYSTEM, US_CUSTOMARY_SYSTEM
 
 from .common import (
     async_recorder_block_till_done,
+    async_wait_purge_done,
     async_wait_recording_done,
     create_engine_test,
     do_adhoc_statistics,
@@ -1675,6 +1676,54 @@ async def test_statistics_during_period_empty_statistic_ids(
     assert response["error"]["code"] == "invalid_format"
 
 
+async def test_statistics_during_period_requested_order(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test statistics_during_period returns the statistics in the requested order."""
+    start = dt_util.as_utc(dt_util.parse_datetime("2022-10-01 00:00:00"))
+    for statistic_id in ("test:second", "test:first"):
+        async_add_external_statistics(
+            hass,
+            {
+                "has_mean": False,
+                "has_sum": True,
+                "name": statistic_id,
+                "source": "test",
+                "statistic_id": statistic_id,
+                "unit_of_measurement": "kWh",
+            },
+            [{"start": start, "last_reset": None, "state": 1, "sum": 1}],
+        )
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    for statistic_ids in (
+        ["test:first", "test:second"],
+        ["test:second", "test:missing", "test:first", "test:second"],
+    ):
+        await client.send_json_auto_id(
+            {
+                "type": "recorder/statistics_during_period",
+                "start_time": start.isoformat(),
+                "statistic_ids": statistic_ids,
+                "period": "hour",
+                "types": ["sum"],
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        assert list(response["result"]) == list(
+            dict.fromkeys(
+                statistic_id
+                for statistic_id in statistic_ids
+                if statistic_id != "test:missing"
+            )
+        )
+        assert response["result"]["test:first"] == [
+            {"start": start.timestamp() * 1000, "end": ANY, "sum": 1.0}
+        ]
+
+
 @pytest.mark.parametrize(
     ("units", "attributes", "display_unit", "statistics_unit", "unit_class"),
     [
@@ -1984,6 +2033,36 @@ async def test_validate_statistics(
     await assert_validation_result(client, {})
 
 
+async def test_subscribe_purge_progress(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test subscribing to the purge progress."""
+    hass.states.async_set("sensor.test", "10")
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json_auto_id({"type": "recorder/subscribe_purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert response["event"]["in_progress"] is False
+    assert response["event"]["started"] is None
+
+    await hass.services.async_call("recorder", "purge", {"keep_days": 1})
+    await async_wait_purge_done(hass)
+    response = await client.receive_json()
+    assert response["event"] == {
+        "in_progress": False,
+        "purge_before": ANY,
+        "started": ANY,
+        "finished": ANY,
+        "deleted_rows": {},
+        "rows_per_second": 0.0,
+        "states_batch_size": ANY,
+        "events_batch_size": ANY,
+    }
+
+
 async def test_clear_statistics(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
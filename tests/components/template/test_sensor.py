@@ -2,6 +2,7 @@
 
 from asyncio import Event
 from datetime import datetime, timedelta
+from typing import Any
 from unittest.mock import ANY, patch
 
 import pytest
@@ -20,10 +21,22 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
-from homeassistant.core import Context, CoreState, HomeAssistant, State, callback
+from homeassistant.core import (
+    Context,
+    CoreState,
+    Event as HassEvent,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity_component import async_update_entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    async_get_template_render_stats,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.template import Template
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.setup import ATTR_COMPONENT, async_setup_component
@@ -859,6 +872,66 @@ async def test_this_variable_early_hass_running(
     }
 
 
+@pytest.mark.parametrize(("count", "domain"), [(1, sensor.DOMAIN)])
+@pytest.mark.parametrize(
+    "config",
+    [
+        {
+            "sensor": {
+                "platform": "template",
+                "sensors": {
+                    "total": {
+                        "value_template": (
+                            "{{ states('sensor.source') | int(0)"
+                            " + states('sensor.double') | int(0) }}"
+                        ),
+                    },
+                    "double": {
+                        "value_template": "{{ states('sensor.source') | int(0) * 2 }}",
+                    },
+                },
+            }
+        },
+    ],
+)
+async def test_dependent_sensors_render_in_order(hass: HomeAssistant, start_ha) -> None:
+    """Test sensors reading other template sensors render after them once."""
+    totals: list[str] = []
+
+    @callback
+    def _total_changed(event: HassEvent[EventStateChangedData]) -> None:
+        totals.append(event.data["new_state"].state)
+
+    async_track_state_change_event(hass, "sensor.total", _total_changed)
+    stats = async_get_template_render_stats(hass)
+    refreshes = {
+        entity_id: stats[entity_id].refreshes if entity_id in stats else 0
+        for entity_id in ("sensor.total", "sensor.double")
+    }
+    hass.states.async_set("sensor.source", "1")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.double").state == "2"
+    assert totals == ["3"]
+
+    rendered: list[str] = []
+    async_render_to_info = Template.async_render_to_info
+
+    def _render_to_info(self: Template, *args: Any, **kwargs: Any) -> Any:
+        rendered.append(self.template)
+        return async_render_to_info(self, *args, **kwargs)
+
+    with patch.object(Template, "async_render_to_info", _render_to_info):
+        hass.states.async_set("sensor.source", "2")
+        await hass.async_block_till_done()
+    assert totals == ["3", "6"]
+    # The total is rendered once for the changes of the source and double
+    assert len(rendered) == 2
+
+    # Each sensor is refreshed once per change of the source
+    assert stats["sensor.total"].refreshes == refreshes["sensor.total"] + 2
+    assert stats["sensor.double"].refreshes == refreshes["sensor.double"] + 2
+
+
 @pytest.mark.parametrize(("count", "domain"), [(1, sensor.DOMAIN)])
 @pytest.mark.parametrize(
     "config",
@@ -2,6 +2,7 @@
 
 import asyncio
 from copy import deepcopy
+from datetime import timedelta
 import logging
 from typing import Any
 from unittest.mock import ANY, AsyncMock, Mock, patch
@@ -18,8 +19,9 @@ from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH_REQUIRED,
 )
 from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
+from homeassistant.components.websocket_api.entity_subscriptions import RESUME_WINDOW
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
+from homeassistant.const import EVENT_STATE_CHANGED, SIGNAL_BOOTSTRAP_INTEGRATIONS
 from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import device_registry as dr
@@ -27,6 +29,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads
 
 from tests.common import (
@@ -34,6 +37,7 @@ from tests.common import (
     MockEntity,
     MockEntityPlatform,
     MockUser,
+    async_fire_time_changed,
     async_mock_service,
     mock_platform,
 )
@@ -1262,6 +1266,167 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_shared_listener(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the entity subscriptions of all connections share one listener."""
+    hass.states.async_set("light.one", "off")
+    hass.states.async_set("light.two", "off")
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    first_client = await hass_ws_client(hass)
+    second_client = await hass_ws_client(hass)
+
+    await first_client.send_json_auto_id({"type": "subscribe_entities"})
+    first_subscription = (await first_client.receive_json())["id"]
+    await first_client.receive_json()
+    await second_client.send_json_auto_id(
+        {"type": "subscribe_entities", "entity_ids": ["light.two"]}
+    )
+    second_subscription = (await second_client.receive_json())["id"]
+    await second_client.receive_json()
+    await second_client.send_json_auto_id(
+        {"type": "subscribe_entities", "entity_ids": ["light.one", "light.two"]}
+    )
+    third_subscription = (await second_client.receive_json())["id"]
+    await second_client.receive_json()
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners_before + 1
+
+    hass.states.async_set("light.one", "on")
+    hass.states.async_set("light.two", "on")
+
+    msg = await first_client.receive_json()
+    assert msg["id"] == first_subscription
+    assert msg["event"]["c"]["light.one"]["+"]["s"] == "on"
+    msg = await first_client.receive_json()
+    assert msg["id"] == first_subscription
+    assert msg["event"]["c"]["light.two"]["+"]["s"] == "on"
+    msg = await second_client.receive_json()
+    assert msg["id"] == third_subscription
+    assert msg["event"]["c"]["light.one"]["+"]["s"] == "on"
+    messages = [await second_client.receive_json() for _ in range(2)]
+    assert {msg["id"] for msg in messages} == {
+        second_subscription,
+        third_subscription,
+    }
+    assert all(msg["event"]["c"]["light.two"]["+"]["s"] == "on" for msg in messages)
+
+    for client, subscription in (
+        (first_client, first_subscription),
+        (second_client, second_subscription),
+        (second_client, third_subscription),
+    ):
+        await client.send_json_auto_id(
+            {"type": "unsubscribe_events", "subscription": subscription}
+        )
+        assert (await client.receive_json())["success"]
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before
+
+
+async def test_subscribe_entities_resume(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test resuming an entity subscription only sends the missed state changes."""
+    hass.states.async_set("light.one", "off")
+    hass.states.async_set("light.two", "off")
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": "subscribe_entities", "entity_ids": ["light.one"], "resumable": True}
+    )
+    msg = await client.receive_json()
+    result = msg["result"]
+    assert result == {"stream_id": ANY, "seq": 0, "resumed": False}
+    msg = await client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.one"]
+    assert "seq" not in msg
+
+    hass.states.async_set("light.one", "on")
+    msg = await client.receive_json()
+    assert msg["seq"] == 1
+    assert msg["event"]["c"]["light.one"]["+"]["s"] == "on"
+    await client.close()
+
+    hass.states.async_set("light.one", "off")
+    hass.states.async_set("light.two", "on")
+    hass.states.async_set("light.one", "unavailable")
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {
+            "type": "subscribe_entities",
+            "entity_ids": ["light.one"],
+            "resume": {"stream_id": result["stream_id"], "seq": 1},
+        }
+    )
+    msg = await client.receive_json()
+    assert msg["result"] == {
+        "stream_id": result["stream_id"],
+        "seq": 4,
+        "resumed": True,
+    }
+    msg = await client.receive_json()
+    assert msg["seq"] == 2
+    assert msg["event"]["c"]["light.one"]["+"]["s"] == "off"
+    msg = await client.receive_json()
+    assert msg["seq"] == 4
+    assert msg["event"]["c"]["light.one"]["+"]["s"] == "unavailable"
+
+    hass.states.async_set("light.one", "on")
+    msg = await client.receive_json()
+    assert msg["seq"] == 5
+
+    # The states of all entities are sent when the stream is unknown
+    await client.send_json_auto_id(
+        {
+            "type": "subscribe_entities",
+            "resume": {"stream_id": "unknown", "seq": 1},
+        }
+    )
+    msg = await client.receive_json()
+    assert msg["result"]["resumed"] is False
+    assert msg["result"]["seq"] == 5
+    msg = await client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.one", "light.two"}
+
+
+async def test_subscribe_entities_resume_window(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the state changes are no longer buffered after the resume window."""
+    hass.states.async_set("light.one", "off")
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": "subscribe_entities", "resumable": True})
+    result = (await client.receive_json())["result"]
+    await client.receive_json()
+    await client.close()
+    await hass.async_block_till_done()
+
+    # The state changes are buffered for the client to reconnect
+    hass.states.async_set("light.one", "on")
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners_before + 1
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=RESUME_WINDOW + 1)
+    )
+    await hass.async_block_till_done()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {
+            "type": "subscribe_entities",
+            "resume": {"stream_id": result["stream_id"], "seq": result["seq"]},
+        }
+    )
+    msg = await client.receive_json()
+    assert msg["result"]["resumed"] is False
+    assert msg["result"]["stream_id"] != result["stream_id"]
+    msg = await client.receive_json()
+    assert msg["event"]["a"]["light.one"]["s"] == "on"
+
+
 async def test_render_template_renders_template(
     hass: HomeAssistant, websocket_client
 ) -> None:
@@ -4,6 +4,7 @@ import asyncio
 from datetime import timedelta
 from typing import Any, cast
 from unittest.mock import patch
+import zlib
 
 from aiohttp import WSMsgType, WSServerHandshakeError, web
 import pytest
@@ -17,6 +18,7 @@ from homeassistant.components.websocket_api import (
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.util.dt import utcnow
+from homeassistant.util.json import json_loads
 
 from tests.common import async_fire_time_changed
 from tests.typing import MockHAClientWebSocket, WebSocketGenerator
@@ -399,6 +401,112 @@ async def test_prepare_fail_connection_reset(
     assert "Connection reset by peer while preparing WebSocket" in caplog.text
 
 
+async def test_enable_deflate_messages(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the messages are deflated in binary frames once enabled."""
+    for i in range(20):
+        hass.states.async_set(
+            f"sensor.power_{i}",
+            str(i),
+            {
+                "unit_of_measurement": "W",
+                "device_class": "power",
+                "state_class": "measurement",
+                "friendly_name": f"Power {i}",
+            },
+        )
+    websocket_client = await hass_ws_client(hass)
+    decompressor = zlib.decompressobj(
+        wbits=-zlib.MAX_WBITS, zdict=const.DEFLATE_DICTIONARY
+    )
+
+    async def _receive_inflated() -> tuple[int, Any]:
+        msg = await websocket_client.receive()
+        assert msg.type is WSMsgType.BINARY
+        data = decompressor.decompress(msg.data)
+        # The frames are smaller than the JSON messages
+        assert len(msg.data) < len(data)
+        return len(msg.data), json_loads(data)
+
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {const.FEATURE_DEFLATE_MESSAGES: const.DEFLATE_VERSION},
+        }
+    )
+    size, msg = await _receive_inflated()
+    assert msg == {"id": 1, "type": "result", "success": True, "result": None}
+    # The preset dictionary already has the keys of the first message
+    assert size < len(
+        zlib.compress(b'{"id":1,"type":"result","success":true,"result":null}')
+    )
+
+    await websocket_client.send_json({"id": 2, "type": "subscribe_entities"})
+    _, msg = await _receive_inflated()
+    assert msg["success"]
+    first_size, msg = await _receive_inflated()
+    assert len(msg["event"]["a"]) == 20
+
+    # Larger messages are deflated in the executor with the same context
+    with patch.object(http, "DEFLATE_MAX_SYNC_SIZE", 0):
+        await websocket_client.send_json({"id": 3, "type": "ping"})
+        _, msg = await _receive_inflated()
+        assert msg == {"id": 3, "type": "pong"}
+
+    # The context is kept, states repeating earlier messages compress better
+    await websocket_client.send_json({"id": 4, "type": "subscribe_entities"})
+    _, msg = await _receive_inflated()
+    assert msg["success"]
+    second_size, msg = await _receive_inflated()
+    assert len(msg["event"]["a"]) == 20
+    assert second_size < first_size / 2
+
+
+async def test_deflate_messages_unknown_version(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the messages are not deflated for an unknown dictionary version."""
+    websocket_client = await hass_ws_client(hass)
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {const.FEATURE_DEFLATE_MESSAGES: 2},
+        }
+    )
+    msg = await websocket_client.receive()
+    assert msg.type is WSMsgType.TEXT
+    assert json_loads(msg.data)["success"] is True
+
+
+async def test_coalesced_state_changes_sent_in_order(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the coalesced state changes are sent in the order of the latest."""
+    hass.states.async_set("light.kitchen", "0")
+    hass.states.async_set("light.hall", "off")
+    websocket_client = await hass_ws_client(hass)
+    await websocket_client.send_json_auto_id({"type": "subscribe_entities"})
+    assert (await websocket_client.receive_json())["success"]
+    await websocket_client.receive_json()
+
+    with patch("homeassistant.components.websocket_api.http.PENDING_MSG_PEAK", 2):
+        for value in range(1, 4):
+            hass.states.async_set("light.kitchen", str(value))
+        hass.states.async_set("light.hall", "on")
+        hass.states.async_set("light.kitchen", "4")
+
+        for value in (1, 2):
+            msg = await websocket_client.receive_json()
+            assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == str(value)
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["a"]["light.hall"]["s"] == "on"
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["a"]["light.kitchen"]["s"] == "4"
+
+
 async def test_enable_coalesce(
     hass: HomeAssistant,
     hass_ws_client: WebSocketGenerator,
@@ -2,13 +2,15 @@
 
 from homeassistant.auth.providers.homeassistant import HassAuthProvider
 from homeassistant.components.websocket_api.auth import TYPE_AUTH_REQUIRED
+from homeassistant.components.websocket_api.const import DATA_STATS
 from homeassistant.components.websocket_api.http import URL
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_component import async_update_entity
 from homeassistant.setup import async_setup_component
 
 from .test_auth import test_auth_active_with_token
 
-from tests.typing import ClientSessionGenerator
+from tests.typing import ClientSessionGenerator, WebSocketGenerator
 
 
 async def test_websocket_api(
@@ -45,3 +47,39 @@ async def test_websocket_api(
 
     state = hass.states.get("sensor.connected_clients")
     assert state.state == "0"
+
+
+async def test_websocket_stats_sensors(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the sensors of the websocket connection statistics."""
+    await async_setup_component(
+        hass, "sensor", {"sensor": {"platform": "websocket_api"}}
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.pending_messages").state == "0"
+    assert hass.states.get("sensor.coalesced_messages").state == "0"
+    assert hass.states.get("sensor.slow_client_disconnects").state == "0"
+
+    await hass_ws_client(hass)
+    stats = hass.data[DATA_STATS]
+    stats.coalesced_messages = 5
+    stats.slow_disconnects = 1
+    [handler] = stats.handlers
+    handler._message_queue.extend((b"1", b"2"))
+
+    for entity_id in (
+        "sensor.pending_messages",
+        "sensor.coalesced_messages",
+        "sensor.slow_client_disconnects",
+    ):
+        await async_update_entity(hass, entity_id)
+    state = hass.states.get("sensor.pending_messages")
+    assert state.state == "2"
+    assert state.attributes["connections"] == [
+        {"connection": handler.description, "pending_messages": 2}
+    ]
+    assert hass.states.get("sensor.coalesced_messages").state == "5"
+    assert hass.states.get("sensor.slow_client_disconnects").state == "1"
+    handler._message_queue.clear()
@@ -21,6 +21,7 @@ from homeassistant.const import (
     ATTR_ATTRIBUTION,
     ATTR_DEVICE_CLASS,
     ATTR_FRIENDLY_NAME,
+    EVENT_STATE_CHANGED,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     EntityCategory,
@@ -37,6 +38,7 @@ from homeassistant.helpers import device_registry as dr, entity, entity_registry
 from homeassistant.helpers.entity_component import async_update_entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
+from homeassistant.setup import async_setup_component
 
 from tests.common import (
     MockConfigEntry,
@@ -44,6 +46,8 @@ from tests.common import (
     MockEntityPlatform,
     MockModule,
     MockPlatform,
+    async_capture_events,
+    async_fire_time_changed,
     mock_integration,
     mock_registry,
 )
@@ -2652,3 +2656,106 @@ async def test_async_write_ha_state_thread_safety_always(
     ):
         await hass.async_add_executor_job(ent2.async_write_ha_state)
     assert not hass.states.get(ent2.entity_id)
+
+
+async def test_coalesced_state_writes(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test state writes are coalesced to the minimum interval."""
+
+    class CoalescingEntity(MockEntity):
+        """Entity coalescing its state writes."""
+
+        _state_write_min_interval = 1.0
+
+    platform = MockEntityPlatform(hass, domain="test")
+    ent = CoalescingEntity(entity_id="test.coalescing")
+    other = CoalescingEntity(entity_id="test.other")
+    ent._attr_state = other._attr_state = "1"
+    await platform.async_add_entities([ent, other])
+    assert hass.states.get("test.coalescing").state == "1"
+
+    state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+    for value in ("2", "3", "4"):
+        ent._attr_state = value
+        ent.async_write_ha_state()
+    other._attr_state = "2"
+    other.async_write_ha_state()
+    assert hass.states.get("test.coalescing").state == "1"
+    assert hass.states.get("test.other").state == "1"
+    assert entity.async_get_suppressed_state_writes(hass) == {"test.coalescing": 2}
+
+    freezer.tick(timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    # Both entities are written in the same callback
+    assert [event.data["entity_id"] for event in state_changes] == [
+        "test.coalescing",
+        "test.other",
+    ]
+    assert hass.states.get("test.coalescing").state == "4"
+    assert hass.states.get("test.other").state == "2"
+
+    # A write after a deferred write is deferred again
+    ent._attr_state = "5"
+    ent.async_write_ha_state()
+    assert hass.states.get("test.coalescing").state == "4"
+
+    # Removing the entity cancels the deferred write
+    await ent.async_remove()
+    freezer.tick(timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("test.coalescing") is None
+    assert len(state_changes) == 3
+
+
+async def test_significant_state_writes(hass: HomeAssistant) -> None:
+    """Test insignificant state writes are dropped."""
+
+    class SignificantEntity(MockEntity):
+        """Entity only writing significant state changes."""
+
+        _state_write_significant_only = True
+
+    assert await async_setup_component(hass, "sensor", {})
+    platform = MockEntityPlatform(hass, domain="sensor")
+    ent = SignificantEntity(
+        entity_id="sensor.temperature",
+        device_class="temperature",
+        unit_of_measurement="°C",
+    )
+    ent._attr_state = "20.0"
+    await platform.async_add_entities([ent])
+    # Wait for the significant change platforms to be loaded
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.temperature").state == "20.0"
+
+    ent._attr_state = "20.2"
+    ent.async_write_ha_state()
+    assert hass.states.get("sensor.temperature").state == "20.0"
+
+    ent._attr_state = "20.6"
+    ent.async_write_ha_state()
+    assert hass.states.get("sensor.temperature").state == "20.6"
+
+    # Attributes added or changed to values which are not numbers are written
+    ent._values["extra_state_attributes"] = {"mode": "eco", "battery": 50}
+    ent._attr_state = "20.7"
+    ent.async_write_ha_state()
+    assert hass.states.get("sensor.temperature").state == "20.7"
+    ent._values["extra_state_attributes"] = {"mode": "boost", "battery": 50}
+    ent.async_write_ha_state()
+    assert hass.states.get("sensor.temperature").attributes["mode"] == "boost"
+
+    # Numeric attributes are left to the significant change platform
+    ent._values["extra_state_attributes"] = {"mode": "boost", "battery": 49}
+    ent._attr_state = "20.8"
+    ent.async_write_ha_state()
+    assert hass.states.get("sensor.temperature").state == "20.7"
+    assert hass.states.get("sensor.temperature").attributes["battery"] == 50
+
+    ent._attr_state = STATE_UNAVAILABLE
+    ent.async_write_ha_state()
+    assert hass.states.get("sensor.temperature").state == STATE_UNAVAILABLE
+    assert entity.async_get_suppressed_state_writes(hass) == {"sensor.temperature": 2}
@@ -13,7 +13,7 @@ from freezegun.api import FrozenDateTimeFactory
 import jinja2
 import pytest
 
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import (
     Event,
@@ -41,6 +41,7 @@ from homeassistant.helpers.event import (
     async_track_state_change_filtered,
     async_track_state_removed_domain,
     async_track_state_report_event,
+    async_track_state_value_change_event,
     async_track_sunrise,
     async_track_sunset,
     async_track_template,
@@ -537,6 +538,35 @@ async def test_async_track_state_change_event(hass: HomeAssistant) -> None:
     unsub_throws()
 
 
+async def test_async_track_state_change_event_profiled(hass: HomeAssistant) -> None:
+    """Test the keyed state change listeners are recorded while profiling."""
+    calls = []
+
+    @ha.callback
+    def entity_listener(event: Event[EventStateChangedData]) -> None:
+        calls.append(event)
+
+    @ha.callback
+    def domain_listener(event: Event[EventStateChangedData]) -> None:
+        calls.append(event)
+
+    async_track_state_change_event(hass, ["light.bowl"], entity_listener)
+    async_track_state_added_domain(hass, "light", domain_listener)
+    profiler = hass.bus.async_start_profiling()
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    hass.bus.async_stop_profiling()
+    assert len(calls) == 2
+
+    listeners = {
+        stats["listener"].rpartition(".")[2]: stats
+        for stats in profiler.as_list()
+        if stats["event_type"] == EVENT_STATE_CHANGED
+    }
+    assert listeners["entity_listener"]["calls"] == 1
+    assert listeners["domain_listener"]["calls"] == 1
+
+
 async def test_async_track_state_change_event_with_empty_list(
     hass: HomeAssistant,
 ) -> None:
@@ -4938,3 +4968,73 @@ async def test_async_track_state_report_event(hass: HomeAssistant) -> None:
     await hass.async_block_till_done()
     assert len(tracker_called) == 2
     unsub()
+
+
+async def test_async_track_state_value_change_event(hass: HomeAssistant) -> None:
+    """Test async_track_state_value_change_event."""
+    state_calls: list[ha.State | None] = []
+    attribute_calls: list[ha.State | None] = []
+
+    @ha.callback
+    def state_callback(event: Event[EventStateChangedData]) -> None:
+        state_calls.append(event.data["new_state"])
+
+    @ha.callback
+    def attribute_callback(event: Event[EventStateChangedData]) -> None:
+        attribute_calls.append(event.data["new_state"])
+
+    unsub_state = async_track_state_value_change_event(
+        hass, ["sensor.power", "sensor.other"], (), state_callback
+    )
+    unsub_attribute = async_track_state_value_change_event(
+        hass, "Sensor.Power", ("unit", "friendly_name"), attribute_callback
+    )
+
+    hass.states.async_set("sensor.power", "1", {"unit": "W"})
+    await hass.async_block_till_done()
+    assert len(state_calls) == 1
+    assert len(attribute_calls) == 1
+
+    # Attribute only changes
+    hass.states.async_set("sensor.power", "1", {"unit": "W", "current": 1})
+    hass.states.async_set("sensor.power", "1", {"unit": "W"}, force_update=True)
+    await hass.async_block_till_done()
+    assert len(state_calls) == 1
+    assert len(attribute_calls) == 1
+
+    hass.states.async_set("sensor.power", "1", {"unit": "kW"})
+    hass.states.async_set("sensor.power", "1", {"unit": "kW", "friendly_name": "P"})
+    hass.states.async_set("sensor.power", "1", {"friendly_name": "P"})
+    await hass.async_block_till_done()
+    assert len(state_calls) == 1
+    assert len(attribute_calls) == 4
+
+    hass.states.async_set("sensor.power", "2", {"friendly_name": "P"})
+    hass.states.async_set("sensor.other", "2")
+    hass.states.async_remove("sensor.power")
+    await hass.async_block_till_done()
+    assert [state.state if state else None for state in state_calls] == [
+        "1",
+        "2",
+        "2",
+        None,
+    ]
+    assert len(attribute_calls) == 6
+
+    unsub_attribute()
+    hass.states.async_set("sensor.power", "3", {"unit": "W"})
+    await hass.async_block_till_done()
+    assert len(state_calls) == 5
+    assert len(attribute_calls) == 6
+
+    unsub_state()
+    hass.states.async_set("sensor.power", "4")
+    await hass.async_block_till_done()
+    assert len(state_calls) == 5
+    assert "track_state_value_change_data" not in hass.data
+    assert "track_state_value_change_attributes" not in hass.data
+
+    assert (
+        async_track_state_value_change_event(hass, [], ("unit",), state_callback)
+        is not None
+    )
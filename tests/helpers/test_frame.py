@@ -105,6 +105,35 @@ async def test_extract_frame_integration_with_excluded_integration(
     )
 
 
+async def test_extract_frame_integration_from_frame(
+    mock_integration_frame: Mock,
+) -> None:
+    """Test extracting the integration frame from the stack of a given frame."""
+    given_frame = extract_stack_to_frame(
+        [
+            Mock(
+                filename="/home/paulus/homeassistant/core.py",
+                lineno="23",
+                line="do_something()",
+            ),
+            Mock(
+                filename="/home/paulus/homeassistant/components/zwave_js/light.py",
+                lineno="42",
+                line="self.light.is_on",
+            ),
+            Mock(
+                filename="/home/paulus/aiohue/lights.py",
+                lineno="2",
+                line="something()",
+            ),
+        ]
+    )
+
+    integration_frame = frame.get_integration_frame(frame=given_frame)
+    assert integration_frame.integration == "zwave_js"
+    assert integration_frame.frame is given_frame.f_back
+
+
 async def test_extract_frame_no_integration(caplog: pytest.LogCaptureFixture) -> None:
     """Test extracting the current frame without integration context."""
     with (
@@ -13,6 +13,8 @@ from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
+import jinja2
 import orjson
 import pytest
 import voluptuous as vol
@@ -317,6 +319,47 @@ async def test_import(hass: HomeAssistant) -> None:
         ).async_render()
 
 
+async def test_bytecode_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test compiled templates are persisted and loaded after a restart."""
+    source = "{{ states('sensor.power') | float(0) * 2 }}"
+    await template.async_load_bytecode_cache(hass)
+    hass.states.async_set("sensor.power", "21")
+    assert template.Template(source, hass).async_render() == 42.0
+    assert (
+        template.Template("{{ value | int + 1 }}", hass).async_render(
+            {"value": "1"}, limited=True
+        )
+        == 2
+    )
+
+    freezer.tick(timedelta(minutes=2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    data = hass_storage[template.BYTECODE_CACHE_STORAGE_KEY]["data"]
+    assert len(data["code"]) == 2
+
+    # Restart with empty environments
+    for env_key in (template._ENVIRONMENT, template._ENVIRONMENT_LIMITED):
+        hass.data.pop(env_key)
+    await template.async_load_bytecode_cache(hass)
+    with patch.object(
+        jinja2.sandbox.ImmutableSandboxedEnvironment, "compile"
+    ) as mock_compile:
+        assert template.Template(source, hass).async_render() == 42.0
+    assert not mock_compile.called
+
+    # The code of other builds is not used
+    hass.data.pop(template._ENVIRONMENT)
+    data["build"] = "2000.1.0"
+    await template.async_load_bytecode_cache(hass)
+    assert hass.data[template._BYTECODE_CACHE].get("normal", source) is None
+    assert template.Template(source, hass).async_render() == 42.0
+
+
 async def test_import_change(hass: HomeAssistant) -> None:
     """Test that a change in HassLoader results in updated imports."""
     await template.async_load_custom_templates(hass)
@@ -3449,6 +3492,55 @@ async def test_closest_function_home_vs_group_state(hass: HomeAssistant) -> None
     assert info.rate_limit is None
 
 
+async def test_state_values(hass: HomeAssistant) -> None:
+    """Test state_values function."""
+    hass.states.async_set("sensor.one", "1.5", {"device_class": "power"})
+    hass.states.async_set(
+        "sensor.two", "2", {"device_class": "power", "unit_of_measurement": "kW"}
+    )
+    hass.states.async_set("sensor.three", "unavailable", {"device_class": "power"})
+    hass.states.async_set("sensor.four", "nan", {"device_class": "power"})
+    hass.states.async_set("sensor.energy", "10", {"device_class": "energy"})
+    hass.states.async_set("input_number.power", "4", {"device_class": "power"})
+
+    info = render_to_info(
+        hass, "{{ state_values('sensor', device_class='power') | sum }}"
+    )
+    assert_result_info(
+        info,
+        3.5,
+        ["sensor.one", "sensor.two", "sensor.three", "sensor.four"],
+        ["sensor"],
+    )
+    # Sensors gaining the device class re-render the template
+    assert info.filter("sensor.energy")
+    assert not info.filter("input_number.power")
+
+    info = render_to_info(hass, "{{ state_values(device_class='power') | max }}")
+    assert_result_info(
+        info,
+        4,
+        [
+            "sensor.one",
+            "sensor.two",
+            "sensor.three",
+            "sensor.four",
+            "input_number.power",
+        ],
+        all_states=True,
+    )
+
+    assert render(
+        hass,
+        "{{ state_values(device_class='power', unit_of_measurement='kW') }}",
+    ) == [2.0]
+    assert render(hass, "{{ state_values('sensor') | count }}") == 3
+    assert render(hass, "{{ state_values(device_class='gas') | sum }}") == 0
+
+    with pytest.raises(TemplateError):
+        render(hass, "{{ state_values('not a domain') }}")
+
+
 async def test_expand(hass: HomeAssistant) -> None:
     """Test expand function."""
     info = render_to_info(hass, "{{ expand('test.object') }}")
@@ -5604,47 +5696,96 @@ async def test_render_to_info_with_exception(hass: HomeAssistant) -> None:
     assert info.entities == {"test_domain.object"}
 
 
-async def test_lru_increases_with_many_entities(hass: HomeAssistant) -> None:
-    """Test that the template internal LRU cache increases with many entities."""
+async def test_template_state_cache_increases_with_many_entities(
+    hass: HomeAssistant,
+) -> None:
+    """Test that the template state cache increases with many entities."""
     # We do not actually want to record 4096 entities so we mock the entity count
     mock_entity_count = 16
 
-    assert template.CACHED_TEMPLATE_LRU.get_size() == template.CACHED_TEMPLATE_STATES
-    assert (
-        template.CACHED_TEMPLATE_NO_COLLECT_LRU.get_size()
-        == template.CACHED_TEMPLATE_STATES
-    )
-    template.CACHED_TEMPLATE_LRU.set_size(8)
-    template.CACHED_TEMPLATE_NO_COLLECT_LRU.set_size(8)
+    assert template.TEMPLATE_STATE_CACHE.size >= template.CACHED_TEMPLATE_STATES
+    cache = template.TemplateStateCache(8)
 
-    template.async_setup(hass)
-    for i in range(mock_entity_count):
-        hass.states.async_set(f"sensor.sensor{i}", "on")
+    with patch.object(template, "TEMPLATE_STATE_CACHE", cache):
+        template.async_setup(hass)
+        for i in range(mock_entity_count):
+            hass.states.async_set(f"sensor.sensor{i}", "on")
 
-    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
-    await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+        await hass.async_block_till_done()
 
-    assert template.CACHED_TEMPLATE_LRU.get_size() == int(
-        round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
-    )
-    assert template.CACHED_TEMPLATE_NO_COLLECT_LRU.get_size() == int(
-        round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
-    )
+        assert cache.size == int(
+            round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
+        )
 
-    await hass.async_stop()
+        await hass.async_stop()
 
-    for i in range(mock_entity_count):
-        hass.states.async_set(f"sensor.sensor_add_{i}", "on")
+        for i in range(mock_entity_count):
+            hass.states.async_set(f"sensor.sensor_add_{i}", "on")
 
-    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=20))
-    await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=20))
+        await hass.async_block_till_done()
 
-    assert template.CACHED_TEMPLATE_LRU.get_size() == int(
-        round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
-    )
-    assert template.CACHED_TEMPLATE_NO_COLLECT_LRU.get_size() == int(
-        round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
-    )
+        assert cache.size == int(
+            round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
+        )
+
+
+async def test_template_state_cache(hass: HomeAssistant) -> None:
+    """Test the template state cache reuses wrappers and counts its usage."""
+    for i in range(4):
+        hass.states.async_set(f"sensor.sensor{i}", "on")
+    cache = template.TemplateStateCache(2)
+
+    with patch.object(template, "TEMPLATE_STATE_CACHE", cache):
+        tpl = template.Template("{{ states.sensor.sensor0.state }}", hass)
+        info = tpl.async_render_to_info()
+        assert info.result() == "on"
+        assert tpl.async_render_to_info().result() == "on"
+        # Iterating the domain uses the wrappers that do not collect
+        info = render_to_info(
+            hass, "{{ states.sensor | map(attribute='state') | list }}"
+        )
+        assert info.result() == ["on", "on", "on", "on"]
+        assert not info.entities
+        assert cache.as_dict() == {
+            "states": 2,
+            "size": 2,
+            "hits": 1,
+            "misses": 5,
+            "evictions": 2,
+            "hit_rate": 1 / 6,
+        }
+        info = render_to_info(hass, "{{ states.sensor.sensor3.state }}")
+        assert info.entities == {"sensor.sensor3"}
+        assert cache.misses == 6
+        info = render_to_info(hass, "{{ states.sensor.sensor3.state }}")
+        assert info.entities == {"sensor.sensor3"}
+        assert cache.hits == 2
+
+        # Grows by the evictions since the last adjustment
+        cache.async_adjust_size(4)
+        assert cache.size == 5
+        cache.async_adjust_size(4)
+        assert cache.size == 5
+
+        # But not over the maximum factor of the entity count
+        cache.set_size(2)
+        render(hass, "{{ states.sensor | map(attribute='state') | list }}")
+        render(hass, "{{ states.sensor | map(attribute='state') | list }}")
+        cache.async_adjust_size(2)
+        assert cache.size == 4
+
+        # Iterating the domain does not stop an entity looked up before
+        # from collecting
+        info = render_to_info(
+            hass,
+            "{% set sensor = states.sensor.sensor3 %}"
+            "{% for state in states.sensor %}{% endfor %}"
+            "{{ sensor.state }}",
+        )
+        assert info.result() == "on"
+        assert info.entities == {"sensor.sensor3"}
 
 
 async def test_floors(
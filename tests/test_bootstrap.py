@@ -18,6 +18,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     BASE_PLATFORMS,
     CONF_DEBUG,
+    EVENT_HOMEASSISTANT_STARTED,
     SIGNAL_BOOTSTRAP_INTEGRATIONS,
 )
 from homeassistant.core import CoreState, HomeAssistant, async_get_hass, callback
@@ -26,6 +27,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.translation import async_translations_loaded
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import Integration
+from homeassistant.setup import DATA_STARTUP_TRACE, async_setup_component
 
 from .common import (
     MockConfigEntry,
@@ -1524,3 +1526,33 @@ def test_should_rollover_is_always_false() -> None:
         ).shouldRollover(Mock())
         is False
     )
+
+
+async def test_startup_trace_export(hass: HomeAssistant) -> None:
+    """Test the startup trace is written once Home Assistant has started."""
+    hass.set_state(CoreState.not_running)
+    bootstrap.async_enable_startup_trace_export(hass)
+    mock_integration(hass, MockModule("first_dep"))
+    mock_integration(hass, MockModule("second_dep", dependencies=["first_dep"]))
+    assert await async_setup_component(hass, "second_dep", {})
+
+    with patch.object(bootstrap, "save_json") as save_json:
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+
+    [(path, chrome_trace), _] = save_json.call_args
+    assert path == hass.config.path(bootstrap.STARTUP_TRACE_FILENAME)
+    assert chrome_trace["otherData"] == {"critical_path": ["first_dep", "second_dep"]}
+    assert {
+        (event["cat"], event["name"])
+        for event in chrome_trace["traceEvents"]
+        if event["ph"] == "X" and event["cat"] != "critical_path"
+    } == {
+        ("first_dep", "requirements"),
+        ("first_dep", "import"),
+        ("first_dep", "setup"),
+        ("second_dep", "requirements"),
+        ("second_dep", "import"),
+        ("second_dep", "setup"),
+    }
+    assert DATA_STARTUP_TRACE not in hass.data
@@ -64,6 +64,7 @@ from homeassistant.helpers.json import json_dumps
 from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -1121,6 +1122,40 @@ def test_state_as_compressed_state_json() -> None:
     assert state.as_compressed_state_json is as_compressed_state
 
 
+async def test_state_attributes_json(hass: HomeAssistant) -> None:
+    """Test the attributes are serialized once per state."""
+    attributes = {"options": ["a", "b"], "friendly_name": "Mode"}
+    hass.states.async_set("select.mode", "a", attributes)
+    state1 = hass.states.get("select.mode")
+    assert isinstance(state1.attributes, ReadOnlyDict)
+    with patch("homeassistant.core.json_bytes", wraps=ha.json_bytes) as json_bytes:
+        assert json_loads(state1.as_dict_json)["attributes"] == attributes
+        assert json_loads(b"{" + state1.as_compressed_state_json + b"}") == {
+            "select.mode": {
+                "s": "a",
+                "a": attributes,
+                "c": state1.context.id,
+                "lc": state1.last_changed_timestamp,
+            }
+        }
+    # Once for the attributes and once for each representation
+    assert json_bytes.call_count == 3
+
+    # A later state sharing the attributes does not share their JSON
+    state1.attributes["options"].append("c")
+    hass.states.async_set("select.mode", "b", state1.attributes)
+    state2 = hass.states.get("select.mode")
+    assert state2.attributes is state1.attributes
+    assert json_loads(state2.as_dict_json)["attributes"]["options"] == [
+        "a",
+        "b",
+        "c",
+    ]
+
+    with pytest.raises(RuntimeError):
+        state2.attributes["friendly_name"] = "Other"
+
+
 async def test_eventbus_add_remove_listener(hass: HomeAssistant) -> None:
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -1169,6 +1204,47 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_profiling(hass: HomeAssistant) -> None:
+    """Test the time spent in the listeners is recorded while profiling."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def mock_filter(event_data):
+        """Mock filter."""
+        return not event_data["filtered"]
+
+    hass.bus.async_listen("test", listener, event_filter=mock_filter)
+    assert hass.bus.profiler is None
+
+    hass.bus.async_fire("test", {"filtered": False})
+    profiler = hass.bus.async_start_profiling(sample_size=8)
+    assert hass.bus.async_start_profiling() is profiler
+    assert hass.bus.profiler is profiler
+    hass.bus.async_fire("test", {"filtered": False})
+    hass.bus.async_fire("test", {"filtered": False})
+    hass.bus.async_fire("test", {"filtered": True})
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    [stats] = [stats for stats in profiler.as_list() if stats["event_type"] == "test"]
+    assert stats["listener"].endswith("test_eventbus_profiling.<locals>.listener")
+    assert stats["calls"] == 2
+    assert stats["rejected"] == 1
+    assert 0 < stats["p99_time"] <= stats["max_time"] <= stats["total_time"]
+
+    assert hass.bus.async_stop_profiling() is profiler
+    assert hass.bus.async_stop_profiling() is None
+    hass.bus.async_fire("test", {"filtered": False})
+    await hass.async_block_till_done()
+    assert len(calls) == 4
+    assert stats in profiler.as_list()
+
+
 async def test_eventbus_run_immediately_callback(hass: HomeAssistant) -> None:
     """Test we can call events immediately with a callback."""
     calls = []
@@ -1470,6 +1546,118 @@ async def test_statemachine_entity_ids(hass: HomeAssistant) -> None:
     assert states == ["light.bowl", "switch.ac"]
 
 
+async def test_statemachine_entity_ids_by_attribute(hass: HomeAssistant) -> None:
+    """Test async_entity_ids_by_attribute method."""
+    hass.states.async_set("sensor.power", "1", {"device_class": "power"})
+    hass.states.async_set("sensor.energy", "1", {"device_class": "energy"})
+    hass.states.async_set(
+        "switch.power", "on", {"device_class": "power", "unit_of_measurement": "W"}
+    )
+    assert hass.states.async_entity_ids_by_attribute(
+        "device_class", "power"
+    ) == unordered(["sensor.power", "switch.power"])
+    assert hass.states.async_entity_ids_by_attribute(
+        "device_class", "power", "sensor"
+    ) == ["sensor.power"]
+    assert hass.states.async_entity_ids_by_attribute("unit_of_measurement", "W") == [
+        "switch.power"
+    ]
+    assert hass.states.async_entity_ids_by_attribute("device_class", "gas") == []
+
+    # State only changes keep the index
+    hass.states.async_set("sensor.power", "2", {"device_class": "power"})
+    hass.states.async_set("sensor.energy", "2", {"device_class": "power"})
+    hass.states.async_set("switch.power", "off", {"unit_of_measurement": "W"})
+    assert hass.states.async_entity_ids_by_attribute(
+        "device_class", "power"
+    ) == unordered(["sensor.power", "sensor.energy"])
+    assert hass.states.async_entity_ids_by_attribute("device_class", "energy") == []
+
+    hass.states.async_remove("sensor.power")
+    assert hass.states.async_entity_ids_by_attribute("device_class", "power") == [
+        "sensor.energy"
+    ]
+
+    with pytest.raises(ValueError, match="friendly_name is not indexed"):
+        hass.states.async_entity_ids_by_attribute("friendly_name", "power")
+
+
+async def test_statemachine_async_set_many(hass: HomeAssistant) -> None:
+    """Test setting many states in one batch."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    hass.states.async_set("light.kitchen", "off")
+    seen: list[tuple[str, str | None]] = []
+
+    @ha.callback
+    def _state_changed(event: ha.Event[ha.EventStateChangedData]) -> None:
+        # All states of the batch are set before the events are fired
+        seen.append(
+            (event.data["entity_id"], hass.states.get("light.porch").state)  # type: ignore[union-attr]
+        )
+
+    state_changed = async_capture_events(hass, EVENT_STATE_CHANGED)
+    state_reported: list[ha.Event[ha.EventStateReportedData]] = []
+
+    @ha.callback
+    def _state_reported(event: ha.Event[ha.EventStateReportedData]) -> None:
+        state_reported.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+    hass.bus.async_listen(
+        EVENT_STATE_REPORTED, _state_reported, event_filter=ha.callback(lambda _: True)
+    )
+    context = ha.Context()
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "on", {"brightness": 200}),
+            ("light.kitchen", "off", None),
+            ("Light.Porch", "on", None),
+        ],
+        context=context,
+    )
+
+    assert seen == [("light.bowl", "on"), ("light.porch", "on")]
+    assert [event.data["entity_id"] for event in state_changed] == [
+        "light.bowl",
+        "light.porch",
+    ]
+    assert state_changed[0].data["old_state"].attributes == {"brightness": 100}
+    assert state_changed[0].data["new_state"].attributes == {"brightness": 200}
+    assert state_changed[1].data["old_state"] is None
+    assert [event.data["entity_id"] for event in state_reported] == ["light.kitchen"]
+    assert all(event.context is context for event in (*state_changed, *state_reported))
+    assert state_changed[0].time_fired_timestamp == (
+        state_changed[1].data["new_state"].last_updated_timestamp
+    )
+
+    # The states set before an invalid state are still announced
+    with pytest.raises(InvalidStateError):
+        hass.states.async_set_many(
+            [("light.bowl", "off", None), ("light.kitchen", "x" * 256, None)]
+        )
+    assert hass.states.get("light.bowl").state == "off"
+    assert hass.states.get("light.kitchen").state == "off"
+    assert state_changed[-1].data["entity_id"] == "light.bowl"
+    assert len(state_changed) == 3
+
+    # The listeners are looked up for every event of the batch
+    late: list[str] = []
+
+    @ha.callback
+    def _add_listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            ha.callback(lambda event: late.append(event.data["entity_id"])),
+        )
+        unsub()
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _add_listener)
+    hass.states.async_set_many(
+        [("light.bowl", "on", None), ("light.kitchen", "on", None)]
+    )
+    assert late == ["light.kitchen"]
+
+
 async def test_statemachine_remove(hass: HomeAssistant) -> None:
     """Test remove method."""
     hass.states.async_set("light.bowl", "on", {})
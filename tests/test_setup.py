@@ -1,6 +1,7 @@
 """Test component/platform setup."""
 
 import asyncio
+import logging
 import threading
 from unittest.mock import ANY, AsyncMock, Mock, patch
 
@@ -25,6 +26,7 @@ from homeassistant.helpers.dispatcher import (
 )
 from homeassistant.helpers.issue_registry import IssueRegistry
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .common import (
     MockConfigEntry,
@@ -1080,6 +1082,52 @@ async def test_async_start_setup_simple_integration_end_to_end(
     }
 
 
+@pytest.mark.usefixtures("mock_handlers")
+async def test_startup_trace(hass: HomeAssistant) -> None:
+    """Test the setup steps are recorded in the startup trace."""
+    hass.set_state(CoreState.not_running)
+    trace = setup.async_enable_startup_trace(hass)
+
+    async def _async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+        coordinator = DataUpdateCoordinator(
+            hass,
+            logging.getLogger(__name__),
+            name="test",
+            update_method=AsyncMock(return_value=True),
+        )
+        await coordinator.async_config_entry_first_refresh()
+        return True
+
+    mock_integration(hass, MockModule("comp", async_setup_entry=_async_setup_entry))
+    mock_platform(hass, "comp.config_flow", None)
+    entry = MockConfigEntry(domain="comp")
+    entry.add_to_hass(hass)
+    assert await setup.async_setup_component(hass, "comp", {})
+    await hass.async_block_till_done()
+
+    assert [(span.name, span.group) for span in trace.spans] == [
+        ("requirements", None),
+        ("import", None),
+        (setup.SetupPhases.SETUP, None),
+        ("import_config_flow", entry.entry_id),
+        ("first_refresh", entry.entry_id),
+        (setup.SetupPhases.CONFIG_ENTRY_SETUP, entry.entry_id),
+    ]
+    assert all(span.start <= span.end for span in trace.spans)
+    assert trace.critical_path() == ["comp"]
+
+    # Nothing is recorded once running, also for setups started before
+    with setup.async_start_setup(
+        hass, integration="late", group="entry_id", phase=setup.SetupPhases.SETUP
+    ):
+        hass.set_state(CoreState.running)
+        with setup.async_pause_setup(hass, setup.SetupPhases.WAIT_IMPORT_PLATFORMS):
+            pass
+        with setup.async_trace_setup_step(hass, "late", "import"):
+            pass
+    assert len(trace.spans) == 6
+
+
 async def test_async_get_setup_timings(hass: HomeAssistant) -> None:
     """Test we can get the setup timings from the setup time data."""
     setup_time = setup._setup_times(hass)
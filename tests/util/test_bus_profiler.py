@@ -0,0 +1,73 @@
+"""Test the event bus profiler."""
+
+import functools
+import gc
+from unittest.mock import Mock
+
+from homeassistant.util.bus_profiler import EventBusProfiler, ListenerStats
+
+
+def test_listener_stats_percentile() -> None:
+    """Test the percentile is taken from the most recent calls."""
+    stats = ListenerStats(10)
+    assert stats.percentile(99) == 0.0
+    for duration in range(1, 6):
+        stats.add_call(duration)
+    assert stats.percentile(99) == 5
+    assert stats.percentile(50) == 3
+
+    for _ in range(10):
+        stats.add_call(1)
+    assert stats.calls == 15
+    assert stats.total_time == 25
+    assert stats.max_time == 5
+    assert stats.percentile(99) == 1
+
+
+def _listener(event: object) -> None:
+    """Listen to events."""
+
+
+def test_profiler_as_list() -> None:
+    """Test the statistics are grouped by listener name and ordered by total time."""
+    profiler = EventBusProfiler(4)
+    fast = Mock(target=functools.partial(_listener))
+    slow = Mock(target=_listener)
+    profiler.add_call("test", fast, 0.1)
+    profiler.add_rejected("test", fast)
+    profiler.add_call("test", slow, 0.3)
+    profiler.add_call("other", slow, 0.2)
+
+    assert profiler.as_list() == [
+        {
+            "event_type": "test",
+            "listener": f"{__name__}._listener",
+            "calls": 2,
+            "rejected": 1,
+            "total_time": 0.4,
+            "mean_time": 0.2,
+            "p99_time": 0.3,
+            "max_time": 0.3,
+        },
+        {
+            "event_type": "other",
+            "listener": f"{__name__}._listener",
+            "calls": 1,
+            "rejected": 0,
+            "total_time": 0.2,
+            "mean_time": 0.2,
+            "p99_time": 0.2,
+            "max_time": 0.2,
+        },
+    ]
+
+
+def test_profiler_does_not_keep_jobs() -> None:
+    """Test the profiler does not keep removed listeners alive."""
+    profiler = EventBusProfiler(4)
+    job = Mock(target=_listener)
+    profiler.add_call("test", job, 0.1)
+    del job
+    gc.collect()
+    assert not profiler._names
+    assert profiler.as_list()[0]["calls"] == 1
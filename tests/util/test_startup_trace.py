@@ -0,0 +1,70 @@
+"""Test the startup trace."""
+
+from homeassistant.util.startup_trace import StartupTrace
+
+
+def _trace() -> StartupTrace:
+    """Return a trace of integrations set up after their dependencies."""
+    trace = StartupTrace()
+    trace.origin = 100.0
+    trace.add_span("import", "http", None, 100.0, 101.0)
+    trace.add_span("setup", "http", None, 101.0, 102.0)
+    trace.add_span("setup", "recorder", None, 100.0, 105.0)
+    trace.add_span("requirements", "api", None, 102.5, 103.0)
+    trace.add_span("setup", "api", None, 103.0, 104.0)
+    trace.add_span("setup", "history", None, 105.0, 106.0)
+    trace.add_span("config_entry_setup", "history", "entry_id", 105.0, 105.5)
+    trace.add_span("first_refresh", "history", "entry_id", 105.1, 105.4)
+    trace.set_dependencies("api", ["http"])
+    trace.set_dependencies("history", ["http", "recorder"])
+    return trace
+
+
+def test_critical_path() -> None:
+    """Test the critical path follows the dependency that finished last."""
+    trace = _trace()
+    assert trace.critical_path() == ["recorder", "history"]
+
+    trace.add_span("setup", "logbook", None, 106.0, 108.0)
+    trace.set_dependencies("logbook", ["api", "history", "frontend"])
+    assert trace.critical_path() == ["recorder", "history", "logbook"]
+
+    assert StartupTrace().critical_path() == []
+
+
+def test_as_chrome_trace() -> None:
+    """Test the timeline is exported in the Chrome trace event format."""
+    chrome_trace = _trace().as_chrome_trace()
+    assert chrome_trace["otherData"] == {"critical_path": ["recorder", "history"]}
+    events = chrome_trace["traceEvents"]
+    lanes = {
+        event["tid"]: event["args"]["name"] for event in events if event["ph"] == "M"
+    }
+    assert sorted(lanes.values()) == [
+        "Critical path",
+        "api",
+        "history",
+        "history (entry_id)",
+        "http",
+        "recorder",
+    ]
+    assert [
+        (lanes[event["tid"]], event["name"], event["ts"], event["dur"])
+        for event in events
+        if event["ph"] == "X" and lanes[event["tid"]] == "history (entry_id)"
+    ] == [
+        ("history (entry_id)", "config_entry_setup", 5_000_000, 500_000),
+        ("history (entry_id)", "first_refresh", 5_100_000, 300_000),
+    ]
+    assert [
+        (event["name"], event["ts"], event["dur"])
+        for event in events
+        if event["ph"] == "X" and event["tid"] == 0
+    ] == [("recorder", 0, 5_000_000), ("history", 5_000_000, 1_000_000)]
+    # The requirements are processed before the setup of api
+    [api_requirements] = [
+        event
+        for event in events
+        if event["name"] == "requirements" and event["cat"] == "api"
+    ]
+    assert api_requirements["ts"] == 2_500_000